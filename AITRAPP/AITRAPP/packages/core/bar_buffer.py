@@ -0,0 +1,189 @@
+"""Array-backed ring buffer for completed bars"""
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from packages.core.models import Bar
+
+# Columns with None mapped to NaN
+OPTIONAL_COLUMNS = (
+    "oi", "vwap", "atr", "rsi", "adx", "ema_fast", "ema_slow", "supertrend", "supertrend_direction",
+)
+INDICATOR_COLUMNS = OPTIONAL_COLUMNS[1:]
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume") + OPTIONAL_COLUMNS
+
+
+class BarBuffer:
+    """
+    Fixed-capacity ring buffer of OHLCV/OI (and attached indicator) columns for one
+    token and window.
+
+    Every row is written twice, at slot and slot + capacity, so the newest n rows are
+    always one contiguous slice: tail() returns read-only NumPy views without copying.
+    A view stays valid until capacity - n further bars have been appended.
+
+    Bar objects are kept in a ring laid out the same way, so bars() is a list slice.
+    Rows without an object are built from the columns on first access and cached;
+    indicator fields set through set_indicators() are visible on both.
+    """
+
+    def __init__(self, token: int, capacity: int = 500):
+        self.token = token
+        self.capacity = capacity
+        self.count = 0  # Bars appended so far; sequence number of the next bar
+
+        size = 2 * capacity
+        self._data: Dict[str, np.ndarray] = {
+            "timestamp": np.zeros(size, dtype="datetime64[us]"),
+            "volume": np.zeros(size, dtype=np.int64),
+        }
+        for name in ("open", "high", "low", "close") + OPTIONAL_COLUMNS:
+            self._data[name] = np.full(size, np.nan)
+
+        self._objects: List[Optional[Bar]] = [None] * size
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, bar: Bar) -> None:
+        """Store a completed bar (the object itself is kept as the cached Bar for that row)."""
+        slot = self.count % self.capacity
+        row = {
+            "timestamp": np.datetime64(bar.timestamp, "us"),
+            "open": bar.open,
+            "high": bar.high,
+            "low": bar.low,
+            "close": bar.close,
+            "volume": bar.volume,
+        }
+        for name in OPTIONAL_COLUMNS:
+            value = getattr(bar, name)
+            row[name] = np.nan if value is None else value
+
+        for name, value in row.items():
+            column = self._data[name]
+            column[slot] = value
+            column[slot + self.capacity] = value
+
+        self._objects[slot] = self._objects[slot + self.capacity] = bar
+        self.count += 1
+
+    def tail(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Zero-copy read-only views of the last n rows of every column (oldest first)."""
+        n = len(self) if n is None else max(0, min(n, len(self)))
+        return {name: self._slice(name, self.count - n, self.count) for name in self._data}
+
+    def _slice(self, name: str, start_seq: int, end_seq: int) -> np.ndarray:
+        """Read-only view of rows [start_seq, end_seq) of one column (range must be in the buffer)."""
+        if end_seq <= start_seq:
+            return self._data[name][:0]
+        end = (end_seq - 1) % self.capacity + self.capacity + 1
+        view = self._data[name][end - (end_seq - start_seq):end]
+        view.flags.writeable = False
+        return view
+
+    def bar_at(self, seq: int) -> Bar:
+        """Bar object for sequence number seq, built from the columns on first access."""
+        if not (self.count - len(self) <= seq < self.count):
+            raise IndexError(f"Bar {seq} is no longer in the buffer")
+        slot = seq % self.capacity
+        bar = self._objects[slot]
+        if bar is not None:
+            return bar
+
+        data = self._data
+        optional = {}
+        for name in OPTIONAL_COLUMNS:
+            value = data[name][slot]
+            optional[name] = None if np.isnan(value) else value.item()
+        if optional["oi"] is not None:
+            optional["oi"] = int(optional["oi"])
+        if optional["supertrend_direction"] is not None:
+            optional["supertrend_direction"] = int(optional["supertrend_direction"])
+
+        bar = Bar(
+            token=self.token,
+            timestamp=data["timestamp"][slot].item(),
+            open=data["open"][slot].item(),
+            high=data["high"][slot].item(),
+            low=data["low"][slot].item(),
+            close=data["close"][slot].item(),
+            volume=data["volume"][slot].item(),
+            **optional,
+        )
+        self._objects[slot] = self._objects[slot + self.capacity] = bar
+        return bar
+
+    def bars(self, n: int) -> "BarView":
+        """Lazy Bar sequence over the last n bars (all bars if n <= 0, like list[-0:])."""
+        size = len(self)
+        n = size if n <= 0 else min(n, size)
+        return BarView(self, self.count - n, n)
+
+    def bar_range(self, start_seq: int, end_seq: int) -> List[Bar]:
+        """Bar objects for sequence numbers [start_seq, end_seq), building any not yet cached."""
+        if end_seq <= start_seq:
+            return []
+        end = (end_seq - 1) % self.capacity + self.capacity + 1
+        bars = self._objects[end - (end_seq - start_seq):end]
+        for i in [i for i, bar in enumerate(bars) if bar is None]:
+            bars[i] = self.bar_at(start_seq + i)
+        return bars
+
+    def latest(self) -> Optional[Bar]:
+        return self.bar_at(self.count - 1) if self.count else None
+
+    def set_indicators(self, values: Dict[str, Optional[float]]) -> None:
+        """Attach indicator values to the newest bar (columns and cached Bar object)."""
+        if not self.count:
+            return
+        slot = (self.count - 1) % self.capacity
+        bar = self._objects[slot]
+        for name in INDICATOR_COLUMNS:
+            value = values.get(name)
+            column = self._data[name]
+            column[slot] = column[slot + self.capacity] = np.nan if value is None else value
+            if bar is not None:
+                setattr(bar, name, value)
+
+
+class BarView(Sequence):
+    """
+    Read-only sequence of Bar objects over a BarBuffer range.
+    Supports len(), indexing, slicing and iteration like the list it replaces; the
+    column arrays are available without building any Bar through column().
+    """
+
+    def __init__(self, buffer: BarBuffer, start_seq: int, length: int):
+        self._buffer = buffer
+        self._start = start_seq
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Bar, List[Bar]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return self._buffer.bar_range(self._start + start, self._start + max(start, stop))
+            return [self._buffer.bar_at(self._start + i) for i in range(start, stop, step)]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("BarView index out of range")
+        return self._buffer.bar_at(self._start + index)
+
+    def __iter__(self):
+        return iter(self._buffer.bar_range(self._start, self._start + self._length))
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of one column for the bars in this view."""
+        buffer = self._buffer
+        if self._start < buffer.count - len(buffer):
+            raise IndexError("BarView range is no longer in the buffer")
+        return buffer._slice(name, self._start, self._start + self._length)
+
+    def __repr__(self) -> str:
+        return f"BarView(token={self._buffer.token}, bars={self._length})"
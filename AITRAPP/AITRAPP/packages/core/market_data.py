@@ -1,17 +1,18 @@
 """WebSocket market data streaming and aggregation"""
 import asyncio
-from collections import defaultdict, deque
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 import numpy as np
-import pandas as pd
 import structlog
 from kiteconnect import KiteTicker
 
 from packages.core.config import Settings
+from packages.core.bar_buffer import BarBuffer
 from packages.core.models import Bar, Tick
 from packages.core.indicators import IndicatorCalculator
+from packages.core.streaming_indicators import StreamingIndicators
 from packages.core.kite_ws import SafeKiteTicker
 
 logger = structlog.get_logger(__name__)
@@ -28,8 +29,8 @@ class TickAggregator:
         self.current_bar: Optional[Bar] = None
         self.current_window_start: Optional[datetime] = None
         
-        # Historical bars
-        self.bars: deque = deque(maxlen=500)  # Keep last 500 bars
+        # Historical bars (ring buffer of columns, last 500 bars)
+        self.bars = BarBuffer(token, capacity=500)
         
     def add_tick(self, tick: Tick) -> Optional[Bar]:
         """
@@ -93,15 +94,17 @@ class TickAggregator:
         floored_epoch = (epoch // self.window_seconds) * self.window_seconds
         return datetime.fromtimestamp(floored_epoch)
     
-    def get_bars(self, n: int = 100) -> List[Bar]:
-        """Get last n bars"""
-        return list(self.bars)[-n:]
+    def get_bars(self, n: int = 100) -> Sequence[Bar]:
+        """Get last n bars (lazy Bar sequence, no copy)"""
+        return self.bars.bars(n)
+    
+    def get_arrays(self, n: int = 100) -> Dict[str, np.ndarray]:
+        """Get last n bars as zero-copy column views (timestamp, open, ..., oi, indicators)"""
+        return self.bars.tail(n)
     
     def get_latest_bar(self) -> Optional[Bar]:
         """Get most recent completed bar"""
-        if self.bars:
-            return self.bars[-1]
-        return None
+        return self.bars.latest()
 
 
 class MarketDataStream:
@@ -129,6 +132,9 @@ class MarketDataStream:
         
         # Indicator calculator
         self.indicator_calc = IndicatorCalculator()
+
+        # Incremental indicator state per token per window, updated once per completed bar
+        self.streaming_indicators: Dict[int, Dict[int, StreamingIndicators]] = defaultdict(dict)
         
         # Subscribed tokens
         self.subscribed_tokens: List[int] = []
@@ -228,41 +234,32 @@ class MarketDataStream:
             return None
     
     def _compute_indicators(self, token: int, window_sec: int) -> None:
-        """Compute technical indicators for a token's bars"""
+        """Update streaming indicators with the bar that just closed and attach them to it"""
         try:
             aggregator = self.aggregators[token][window_sec]
-            bars = aggregator.get_bars(200)  # Get enough bars for indicators
-            
-            if len(bars) < 50:  # Need minimum bars
+            latest_bar = aggregator.get_latest_bar()
+            if latest_bar is None:
                 return
-            
-            # Convert to DataFrame
-            df = pd.DataFrame([
-                {
-                    "open": b.open,
-                    "high": b.high,
-                    "low": b.low,
-                    "close": b.close,
-                    "volume": b.volume
-                }
-                for b in bars
-            ])
-            
-            # Compute indicators
-            indicators = self.indicator_calc.compute_all(df)
-            
-            # Attach indicators to latest bar
-            if bars:
-                latest_bar = bars[-1]
-                latest_bar.vwap = indicators.get("vwap")
-                latest_bar.atr = indicators.get("atr")
-                latest_bar.rsi = indicators.get("rsi")
-                latest_bar.adx = indicators.get("adx")
-                latest_bar.ema_fast = indicators.get("ema_fast")
-                latest_bar.ema_slow = indicators.get("ema_slow")
-                latest_bar.supertrend = indicators.get("supertrend")
-                latest_bar.supertrend_direction = indicators.get("supertrend_direction")
-        
+
+            state = self.streaming_indicators[token].get(window_sec)
+            if state is None:
+                calc = self.indicator_calc
+                state = StreamingIndicators(
+                    atr_period=calc.atr_period,
+                    rsi_period=calc.rsi_period,
+                    adx_period=calc.adx_period,
+                    ema_fast=calc.ema_fast,
+                    ema_slow=calc.ema_slow,
+                    supertrend_period=calc.supertrend_period,
+                    supertrend_multiplier=calc.supertrend_multiplier,
+                )
+                self.streaming_indicators[token][window_sec] = state
+
+            indicators = state.update(latest_bar.high, latest_bar.low, latest_bar.close, latest_bar.volume)
+
+            # Sets the bar's columns and the Bar object
+            aggregator.bars.set_indicators(indicators)
+
         except Exception as e:
             logger.error("Failed to compute indicators", token=token, error=str(e))
     
@@ -332,6 +329,7 @@ class MarketDataStream:
             for token in tokens:
                 if token in self.aggregators:
                     del self.aggregators[token]
+                self.streaming_indicators.pop(token, None)
             
             logger.info(f"Unsubscribed from {len(tokens)} instruments")
         
@@ -342,12 +340,18 @@ class MarketDataStream:
         """Get latest tick for a token"""
         return self.latest_ticks.get(token)
     
-    def get_bars(self, token: int, window_sec: int, n: int = 100) -> List[Bar]:
+    def get_bars(self, token: int, window_sec: int, n: int = 100) -> Sequence[Bar]:
         """Get bars for a token and window"""
         if token in self.aggregators and window_sec in self.aggregators[token]:
             return self.aggregators[token][window_sec].get_bars(n)
         return []
     
+    def get_bar_arrays(self, token: int, window_sec: int, n: int = 100) -> Dict[str, np.ndarray]:
+        """Get zero-copy column views of the last n bars for a token and window"""
+        if token in self.aggregators and window_sec in self.aggregators[token]:
+            return self.aggregators[token][window_sec].get_arrays(n)
+        return {}
+    
     def get_latest_bar(self, token: int, window_sec: int) -> Optional[Bar]:
         """Get latest completed bar for a token and window"""
         if token in self.aggregators and window_sec in self.aggregators[token]:
@@ -0,0 +1,206 @@
+"""Incremental (per-bar) technical indicators for live bar streams"""
+import math
+from collections import deque
+from typing import Dict, Optional
+
+NAN = float("nan")
+
+
+class _RollingMean:
+    """
+    Simple moving average over the last `period` values.
+    Matches IndicatorCalculator.rolling_mean: NaN until `period` values, and NaN while
+    any NaN is inside the window. Indicator periods are small and fixed, so the window is
+    summed directly (no running-sum drift, exact zeros stay zero).
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values: deque = deque(maxlen=period)
+
+    def push(self, value: float) -> float:
+        self.values.append(value)
+        if len(self.values) < self.period:
+            return NAN
+        return sum(self.values) / self.period
+
+
+class _RollingSum:
+    """Running sum over a long window, re-summed once per window length to bound float drift."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+        self.total = 0.0
+        self._pushes = 0
+
+    def push(self, value: float) -> float:
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+        self._pushes += 1
+        if self._pushes >= self.window:
+            self.total = math.fsum(self.values)
+            self._pushes = 0
+        return self.total
+
+
+def _ratio_rsi(avg_gain: float, avg_loss: float) -> float:
+    # Same IEEE semantics as the NumPy version: x/0 -> inf (RSI 100), 0/0 -> NaN
+    if avg_gain != avg_gain or avg_loss != avg_loss:
+        return NAN
+    if avg_loss == 0:
+        return NAN if avg_gain == 0 else 100.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+class StreamingIndicators:
+    """
+    O(1)-per-bar VWAP, ATR, RSI, ADX, EMA and Supertrend.
+
+    Feed completed bars in order with update(); values equal the last element of the
+    IndicatorCalculator series functions run over every bar seen so far. VWAP is over
+    the last `vwap_window` bars, like compute_all over a bar window of that size.
+    """
+
+    def __init__(
+        self,
+        atr_period: int = 14,
+        rsi_period: int = 14,
+        adx_period: int = 14,
+        ema_fast: int = 34,
+        ema_slow: int = 89,
+        supertrend_period: int = 10,
+        supertrend_multiplier: float = 3.0,
+        vwap_window: int = 200,
+    ):
+        self.ema_fast_period = ema_fast
+        self.ema_slow_period = ema_slow
+        self.supertrend_multiplier = supertrend_multiplier
+        # compute_all returns nothing until the longest lookback is filled
+        self.min_bars = max(atr_period, rsi_period, adx_period, ema_slow)
+
+        self.count = 0
+        self.prev_high = NAN
+        self.prev_low = NAN
+        self.prev_close = NAN
+
+        self._atr = _RollingMean(atr_period)
+        self._avg_gain = _RollingMean(rsi_period)
+        self._avg_loss = _RollingMean(rsi_period)
+        self._adx_tr = _RollingMean(adx_period)
+        self._plus_dm = _RollingMean(adx_period)
+        self._minus_dm = _RollingMean(adx_period)
+        self._adx = _RollingMean(adx_period)
+        self._st_atr = _RollingMean(supertrend_period)
+        self._pv = _RollingSum(vwap_window)
+        self._volume = _RollingSum(vwap_window)
+
+        self.ema_fast = NAN
+        self.ema_slow = NAN
+        self.upper_band = NAN
+        self.lower_band = NAN
+        self.supertrend = NAN
+        self.supertrend_direction = 1
+
+        self.values: Dict[str, Optional[float]] = {}
+
+    @staticmethod
+    def _ema_step(prev: float, value: float, period: int) -> float:
+        # pandas ewm(span=period, adjust=False)
+        if prev != prev:
+            return value
+        alpha = 2.0 / (period + 1)
+        return alpha * value + (1 - alpha) * prev
+
+    def update(self, high: float, low: float, close: float, volume: float) -> Dict[str, Optional[float]]:
+        """Add one completed bar and return the latest indicator values ({} until warmed up)."""
+        high = float(high)
+        low = float(low)
+        close = float(close)
+        first = self.count == 0
+
+        # True range (first bar: high - low)
+        if first:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+        atr = self._atr.push(tr)
+
+        # RSI (first delta is NaN, which counts as neither gain nor loss)
+        delta = NAN if first else close - self.prev_close
+        rsi = _ratio_rsi(
+            self._avg_gain.push(delta if delta > 0 else 0.0),
+            self._avg_loss.push(-delta if delta < 0 else 0.0),
+        )
+
+        # ADX
+        up_move = NAN if first else high - self.prev_high
+        down_move = NAN if first else self.prev_low - low
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+        adx_atr = self._adx_tr.push(tr)
+        plus_dm_smooth = self._plus_dm.push(plus_dm)
+        minus_dm_smooth = self._minus_dm.push(minus_dm)
+        plus_di = 100 * plus_dm_smooth / adx_atr if adx_atr else NAN
+        minus_di = 100 * minus_dm_smooth / adx_atr if adx_atr else NAN
+        di_sum = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di) / di_sum if di_sum else NAN
+        adx = self._adx.push(dx)
+
+        # EMAs
+        self.ema_fast = self._ema_step(self.ema_fast, close, self.ema_fast_period)
+        self.ema_slow = self._ema_step(self.ema_slow, close, self.ema_slow_period)
+
+        # Supertrend (band ratchet from IndicatorCalculator.supertrend_series)
+        st_atr = self._st_atr.push(tr)
+        hl_avg = (high + low) / 2
+        basic_ub = hl_avg + self.supertrend_multiplier * st_atr
+        basic_lb = hl_avg - self.supertrend_multiplier * st_atr
+        if first:
+            self.upper_band = basic_ub
+            self.lower_band = basic_lb
+            self.supertrend = 0.0
+            self.supertrend_direction = 1
+        else:
+            if self.upper_band != self.upper_band or basic_ub < self.upper_band or self.prev_close > self.upper_band:
+                self.upper_band = basic_ub
+            if self.lower_band != self.lower_band or basic_lb > self.lower_band or self.prev_close < self.lower_band:
+                self.lower_band = basic_lb
+            if close <= self.upper_band:
+                self.supertrend = self.upper_band
+                self.supertrend_direction = -1
+            else:
+                self.supertrend = self.lower_band
+                self.supertrend_direction = 1
+
+        # VWAP over the recent window
+        pv = self._pv.push((high + low + close) / 3 * volume)
+        vol = self._volume.push(float(volume))
+
+        self.prev_high = high
+        self.prev_low = low
+        self.prev_close = close
+        self.count += 1
+
+        if self.count < self.min_bars:
+            self.values = {}
+            return self.values
+
+        self.values = {
+            "vwap": pv / vol if vol else None,
+            "atr": _finite(atr),
+            "rsi": _finite(rsi),
+            "adx": _finite(adx),
+            "ema_fast": _finite(self.ema_fast),
+            "ema_slow": _finite(self.ema_slow),
+            "supertrend": _finite(self.supertrend),
+            "supertrend_direction": self.supertrend_direction,
+        }
+        return self.values
+
+
+def _finite(value: float) -> Optional[float]:
+    return None if value != value else float(value)
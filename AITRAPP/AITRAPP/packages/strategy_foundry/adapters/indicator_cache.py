@@ -0,0 +1,123 @@
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from packages.strategy_foundry.adapters.core_indicators import IndicatorsAdapter
+
+# Full-series frames kept by IndicatorCache.for_frame (e.g. 5m + 15m + 1d per instrument)
+MAX_CACHED_FRAMES = 8
+
+
+def _compute(df: pd.DataFrame, indicator: str, params: Dict) -> Any:
+    if indicator == 'rsi':
+        return IndicatorsAdapter.rsi(df, **params)
+    if indicator == 'adx':
+        return IndicatorsAdapter.adx(df, **params)
+    if indicator == 'atr':
+        return IndicatorsAdapter.atr(df, **params)
+    if indicator == 'ema':
+        return IndicatorsAdapter.ema(df['close'], **params)
+    if indicator == 'supertrend':
+        return IndicatorsAdapter.supertrend(df, **params)
+    if indicator == 'bollinger':
+        return IndicatorsAdapter.bollinger_bands(df['close'], **params)
+    if indicator == 'donchian':
+        return IndicatorsAdapter.donchian(df, **params)
+    raise ValueError(f"Unknown indicator: {indicator}")
+
+
+def _slice(value: Any, rows: slice) -> Any:
+    if isinstance(value, tuple):
+        return tuple(v.iloc[rows] for v in value)
+    return value.iloc[rows]
+
+
+class IndicatorCache:
+    """
+    Memoizes IndicatorsAdapter results for one DataFrame, keyed by (indicator, params).
+    Shared instances are looked up by a content hash of the frame, so every evaluator
+    built on the same data reuses the same results.
+    """
+
+    _frames: "OrderedDict[str, IndicatorCache]" = OrderedDict()
+    # Running hit/miss totals of shared caches, including frames since evicted
+    _hits = 0
+    _misses = 0
+
+    def __init__(self, df: pd.DataFrame, key: Optional[str] = None):
+        self.df = df
+        self.key = key
+        self.hits = 0
+        self.misses = 0
+        self._results: Dict[Tuple, Any] = {}
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame) -> "IndicatorCache":
+        """Shared cache for df, found by content hash (LRU of MAX_CACHED_FRAMES frames)."""
+        key = cls.content_hash(df)
+        cache = cls._frames.get(key)
+        if cache is None:
+            cache = cls(df, key)
+            cls._frames[key] = cache
+            while len(cls._frames) > MAX_CACHED_FRAMES:
+                cls._frames.popitem(last=False)
+        else:
+            cls._frames.move_to_end(key)
+        return cache
+
+    @staticmethod
+    def content_hash(df: pd.DataFrame) -> str:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).values
+        columns = ",".join(map(str, df.columns)).encode()
+        return hashlib.sha1(columns + row_hashes.tobytes()).hexdigest()
+
+    @classmethod
+    def stats(cls) -> Dict:
+        """Hit/miss totals of the shared caches since the last clear()."""
+        hits, misses = IndicatorCache._hits, IndicatorCache._misses
+        total = hits + misses
+        return {
+            "frames": len(cls._frames),
+            "entries": sum(len(c._results) for c in cls._frames.values()),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+    @classmethod
+    def clear(cls):
+        cls._frames.clear()
+        IndicatorCache._hits = IndicatorCache._misses = 0
+
+    def get(self, indicator: str, params: Dict) -> Any:
+        """Series (or tuple of Series) for the whole frame. Treat results as read-only."""
+        key = (indicator, tuple(sorted(params.items())))
+        if key in self._results:
+            self.hits += 1
+            if self.key is not None:
+                IndicatorCache._hits += 1
+            return self._results[key]
+
+        self.misses += 1
+        if self.key is not None:
+            IndicatorCache._misses += 1
+        value = _compute(self.df, indicator, params)
+        self._results[key] = value
+        return value
+
+    def view(self, start: int, end: int) -> "IndicatorView":
+        """Indicators for the rows df.iloc[start:end], sliced from the full-series results."""
+        return IndicatorView(self, slice(start, end))
+
+
+class IndicatorView:
+    """Positional window onto an IndicatorCache (e.g. one walk-forward fold)."""
+
+    def __init__(self, cache: IndicatorCache, rows: slice):
+        self.cache = cache
+        self.rows = rows
+
+    def get(self, indicator: str, params: Dict) -> Any:
+        return _slice(self.cache.get(indicator, params), self.rows)
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+# Exit reason codes stored in TRADE_DTYPE['reason'], in the order the bar loop checks them
+REASON_EOD, REASON_TIME, REASON_SL, REASON_TP = range(4)
+EXIT_REASONS = np.array(["EOD", "Time", "SL", "TP"], dtype=object)
+
+TRADE_DTYPE = np.dtype([
+    ("entry_idx", np.int64),
+    ("exit_idx", np.int64),
+    ("entry_price", np.float64),
+    ("exit_price", np.float64),
+    ("net_return", np.float64),
+    ("reason", np.int8),
+    ("bars_held", np.int64),
+])
+
+TRADE_COLUMNS = ["entry_idx", "exit_idx", "entry_price", "exit_price", "net_return", "reason", "bars_held"]
+
+# Candidate entries scanned per block (rows x max_bars_hold boolean matrices)
+CHUNK_ROWS = 4096
+
+
+def simulate_long_trades(
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    signals: np.ndarray,
+    atr: np.ndarray,
+    force_exit: np.ndarray,
+    stop_loss_atr: float,
+    take_profit_atr: float,
+    max_bars_hold: int,
+    friction_bps: float,
+) -> np.ndarray:
+    """
+    Array-based exit simulation for long-only trades.
+
+    Same rules as the bar-by-bar loop: enter at Open[i] when signal[i-1] == 1 and bar i is
+    not past the EOD exit time; on each later bar exit on EOD (Open), time stop (Open),
+    stop loss (stop or gap Open), then take profit (target or gap Open). No re-entry on the
+    exit bar and no pyramiding. A trade still open at the last bar is not reported.
+
+    Instead of stepping through every bar, the exit bar of every possible entry is found at
+    once by scanning the next max_bars_hold bars as a matrix (the time stop bounds the
+    search). Trades are then chained: each trade starts at the first entry after the
+    previous exit, which only loops over the trades themselves.
+
+    Returns:
+        Structured array of TRADE_DTYPE, one row per closed trade
+    """
+    n = len(opens)
+    if n < 2:
+        return np.empty(0, dtype=TRADE_DTYPE)
+
+    opens = np.asarray(opens, dtype=np.float64)
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    force_exit = np.asarray(force_exit, dtype=bool)
+
+    # Possible entries: signal on the completed bar, entry bar before the EOD cut-off
+    candidates = np.flatnonzero((np.asarray(signals)[:-1] == 1) & ~force_exit[1:]) + 1
+    if len(candidates) == 0:
+        return np.empty(0, dtype=TRADE_DTYPE)
+
+    entry_prices = opens[candidates]
+
+    # Stops from the signal bar's ATR, 1% of price when ATR is unavailable
+    atr_values = np.asarray(atr, dtype=np.float64)[candidates - 1]
+    missing_atr = (atr_values == 0) | np.isnan(atr_values)
+    atr_values = np.where(missing_atr, entry_prices * 0.01, atr_values)
+    stop_losses = entry_prices - stop_loss_atr * atr_values
+    take_profits = entry_prices + take_profit_atr * atr_values
+
+    # Time stop fires once (i - entry_idx) >= max_bars_hold, so no exit lies further out
+    offsets = np.arange(1, max(int(max_bars_hold), 1) + 1)
+    time_stop = offsets >= max_bars_hold
+
+    exit_idx = np.full(len(candidates), -1, dtype=np.int64)
+    reasons = np.zeros(len(candidates), dtype=np.int8)
+
+    for start in range(0, len(candidates), CHUNK_ROWS):
+        block = slice(start, start + CHUNK_ROWS)
+        bars = candidates[block, None] + offsets
+        in_range = bars < n
+        bars = np.minimum(bars, n - 1)
+
+        eod_hit = force_exit[bars]
+        time_hit = np.broadcast_to(time_stop, bars.shape)
+        sl_hit = lows[bars] <= stop_losses[block, None]
+        tp_hit = highs[bars] >= take_profits[block, None]
+        hit = (eod_hit | time_hit | sl_hit | tp_hit) & in_range
+
+        first = hit.argmax(axis=1)
+        rows = np.arange(len(first))
+        exited = hit[rows, first]
+
+        # Same precedence as the bar loop when several exits fire on one bar
+        reason = np.select(
+            [eod_hit[rows, first], time_hit[rows, first], sl_hit[rows, first]],
+            [REASON_EOD, REASON_TIME, REASON_SL],
+            default=REASON_TP,
+        )
+        exit_idx[block] = np.where(exited, bars[rows, first], -1)
+        reasons[block] = reason
+
+    # Chain trades: after an exit, the next trade is the first entry after the exit bar
+    next_candidate = np.searchsorted(candidates, exit_idx, side="right")
+    taken = []
+    pos = 0
+    while pos < len(candidates) and exit_idx[pos] >= 0:
+        taken.append(pos)
+        pos = next_candidate[pos]
+
+    taken = np.asarray(taken, dtype=np.int64)
+    trades = np.empty(len(taken), dtype=TRADE_DTYPE)
+    if len(taken) == 0:
+        return trades
+
+    exits = exit_idx[taken]
+    reason = reasons[taken]
+    exit_opens = opens[exits]
+    stops = stop_losses[taken]
+    targets = take_profits[taken]
+
+    # Stops and targets fill at their level unless the bar gapped through it
+    exit_prices = np.select(
+        [reason == REASON_SL, reason == REASON_TP],
+        [np.where(exit_opens < stops, exit_opens, stops), np.where(exit_opens > targets, exit_opens, targets)],
+        default=exit_opens,
+    )
+
+    eff_entry = entry_prices[taken] * (1 + friction_bps / 10000.0)
+    eff_exit = exit_prices * (1 - friction_bps / 10000.0)
+
+    trades["entry_idx"] = candidates[taken]
+    trades["exit_idx"] = exits
+    trades["entry_price"] = entry_prices[taken]
+    trades["exit_price"] = exit_prices
+    trades["net_return"] = (eff_exit - eff_entry) / eff_entry
+    trades["reason"] = reason
+    trades["bars_held"] = exits - candidates[taken]
+    return trades
+
+
+def trades_to_frame(trades: np.ndarray) -> pd.DataFrame:
+    """Convert TRADE_DTYPE records to the engine's trades DataFrame."""
+    if len(trades) == 0:
+        return pd.DataFrame()
+
+    frame = pd.DataFrame({name: trades[name] for name in TRADE_COLUMNS})
+    frame["reason"] = EXIT_REASONS[trades["reason"]]
+    return frame
@@ -0,0 +1,189 @@
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from packages.strategy_foundry.adapters.core_costs import CostModel
+from packages.strategy_foundry.adapters.indicator_cache import IndicatorCache
+from packages.strategy_foundry.backtest.walkforward import WalkForwardEvaluator
+from packages.strategy_foundry.factory.grammar import StrategyConfig
+
+logger = logging.getLogger(__name__)
+
+# Chunks per worker: small enough to balance load, large enough to amortize dispatch
+CHUNKS_PER_WORKER = 4
+
+
+class SharedFrame:
+    """
+    DataFrame whose columns live in one POSIX shared memory block.
+    Pickling a SharedFrame only sends the block name and column layout, so worker
+    processes attach to the data instead of receiving a copy per task.
+    """
+
+    def __init__(self, name: str, nrows: int, columns: List[Tuple[str, str, int, Optional[str]]]):
+        self.name = name
+        self.nrows = nrows
+        self.columns = columns  # (column, numpy dtype, byte offset, timezone)
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    @classmethod
+    def create(cls, df: pd.DataFrame) -> "SharedFrame":
+        arrays = []
+        for col in df.columns:
+            series = df[col]
+            tz = None
+            if isinstance(series.dtype, pd.DatetimeTZDtype):
+                tz = str(series.dt.tz)
+                values = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+            else:
+                values = series.to_numpy()
+            if values.dtype == object:
+                raise TypeError(f"Column {col!r} has object dtype and cannot be shared")
+            arrays.append((col, np.ascontiguousarray(values), tz))
+
+        columns = []
+        offset = 0
+        for col, values, tz in arrays:
+            offset = math.ceil(offset / 8) * 8
+            columns.append((col, values.dtype.str, offset, tz))
+            offset += values.nbytes
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (col, dtype, start, tz), (_, values, _) in zip(columns, arrays):
+            np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, offset=start)[:] = values
+
+        frame = cls(shm.name, len(df), columns)
+        frame._shm = shm
+        return frame
+
+    def to_frame(self) -> pd.DataFrame:
+        """Attach (once) and rebuild the DataFrame over the shared buffers."""
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+
+        data = {}
+        for col, dtype, offset, tz in self.columns:
+            values = np.ndarray((self.nrows,), dtype=np.dtype(dtype), buffer=self._shm.buf, offset=offset)
+            values.flags.writeable = False
+            if tz is not None:
+                data[col] = pd.Series(pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(tz))
+            else:
+                data[col] = pd.Series(values, copy=False)
+        return pd.DataFrame(data, copy=False)
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self):
+        shm = self._shm or shared_memory.SharedMemory(name=self.name)
+        shm.close()
+        shm.unlink()
+        self._shm = None
+
+    def __getstate__(self):
+        return {'name': self.name, 'nrows': self.nrows, 'columns': self.columns}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = None
+
+
+_worker_evaluators: Dict[str, WalkForwardEvaluator] = {}
+
+
+def _init_worker(frames: Dict[str, SharedFrame], folds: int, cost_model: CostModel):
+    """Build one WalkForwardEvaluator per timeframe; runs once per worker process."""
+    _worker_evaluators.clear()
+    for key, frame in frames.items():
+        df = frame.to_frame() if isinstance(frame, SharedFrame) else frame
+        _worker_evaluators[key] = WalkForwardEvaluator(df, folds=folds, cost_model=cost_model)
+
+
+def _evaluate_chunk(chunk: List[Tuple[int, StrategyConfig]]) -> Tuple[List[Tuple], Dict]:
+    """
+    Evaluate candidates on every timeframe.
+    Returns (position, timeframe, metrics, error) rows plus indicator cache hits/misses for the chunk.
+    """
+    before = IndicatorCache.stats()
+    rows = []
+    for position, cand in chunk:
+        for key, evaluator in _worker_evaluators.items():
+            try:
+                rows.append((position, key, evaluator.evaluate(cand), None))
+            except Exception as e:
+                rows.append((position, key, None, str(e)))
+
+    after = IndicatorCache.stats()
+    cache = {'hits': after['hits'] - before['hits'], 'misses': after['misses'] - before['misses']}
+    return rows, cache
+
+
+def evaluate_candidates(
+    frames: Dict[str, pd.DataFrame],
+    candidates: List[StrategyConfig],
+    folds: int,
+    cost_model: CostModel,
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+) -> Tuple[Dict[str, List[Dict]], Dict]:
+    """
+    Walk-forward evaluation of every candidate on every frame (e.g. {"5m": df_5m, "15m": df_15m}).
+
+    With workers > 1 the frames are placed in shared memory and candidates are sent to a
+    process pool in chunks. Results are merged back in candidate order, so the output
+    (and any leaderboard built from it) is identical to a serial run.
+
+    Returns:
+        ({timeframe: [{"strategy": cand, "metrics": [...]}, ...]},
+         indicator cache hits/misses from worker processes)
+    """
+    indexed = list(enumerate(candidates))
+    worker_cache = {'hits': 0, 'misses': 0}
+
+    if workers <= 1 or len(candidates) <= 1:
+        _init_worker(frames, folds, cost_model)
+        rows, _ = _evaluate_chunk(indexed)
+    else:
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(indexed) / (workers * CHUNKS_PER_WORKER)))
+        chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+
+        shared = {}
+        try:
+            for key, df in frames.items():
+                shared[key] = SharedFrame.create(df)
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shared, folds, cost_model),
+            ) as pool:
+                rows = []
+                for chunk_rows, cache in pool.map(_evaluate_chunk, chunks):
+                    rows.extend(chunk_rows)
+                    worker_cache['hits'] += cache['hits']
+                    worker_cache['misses'] += cache['misses']
+        finally:
+            for frame in shared.values():
+                frame.unlink()
+
+    results = {key: [] for key in frames}
+    for position, key, metrics, error in sorted(rows, key=lambda row: row[0]):
+        cand = candidates[position]
+        if error is not None:
+            logger.warning(f"Failed {key} eval for {cand.strategy_id}: {error}")
+            continue
+        results[key].append({"strategy": cand, "metrics": metrics})
+
+    return results, worker_cache
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
@@ -5,6 +5,7 @@ from packages.strategy_foundry.backtest.engine import BacktestEngine
 from packages.strategy_foundry.backtest.metrics import MetricCalculator
 from packages.strategy_foundry.factory.grammar import StrategyConfig
 from packages.strategy_foundry.adapters.core_costs import CostModel
+from packages.strategy_foundry.adapters.indicator_cache import IndicatorCache
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,7 @@ class SanityChecker:
             return {"passed": True, "reason": "NoData"}
 
         # Run on Daily
-        trades = self.engine.run(self.df_daily, config)
+        trades = self.engine.run(self.df_daily, config, IndicatorCache.for_frame(self.df_daily))
 
         # Calculate Metrics (Full history)
         start_date = self.df_daily['datetime'].iloc[0]
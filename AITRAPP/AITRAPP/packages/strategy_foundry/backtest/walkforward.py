@@ -5,6 +5,7 @@ from packages.strategy_foundry.backtest.engine import BacktestEngine
 from packages.strategy_foundry.backtest.metrics import MetricCalculator
 from packages.strategy_foundry.factory.grammar import StrategyConfig
 from packages.strategy_foundry.adapters.core_costs import CostModel
+from packages.strategy_foundry.adapters.indicator_cache import IndicatorCache
 
 class WalkForwardEvaluator:
     def __init__(self, df: pd.DataFrame, folds: int = 4, cost_model: CostModel = None):
@@ -15,6 +16,8 @@ class WalkForwardEvaluator:
             # Default fallback if not provided
             self.cost_model = CostModel(slippage_bps=5.0, brokerage_per_order=20.0, tax_bps=3.0, spread_guard_bps=2.0)
         self.engine = BacktestEngine(self.cost_model)
+        # Indicators are computed once on the full series; folds get slices of them
+        self.indicators = IndicatorCache.for_frame(df)
 
     def evaluate(self, config: StrategyConfig, instrument_type: str = 'FUTURE') -> List[Dict]:
         """
@@ -36,7 +39,7 @@ class WalkForwardEvaluator:
             fold_df = self.df.iloc[start_idx:end_idx].copy()
 
             # Run Engine
-            trades = self.engine.run(fold_df, config)
+            trades = self.engine.run(fold_df, config, self.indicators.view(start_idx, end_idx))
 
             # Calculate Metrics
             # Time span in years
@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Rows in the open tail part; appends merge into it until it is full, then a new part starts
+TAIL_PART_ROWS = 5000
+
+
+class ParquetBarCache:
+    """
+    Typed OHLCV cache: one Parquet dataset per symbol and interval, plus a per-symbol
+    manifest with the last cached timestamp.
+
+    Layout:
+        <root>/<symbol>/manifest.json
+        <root>/<symbol>/interval=<interval>/part-00000.parquet, part-00001.parquet, ...
+
+    Bars are sorted by datetime (stored as UTC). New bars are appended to the tail part,
+    replacing any cached bars with the same or later timestamps (e.g. an in-progress bar).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _symbol_dir(self, symbol: str) -> str:
+        safe_symbol = symbol.replace('^', '').replace('.', '_')
+        return os.path.join(self.root, safe_symbol)
+
+    def _interval_dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), f"interval={interval}")
+
+    def _manifest_path(self, symbol: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), 'manifest.json')
+
+    def manifest(self, symbol: str) -> Dict:
+        path = self._manifest_path(symbol)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Unreadable bar cache manifest for {symbol}: {e}")
+            return {}
+
+    def _write_manifest(self, symbol: str, manifest: Dict):
+        path = self._manifest_path(symbol)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def entry(self, symbol: str, interval: str) -> Optional[Dict]:
+        return self.manifest(symbol).get(interval)
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        entry = self.entry(symbol, interval)
+        if not entry:
+            return None
+        return pd.Timestamp(entry['last_timestamp'])
+
+    def is_fresh(self, symbol: str, interval: str, max_age: timedelta) -> bool:
+        entry = self.entry(symbol, interval)
+        if not entry:
+            return False
+        updated_at = datetime.fromisoformat(entry['updated_at'])
+        return datetime.now(timezone.utc) - updated_at < max_age
+
+    def read(self, symbol: str, interval: str, since: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        """Memory-mapped read of the cached bars, optionally only those at or after `since`."""
+        entry = self.entry(symbol, interval)
+        if not entry:
+            return None
+
+        interval_dir = self._interval_dir(symbol, interval)
+        filters = [('datetime', '>=', pd.Timestamp(since).tz_convert('UTC'))] if since is not None else None
+        # partitioning=None: the interval is known, don't add the hive key as a column
+        tables = [
+            pq.read_table(os.path.join(interval_dir, part), memory_map=True, filters=filters, partitioning=None)
+            for part in entry['parts']
+        ]
+        table = pa.concat_tables(tables, promote_options='permissive')
+        return table.to_pandas()
+
+    def append(self, symbol: str, interval: str, df: pd.DataFrame, replace: bool = False) -> int:
+        """
+        Add downloaded bars. Bars at or after the first new timestamp are replaced.
+        replace=True drops the cached dataset first (full re-download).
+        Returns the number of bars newer than the previous last timestamp.
+        """
+        if df is None or df.empty:
+            return 0
+
+        df = df.copy()
+        df['datetime'] = pd.to_datetime(df['datetime'], utc=True)
+        df = df.sort_values('datetime').drop_duplicates('datetime', keep='last').reset_index(drop=True)
+
+        manifest = self.manifest(symbol)
+        entry = None if replace else manifest.get(interval)
+        interval_dir = self._interval_dir(symbol, interval)
+        os.makedirs(interval_dir, exist_ok=True)
+
+        parts = list(entry['parts']) if entry else []
+        rows = entry['rows'] if entry else 0
+        previous_last = pd.Timestamp(entry['last_timestamp']) if entry else None
+        first_new = df['datetime'].iloc[0]
+        if previous_last is not None and first_new <= previous_last:
+            if parts and first_new < pd.Timestamp(entry['tail_start']):
+                # Overlaps sealed parts: rewrite the whole dataset once
+                cached = self.read(symbol, interval)
+                df = pd.concat([cached[cached['datetime'] < first_new], df], ignore_index=True)
+                parts, rows = [], 0
+
+        new_rows = len(df) if previous_last is None else int((df['datetime'] > previous_last).sum())
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if parts:
+            tail_path = os.path.join(interval_dir, parts[-1])
+            tail = pq.read_table(tail_path, partitioning=None)
+            tail_rows = tail.num_rows
+            tail = tail.filter(pc.less(tail['datetime'], pa.scalar(first_new, tail.schema.field('datetime').type)))
+            if tail_rows < TAIL_PART_ROWS or tail.num_rows == 0:
+                table = pa.concat_tables([tail, table], promote_options='permissive')
+                rows -= tail_rows
+                parts.pop()
+            elif tail.num_rows < tail_rows:
+                pq.write_table(tail, tail_path)
+                rows -= tail_rows - tail.num_rows
+
+        tail_start = table['datetime'][0].as_py()
+        for start in range(0, table.num_rows, TAIL_PART_ROWS):
+            chunk = table.slice(start, TAIL_PART_ROWS)
+            part = f"part-{len(parts):05d}.parquet"
+            pq.write_table(chunk, os.path.join(interval_dir, part))
+            parts.append(part)
+            tail_start = chunk['datetime'][0].as_py()
+        rows += table.num_rows
+
+        # Parts left over from a rewrite (or a replaced dataset) are no longer referenced
+        for name in set(os.listdir(interval_dir)) - set(parts):
+            os.remove(os.path.join(interval_dir, name))
+
+        manifest[interval] = {
+            'parts': parts,
+            'rows': rows,
+            'tail_start': pd.Timestamp(tail_start).isoformat(),
+            'last_timestamp': pd.Timestamp(table['datetime'][-1].as_py()).isoformat(),
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+        }
+        self._write_manifest(symbol, manifest)
+        return new_rows
+
+    def touch(self, symbol: str, interval: str):
+        """Mark the cache fresh when a refresh returned no new bars."""
+        manifest = self.manifest(symbol)
+        if interval in manifest:
+            manifest[interval]['updated_at'] = datetime.now(timezone.utc).isoformat()
+            self._write_manifest(symbol, manifest)
@@ -2,11 +2,12 @@ import os
 import pandas as pd
 import yaml
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import pytz
 from typing import Optional, Dict
 
 from packages.strategy_foundry.data.sources import YahooSource
+from packages.strategy_foundry.data.bar_cache import ParquetBarCache
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,10 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CONFIG_PATH = os.path.join(BASE_DIR, 'configs', 'foundry.yaml')
 INSTRUMENT_MAP_PATH = os.path.join(BASE_DIR, 'configs', 'instrument_map.yaml')
 CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache')
+BAR_CACHE_DIR = os.path.join(CACHE_DIR, 'bars')
+
+# Cached bars younger than this are served without asking the source for new ones
+CACHE_MAX_AGE = timedelta(minutes=55)
 
 IST = pytz.timezone('Asia/Kolkata')
 
@@ -23,6 +28,7 @@ class DataLoader:
         self.source = YahooSource()
         self.cache_dir = CACHE_DIR
         os.makedirs(self.cache_dir, exist_ok=True)
+        self.bar_cache = ParquetBarCache(BAR_CACHE_DIR)
 
         # Load configs
         self.foundry_config = self._load_yaml(CONFIG_PATH).get('foundry', {})
@@ -37,22 +43,22 @@ class DataLoader:
             return yaml.safe_load(f)
 
     def _get_cache_path(self, symbol: str, interval: str) -> str:
-        # Sanitize symbol for filename
+        # Legacy CSV cache, only read to seed the Parquet cache
         safe_symbol = symbol.replace('^', '').replace('.', '_')
         return os.path.join(self.cache_dir, f"{safe_symbol}_{interval}.csv")
 
-    def _is_cache_valid(self, path: str) -> bool:
-        if not os.path.exists(path):
-            return False
-
-        mtime = datetime.fromtimestamp(os.path.getmtime(path))
-        # Valid if less than 4 hours old (for hourly runs)
-        # Or maybe just "today"?
-        # Intraday data updates frequently. 1 hour validity?
-        # The prompt says "hourly".
-        if datetime.now() - mtime < timedelta(minutes=55):
-            return True
-        return False
+    def _seed_from_csv(self, symbol: str, interval: str):
+        """Import a legacy CSV cache file once, so the first refresh only fetches the tail."""
+        cache_path = self._get_cache_path(symbol, interval)
+        if self.bar_cache.entry(symbol, interval) or not os.path.exists(cache_path):
+            return
+        try:
+            df = pd.read_csv(cache_path)
+            df['datetime'] = pd.to_datetime(df['datetime'], utc=True)
+            self.bar_cache.append(symbol, interval, df)
+            logger.info(f"Seeded {symbol} ({interval}) bar cache from {cache_path}")
+        except Exception as e:
+            logger.error(f"Legacy cache import failed for {symbol}: {e}")
 
     def get_data(self, instrument: str, interval: str = "1d", force_download: bool = False) -> Optional[pd.DataFrame]:
         """
@@ -96,37 +102,38 @@ class DataLoader:
         return df
 
     def _get_data_for_symbol(self, symbol: str, interval: str, force_download: bool) -> Optional[pd.DataFrame]:
-        cache_path = self._get_cache_path(symbol, interval)
+        days = self.foundry_config.get('data_days_intraday', 59) if interval in ['5m', '15m'] else self.foundry_config.get('data_days_daily', 3650)
+        now = datetime.now(timezone.utc)
+        # Only the configured window is returned, however far back the cache goes
+        since = pd.Timestamp(now - timedelta(days=days))
 
-        if not force_download and self._is_cache_valid(cache_path):
-            try:
+        if not force_download:
+            self._seed_from_csv(symbol, interval)
+            if self.bar_cache.is_fresh(symbol, interval, CACHE_MAX_AGE):
                 logger.info(f"Loading {symbol} ({interval}) from cache")
-                df = pd.read_csv(cache_path)
-                df['datetime'] = pd.to_datetime(df['datetime']) # UTC aware usually from read_csv if saved that way?
-                # pd.to_datetime might lose tz if not careful.
-                # When we save, we should use iso format.
-                return df
-            except Exception as e:
-                logger.error(f"Cache read error for {symbol}: {e}")
-
-        # Download
-        days = self.foundry_config.get('data_days_intraday', 59) if interval in ['5m', '15m'] else self.foundry_config.get('data_days_daily', 3650)
+                return self.bar_cache.read(symbol, interval, since)
+
+        # Download only the missing tail (from the day of the last cached bar)
+        last_ts = self.bar_cache.last_timestamp(symbol, interval)
+        fetch_days = days
+        if last_ts is not None and not force_download:
+            fetch_days = min(days, max(1, (now - last_ts.to_pydatetime()).days + 1))
 
-        df = self.source.download(symbol, interval, days)
+        df = self.source.download(symbol, interval, fetch_days)
 
-        if df is not None:
-            # Save to cache
-            df.to_csv(cache_path, index=False)
-        elif os.path.exists(cache_path):
+        if df is not None and not df.empty:
+            new_bars = self.bar_cache.append(symbol, interval, df, replace=force_download)
+            logger.info(f"Cached {new_bars} new bars for {symbol} ({interval})")
+        elif last_ts is None:
+            return df
+        elif df is not None:
+            # Nothing new since the last bar (e.g. market closed)
+            self.bar_cache.touch(symbol, interval)
+        else:
             # Fallback to stale cache
             logger.warning(f"Download failed for {symbol}, using stale cache")
-            try:
-                df = pd.read_csv(cache_path)
-                df['datetime'] = pd.to_datetime(df['datetime'])
-            except:
-                pass
 
-        return df
+        return self.bar_cache.read(symbol, interval, since)
 
 if __name__ == "__main__":
     loader = DataLoader()
@@ -6,7 +6,7 @@ import pandas as pd
 import numpy as np
 from packages.strategy_foundry.factory.grammar import StrategyConfig, Rule, Filter
 from packages.strategy_foundry.factory.parameter_space import ParameterSpace
-from packages.strategy_foundry.adapters.core_indicators import IndicatorsAdapter
+from packages.strategy_foundry.adapters.indicator_cache import IndicatorCache
 
 class StrategyGenerator:
     def generate_candidate(self) -> StrategyConfig:
@@ -88,22 +88,26 @@ class StrategyGenerator:
             max_bars_hold=max_bars
         )
 
-    def generate_signal(self, df: pd.DataFrame, config: StrategyConfig) -> pd.Series:
+    def generate_signal(self, df: pd.DataFrame, config: StrategyConfig, indicators=None) -> pd.Series:
         """
         Generates Entry Signal (1 = Buy, 0 = None).
         Does NOT handle exits (Backtest engine handles exits).
+        indicators: IndicatorCache/IndicatorView for df; computed fresh when omitted.
         """
+        if indicators is None:
+            indicators = IndicatorCache(df)
+
         # Base Signal
         signal = pd.Series(True, index=df.index)
 
         # Apply Entry Rules
         for rule in config.entry_rules:
-            cond = self._evaluate_condition(df, rule.indicator, rule.operator, rule.threshold, rule.params)
+            cond = self._evaluate_condition(df, rule.indicator, rule.operator, rule.threshold, rule.params, indicators)
             signal = signal & cond
 
         # Apply Filters
         for filt in config.filters:
-            cond = self._evaluate_condition(df, filt.indicator, filt.operator, filt.threshold, filt.params)
+            cond = self._evaluate_condition(df, filt.indicator, filt.operator, filt.threshold, filt.params, indicators)
             signal = signal & cond
 
         # Convert boolean to integer signal (1)
@@ -116,17 +120,21 @@ class StrategyGenerator:
 
         return signal.astype(int)
 
-    def _evaluate_condition(self, df: pd.DataFrame, indicator: str, operator: str, threshold: Any, params: Dict) -> pd.Series:
+    def _evaluate_condition(self, df: pd.DataFrame, indicator: str, operator: str, threshold: Any, params: Dict,
+                            indicators=None) -> pd.Series:
+        if indicators is None:
+            indicators = IndicatorCache(df)
+
         # Special composite handling first
         if indicator == 'bollinger':
-            u, m, l = IndicatorsAdapter.bollinger_bands(df['close'], **params)
+            u, m, l = indicators.get('bollinger', params)
             if threshold == 'upper':
                 return df['close'] > u if operator == '>' else df['close'] < u
             elif threshold == 'lower':
                 return df['close'] < l if operator == '<' else df['close'] > l
 
         if indicator == 'donchian':
-            u, l = IndicatorsAdapter.donchian(df, **params)
+            u, l = indicators.get('donchian', params)
             if threshold == 'upper':
                  return df['close'] > u if operator == '>' else df['close'] < u
             elif threshold == 'lower':
@@ -136,13 +144,13 @@ class StrategyGenerator:
         if indicator == 'close':
             lhs = df['close']
         elif indicator == 'rsi':
-            lhs = IndicatorsAdapter.rsi(df, **params)
+            lhs = indicators.get('rsi', params)
         elif indicator == 'adx':
-            lhs = IndicatorsAdapter.adx(df, **params)
+            lhs = indicators.get('adx', params)
         elif indicator == 'ema':
-            lhs = IndicatorsAdapter.ema(df['close'], **params)
+            lhs = indicators.get('ema', params)
         elif indicator == 'supertrend':
-            st, direction = IndicatorsAdapter.supertrend(df, **params)
+            st, direction = indicators.get('supertrend', params)
             if threshold == 1 or threshold == -1:
                 lhs = direction
             else:
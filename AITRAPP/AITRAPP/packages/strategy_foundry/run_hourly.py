@@ -13,8 +13,10 @@ logger = logging.getLogger(__name__)
 from packages.strategy_foundry.data.loader import DataLoader
 from packages.strategy_foundry.factory.generator import StrategyGenerator
 from packages.strategy_foundry.factory.registry import CandidateRegistry
-from packages.strategy_foundry.backtest.walkforward import WalkForwardEvaluator
+from packages.strategy_foundry.backtest.parallel import evaluate_candidates, default_workers
 from packages.strategy_foundry.backtest.sanity import SanityChecker
+from packages.strategy_foundry.adapters.indicator_cache import IndicatorCache
+from packages.strategy_foundry.adapters.core_costs import CostModel
 from packages.strategy_foundry.selection.ranker import Ranker
 from packages.strategy_foundry.selection.promote import Promoter
 from packages.strategy_foundry.live.signal_publisher import SignalPublisher
@@ -33,7 +35,18 @@ def run():
     N_CANDIDATES = foundry_conf.get('fast_mode_candidates', 15) if FAST_MODE else foundry_conf.get('max_candidates', 80)
     FOLDS = foundry_conf.get('fast_mode_folds', 2) if FAST_MODE else foundry_conf.get('folds', 4)
 
-    logger.info(f"Starting Strategy Foundry (FAST_MODE={FAST_MODE}, N={N_CANDIDATES}, FOLDS={FOLDS})")
+    # Candidate evaluation processes (0 = one per core)
+    WORKERS = int(os.environ.get('FOUNDRY_WORKERS', foundry_conf.get('workers', 1))) or default_workers()
+
+    execution_conf = config_yaml.get('execution', {})
+    cost_model = CostModel(
+        slippage_bps=execution_conf.get('slippage_bps_per_side', 5.0),
+        brokerage_per_order=execution_conf.get('brokerage_per_order', 20.0),
+        tax_bps=execution_conf.get('tax_bps', 3.0),
+        spread_guard_bps=execution_conf.get('spread_guard_bps', 2.0),
+    )
+
+    logger.info(f"Starting Strategy Foundry (FAST_MODE={FAST_MODE}, N={N_CANDIDATES}, FOLDS={FOLDS}, WORKERS={WORKERS})")
 
     instruments = ['NIFTY', 'SENSEX']
     run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -42,6 +55,8 @@ def run():
 
     loader = DataLoader()
     generator = StrategyGenerator()
+    # Fresh indicator caches (and hit/miss stats) for this run
+    IndicatorCache.clear()
 
     # Generate Candidates (Shared across instruments?)
     # Usually strategy logic is instrument-agnostic.
@@ -58,6 +73,7 @@ def run():
     CandidateRegistry.save_candidates(candidates, f"{run_dir}/candidates.json")
 
     leaderboard_rows = []
+    worker_cache = {'hits': 0, 'misses': 0}
 
     for instrument in instruments:
         logger.info(f"Processing {instrument}")
@@ -76,26 +92,13 @@ def run():
             continue
 
         # 3. Evaluate (Walk Forward)
-        wf_5m = WalkForwardEvaluator(df_5m, folds=FOLDS)
-        wf_15m = WalkForwardEvaluator(df_15m, folds=FOLDS)
-
-        results_5m = []
-        results_15m = []
-
-        for cand in candidates:
-            # 5m
-            try:
-                m5 = wf_5m.evaluate(cand)
-                results_5m.append({"strategy": cand, "metrics": m5})
-            except Exception as e:
-                logger.warning(f"Failed 5m eval for {cand.strategy_id}: {e}")
-
-            # 15m
-            try:
-                m15 = wf_15m.evaluate(cand)
-                results_15m.append({"strategy": cand, "metrics": m15})
-            except Exception as e:
-                logger.warning(f"Failed 15m eval for {cand.strategy_id}: {e}")
+        results, cache_counts = evaluate_candidates(
+            {"5m": df_5m, "15m": df_15m}, candidates, FOLDS, cost_model, workers=WORKERS
+        )
+        results_5m = results["5m"]
+        results_15m = results["15m"]
+        worker_cache['hits'] += cache_counts['hits']
+        worker_cache['misses'] += cache_counts['misses']
 
         # 4. Rank & Blend
         # We need a blended score.
@@ -130,7 +133,7 @@ def run():
 
             # 5. Sanity Check (Top 10)
             top_candidates = merged.head(10)
-            sanity_checker = SanityChecker(df_1d, wf_5m.cost_model)
+            sanity_checker = SanityChecker(df_1d, cost_model)
 
             champion_candidate = None
             champion_row = None
@@ -227,6 +230,13 @@ def run():
             f.write(lb_df.to_markdown(index=False))
             f.write("\n")
 
+    # Parent-process caches plus the counts reported back by pool workers
+    cache_stats = IndicatorCache.stats()
+    hits = cache_stats['hits'] + worker_cache['hits']
+    misses = cache_stats['misses'] + worker_cache['misses']
+    hit_rate = hits / (hits + misses) if hits + misses else 0.0
+    logger.info(f"Indicator cache: {hits} hits, {misses} misses ({hit_rate:.1%})")
+
     logger.info("Run completed")
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from packages.strategy_foundry.data import bar_cache as bar_cache_module
+from packages.strategy_foundry.data.bar_cache import ParquetBarCache
+from packages.strategy_foundry.data.loader import DataLoader
+
+
+def bars(start, n, close=100.0):
+    times = pd.date_range(start, periods=n, freq="5min", tz="UTC")
+    values = close + np.arange(n, dtype=float)
+    return pd.DataFrame({
+        "datetime": times,
+        "open": values,
+        "high": values + 1,
+        "low": values - 1,
+        "close": values,
+        "volume": np.full(n, 1000, dtype=np.int64),
+    })
+
+
+def test_append_replaces_overlap_and_seals_parts(tmp_path, monkeypatch):
+    monkeypatch.setattr(bar_cache_module, "TAIL_PART_ROWS", 10)
+    cache = ParquetBarCache(str(tmp_path))
+    start = pd.Timestamp("2024-06-10 03:45", tz="UTC")
+
+    assert cache.append("^NSEI", "5m", bars(start, 25)) == 25
+    entry = cache.entry("^NSEI", "5m")
+    assert entry["parts"] == ["part-00000.parquet", "part-00001.parquet", "part-00002.parquet"]
+
+    # Refresh repeats the in-progress last bar with a new close and adds 3 bars
+    tail = bars(start + pd.Timedelta(minutes=5 * 24), 4, close=500.0)
+    assert cache.append("^NSEI", "5m", tail) == 3
+    df = cache.read("^NSEI", "5m")
+    assert len(df) == 28 and df["datetime"].is_monotonic_increasing
+    assert df["close"].iloc[24] == 500.0
+    assert cache.last_timestamp("^NSEI", "5m") == start + pd.Timedelta(minutes=5 * 27)
+    assert cache.entry("^NSEI", "5m")["rows"] == 28
+
+    # Overlap reaching into sealed parts rewrites the dataset
+    assert cache.append("^NSEI", "5m", bars(start + pd.Timedelta(minutes=25), 2, close=0.0)) == 0
+    df = cache.read("^NSEI", "5m")
+    assert len(df) == 7
+    assert sorted(p.name for p in (tmp_path / "NSEI" / "interval=5m").iterdir()) == ["part-00000.parquet"]
+
+    since = cache.read("^NSEI", "5m", since=start + pd.Timedelta(minutes=20))
+    assert since["datetime"].iloc[0] == start + pd.Timedelta(minutes=20)
+
+
+class FakeSource:
+    def __init__(self, df):
+        self.df = df
+        self.requests = []
+
+    def download(self, symbol, interval, days):
+        self.requests.append(days)
+        since = pd.Timestamp(datetime.now(timezone.utc)) - pd.Timedelta(days=days)
+        return self.df[self.df["datetime"] >= since].reset_index(drop=True)
+
+
+def test_loader_downloads_only_missing_tail(tmp_path):
+    now = pd.Timestamp(datetime.now(timezone.utc)).floor("5min")
+    history = pd.concat([bars(now - pd.Timedelta(days=d), 12) for d in range(10, 0, -1)], ignore_index=True)
+
+    loader = DataLoader()
+    loader.bar_cache = ParquetBarCache(str(tmp_path))
+    loader.source = FakeSource(history.iloc[:-12])
+
+    first = loader._get_data_for_symbol("^NSEI", "5m", force_download=False)
+    assert len(first) == 108 and loader.source.requests == [59]
+
+    # Fresh cache: served without touching the source
+    loader._get_data_for_symbol("^NSEI", "5m", force_download=False)
+    assert loader.source.requests == [59]
+
+    # Stale cache: only the days since the last bar are requested
+    entry = loader.bar_cache.manifest("^NSEI")
+    entry["5m"]["updated_at"] = "2000-01-01T00:00:00+00:00"
+    loader.bar_cache._write_manifest("^NSEI", entry)
+    loader.source.df = history
+    refreshed = loader._get_data_for_symbol("^NSEI", "5m", force_download=False)
+    assert loader.source.requests[-1] == 2
+    pd.testing.assert_series_equal(refreshed["close"], history["close"], check_names=False)
+
+    # Download failure falls back to the cached bars
+    loader.source.download = lambda *args: None
+    assert len(loader._get_data_for_symbol("^NSEI", "5m", force_download=True)) == 120
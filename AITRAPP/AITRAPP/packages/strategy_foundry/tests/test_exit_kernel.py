@@ -0,0 +1,164 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from packages.strategy_foundry.adapters.core_costs import CostModel
+from packages.strategy_foundry.adapters.indicator_cache import IndicatorCache
+from packages.strategy_foundry.backtest.engine import BacktestEngine
+from packages.strategy_foundry.backtest.kernel import (
+    REASON_EOD,
+    REASON_SL,
+    REASON_TIME,
+    REASON_TP,
+    TRADE_DTYPE,
+    simulate_long_trades,
+)
+from packages.strategy_foundry.factory.generator import StrategyGenerator
+
+
+def intraday_df(days=20, seed=0):
+    """5m NSE session bars (09:15-15:25) with a random walk."""
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range("2024-01-01", periods=days)
+    times = [
+        day + pd.Timedelta(hours=9, minutes=15) + pd.Timedelta(minutes=5 * k)
+        for day in sessions
+        for k in range(75)
+    ]
+    close = 100 + rng.standard_normal(len(times)).cumsum()
+    open_ = close + rng.standard_normal(len(times)) * 0.3
+    return pd.DataFrame({
+        "datetime": times,
+        "open": open_,
+        "high": np.maximum(open_, close) + rng.random(len(times)),
+        "low": np.minimum(open_, close) - rng.random(len(times)),
+        "close": close,
+        "volume": rng.integers(100, 1000, len(times)),
+    })
+
+
+def run_bar_loop(engine, df, config, indicators=None):
+    """Reference bar-by-bar version of BacktestEngine.run() the array kernel must match."""
+    if indicators is None:
+        indicators = IndicatorCache(df)
+    signal_arr = engine.generator.generate_signal(df, config, indicators).values
+    opens = df["open"].values
+    highs = df["high"].values
+    lows = df["low"].values
+    atr_series = indicators.get("atr", {"period": 14}).fillna(0).values
+    force_exit_mask = engine._force_exit_mask(df, config)
+    friction = (engine.cost_model.slippage_bps + engine.cost_model.tax_bps) / 10000.0
+
+    trades = []
+
+    def record(exit_price, exit_idx, reason):
+        eff_entry = entry_price * (1 + friction)
+        eff_exit = exit_price * (1 - friction)
+        trades.append({
+            "entry_idx": entry_idx,
+            "exit_idx": exit_idx,
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "net_return": (eff_exit - eff_entry) / eff_entry,
+            "reason": reason,
+            "bars_held": exit_idx - entry_idx,
+        })
+
+    in_trade = False
+    entry_price = stop_loss = take_profit = 0.0
+    entry_idx = 0
+    for i in range(1, len(df)):
+        if in_trade:
+            # EOD, then time stop, then SL, then TP; gaps fill at the open
+            if force_exit_mask[i]:
+                record(opens[i], i, "EOD")
+                in_trade = False
+                continue
+            if (i - entry_idx) >= config.max_bars_hold:
+                record(opens[i], i, "Time")
+                in_trade = False
+                continue
+            if lows[i] <= stop_loss:
+                record(opens[i] if opens[i] < stop_loss else stop_loss, i, "SL")
+                in_trade = False
+                continue
+            if highs[i] >= take_profit:
+                record(opens[i] if opens[i] > take_profit else take_profit, i, "TP")
+                in_trade = False
+                continue
+
+        # Signal on the completed bar i-1 enters at the open of bar i
+        if not in_trade and signal_arr[i - 1] == 1 and not force_exit_mask[i]:
+            in_trade = True
+            entry_price = opens[i]
+            entry_idx = i
+            atr_val = atr_series[i - 1]
+            if atr_val == 0 or np.isnan(atr_val):
+                atr_val = entry_price * 0.01
+            stop_loss = entry_price - (config.stop_loss_atr * atr_val)
+            take_profit = entry_price + (config.take_profit_atr * atr_val)
+
+    return pd.DataFrame(trades)
+
+
+@pytest.fixture
+def engine():
+    cost_model = CostModel(slippage_bps=5.0, brokerage_per_order=20.0, tax_bps=3.0, spread_guard_bps=2.0)
+    return BacktestEngine(cost_model)
+
+
+def test_kernel_matches_bar_loop(engine):
+    """Array kernel returns exactly the trades of the bar-by-bar loop."""
+    random.seed(7)
+    generator = StrategyGenerator()
+    compared = 0
+
+    for seed in range(3):
+        df = intraday_df(seed=seed)
+        for _ in range(15):
+            config = generator.generate_candidate()
+            expected = run_bar_loop(engine, df, config)
+            actual = engine.run(df, config)
+            pd.testing.assert_frame_equal(actual, expected)
+            compared += len(expected)
+
+    assert compared > 0
+
+
+def test_exit_precedence_and_gaps():
+    """EOD beats time stop beats SL beats TP; gaps fill at the open."""
+    opens = np.array([100.0, 100.0, 100.0, 95.0, 100.0, 100.0, 112.0, 100.0, 100.0])
+    highs = opens + 1
+    lows = opens - 1
+    signals = np.array([1, 0, 0, 1, 0, 1, 0, 0, 0])
+    atr = np.full(len(opens), 2.0)
+    force_exit = np.zeros(len(opens), dtype=bool)
+    force_exit[-1] = True
+
+    trades = simulate_long_trades(opens, highs, lows, signals, atr, force_exit, 2.0, 5.0, 10, 0.0)
+
+    assert trades.dtype == TRADE_DTYPE
+    # Enter at bar 1; bar 3 gaps below the 96 stop -> exit at open 95
+    assert trades[0]["entry_idx"] == 1 and trades[0]["exit_idx"] == 3
+    assert trades[0]["reason"] == REASON_SL and trades[0]["exit_price"] == 95.0
+    # Signal on the exit bar enters at bar 4; bar 6 gaps above the 110 target
+    assert trades[1]["entry_idx"] == 4 and trades[1]["reason"] == REASON_TP
+    assert trades[1]["exit_price"] == 112.0
+    # Signal at bar 5 was inside the previous trade; nothing left to enter after bar 6
+    assert len(trades) == 2
+
+    # Enter at bar 6: time stop at bar 7, but on bar 8 the EOD exit wins over the time stop
+    single = np.eye(1, len(opens), 5, dtype=int)[0]
+    trades = simulate_long_trades(opens, highs, lows, single, atr, force_exit, 50.0, 50.0, 1, 0.0)
+    assert [(t["exit_idx"], t["reason"]) for t in trades] == [(7, REASON_TIME)]
+    trades = simulate_long_trades(opens, highs, lows, single, atr, force_exit, 50.0, 50.0, 2, 0.0)
+    assert [(t["exit_idx"], t["reason"]) for t in trades] == [(8, REASON_EOD)]
+
+
+def test_open_trade_at_end_is_not_reported():
+    opens = np.full(5, 100.0)
+    trades = simulate_long_trades(opens, opens + 1, opens - 1, np.array([1, 0, 0, 0, 0]),
+                                  np.full(5, 1.0), np.zeros(5, dtype=bool), 50.0, 50.0, 75, 0.0)
+    assert len(trades) == 0
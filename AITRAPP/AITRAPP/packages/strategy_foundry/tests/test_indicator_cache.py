@@ -0,0 +1,101 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from packages.strategy_foundry.adapters.core_indicators import IndicatorsAdapter
+from packages.strategy_foundry.adapters.indicator_cache import MAX_CACHED_FRAMES, IndicatorCache
+from packages.strategy_foundry.backtest.walkforward import WalkForwardEvaluator
+from packages.strategy_foundry.factory.generator import StrategyGenerator
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(1)
+    close = 100 + rng.standard_normal(2000).cumsum()
+    return pd.DataFrame({
+        "datetime": pd.date_range("2024-01-01 09:15", periods=2000, freq="5min"),
+        "open": close + rng.standard_normal(2000) * 0.3,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": rng.integers(100, 1000, 2000),
+    })
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    IndicatorCache.clear()
+    yield
+    IndicatorCache.clear()
+
+
+def test_hits_and_content_hash_sharing(bars):
+    cache = IndicatorCache.for_frame(bars)
+    rsi = cache.get('rsi', {'period': 14})
+    pd.testing.assert_series_equal(rsi, IndicatorsAdapter.rsi(bars, period=14))
+    assert cache.get('rsi', {'period': 14}) is rsi
+    cache.get('rsi', {'period': 7})
+
+    # Same content, different object -> same cache; changed content -> new cache
+    assert IndicatorCache.for_frame(bars.copy()) is cache
+    changed = bars.copy()
+    changed.loc[5, 'close'] += 1
+    assert IndicatorCache.for_frame(changed) is not cache
+
+    stats = IndicatorCache.stats()
+    assert (stats['hits'], stats['misses'], stats['frames'], stats['entries']) == (1, 2, 2, 2)
+
+
+def test_stats_keep_evicted_frames(bars):
+    for shift in range(MAX_CACHED_FRAMES + 2):
+        shifted = bars.assign(close=bars['close'] + shift)
+        cache = IndicatorCache.for_frame(shifted)
+        cache.get('rsi', {'period': 14})
+        cache.get('rsi', {'period': 14})
+    # Private caches are not part of the shared totals
+    IndicatorCache(bars).get('rsi', {'period': 14})
+
+    stats = IndicatorCache.stats()
+    assert stats['frames'] == MAX_CACHED_FRAMES
+    assert stats['entries'] == MAX_CACHED_FRAMES
+    assert (stats['hits'], stats['misses']) == (MAX_CACHED_FRAMES + 2, MAX_CACHED_FRAMES + 2)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_views_slice_full_series(bars):
+    cache = IndicatorCache.for_frame(bars)
+    view = cache.view(500, 1000)
+
+    upper, middle, lower = view.get('bollinger', {'period': 20, 'std': 2.0})
+    full_upper = cache.get('bollinger', {'period': 20, 'std': 2.0})[0]
+    pd.testing.assert_series_equal(upper, full_upper.iloc[500:1000])
+    assert np.shares_memory(upper.values, full_upper.values)
+
+    ema = view.get('ema', {'period': 21})
+    assert ema.index.equals(bars.index[500:1000])
+    assert cache.misses == 2
+
+
+def test_walkforward_reuses_indicators(bars):
+    random.seed(3)
+    generator = StrategyGenerator()
+    candidates = [generator.generate_candidate() for _ in range(20)]
+    evaluator = WalkForwardEvaluator(bars, folds=4)
+
+    for config in candidates:
+        evaluator.evaluate(config)
+
+    stats = IndicatorCache.stats()
+    assert stats['frames'] == 1
+    # Every candidate needs ATR; only the first computes it
+    assert stats['hits'] >= 4 * len(candidates) - 1
+    assert stats['misses'] == stats['entries']
+
+    # Uncached signals on the full series match the cached path
+    for config in candidates[:5]:
+        pd.testing.assert_series_equal(
+            generator.generate_signal(bars, config),
+            generator.generate_signal(bars, config, evaluator.indicators),
+        )
@@ -0,0 +1,61 @@
+import pickle
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from packages.strategy_foundry.adapters.core_costs import CostModel
+from packages.strategy_foundry.adapters.indicator_cache import IndicatorCache
+from packages.strategy_foundry.backtest.parallel import SharedFrame, evaluate_candidates
+from packages.strategy_foundry.factory.generator import StrategyGenerator
+
+
+def bars(n, freq, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    return pd.DataFrame({
+        "datetime": pd.date_range("2024-01-01 09:15", periods=n, freq=freq, tz="Asia/Kolkata"),
+        "open": close + rng.standard_normal(n) * 0.3,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": rng.integers(100, 1000, n),
+    })
+
+
+@pytest.fixture
+def cost_model():
+    return CostModel(slippage_bps=5.0, brokerage_per_order=20.0, tax_bps=3.0, spread_guard_bps=2.0)
+
+
+def test_shared_frame_round_trip():
+    df = bars(500, "5min", 0)
+    frame = SharedFrame.create(df)
+    try:
+        # Workers receive only the layout and attach by name
+        attached = pickle.loads(pickle.dumps(frame))
+        pd.testing.assert_frame_equal(attached.to_frame(), df)
+        attached.close()
+    finally:
+        frame.unlink()
+
+
+def test_parallel_matches_serial(cost_model):
+    random.seed(11)
+    generator = StrategyGenerator()
+    candidates = [generator.generate_candidate() for _ in range(12)]
+    frames = {"5m": bars(3000, "5min", 1), "15m": bars(1000, "15min", 2)}
+
+    serial, _ = evaluate_candidates(frames, candidates, 3, cost_model, workers=1)
+    # Forked workers would otherwise inherit the serial run's cached indicators
+    IndicatorCache.clear()
+    parallel, worker_cache = evaluate_candidates(frames, candidates, 3, cost_model, workers=2, chunk_size=5)
+
+    assert worker_cache['misses'] > 0
+    for key in frames:
+        assert [r["strategy"].strategy_id for r in parallel[key]] == [c.strategy_id for c in candidates]
+        pd.testing.assert_frame_equal(
+            pd.DataFrame([m for r in parallel[key] for m in r["metrics"]]),
+            pd.DataFrame([m for r in serial[key] for m in r["metrics"]]),
+        )
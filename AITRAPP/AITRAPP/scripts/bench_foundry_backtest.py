@@ -0,0 +1,77 @@
+import random
+import sys
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from packages.strategy_foundry.adapters.indicator_cache import IndicatorCache
+from packages.strategy_foundry.backtest.walkforward import WalkForwardEvaluator
+from packages.strategy_foundry.factory.generator import StrategyGenerator
+from packages.strategy_foundry.tests.test_exit_kernel import run_bar_loop
+
+
+def make_bars(days: int) -> pd.DataFrame:
+    """5m NSE session bars (09:15-15:25) with a random walk."""
+    rng = np.random.default_rng(0)
+    sessions = pd.bdate_range("2024-01-01", periods=days)
+    times = [
+        day + pd.Timedelta(hours=9, minutes=15) + pd.Timedelta(minutes=5 * k)
+        for day in sessions
+        for k in range(75)
+    ]
+    close = 100 + rng.standard_normal(len(times)).cumsum()
+    open_ = close + rng.standard_normal(len(times)) * 0.3
+    return pd.DataFrame({
+        "datetime": times,
+        "open": open_,
+        "high": np.maximum(open_, close) + rng.random(len(times)),
+        "low": np.minimum(open_, close) - rng.random(len(times)),
+        "close": close,
+        "volume": rng.integers(100, 1000, len(times)),
+    })
+
+
+def bench(candidates: int = 40, days: int = 120):
+    """Candidates evaluated per second through WalkForwardEvaluator (4 folds of 5m bars)."""
+    df = make_bars(days)
+    random.seed(0)
+    generator = StrategyGenerator()
+    configs = [generator.generate_candidate() for _ in range(candidates)]
+
+    evaluator = WalkForwardEvaluator(df, folds=4)
+    engine = evaluator.engine
+    kernel_run = engine.run
+    # Reference per-bar exits, kept with the kernel tests
+    bar_loop_run = partial(run_bar_loop, engine)
+
+    print(f"{candidates} candidates, {len(df)} bars, 4 folds")
+    print(f"{'Exits':<14}{'Backtests/sec':>16}{'Candidates/sec':>16}")
+    # Warm up pandas/numpy code paths so the first timed method is not penalised
+    evaluator.evaluate(configs[0])
+    bar_loop_run(df, configs[0])
+
+    rates = {}
+    for name, run in [("bar loop", bar_loop_run), ("array kernel", kernel_run)]:
+        # Full-series backtests isolate the engine; walk-forward adds signals and metrics per fold
+        start = time.perf_counter()
+        for config in configs:
+            run(df, config)
+        backtests = candidates / (time.perf_counter() - start)
+
+        engine.run = run
+        evaluator.indicators = IndicatorCache(df)
+        start = time.perf_counter()
+        for config in configs:
+            evaluator.evaluate(config)
+        rates[name] = (backtests, candidates / (time.perf_counter() - start))
+        print(f"{name:<14}{rates[name][0]:>16.2f}{rates[name][1]:>16.2f}")
+    engine.run = kernel_run
+
+    loop, kernel = rates["bar loop"], rates["array kernel"]
+    print(f"Speedup: {kernel[0] / loop[0]:.2f}x backtests, {kernel[1] / loop[1]:.2f}x candidates")
+
+
+if __name__ == "__main__":
+    bench(*(int(arg) for arg in sys.argv[1:3]))
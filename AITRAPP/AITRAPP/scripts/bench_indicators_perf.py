@@ -2,6 +2,7 @@ import time
 import pandas as pd
 import numpy as np
 from packages.core.indicators import IndicatorCalculator
+from packages.core.streaming_indicators import StreamingIndicators
 
 def bench():
     # Create 500 bars data (realistic window)
@@ -32,5 +33,28 @@ def bench():
         results[name] = duration
         print(f"{name}: {duration:.3f} ms")
 
+    bench_streaming(df)
+
+
+def bench_streaming(df):
+    """Per-bar cost in MarketDataStream: compute_all over a 200-bar window vs StreamingIndicators.update"""
+    calc = IndicatorCalculator()
+    window = 200
+    bars = df.to_dict('records')
+
+    start = time.time()
+    for i in range(window, len(df)):
+        calc.compute_all(df.iloc[i - window:i])
+    batch = (time.time() - start) / (len(df) - window) * 1000
+
+    stream = StreamingIndicators(vwap_window=window)
+    start = time.time()
+    for bar in bars:
+        stream.update(bar['high'], bar['low'], bar['close'], bar['volume'])
+    streaming = (time.time() - start) / len(bars) * 1000
+
+    print(f"Batch compute_all (200 bars): {batch:.3f} ms/bar")
+    print(f"Streaming update: {streaming:.4f} ms/bar")
+    print(f"Speedup: {batch / streaming:.0f}x")
 if __name__ == "__main__":
     bench()
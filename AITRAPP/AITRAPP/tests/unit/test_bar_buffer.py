@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from packages.core.bar_buffer import BarBuffer
+from packages.core.models import Bar, Tick
+
+START = datetime(2024, 6, 10, 9, 15)
+
+
+def make_bar(i, oi=None):
+    price = 100.0 + i
+    return Bar(token=1, timestamp=START + timedelta(seconds=5 * i), open=price, high=price + 1,
+               low=price - 1, close=price + 0.5, volume=10 * i, oi=oi)
+
+
+def test_tail_views_after_wraparound():
+    buffer = BarBuffer(token=1, capacity=8)
+    for i in range(21):
+        buffer.append(make_bar(i, oi=i))
+
+    assert len(buffer) == 8
+    tail = buffer.tail(5)
+    np.testing.assert_array_equal(tail["close"], [116.5, 117.5, 118.5, 119.5, 120.5])
+    np.testing.assert_array_equal(tail["oi"], [16, 17, 18, 19, 20])
+    assert tail["timestamp"][-1].item() == START + timedelta(seconds=100)
+    assert np.shares_memory(tail["close"], buffer._data["close"])
+    assert not tail["close"].flags.writeable
+    assert len(buffer.tail(100)["open"]) == 8
+
+
+def test_lazy_bars_match_appended_bars():
+    buffer = BarBuffer(token=1, capacity=8)
+    originals = [make_bar(i, oi=None if i % 2 else i) for i in range(12)]
+    for bar in originals:
+        buffer.append(bar)
+
+    # Build every Bar from the columns rather than the cached objects
+    buffer._objects[:] = [None] * len(buffer._objects)
+    view = buffer.bars(5)
+    assert len(view) == 5 and view[-1] == originals[-1] and view[0] == originals[7]
+    assert view[1:3] == originals[8:10]
+    assert [b.close for b in view] == [b.close for b in originals[7:]]
+    assert view[-1] is view[-1]
+    assert len(buffer.bars(0)) == 8 and len(buffer.bars(100)) == 8
+    np.testing.assert_array_equal(view.column("volume"), [70, 80, 90, 100, 110])
+
+    with pytest.raises(IndexError):
+        buffer.bar_at(3)
+
+
+def test_set_indicators_updates_columns_and_bar():
+    buffer = BarBuffer(token=1, capacity=4)
+    bar = make_bar(0)
+    buffer.append(bar)
+    buffer.set_indicators({"rsi": 55.0, "supertrend_direction": -1})
+
+    assert bar.rsi == 55.0 and bar.supertrend_direction == -1 and bar.atr is None
+    assert buffer.tail(1)["rsi"][0] == 55.0
+
+    buffer._objects[:] = [None] * len(buffer._objects)
+    rebuilt = buffer.latest()
+    assert rebuilt.rsi == 55.0 and rebuilt.supertrend_direction == -1 and rebuilt.atr is None
+
+
+def test_tick_aggregator_uses_ring_buffer():
+    pytest.importorskip("kiteconnect")
+    from packages.core.market_data import TickAggregator
+
+    aggregator = TickAggregator(token=1, window_seconds=5)
+    completed = []
+    for i in range(60):
+        tick = Tick(token=1, timestamp=START + timedelta(seconds=i), last_price=100.0 + i,
+                    last_quantity=1, oi=7)
+        bar = aggregator.add_tick(tick)
+        if bar:
+            completed.append(bar)
+
+    assert len(completed) == 11
+    assert aggregator.get_latest_bar() is completed[-1]
+    assert list(aggregator.get_bars(3)) == completed[-3:]
+    arrays = aggregator.get_arrays(2)
+    np.testing.assert_array_equal(arrays["high"], [b.high for b in completed[-2:]])
+    np.testing.assert_array_equal(arrays["volume"], [5, 5])
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from packages.core.indicators import IndicatorCalculator
+from packages.core.streaming_indicators import StreamingIndicators
+
+
+def make_bars(n, seed=7, flat_from=None):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    if flat_from is not None:
+        # Flat stretch: zero gains/losses and zero directional movement
+        close[flat_from:] = close[flat_from]
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    if flat_from is not None:
+        high[flat_from:] = close[flat_from]
+        low[flat_from:] = close[flat_from]
+    return pd.DataFrame({
+        'open': close,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': rng.integers(100, 1000, n),
+    })
+
+
+def batch_values(calc, df, vwap_window):
+    """Last values of the batch series functions over all bars so far."""
+    tr = calc.calculate_tr(df)
+    supertrend, direction = calc.supertrend_series(df, tr)
+    recent = df.iloc[-vwap_window:]
+    return {
+        'vwap': calc._vwap(recent),
+        'atr': calc.atr_series(df, tr)[-1],
+        'rsi': calc.rsi_series(df)[-1],
+        'adx': calc.adx_series(df, tr)[-1],
+        'ema_fast': calc.ema_series(df['close'], calc.ema_fast).iloc[-1],
+        'ema_slow': calc.ema_series(df['close'], calc.ema_slow).iloc[-1],
+        'supertrend': supertrend[-1],
+        'supertrend_direction': direction[-1],
+    }
+
+
+@pytest.mark.parametrize('flat_from', [None, 150])
+def test_streaming_matches_batch(flat_from):
+    df = make_bars(260, flat_from=flat_from)
+    calc = IndicatorCalculator()
+    stream = StreamingIndicators(vwap_window=50)
+
+    for i, bar in enumerate(df.itertuples(index=False), 1):
+        values = stream.update(bar.high, bar.low, bar.close, bar.volume)
+        if i < stream.min_bars:
+            assert values == {}
+            continue
+        # Check every bar once warmed up, and a sparse set for speed afterwards
+        if i > 120 and i % 7:
+            continue
+
+        expected = batch_values(calc, df.iloc[:i], 50)
+        for key, value in expected.items():
+            if pd.isna(value):
+                assert values[key] is None, (i, key)
+            else:
+                assert values[key] == pytest.approx(value, rel=1e-9, abs=1e-9), (i, key)
+
+
+def test_compute_all_window_agrees_on_windowless_indicators():
+    """compute_all over a 200-bar window gives the same SMA-based values as the stream."""
+    df = make_bars(400, seed=3)
+    stream = StreamingIndicators()
+    for bar in df.itertuples(index=False):
+        values = stream.update(bar.high, bar.low, bar.close, bar.volume)
+
+    batch = IndicatorCalculator().compute_all(df.iloc[-200:].reset_index(drop=True))
+    for key in ('vwap', 'atr', 'rsi', 'adx'):
+        assert values[key] == pytest.approx(batch[key], rel=1e-9)
@@ -10,6 +10,8 @@ from sqlalchemy import func
 
 from database.latency_db import OrderLatency, latency_session
 from limiter import limiter
+from utils.httpx_client import get_http_pool_metrics
+from utils.latency_histogram import get_latency_histograms
 from utils.logging import get_logger
 from utils.session import check_session_validity
 
@@ -38,30 +40,27 @@ def format_ist_time(timestamp):
 def get_histogram_data(broker=None):
     """Get histogram data for RTT distribution"""
     try:
-        query = OrderLatency.query
-        if broker:
-            query = query.filter_by(broker=broker)
-
-        # Get all RTT values
-        rtts = [r[0] for r in query.with_entities(OrderLatency.rtt_ms).all()]
-
-        if not rtts:
+        # RTT distribution from the streaming histograms (no per-row fetch)
+        histogram = get_latency_histograms().merged("all", broker=broker or None, stage="rtt")
+        if not histogram.count:
             return {"bins": [], "counts": [], "avg_rtt": 0, "min_rtt": 0, "max_rtt": 0}
+        values, weights = histogram.values()
 
         # Calculate statistics
-        avg_rtt = sum(rtts) / len(rtts)
-        min_rtt = min(rtts)
-        max_rtt = max(rtts)
+        avg_rtt = histogram.sum / histogram.count
+        min_rtt = values[0]
+        max_rtt = values[-1]
 
         # Create histogram bins
         bin_count = 30  # Number of bins
-        bin_width = (max_rtt - min_rtt) / bin_count if max_rtt > min_rtt else 1
 
-        # Create histogram using numpy
-        counts, bins = np.histogram(rtts, bins=bin_count, range=(min_rtt, max_rtt))
+        # Create histogram using numpy (bucket values weighted by their counts)
+        counts, bins = np.histogram(
+            values, bins=bin_count, range=(min_rtt, max_rtt), weights=weights
+        )
 
         # Convert to list for JSON serialization
-        counts = counts.tolist()
+        counts = counts.astype(int).tolist()
         bins = bins.tolist()
 
         # Create bin labels (use the start of each bin)
@@ -225,6 +224,39 @@ def get_stats():
         return jsonify({"error": str(e)}), 500
 
 
+@latency_bp.route("/api/percentiles", methods=["GET"])
+@check_session_validity
+@limiter.limit("60/minute")
+def get_percentiles():
+    """API endpoint to get latency percentiles over a rolling window (1m, 1h, 1d or all)"""
+    window = request.args.get("window", "1h")
+    broker = request.args.get("broker") or None
+    api_type = request.args.get("api_type") or None
+    stage = request.args.get("stage", "total")
+    try:
+        summary = get_latency_histograms().summary(window, broker, api_type, stage)
+        return jsonify(
+            {"window": window, "broker": broker, "api_type": api_type, "stage": stage, **summary}
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.exception(f"Error fetching latency percentiles: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@latency_bp.route("/api/http_pools", methods=["GET"])
+@check_session_validity
+@limiter.limit("60/minute")
+def get_http_pools():
+    """API endpoint to get broker HTTP connection pool metrics (reuse and pool wait)"""
+    try:
+        return jsonify(get_http_pool_metrics())
+    except Exception as e:
+        logger.exception(f"Error fetching HTTP pool metrics: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 @latency_bp.route("/api/broker/<broker>/stats", methods=["GET"])
 @check_session_validity
 @limiter.limit("60/minute")
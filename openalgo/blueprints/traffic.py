@@ -7,6 +7,7 @@ import pytz
 from flask import Blueprint, Response, jsonify, render_template, request, session
 from sqlalchemy import func
 
+from database.log_writer import get_log_writer_stats
 from database.traffic_db import TrafficLog, logs_session
 from limiter import limiter
 from utils.session import check_session_validity
@@ -182,7 +183,15 @@ def get_stats():
                 ),
             }
 
-        return jsonify({"overall": overall_stats, "api": api_stats, "endpoints": endpoint_stats})
+        return jsonify(
+            {
+                "overall": overall_stats,
+                "api": api_stats,
+                "endpoints": endpoint_stats,
+                # Buffered log writer counters (queued/written/dropped/failed/pending rows)
+                "log_writers": get_log_writer_stats(),
+            }
+        )
     except Exception as e:
         logger.exception(f"Error fetching traffic stats: {e}")
         return jsonify({"error": str(e)}), 500
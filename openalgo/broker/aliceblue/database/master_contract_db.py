@@ -13,6 +13,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from database.auth_db import get_auth_token
+from database.master_contract_loader import begin_load, stage_dataframe
 from extensions import socketio  # Import SocketIO
 from utils.httpx_client import get_httpx_client
 from utils.logging import get_logger
@@ -103,35 +104,16 @@ def init_db():
 
 
 def delete_symtoken_table():
-    logger.info("Deleting Symtoken Table")
-    SymToken.query.delete()
-    db_session.commit()
+    logger.info("Staging master contract (symtoken is updated when it is applied)")
+    begin_load()
 
 
 def copy_from_dataframe(df):
     logger.info("Performing Bulk Insert")
-    # Convert DataFrame to a list of dictionaries
-    data_dict = df.to_dict(orient="records")
-
-    # Retrieve existing tokens to filter them out from the insert
-    existing_tokens = {result.token for result in db_session.query(SymToken.token).all()}
-
-    # Filter out data_dict entries with tokens that already exist
-    filtered_data_dict = [row for row in data_dict if row["token"] not in existing_tokens]
-
-    # Insert in bulk the filtered records
     try:
-        if filtered_data_dict:  # Proceed only if there's anything to insert
-            db_session.bulk_insert_mappings(SymToken, filtered_data_dict)
-            db_session.commit()
-            logger.info(
-                f"Bulk insert completed successfully with {len(filtered_data_dict)} new records."
-            )
-        else:
-            logger.info("No new records to insert.")
+        stage_dataframe(df)
     except Exception as e:
         logger.error(f"Error during bulk insert: {e}")
-        db_session.rollback()
 
 
 def download_csv_aliceblue_data(output_path):
@@ -652,9 +634,7 @@ def master_contract_download():
         copy_from_dataframe(token_df)
         delete_aliceblue_temp_data(output_path)
 
-        return socketio.emit(
-            "master_contract_download", {"status": "success", "message": "Successfully Downloaded"}
-        )
+        logger.info("Successfully Downloaded")
 
     except Exception as e:
         logger.info(f"{e}")
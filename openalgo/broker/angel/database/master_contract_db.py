@@ -3,7 +3,6 @@
 import gzip
 import os
 import shutil
-from datetime import datetime
 
 import pandas as pd
 import requests
@@ -11,6 +10,7 @@ from sqlalchemy import Column, Float, Index, Integer, Sequence, String, create_e
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+from database.master_contract_loader import begin_load, format_expiry, stage_dataframe
 from extensions import socketio  # Import SocketIO
 from utils.logging import get_logger
 
@@ -50,35 +50,16 @@ def init_db():
 
 
 def delete_symtoken_table():
-    logger.info("Deleting Symtoken Table")
-    SymToken.query.delete()
-    db_session.commit()
+    logger.info("Staging master contract (symtoken is updated when it is applied)")
+    begin_load()
 
 
 def copy_from_dataframe(df):
     logger.info("Performing Bulk Insert")
-    # Convert DataFrame to a list of dictionaries
-    data_dict = df.to_dict(orient="records")
-
-    # Retrieve existing tokens to filter them out from the insert
-    existing_tokens = {result.token for result in db_session.query(SymToken.token).all()}
-
-    # Filter out data_dict entries with tokens that already exist
-    filtered_data_dict = [row for row in data_dict if row["token"] not in existing_tokens]
-
-    # Insert in bulk the filtered records
     try:
-        if filtered_data_dict:  # Proceed only if there's anything to insert
-            db_session.bulk_insert_mappings(SymToken, filtered_data_dict)
-            db_session.commit()
-            logger.info(
-                f"Bulk insert completed successfully with {len(filtered_data_dict)} new records."
-            )
-        else:
-            logger.info("No new records to insert.")
+        stage_dataframe(df)
     except Exception as e:
         logger.error(f"Error during bulk insert: {e}")
-        db_session.rollback()
 
 
 def download_json_angel_data(url, output_path):
@@ -95,35 +76,6 @@ def download_json_angel_data(url, output_path):
         logger.error(f"Failed to download data. Status code: {response.status_code}")
 
 
-def reformat_symbol(row):
-    symbol = row["symbol"]
-    instrument_type = row["instrumenttype"]
-
-    if instrument_type == "FUT":
-        # For FUT, remove the spaces and append 'FUT' at the end
-        parts = symbol.split(" ")
-        if len(parts) == 5:  # Make sure the symbol has the correct format
-            symbol = parts[0] + parts[2] + parts[3] + parts[4] + parts[1]
-    elif instrument_type in ["CE", "PE"]:
-        # For CE/PE, rearrange the parts and remove spaces
-        parts = symbol.split(" ")
-        if len(parts) == 6:  # Make sure the symbol has the correct format
-            symbol = parts[0] + parts[3] + parts[4] + parts[5] + parts[1] + parts[2]
-    else:
-        symbol = symbol  # No change for other instrument types
-
-    return symbol
-
-
-def convert_date(date_str):
-    # Convert from '19MAR2024' to '19-MAR-24'
-    try:
-        return datetime.strptime(date_str, "%d%b%Y").strftime("%d-%b-%y")
-    except ValueError:
-        # Return the original date if it doesn't match the format
-        return date_str
-
-
 def process_angel_json(path):
     """
     Processes the Angel JSON file to fit the existing database schema.
@@ -151,9 +103,6 @@ def process_angel_json(path):
         }
     )
 
-    # Reformat 'symbol' column if needed (based on the given reformat_symbol function)
-    # df['symbol'] = df.apply(lambda row: reformat_symbol(row), axis=1)
-
     # Assuming 'brsymbol' and 'brexchange' are not present in the JSON and are the same as 'symbol' and 'exchange'
     df["brsymbol"] = df["symbol"]
     df["brexchange"] = df["exchange"]
@@ -166,9 +115,8 @@ def process_angel_json(path):
     # Reformat 'symbol' based on 'brsymbol'
     df["symbol"] = df["symbol"].str.replace("-EQ|-BE|-MF|-SG", "", regex=True)
 
-    # Assuming the 'expiry' field in the JSON is in the format '19MAR2024'
-    df["expiry"] = df["expiry"].apply(lambda x: convert_date(x) if pd.notnull(x) else x)
-    df["expiry"] = df["expiry"].str.upper()
+    # Expiry '19MAR2024' -> '19-MAR-24' (values in other formats are kept)
+    df["expiry"] = format_expiry(df["expiry"], "%d%b%Y").str.upper()
 
     # Convert 'strike' to float, 'lotsize' to int, and 'tick_size' to float as per the database schema
     df["strike"] = df["strike"].astype(float) / 100
@@ -382,9 +330,7 @@ def master_contract_download():
         delete_symtoken_table()  # Consider the implications of this action
         copy_from_dataframe(token_df)
 
-        return socketio.emit(
-            "master_contract_download", {"status": "success", "message": "Successfully Downloaded"}
-        )
+        logger.info("Successfully Downloaded")
 
     except Exception as e:
         logger.info(f"{str(e)}")
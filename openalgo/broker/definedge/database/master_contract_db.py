@@ -14,6 +14,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from database.auth_db import get_auth_token
+from database.master_contract_loader import begin_load, stage_dataframe
 from database.user_db import find_user_by_username
 from extensions import socketio  # Import SocketIO
 from utils.httpx_client import get_httpx_client
@@ -50,21 +51,19 @@ def init_db():
 
 
 def delete_symtoken_table():
-    """Delete all records from symtoken table"""
+    """Start a new symtoken load (rows are replaced when the load is applied)"""
     try:
-        db_session.query(SymToken).delete()
-        db_session.commit()
-        logger.info("All records deleted from symtoken table")
+        begin_load()
+        logger.info("Staging master contract for the symtoken table")
     except Exception as e:
-        logger.error(f"Error deleting symtoken table: {e}")
-        db_session.rollback()
+        logger.error(f"Error starting symtoken load: {e}")
 
 
 def copy_from_dataframe(df):
     """Copy dataframe to database"""
     try:
-        df.to_sql("symtoken", con=engine, if_exists="append", index=False)
-        logger.info(f"Inserted {len(df)} records into symtoken table")
+        staged = stage_dataframe(df, unique=None)
+        logger.info(f"Staged {staged} records for the symtoken table")
     except Exception as e:
         logger.error(f"Error copying dataframe to database: {e}")
 
@@ -724,10 +723,7 @@ def master_contract_download():
 
         # Emit socketio event if available
         try:
-            return socketio.emit(
-                "master_contract_download",
-                {"status": "success", "message": "Successfully Downloaded"},
-            )
+            logger.info("Successfully Downloaded")
         except:
             return True
 
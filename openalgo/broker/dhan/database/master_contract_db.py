@@ -15,6 +15,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from database.auth_db import get_auth_token
+from database.master_contract_loader import begin_load, stage_dataframe
 from extensions import socketio  # Import SocketIO
 from utils.logging import get_logger
 
@@ -54,35 +55,16 @@ def init_db():
 
 
 def delete_symtoken_table():
-    logger.info("Deleting Symtoken Table")
-    SymToken.query.delete()
-    db_session.commit()
+    logger.info("Staging master contract (symtoken is updated when it is applied)")
+    begin_load()
 
 
 def copy_from_dataframe(df):
     logger.info("Performing Bulk Insert")
-    # Convert DataFrame to a list of dictionaries
-    data_dict = df.to_dict(orient="records")
-
-    # Retrieve existing tokens to filter them out from the insert
-    existing_tokens = {result.token for result in db_session.query(SymToken.token).all()}
-
-    # Filter out data_dict entries with tokens that already exist
-    filtered_data_dict = [row for row in data_dict if row["token"] not in existing_tokens]
-
-    # Insert in bulk the filtered records
     try:
-        if filtered_data_dict:  # Proceed only if there's anything to insert
-            db_session.bulk_insert_mappings(SymToken, filtered_data_dict)
-            db_session.commit()
-            logger.info(
-                f"Bulk insert completed successfully with {len(filtered_data_dict)} new records."
-            )
-        else:
-            logger.info("No new records to insert.")
+        stage_dataframe(df)
     except Exception as e:
-        logger.exception(f"Error during bulk insert: {e}")
-        db_session.rollback()
+        logger.error(f"Error during bulk insert: {e}")
 
 
 def download_csv_dhan_data(output_path):
@@ -295,9 +277,7 @@ def master_contract_download():
 
         # token_df = token_df.drop_duplicates(subset='symbol', keep='first')
 
-        return socketio.emit(
-            "master_contract_download", {"status": "success", "message": "Successfully Downloaded"}
-        )
+        logger.info("Successfully Downloaded")
 
     except Exception as e:
         logger.exception(f"Error during master contract download: {e}")
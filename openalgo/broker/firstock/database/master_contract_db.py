@@ -6,6 +6,7 @@ from sqlalchemy import Column, Float, Index, Integer, Sequence, String, create_e
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+from database.master_contract_loader import begin_load, stage_dataframe
 from extensions import socketio
 from utils.httpx_client import get_httpx_client
 from utils.logging import get_logger
@@ -46,29 +47,16 @@ def init_db():
 
 
 def delete_symtoken_table():
-    logger.info("Deleting Symtoken Table")
-    SymToken.query.delete()
-    db_session.commit()
+    logger.info("Staging master contract (symtoken is updated when it is applied)")
+    begin_load()
 
 
 def copy_from_dataframe(df):
     logger.info("Performing Bulk Insert")
-    data_dict = df.to_dict(orient="records")
-    existing_tokens = {result.token for result in db_session.query(SymToken.token).all()}
-    filtered_data_dict = [row for row in data_dict if row["token"] not in existing_tokens]
-
     try:
-        if filtered_data_dict:
-            db_session.bulk_insert_mappings(SymToken, filtered_data_dict)
-            db_session.commit()
-            logger.info(
-                f"Bulk insert completed successfully with {len(filtered_data_dict)} new records."
-            )
-        else:
-            logger.info("No new records to insert.")
+        stage_dataframe(df)
     except Exception as e:
         logger.error(f"Error during bulk insert: {e}")
-        db_session.rollback()
 
 
 # Firstock URLs for downloading symbol files
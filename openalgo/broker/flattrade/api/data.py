@@ -1,4 +1,3 @@
-import asyncio
 import json
 import os
 import time
@@ -10,11 +9,11 @@ import httpx
 import pandas as pd
 
 from database.token_db import get_br_symbol, get_oa_symbol, get_token
-from utils.httpx_client import get_httpx_client
+from utils.httpx_client import fan_out, get_httpx_client
 from utils.logging import get_logger
 
 # Toggle between async and threaded approach
-USE_ASYNC = True  # Set to True to use asyncio (better performance)
+USE_ASYNC = True  # Set to True to use the async fan-out (better performance)
 
 logger = get_logger(__name__)
 
@@ -169,71 +168,22 @@ class BrokerData:
             logger.exception("Error fetching multiquotes")
             raise Exception(f"Error fetching multiquotes: {e}")
 
-    def _fetch_single_quote_sync(
-        self, symbol: str, exchange: str, api_exchange: str, token: str, api_key: str
-    ) -> dict:
-        """
-        Fetch quote for a single symbol synchronously (for ThreadPoolExecutor)
-        """
-        try:
-            data = {"uid": api_key, "actid": api_key, "exch": api_exchange, "token": token}
-
-            payload_str = "jData=" + json.dumps(data) + "&jKey=" + self.auth_token
-            headers = {"Content-Type": "application/x-www-form-urlencoded"}
-            url = "https://piconnect.flattrade.in/PiConnectTP/GetQuotes"
-
-            # Use httpx.post for sync requests
-            http_response = httpx.post(url, content=payload_str, headers=headers, timeout=10.0)
-            response = http_response.json()
-
-            if response.get("stat") != "Ok":
-                return {
-                    "symbol": symbol,
-                    "exchange": exchange,
-                    "error": response.get("emsg", "Unknown error"),
-                }
-
-            return {
-                "symbol": symbol,
-                "exchange": exchange,
-                "data": {
-                    "bid": float(response.get("bp1", 0)),
-                    "ask": float(response.get("sp1", 0)),
-                    "open": float(response.get("o", 0)),
-                    "high": float(response.get("h", 0)),
-                    "low": float(response.get("l", 0)),
-                    "ltp": float(response.get("lp", 0)),
-                    "prev_close": float(response.get("c", 0)) if "c" in response else 0,
-                    "volume": int(float(response.get("v", 0))),
-                    "oi": int(response.get("oi", 0)),
-                    "tick_size": float(response.get("ti", 0)) if response.get("ti") else None,
-                },
-            }
-
-        except Exception as e:
-            return {"symbol": symbol, "exchange": exchange, "error": str(e)}
+    def _quote_request(self, api_exchange: str, token: str, api_key: str) -> dict:
+        """GetQuotes request for one symbol (httpx arguments, as taken by fan_out)"""
+        data = {"uid": api_key, "actid": api_key, "exch": api_exchange, "token": token}
+        return {
+            "method": "POST",
+            "url": "https://piconnect.flattrade.in/PiConnectTP/GetQuotes",
+            "content": "jData=" + json.dumps(data) + "&jKey=" + self.auth_token,
+            "headers": {"Content-Type": "application/x-www-form-urlencoded"},
+            "timeout": 10.0,
+        }
 
-    async def _fetch_single_quote_async(
-        self,
-        client: httpx.AsyncClient,
-        symbol: str,
-        exchange: str,
-        api_exchange: str,
-        token: str,
-        api_key: str,
-    ) -> dict:
-        """
-        Fetch quote for a single symbol asynchronously
-        """
+    def _quote_result(self, symbol: str, exchange: str, http_response) -> dict:
+        """Multiquotes result item from a GetQuotes response (or the exception raised)"""
         try:
-            data = {"uid": api_key, "actid": api_key, "exch": api_exchange, "token": token}
-
-            payload_str = "jData=" + json.dumps(data) + "&jKey=" + self.auth_token
-            headers = {"Content-Type": "application/x-www-form-urlencoded"}
-            url = "https://piconnect.flattrade.in/PiConnectTP/GetQuotes"
-
-            # Use async httpx client
-            http_response = await client.post(url, content=payload_str, headers=headers)
+            if isinstance(http_response, Exception):
+                raise http_response
             response = http_response.json()
 
             if response.get("stat") != "Ok":
@@ -268,43 +218,18 @@ class BrokerData:
             logger.warning(f"Error processing quote for {symbol}@{exchange}: {str(e)}")
             return {"symbol": symbol, "exchange": exchange, "error": str(e)}
 
-    async def _process_quotes_batch_async(self, symbols: list, api_key: str) -> list:
+    def _fetch_single_quote_sync(
+        self, symbol: str, exchange: str, api_exchange: str, token: str, api_key: str
+    ) -> dict:
         """
-        Process a batch of symbols using async httpx
+        Fetch quote for a single symbol synchronously (for ThreadPoolExecutor)
         """
-        results = []
-
-        # High connection limits for maximum concurrency
-        limits = httpx.Limits(max_connections=100, max_keepalive_connections=100)
-        async with httpx.AsyncClient(timeout=10.0, limits=limits) as client:
-            tasks = [
-                self._fetch_single_quote_async(
-                    client,
-                    item["symbol"],
-                    item["exchange"],
-                    item["api_exchange"],
-                    item["token"],
-                    api_key,
-                )
-                for item in symbols
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Convert exceptions to error dicts
-        final_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                final_results.append(
-                    {
-                        "symbol": symbols[i]["symbol"],
-                        "exchange": symbols[i]["exchange"],
-                        "error": str(result),
-                    }
-                )
-            else:
-                final_results.append(result)
-
-        return final_results
+        request = self._quote_request(api_exchange, token, api_key)
+        try:
+            http_response = httpx.request(**request)
+        except Exception as e:
+            http_response = e
+        return self._quote_result(symbol, exchange, http_response)
 
     def _process_quotes_batch(self, symbols: list) -> list:
         """
@@ -365,8 +290,17 @@ class BrokerData:
         start_time = time.time()
 
         if USE_ASYNC:
-            # Async approach with httpx.AsyncClient
-            results = asyncio.run(self._process_quotes_batch_async(prepared_symbols, api_key))
+            # Async approach: the shared per-host async client, bounded concurrency
+            responses = fan_out(
+                [
+                    self._quote_request(item["api_exchange"], item["token"], api_key)
+                    for item in prepared_symbols
+                ]
+            )
+            results = [
+                self._quote_result(item["symbol"], item["exchange"], response)
+                for item, response in zip(prepared_symbols, responses, strict=True)
+            ]
         else:
             # ThreadPoolExecutor approach
             results = []
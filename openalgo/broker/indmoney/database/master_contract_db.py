@@ -6,7 +6,6 @@ import io
 import json
 import os
 import shutil
-import time
 
 import numpy as np
 import pandas as pd
@@ -16,6 +15,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from database.auth_db import get_auth_token
+from database.master_contract_loader import begin_load, stage_dataframe
 from extensions import socketio  # Import SocketIO
 from utils.logging import get_logger
 
@@ -74,77 +74,16 @@ def init_db():
 
 
 def delete_symtoken_table():
-    logger.info("Deleting Symtoken Table")
-    SymToken.query.delete()
-    db_session.commit()
+    logger.info("Staging master contract (symtoken is updated when it is applied)")
+    begin_load()
 
 
 def copy_from_dataframe(df):
     logger.info("Performing Bulk Insert")
-    # Convert DataFrame to a list of dictionaries
-    data_dict = df.to_dict(orient="records")
-
-    # Retrieve existing tokens to filter them out from the insert
-    existing_tokens = {result.token for result in db_session.query(SymToken.token).all()}
-
-    # Filter out data_dict entries with tokens that already exist
-    filtered_data_dict = [row for row in data_dict if row["token"] not in existing_tokens]
-
-    # Insert in smaller chunks to minimize database lock time
-    chunk_size = 500  # Reduced chunk size for shorter lock duration
-    total_inserted = 0
-
     try:
-        if filtered_data_dict:  # Proceed only if there's anything to insert
-            logger.info(
-                f"Starting bulk insert of {len(filtered_data_dict)} records in chunks of {chunk_size}"
-            )
-
-            # Process data in chunks
-            for i in range(0, len(filtered_data_dict), chunk_size):
-                chunk = filtered_data_dict[i : i + chunk_size]
-
-                # Use a separate transaction for each chunk with retry logic
-                try:
-                    # Insert chunk
-                    db_session.bulk_insert_mappings(SymToken, chunk)
-                    db_session.commit()  # Commit each chunk immediately
-
-                    total_inserted += len(chunk)
-
-                    # Log progress every 20 chunks (10,000 records)
-                    if (i // chunk_size + 1) % 20 == 0:
-                        logger.debug(f"Processed {total_inserted} records so far...")
-
-                except Exception as chunk_error:
-                    logger.warning(
-                        f"Error inserting chunk {i // chunk_size + 1}, retrying: {chunk_error}"
-                    )
-                    db_session.rollback()
-
-                    # Retry once for this chunk
-                    try:
-                        time.sleep(0.1)  # Brief pause before retry
-                        db_session.bulk_insert_mappings(SymToken, chunk)
-                        db_session.commit()
-                        total_inserted += len(chunk)
-                    except Exception as retry_error:
-                        logger.error(
-                            f"Failed to insert chunk {i // chunk_size + 1} after retry: {retry_error}"
-                        )
-                        db_session.rollback()
-                        # Continue with next chunk instead of failing completely
-                        continue
-
-                # Small delay to allow other operations
-                time.sleep(0.005)  # 5ms delay between chunks (reduced from 10ms)
-
-            logger.info(f"Bulk insert completed successfully with {total_inserted} new records.")
-        else:
-            logger.info("No new records to insert.")
+        stage_dataframe(df)
     except Exception as e:
-        logger.exception(f"Error during bulk insert: {e}")
-        db_session.rollback()
+        logger.error(f"Error during bulk insert: {e}")
 
 
 def download_csv_indmoney_data(output_path):
@@ -479,10 +418,7 @@ def master_contract_download():
         if not token_df.empty:
             copy_from_dataframe(token_df)
             delete_indmoney_temp_data(output_path)
-            return socketio.emit(
-                "master_contract_download",
-                {"status": "success", "message": "Successfully Downloaded Indmoney Instruments"},
-            )
+            logger.info("Successfully Downloaded Indmoney Instruments")
         else:
             return socketio.emit(
                 "master_contract_download",
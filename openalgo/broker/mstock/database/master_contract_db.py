@@ -10,6 +10,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from database.auth_db import get_auth_token
+from database.master_contract_loader import begin_load, stage_dataframe
 from extensions import socketio
 from utils.logging import get_logger
 
@@ -56,32 +57,18 @@ def init_db():
 
 
 def delete_symtoken_table():
-    logger.info("Deleting SymToken Table (MStock)")
-    SymToken.query.delete()
-    db_session.commit()
+    logger.info("Staging master contract (symtoken is updated when it is applied)")
+    begin_load()
 
 
 def copy_from_dataframe(df):
     """Bulk insert DataFrame records into the symtoken table."""
     logger.info("Performing Bulk Insert into SymToken Table")
-
-    data_dict = df.to_dict(orient="records")
-    existing_tokens = {result.token for result in db_session.query(SymToken.token).all()}
-
-    filtered_data_dict = [
-        row for row in data_dict if row.get("token") and str(row["token"]) not in existing_tokens
-    ]
-
     try:
-        if filtered_data_dict:
-            db_session.bulk_insert_mappings(SymToken, filtered_data_dict)
-            db_session.commit()
-            logger.info(f"Inserted {len(filtered_data_dict)} new records successfully.")
-        else:
-            logger.info("No new MStock records to insert.")
+        # Rows without a token cannot be looked up
+        stage_dataframe(df[df["token"].astype(bool)])
     except Exception as e:
         logger.error(f"Error during MStock bulk insert: {e}")
-        db_session.rollback()
 
 
 # -------------------------------------------------------------------
@@ -670,13 +657,7 @@ def master_contract_download():
         else:
             logger.warning("No NSE index data fetched from web")
 
-        socketio.emit(
-            "master_contract_download",
-            {
-                "status": "success",
-                "message": "MStock Master Contract downloaded and stored successfully",
-            },
-        )
+        logger.info("MStock Master Contract downloaded and stored successfully")
 
     except Exception as e:
         logger.error(f"Error during MStock master contract pipeline: {str(e)}")
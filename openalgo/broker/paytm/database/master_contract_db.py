@@ -8,6 +8,7 @@ from sqlalchemy import Column, Float, Index, Integer, Sequence, String, create_e
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+from database.master_contract_loader import begin_load, stage_dataframe
 from extensions import socketio  # Import SocketIO
 from utils.httpx_client import get_httpx_client
 from utils.logging import get_logger
@@ -48,61 +49,25 @@ def init_db():
 
 
 def delete_symtoken_table():
-    logger.info("Deleting Symtoken Table")
-    SymToken.query.delete()
-    db_session.commit()
+    logger.info("Staging master contract (symtoken is updated when it is applied)")
+    begin_load()
 
 
 def copy_from_dataframe(df):
     logger.info("Performing Bulk Insert")
-    # Convert DataFrame to a list of dictionaries
-    data_dict = df.to_dict(orient="records")
-
-    # Retrieve existing tokens to filter them out from the insert
-    existing_tokens = {result.token for result in db_session.query(SymToken.token).all()}
-
-    # Filter out data_dict entries with tokens that already exist
-    filtered_data_dict = [row for row in data_dict if row["token"] not in existing_tokens]
-
-    # Insert in bulk the filtered records
     try:
-        if filtered_data_dict:  # Proceed only if there's anything to insert
-            # Pre-validate records before insertion
-            invalid_records = []
-            valid_records = []
-
-            for record in filtered_data_dict:
-                # Allow indices ("I") even if symbol is missing
-                if record.get("instrumenttype") == "I":
-                    valid_records.append(record)
-                else:
-                    # Check if symbol exists and is not empty/null
-                    symbol = record.get("symbol")
-                    if not symbol or pd.isna(symbol) or str(symbol).strip() == "":
-                        invalid_records.append(record)
-                        logger.error(f"Schema validation failed for record: {record}")
-                        logger.debug("Symbol is missing, empty, or null")
-                    else:
-                        valid_records.append(record)
-
-            if valid_records:
-                db_session.bulk_insert_mappings(SymToken, valid_records)
-                db_session.commit()
-                logger.info(
-                    f"Bulk insert completed successfully with {len(valid_records)} new records."
-                )
-
-            if invalid_records:
-                logger.warning(
-                    f"{len(invalid_records)} records failed schema validation and were skipped."
-                )
-        else:
-            logger.info("No new records to insert.")
+        # Every instrument except indices ("I") needs a symbol
+        symbol = df["symbol"].fillna("").astype(str).str.strip()
+        valid = (df["instrumenttype"] == "I") | (symbol != "")
+        if not valid.all():
+            logger.warning(
+                f"{int((~valid).sum())} records failed schema validation and were skipped."
+            )
+        stage_dataframe(df[valid])
     except Exception as e:
         logger.exception(f"Error during bulk insert: {e}")
         if hasattr(e, "__cause__"):
             logger.error(f"Caused by: {e.__cause__}")
-        db_session.rollback()
 
 
 def download_csv_paytm_data(output_path):
@@ -315,9 +280,7 @@ def master_contract_download():
 
         # token_df = token_df.drop_duplicates(subset='symbol', keep='first')
 
-        return socketio.emit(
-            "master_contract_download", {"status": "success", "message": "Successfully Downloaded"}
-        )
+        logger.info("Successfully Downloaded")
 
     except Exception as e:
         logger.exception(f"An error occurred during master contract download: {e}")
@@ -9,6 +9,7 @@ from sqlalchemy import Column, Float, Index, Integer, Sequence, String, create_e
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+from database.master_contract_loader import begin_load, stage_dataframe
 from extensions import socketio  # Import SocketIO
 from utils.logging import get_logger
 
@@ -49,40 +50,17 @@ def init_db():
 
 
 def delete_symtoken_table():
-    logger.info("Deleting Symtoken Table")
-    SymToken.query.delete()
-    db_session.commit()
+    logger.info("Staging master contract (symtoken is updated when it is applied)")
+    begin_load()
 
 
 def copy_from_dataframe(df):
     logger.info("Performing Bulk Insert")
-    # Convert DataFrame to a list of dictionaries
-    data_dict = df.to_dict(orient="records")
-
-    # Retrieve existing token-exchange combinations to filter them out from the insert
-    existing_token_exchange = {
-        (result.token, result.exchange)
-        for result in db_session.query(SymToken.token, SymToken.exchange).all()
-    }
-
-    # Filter out data_dict entries with token-exchange combinations that already exist
-    filtered_data_dict = [
-        row for row in data_dict if (row["token"], row["exchange"]) not in existing_token_exchange
-    ]
-
-    # Insert in bulk the filtered records
     try:
-        if filtered_data_dict:  # Proceed only if there's anything to insert
-            db_session.bulk_insert_mappings(SymToken, filtered_data_dict)
-            db_session.commit()
-            logger.info(
-                f"Bulk insert completed successfully with {len(filtered_data_dict)} new records."
-            )
-        else:
-            logger.info("No new records to insert.")
+        # Tokens repeat across exchanges; skip token-exchange pairs already staged
+        stage_dataframe(df, unique=("token", "exchange"))
     except Exception as e:
         logger.error(f"Error during bulk insert: {e}")
-        db_session.rollback()
 
 
 # Define the shoonya URLs for downloading the symbol files
@@ -902,9 +880,7 @@ def master_contract_download():
 
         delete_shoonya_temp_data(output_path)
 
-        return socketio.emit(
-            "master_contract_download", {"status": "success", "message": "Successfully Downloaded"}
-        )
+        logger.info("Successfully Downloaded")
     except Exception as e:
         logger.info(f"{str(e)}")
         return socketio.emit("master_contract_download", {"status": "error", "message": str(e)})
@@ -13,6 +13,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from database.auth_db import get_auth_token
+from database.master_contract_loader import begin_load, format_strike, stage_dataframe
 from extensions import socketio  # Import SocketIO
 from utils.httpx_client import get_httpx_client
 from utils.logging import get_logger
@@ -53,35 +54,16 @@ def init_db():
 
 
 def delete_symtoken_table():
-    logger.info("Deleting Symtoken Table")
-    SymToken.query.delete()
-    db_session.commit()
+    logger.info("Staging master contract (symtoken is updated when it is applied)")
+    begin_load()
 
 
 def copy_from_dataframe(df):
     logger.info("Performing Bulk Insert")
-    # Convert DataFrame to a list of dictionaries
-    data_dict = df.to_dict(orient="records")
-
-    # Retrieve existing tokens to filter them out from the insert
-    existing_tokens = {result.token for result in db_session.query(SymToken.token).all()}
-
-    # Filter out data_dict entries with tokens that already exist
-    filtered_data_dict = [row for row in data_dict if row["token"] not in existing_tokens]
-
-    # Insert in bulk the filtered records
     try:
-        if filtered_data_dict:  # Proceed only if there's anything to insert
-            db_session.bulk_insert_mappings(SymToken, filtered_data_dict)
-            db_session.commit()
-            logger.info(
-                f"Bulk insert completed successfully with {len(filtered_data_dict)} new records."
-            )
-        else:
-            logger.info("No new records to insert.")
+        stage_dataframe(df)
     except Exception as e:
         logger.error(f"Error during bulk insert: {e}")
-        db_session.rollback()
 
 
 def download_csv_zerodha_data(output_path):
@@ -134,26 +116,6 @@ def download_csv_zerodha_data(output_path):
         raise
 
 
-def reformat_symbol(row):
-    symbol = row["symbol"]
-    instrument_type = row["instrumenttype"]
-
-    if instrument_type == "FUT":
-        # For FUT, remove the spaces and append 'FUT' at the end
-        parts = symbol.split(" ")
-        if len(parts) == 5:  # Make sure the symbol has the correct format
-            symbol = parts[0] + parts[2] + parts[3] + parts[4] + parts[1]
-    elif instrument_type in ["CE", "PE"]:
-        # For CE/PE, rearrange the parts and remove spaces
-        parts = symbol.split(" ")
-        if len(parts) == 6:  # Make sure the symbol has the correct format
-            symbol = parts[0] + parts[3] + parts[4] + parts[5] + parts[1] + parts[2]
-    else:
-        symbol = symbol  # No change for other instrument types
-
-    return symbol
-
-
 def process_zerodha_csv(path):
     """
     Processes the Zerodha CSV file to fit the existing database schema and performs exchange name mapping.
@@ -215,34 +177,18 @@ def process_zerodha_csv(path):
     )
 
     df["brsymbol"] = df["symbol"]
-    df["symbol"] = df.apply(reformat_symbol, axis=1)
     df["brexchange"] = df["exchange"]
 
     # Fill NaN values in the 'expiry' column with an empty string
     df["expiry"] = df["expiry"].fillna("")
 
-    # Futures Symbol Update
-    df.loc[(df["instrumenttype"] == "FUT"), "symbol"] = (
-        df["name"] + df["expiry"].str.replace("-", "", regex=False) + "FUT"
-    )
-
-    # Options Symbol Update
-
-    def format_strike(strike):
-        # Convert the string to a float, then to an integer, and finally back to a string.
-        return str(int(float(strike)))
-
-    df.loc[(df["instrumenttype"] == "CE"), "symbol"] = (
-        df["name"]
-        + df["expiry"].str.replace("-", "", regex=False)
-        + df["strike"].apply(format_strike)
-        + df["instrumenttype"]
-    )
-    df.loc[(df["instrumenttype"] == "PE"), "symbol"] = (
-        df["name"]
-        + df["expiry"].str.replace("-", "", regex=False)
-        + df["strike"].apply(format_strike)
-        + df["instrumenttype"]
+    # Futures and options symbols: NAME + DDMMMYY (+ strike + CE/PE | FUT)
+    expiry_code = df["expiry"].str.replace("-", "", regex=False)
+    futures = df["instrumenttype"] == "FUT"
+    df.loc[futures, "symbol"] = df["name"] + expiry_code + "FUT"
+    options = df["instrumenttype"].isin(["CE", "PE"])
+    df.loc[options, "symbol"] = (
+        df["name"] + expiry_code + format_strike(df.loc[options, "strike"]) + df["instrumenttype"]
     )
 
     df["symbol"] = df["symbol"].replace(
@@ -288,9 +234,7 @@ def master_contract_download():
         delete_symtoken_table()  # Consider the implications of this action
         copy_from_dataframe(token_df)
 
-        return socketio.emit(
-            "master_contract_download", {"status": "success", "message": "Successfully Downloaded"}
-        )
+        logger.info("Successfully Downloaded")
 
     except Exception as e:
         logger.info(f"{str(e)}")
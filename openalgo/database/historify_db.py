@@ -6,7 +6,12 @@ High-performance columnar storage for historical market data.
 Optimized for backtesting and analytical queries.
 """
 
+import atexit
+import csv
 import os
+import queue
+import threading
+import time
 from contextlib import contextmanager
 from datetime import date, datetime
 from pathlib import Path
@@ -14,6 +19,10 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from dotenv import load_dotenv
 
 from utils.logging import get_logger
@@ -46,48 +55,305 @@ def ensure_db_directory():
         logger.info(f"Created database directory: {db_dir}")
 
 
+# Read connection pool size for chart, catalog and export queries
+HISTORIFY_READ_POOL_SIZE = int(os.getenv("HISTORIFY_READ_POOL_SIZE", "4"))
+# Seconds without any open cursor before the database file is closed (0 keeps it open).
+# DuckDB lets only one process open the file read-write, so other processes
+# (upgrade/migrate_historify.py, scripts) can open it once the app goes idle.
+HISTORIFY_IDLE_CLOSE_SECONDS = float(os.getenv("HISTORIFY_IDLE_CLOSE_SECONDS", "10"))
+
+
+class _ConnectionManager:
+    """
+    Long-lived DuckDB connections for the Historify database.
+
+    The database file is opened on first use and shared by the process. Writers get a
+    per-thread cursor of that root connection and readers borrow cursors from a small pool,
+    so neither pays the file-open and catalog-load cost per call. DuckDB does not allow a
+    read_only connection to a file that is already open read-write in the same process, so
+    pooled read cursors share the writer's database instance and rely on its MVCC snapshots
+    for isolation.
+
+    While the file is open, no other process can open it. Once no cursor has been in use
+    for idle_close_seconds, the root connection (and every cursor on it) is closed, and
+    the next call reopens it.
+    """
+
+    def __init__(
+        self,
+        read_pool_size: int = HISTORIFY_READ_POOL_SIZE,
+        idle_close_seconds: float = HISTORIFY_IDLE_CLOSE_SECONDS,
+    ):
+        self._lock = threading.Lock()
+        self._root: duckdb.DuckDBPyConnection | None = None
+        self._local = threading.local()
+        self._generation = 0
+        self._read_pool: queue.LifoQueue = queue.LifoQueue(maxsize=max(read_pool_size, 1))
+
+        # Cursors handed out and not yet released; the file is closed when idle
+        self._idle_close_seconds = idle_close_seconds
+        self._active = 0
+        self._last_release = 0.0
+        self._idle_timer: threading.Timer | None = None
+
+        # Statistics
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "root_opens": 0,
+            "idle_closes": 0,
+            "write_acquires": 0,
+            "write_cursor_creates": 0,
+            "read_acquires": 0,
+            "read_pool_hits": 0,
+            "read_pool_misses": 0,
+            "acquire_time_ms": 0.0,
+            "max_acquire_ms": 0.0,
+        }
+
+    def _checkout(
+        self, max_retries: int, retry_delay: float
+    ) -> tuple[duckdb.DuckDBPyConnection, int]:
+        """Count one more active user and return (root connection, generation)"""
+        with self._lock:
+            root = self._open_root(max_retries, retry_delay)
+            self._active += 1
+            return root, self._generation
+
+    def release(self):
+        """Count one active user less, closing the file once the process stays idle"""
+        with self._lock:
+            self._active -= 1
+            self._last_release = time.monotonic()
+            if self._active == 0 and self._idle_close_seconds > 0 and self._idle_timer is None:
+                self._schedule_idle_close(self._idle_close_seconds)
+
+    def _schedule_idle_close(self, delay: float):
+        """Start the idle-close timer (caller must hold _lock)"""
+        self._idle_timer = threading.Timer(delay, self._close_if_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _close_if_idle(self):
+        with self._lock:
+            self._idle_timer = None
+            if self._active or self._root is None:
+                return
+            remaining = self._idle_close_seconds - (time.monotonic() - self._last_release)
+            if remaining > 0:
+                self._schedule_idle_close(remaining)
+                return
+            self._close_root()
+        self._record("idle_closes")
+        logger.debug("Closed idle Historify DuckDB connection")
+
+    def _open_root(self, max_retries: int, retry_delay: float) -> duckdb.DuckDBPyConnection:
+        """
+        Open the root connection, retrying while another process holds the file lock
+
+        Caller must hold _lock.
+        """
+        if self._root is not None:
+            return self._root
+
+        ensure_db_directory()
+        db_path = get_db_path()
+        last_error = None
+
+        for attempt in range(max_retries):
+            try:
+                self._root = duckdb.connect(db_path)
+                self._generation += 1
+                self._record("root_opens")
+                return self._root
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries - 1:
+                    logger.debug(f"DuckDB connection attempt {attempt + 1} failed, retrying: {e}")
+                    time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
+                else:
+                    logger.exception(
+                        f"Failed to connect to DuckDB after {max_retries} attempts: {e}"
+                    )
+
+        raise last_error or Exception("Failed to connect to DuckDB")
+
+    def _record(self, key: str, acquire_seconds: float | None = None):
+        with self._stats_lock:
+            self._stats[key] += 1
+            if acquire_seconds is not None:
+                elapsed_ms = acquire_seconds * 1000
+                self._stats["acquire_time_ms"] += elapsed_ms
+                if elapsed_ms > self._stats["max_acquire_ms"]:
+                    self._stats["max_acquire_ms"] = elapsed_ms
+
+    def write_cursor(self, max_retries: int, retry_delay: float) -> duckdb.DuckDBPyConnection:
+        """Get this thread's cursor on the root connection"""
+        start = time.perf_counter()
+        root, generation = self._checkout(max_retries, retry_delay)
+
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None or self._local.generation != generation:
+            try:
+                cursor = root.cursor()
+            except Exception:
+                self.release()
+                raise
+            self._local.cursor = cursor
+            self._local.generation = generation
+            self._record("write_cursor_creates")
+
+        self._record("write_acquires", time.perf_counter() - start)
+        return cursor
+
+    def discard_write_cursor(self):
+        """Close this thread's cursor, rolling back any transaction left open on it"""
+        cursor = getattr(self._local, "cursor", None)
+        self._local.cursor = None
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception as e:
+                logger.debug(f"Error closing DuckDB cursor: {e}")
+
+    def acquire_read_cursor(
+        self, max_retries: int, retry_delay: float
+    ) -> tuple[duckdb.DuckDBPyConnection, int]:
+        """Borrow a read cursor from the pool, creating one if the pool is empty"""
+        start = time.perf_counter()
+        root, generation = self._checkout(max_retries, retry_delay)
+
+        try:
+            cursor, cursor_generation = self._read_pool.get_nowait()
+            if cursor_generation == generation:
+                self._record("read_pool_hits")
+                self._record("read_acquires", time.perf_counter() - start)
+                return cursor, generation
+            cursor.close()
+        except queue.Empty:
+            pass
+
+        try:
+            cursor = root.cursor()
+        except Exception:
+            self.release()
+            raise
+        self._record("read_pool_misses")
+        self._record("read_acquires", time.perf_counter() - start)
+        return cursor, generation
+
+    def release_read_cursor(self, cursor: duckdb.DuckDBPyConnection, generation: int):
+        """Return a read cursor to the pool, closing it if the pool is full or stale"""
+        if generation == self._generation:
+            try:
+                self._read_pool.put_nowait((cursor, generation))
+                return
+            except queue.Full:
+                pass
+        cursor.close()
+
+    def close(self):
+        """Close all pooled cursors and the root connection"""
+        with self._lock:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            self._close_root()
+
+    def _close_root(self):
+        """Close pooled cursors and the root connection (caller must hold _lock)"""
+        while True:
+            try:
+                cursor, _ = self._read_pool.get_nowait()
+                cursor.close()
+            except queue.Empty:
+                break
+
+        if self._root is not None:
+            try:
+                # Also closes every cursor created from it, releasing the file lock
+                self._root.close()
+            except Exception as e:
+                logger.debug(f"Error closing DuckDB connection: {e}")
+            self._root = None
+            # Outstanding per-thread cursors are recreated on next use
+            self._generation += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool-hit and connection-acquire statistics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        acquires = stats["write_acquires"] + stats["read_acquires"]
+        stats["read_pool_size"] = self._read_pool.qsize()
+        stats["read_pool_capacity"] = self._read_pool.maxsize
+        stats["read_pool_hit_rate"] = (
+            round(stats["read_pool_hits"] / stats["read_acquires"] * 100, 2)
+            if stats["read_acquires"]
+            else 0.0
+        )
+        stats["avg_acquire_ms"] = round(stats["acquire_time_ms"] / acquires, 4) if acquires else 0.0
+        stats["acquire_time_ms"] = round(stats["acquire_time_ms"], 2)
+        stats["max_acquire_ms"] = round(stats["max_acquire_ms"], 4)
+        return stats
+
+
+_connection_manager = _ConnectionManager()
+atexit.register(_connection_manager.close)
+
+
 @contextmanager
 def get_connection(max_retries: int = 3, retry_delay: float = 0.5):
     """
-    Get a DuckDB connection with proper resource management and retry logic.
+    Get a DuckDB connection for reads and writes.
 
-    DuckDB uses exclusive file locking on Windows. This function includes retry
-    logic to handle temporary file access conflicts in concurrent scenarios.
+    Returns this thread's cursor on the process-wide Historify connection. The database
+    file is opened on first use and closed again after HISTORIFY_IDLE_CLOSE_SECONDS without
+    use, with retry logic for file access conflicts (DuckDB lets one process at a time
+    open the file read-write).
 
     Args:
-        max_retries: Maximum number of connection attempts (default: 3)
+        max_retries: Maximum number of attempts to open the database (default: 3)
         retry_delay: Delay in seconds between retries (default: 0.5)
 
     Usage:
         with get_connection() as conn:
             result = conn.execute("SELECT * FROM market_data").fetchdf()
     """
-    import time
-
-    ensure_db_directory()
-    db_path = get_db_path()
-    conn = None
-    last_error = None
+    cursor = _connection_manager.write_cursor(max_retries, retry_delay)
+    try:
+        yield cursor
+    except Exception:
+        # Start the next call in this thread from a clean cursor
+        _connection_manager.discard_write_cursor()
+        raise
+    finally:
+        _connection_manager.release()
 
-    for attempt in range(max_retries):
-        try:
-            conn = duckdb.connect(db_path)
-            break
-        except Exception as e:
-            last_error = e
-            if attempt < max_retries - 1:
-                logger.debug(f"DuckDB connection attempt {attempt + 1} failed, retrying: {e}")
-                time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
-            else:
-                logger.exception(f"Failed to connect to DuckDB after {max_retries} attempts: {e}")
 
-    if conn is None:
-        raise last_error or Exception("Failed to connect to DuckDB")
+@contextmanager
+def get_read_connection(max_retries: int = 3, retry_delay: float = 0.5):
+    """
+    Get a pooled DuckDB connection for read-only queries (charts, catalog, exports).
 
+    Usage:
+        with get_read_connection() as conn:
+            df = conn.execute("SELECT * FROM data_catalog").fetchdf()
+    """
+    cursor, generation = _connection_manager.acquire_read_cursor(max_retries, retry_delay)
     try:
-        yield conn
+        yield cursor
+    except Exception:
+        cursor.close()
+        raise
+    else:
+        _connection_manager.release_read_cursor(cursor, generation)
     finally:
-        conn.close()
+        _connection_manager.release()
+
+
+def close_connections():
+    """Close the process-wide Historify connections (reopened on next use)."""
+    _connection_manager.close()
 
 
 def init_database():
@@ -239,6 +505,37 @@ def init_database():
             )
         """)
 
+        # Materialized rollups of 1m/D data (5m..1h, W, M) - see refresh_rollups()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS market_data_rollups (
+                symbol VARCHAR NOT NULL,
+                exchange VARCHAR NOT NULL,
+                interval VARCHAR NOT NULL,
+                timestamp BIGINT NOT NULL,
+                bucket_start BIGINT NOT NULL,
+                bucket_end BIGINT NOT NULL,
+                open DOUBLE NOT NULL,
+                high DOUBLE NOT NULL,
+                low DOUBLE NOT NULL,
+                close DOUBLE NOT NULL,
+                volume BIGINT NOT NULL,
+                oi BIGINT DEFAULT 0,
+                PRIMARY KEY (symbol, exchange, interval, timestamp)
+            )
+        """)
+
+        # Candle alignment each rollup was built with (missing row = not materialized)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS market_data_rollup_state (
+                symbol VARCHAR NOT NULL,
+                exchange VARCHAR NOT NULL,
+                interval VARCHAR NOT NULL,
+                anchor_seconds INTEGER NOT NULL,
+                refreshed_at TIMESTAMP DEFAULT current_timestamp,
+                PRIMARY KEY (symbol, exchange, interval)
+            )
+        """)
+
         # Create indexes for common query patterns
         conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_market_data_timestamp
@@ -279,7 +576,7 @@ def init_database():
 
 def get_watchlist() -> list[dict[str, Any]]:
     """Get all symbols in the watchlist."""
-    with get_connection() as conn:
+    with get_read_connection() as conn:
         result = conn.execute("""
             SELECT id, symbol, exchange, display_name, added_at
             FROM watchlist
@@ -443,10 +740,139 @@ def clear_watchlist() -> tuple[bool, str]:
 # =============================================================================
 
 
+# Columns stored per bar, in market_data order after (symbol, exchange, interval)
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume", "oi"]
+
+# Merge statement shared by DataFrame upserts and file imports. The source relation provides
+# OHLCV_COLUMNS; symbol, exchange and interval are bound as parameters rather than being
+# materialized as per-row columns.
+_MARKET_DATA_MERGE_SQL = """
+    INSERT INTO market_data
+    (symbol, exchange, interval, timestamp, open, high, low, close, volume, oi)
+    SELECT ?, ?, ?, timestamp, open, high, low, close, volume, oi
+    FROM {source}
+    ON CONFLICT (symbol, exchange, interval, timestamp) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        oi = EXCLUDED.oi
+"""
+
+
+def _ohlcv_to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Build an Arrow table of OHLCV_COLUMNS from a DataFrame without copying it.
+
+    Numeric columns are wrapped zero-copy; only a non-epoch timestamp column is converted.
+    """
+    columns = {}
+    for name in OHLCV_COLUMNS:
+        if name in df.columns:
+            columns[name] = df[name]
+        elif name == "oi":
+            columns[name] = pd.Series(0, index=df.index, dtype="int64")
+
+    # Ensure timestamp is integer (epoch seconds)
+    if columns["timestamp"].dtype != "int64":
+        columns["timestamp"] = pd.to_datetime(columns["timestamp"]).astype("int64") // 10**9
+
+    return pa.Table.from_pydict(
+        {name: pa.Array.from_pandas(series) for name, series in columns.items()}
+    )
+
+
+def _merge_arrow(conn, table: pa.Table | pa.RecordBatch, symbol: str, exchange: str, interval: str):
+    """Merge an Arrow table of OHLCV_COLUMNS into market_data with one INSERT ... ON CONFLICT."""
+    conn.register("_historify_ingest", table)
+    try:
+        conn.execute(
+            _MARKET_DATA_MERGE_SQL.format(source="_historify_ingest"),
+            [symbol.upper(), exchange.upper(), interval],
+        )
+    finally:
+        conn.unregister("_historify_ingest")
+
+
+def _update_catalog(conn, symbol: str, exchange: str, interval: str):
+    """Refresh the data_catalog entry for a symbol after its market data changed."""
+    # Check if exists first due to multiple constraints
+    existing = conn.execute(
+        """
+        SELECT id FROM data_catalog
+        WHERE symbol = ? AND exchange = ? AND interval = ?
+    """,
+        [symbol.upper(), exchange.upper(), interval],
+    ).fetchone()
+
+    if existing:
+        # Update existing record
+        conn.execute(
+            """
+            UPDATE data_catalog SET
+                first_timestamp = (SELECT MIN(timestamp) FROM market_data
+                                  WHERE symbol = ? AND exchange = ? AND interval = ?),
+                last_timestamp = (SELECT MAX(timestamp) FROM market_data
+                                 WHERE symbol = ? AND exchange = ? AND interval = ?),
+                record_count = (SELECT COUNT(*) FROM market_data
+                               WHERE symbol = ? AND exchange = ? AND interval = ?),
+                last_download_at = current_timestamp
+            WHERE symbol = ? AND exchange = ? AND interval = ?
+        """,
+            [
+                symbol.upper(),
+                exchange.upper(),
+                interval,
+                symbol.upper(),
+                exchange.upper(),
+                interval,
+                symbol.upper(),
+                exchange.upper(),
+                interval,
+                symbol.upper(),
+                exchange.upper(),
+                interval,
+            ],
+        )
+    else:
+        # Insert new record
+        next_id_result = conn.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM data_catalog"
+        ).fetchone()
+        next_id = next_id_result[0] if next_id_result else 1
+
+        conn.execute(
+            """
+            INSERT INTO data_catalog
+            (id, symbol, exchange, interval, first_timestamp, last_timestamp,
+             record_count, last_download_at)
+            SELECT
+                ?, ?, ?, ?,
+                MIN(timestamp), MAX(timestamp), COUNT(*),
+                current_timestamp
+            FROM market_data
+            WHERE symbol = ? AND exchange = ? AND interval = ?
+        """,
+            [
+                next_id,
+                symbol.upper(),
+                exchange.upper(),
+                interval,
+                symbol.upper(),
+                exchange.upper(),
+                interval,
+            ],
+        )
+
+
 def upsert_market_data(df: pd.DataFrame, symbol: str, exchange: str, interval: str) -> int:
     """
     Insert or update OHLCV data from a pandas DataFrame.
 
+    The DataFrame is handed to DuckDB as an Arrow table and merged in a single
+    INSERT ... ON CONFLICT statement.
+
     Args:
         df: DataFrame with columns: timestamp, open, high, low, close, volume, oi (optional)
         symbol: Trading symbol
@@ -460,121 +886,14 @@ def upsert_market_data(df: pd.DataFrame, symbol: str, exchange: str, interval: s
         return 0
 
     try:
-        # Prepare DataFrame
-        df = df.copy()
-        df["symbol"] = symbol.upper()
-        df["exchange"] = exchange.upper()
-        df["interval"] = interval
-
-        # Ensure required columns exist
-        if "oi" not in df.columns:
-            df["oi"] = 0
-
-        # Ensure timestamp is integer (epoch seconds)
-        if df["timestamp"].dtype != "int64":
-            df["timestamp"] = pd.to_datetime(df["timestamp"]).astype("int64") // 10**9
-
-        # Select only required columns in correct order
-        df = df[
-            [
-                "symbol",
-                "exchange",
-                "interval",
-                "timestamp",
-                "open",
-                "high",
-                "low",
-                "close",
-                "volume",
-                "oi",
-            ]
-        ]
+        table = _ohlcv_to_arrow(df)
 
         with get_connection() as conn:
-            # Use INSERT with ON CONFLICT for upsert (DuckDB requires explicit conflict target)
-            conn.execute("""
-                INSERT INTO market_data
-                (symbol, exchange, interval, timestamp, open, high, low, close, volume, oi)
-                SELECT symbol, exchange, interval, timestamp, open, high, low, close, volume, oi
-                FROM df
-                ON CONFLICT (symbol, exchange, interval, timestamp) DO UPDATE SET
-                    open = EXCLUDED.open,
-                    high = EXCLUDED.high,
-                    low = EXCLUDED.low,
-                    close = EXCLUDED.close,
-                    volume = EXCLUDED.volume,
-                    oi = EXCLUDED.oi
-            """)
-
-            # Update catalog - check if exists first due to multiple constraints
-            existing = conn.execute(
-                """
-                SELECT id FROM data_catalog
-                WHERE symbol = ? AND exchange = ? AND interval = ?
-            """,
-                [symbol.upper(), exchange.upper(), interval],
-            ).fetchone()
-
-            if existing:
-                # Update existing record
-                conn.execute(
-                    """
-                    UPDATE data_catalog SET
-                        first_timestamp = (SELECT MIN(timestamp) FROM market_data
-                                          WHERE symbol = ? AND exchange = ? AND interval = ?),
-                        last_timestamp = (SELECT MAX(timestamp) FROM market_data
-                                         WHERE symbol = ? AND exchange = ? AND interval = ?),
-                        record_count = (SELECT COUNT(*) FROM market_data
-                                       WHERE symbol = ? AND exchange = ? AND interval = ?),
-                        last_download_at = current_timestamp
-                    WHERE symbol = ? AND exchange = ? AND interval = ?
-                """,
-                    [
-                        symbol.upper(),
-                        exchange.upper(),
-                        interval,
-                        symbol.upper(),
-                        exchange.upper(),
-                        interval,
-                        symbol.upper(),
-                        exchange.upper(),
-                        interval,
-                        symbol.upper(),
-                        exchange.upper(),
-                        interval,
-                    ],
-                )
-            else:
-                # Insert new record
-                next_id_result = conn.execute(
-                    "SELECT COALESCE(MAX(id), 0) + 1 FROM data_catalog"
-                ).fetchone()
-                next_id = next_id_result[0] if next_id_result else 1
-
-                conn.execute(
-                    """
-                    INSERT INTO data_catalog
-                    (id, symbol, exchange, interval, first_timestamp, last_timestamp,
-                     record_count, last_download_at)
-                    SELECT
-                        ?, ?, ?, ?,
-                        MIN(timestamp), MAX(timestamp), COUNT(*),
-                        current_timestamp
-                    FROM market_data
-                    WHERE symbol = ? AND exchange = ? AND interval = ?
-                """,
-                    [
-                        next_id,
-                        symbol.upper(),
-                        exchange.upper(),
-                        interval,
-                        symbol.upper(),
-                        exchange.upper(),
-                        interval,
-                    ],
-                )
+            _merge_arrow(conn, table, symbol, exchange, interval)
+            _update_catalog(conn, symbol, exchange, interval)
 
         logger.info(f"Upserted {len(df)} records for {symbol}:{exchange}:{interval}")
+        _refresh_rollups_for_table(table, symbol, exchange, interval)
         return len(df)
 
     except Exception as e:
@@ -582,6 +901,64 @@ def upsert_market_data(df: pd.DataFrame, symbol: str, exchange: str, interval: s
         raise
 
 
+def upsert_market_data_batch(frames: list[tuple[pd.DataFrame, str, str, str]]) -> int:
+    """
+    Insert or update OHLCV data for several symbols in one transaction.
+
+    Each (df, symbol, exchange, interval) entry is merged like upsert_market_data, but all
+    merges and catalog updates commit together; if any of them fails, none is stored.
+
+    Args:
+        frames: List of (DataFrame, symbol, exchange, interval)
+
+    Returns:
+        Number of records inserted/updated
+    """
+    tables = [
+        (_ohlcv_to_arrow(df), symbol, exchange, interval)
+        for df, symbol, exchange, interval in frames
+        if not df.empty
+    ]
+    if not tables:
+        return 0
+
+    try:
+        with get_connection() as conn:
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                for table, symbol, exchange, interval in tables:
+                    _merge_arrow(conn, table, symbol, exchange, interval)
+                    _update_catalog(conn, symbol, exchange, interval)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        records = sum(table.num_rows for table, _, _, _ in tables)
+        logger.info(f"Upserted {records} records for {len(tables)} symbol intervals")
+
+        for table, symbol, exchange, interval in tables:
+            _refresh_rollups_for_table(table, symbol, exchange, interval)
+        return records
+
+    except Exception as e:
+        logger.exception(f"Error upserting market data batch: {e}")
+        raise
+
+
+def _refresh_rollups_for_table(table: pa.Table, symbol: str, exchange: str, interval: str):
+    """Refresh the rollups covering an upserted Arrow table of OHLCV_COLUMNS."""
+    if HISTORIFY_ENABLE_ROLLUPS and interval in ROLLUP_INTERVALS.values():
+        timestamps = table.column("timestamp")
+        _refresh_rollups_after_upsert(
+            symbol,
+            exchange,
+            interval,
+            pc.min(timestamps).as_py(),
+            pc.max(timestamps).as_py(),
+        )
+
+
 # Storage intervals - only these are physically stored
 STORAGE_INTERVALS = {"1m", "D"}
 
@@ -752,6 +1129,12 @@ def get_ohlcv(
         DataFrame with columns: timestamp, open, high, low, close, volume, oi
     """
     try:
+        # Serve common intervals from the materialized rollups when available
+        if HISTORIFY_ENABLE_ROLLUPS and interval in ROLLUP_INTERVALS:
+            result = _get_rollup_ohlcv(symbol, exchange, interval, start_timestamp, end_timestamp)
+            if result is not None:
+                return result
+
         # Check if this is a daily-aggregated interval (W, MO, Q, Y)
         if is_daily_aggregated_interval(interval):
             return _get_daily_aggregated_ohlcv(
@@ -790,7 +1173,7 @@ def get_ohlcv(
 
         query += " ORDER BY timestamp ASC"
 
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             result = conn.execute(query, params).fetchdf()
 
         return result
@@ -844,6 +1227,39 @@ def _get_market_open_seconds(exchange: str) -> int:
     return EXCHANGE_MARKET_OPEN_SECONDS.get(exchange.upper(), 33300)
 
 
+def _intraday_bucket_sql(market_open_seconds: int, interval_seconds: int) -> str:
+    """
+    SQL expression mapping a 1m `timestamp` to the start of its candle.
+    Aligns candle boundaries to exchange market open time.
+    """
+    # IST timezone offset from UTC (5 hours 30 minutes = 19800 seconds)
+    # We need this because timestamps are in UTC epoch
+    ist_offset = 19800
+
+    # Candle alignment algorithm:
+    # 1. Convert UTC timestamp to IST by adding ist_offset
+    # 2. Get seconds from midnight: (timestamp + ist_offset) % 86400
+    # 3. Get trading seconds: seconds_from_midnight - market_open_seconds
+    # 4. Calculate bucket: (trading_seconds / interval_seconds) * interval_seconds
+    # 5. Candle start = day_start + market_open_seconds + bucket
+    #
+    # In SQL:
+    # day_start_utc = ((timestamp + ist_offset) / 86400) * 86400 - ist_offset
+    # seconds_from_midnight_ist = (timestamp + ist_offset) % 86400
+    # trading_seconds = seconds_from_midnight_ist - market_open_seconds
+    # bucket_offset = (trading_seconds / interval_seconds) * interval_seconds
+    # candle_timestamp = day_start_utc + market_open_seconds + bucket_offset
+
+    # Use FLOOR() to ensure proper integer division for candle alignment
+    # Without FLOOR(), floating-point division can cause incorrect bucketing
+    return (
+        f"(FLOOR((timestamp + {ist_offset}) / 86400) * 86400 - {ist_offset}) + "
+        f"{market_open_seconds} + "
+        f"FLOOR((((timestamp + {ist_offset}) % 86400) - {market_open_seconds}) / {interval_seconds})"
+        f" * {interval_seconds}"
+    )
+
+
 def _get_aggregated_ohlcv(
     symbol: str,
     exchange: str,
@@ -886,32 +1302,10 @@ def _get_aggregated_ohlcv(
         # Get market open time for this exchange (in seconds from midnight)
         market_open_seconds = _get_market_open_seconds(exchange)
 
-        # IST timezone offset from UTC (5 hours 30 minutes = 19800 seconds)
-        # We need this because timestamps are in UTC epoch
-        ist_offset = 19800
-
-        # Candle alignment algorithm:
-        # 1. Convert UTC timestamp to IST by adding ist_offset
-        # 2. Get seconds from midnight: (timestamp + ist_offset) % 86400
-        # 3. Get trading seconds: seconds_from_midnight - market_open_seconds
-        # 4. Calculate bucket: (trading_seconds / interval_seconds) * interval_seconds
-        # 5. Candle start = day_start + market_open_seconds + bucket
-        #
-        # In SQL:
-        # day_start_utc = ((timestamp + ist_offset) / 86400) * 86400 - ist_offset
-        # seconds_from_midnight_ist = (timestamp + ist_offset) % 86400
-        # trading_seconds = seconds_from_midnight_ist - market_open_seconds
-        # bucket_offset = (trading_seconds / interval_seconds) * interval_seconds
-        # candle_timestamp = day_start_utc + market_open_seconds + bucket_offset
-
-        # Use FLOOR() to ensure proper integer division for candle alignment
-        # Without FLOOR(), floating-point division can cause incorrect bucketing
+        bucket_expr = _intraday_bucket_sql(market_open_seconds, interval_seconds)
         query = f"""
             SELECT
-                (FLOOR((timestamp + {ist_offset}) / 86400) * 86400 - {ist_offset}) +
-                {market_open_seconds} +
-                FLOOR((((timestamp + {ist_offset}) % 86400) - {market_open_seconds}) / {interval_seconds}) * {interval_seconds}
-                as timestamp,
+                {bucket_expr} as timestamp,
                 FIRST(open ORDER BY timestamp) as open,
                 MAX(high) as high,
                 MIN(low) as low,
@@ -932,13 +1326,11 @@ def _get_aggregated_ohlcv(
             params.append(end_timestamp)
 
         query += f"""
-            GROUP BY (FLOOR((timestamp + {ist_offset}) / 86400) * 86400 - {ist_offset}) +
-                     {market_open_seconds} +
-                     FLOOR((((timestamp + {ist_offset}) % 86400) - {market_open_seconds}) / {interval_seconds}) * {interval_seconds}
+            GROUP BY {bucket_expr}
             ORDER BY timestamp ASC
         """
 
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             result = conn.execute(query, params).fetchdf()
 
         return result
@@ -948,6 +1340,66 @@ def _get_aggregated_ohlcv(
         return pd.DataFrame()
 
 
+def _daily_group_sql(parsed: dict[str, Any]) -> str | None:
+    """
+    SQL expression grouping D `timestamp` values into W/M/Q/Y periods (IST calendar).
+    Returns None for interval types that are not built from daily data.
+    """
+    interval_type = parsed["type"]
+    interval_value = parsed.get("value", 1)
+
+    # IST timezone offset from UTC (5 hours 30 minutes = 19800 seconds)
+    ist_offset = 19800
+
+    # Build the GROUP BY expression based on interval type
+    if interval_type == "weekly":
+        # Group by ISO week number, adjusting for multi-week intervals
+        # ISO week starts on Monday
+        if interval_value == 1:
+            group_expr = f"DATE_TRUNC('week', to_timestamp(timestamp + {ist_offset}))"
+        else:
+            # For multi-week intervals, group weeks together
+            group_expr = f"""
+                DATE_TRUNC('week', to_timestamp(timestamp + {ist_offset})) -
+                INTERVAL ((EXTRACT(WEEK FROM to_timestamp(timestamp + {ist_offset})) - 1) % {interval_value}) WEEK
+            """
+    elif interval_type == "monthly":
+        # Group by calendar month
+        if interval_value == 1:
+            group_expr = f"DATE_TRUNC('month', to_timestamp(timestamp + {ist_offset}))"
+        else:
+            # For multi-month intervals, group months together
+            group_expr = f"""
+                DATE_TRUNC('month', to_timestamp(timestamp + {ist_offset})) -
+                INTERVAL ((EXTRACT(MONTH FROM to_timestamp(timestamp + {ist_offset})) - 1) % {interval_value}) MONTH
+            """
+    elif interval_type == "quarterly":
+        # Group by calendar quarter (3 months)
+        months = parsed.get("months", 3)
+        if months == 3:
+            group_expr = f"DATE_TRUNC('quarter', to_timestamp(timestamp + {ist_offset}))"
+        else:
+            # For multi-quarter intervals
+            group_expr = f"""
+                DATE_TRUNC('quarter', to_timestamp(timestamp + {ist_offset})) -
+                INTERVAL ((EXTRACT(QUARTER FROM to_timestamp(timestamp + {ist_offset})) - 1) % {interval_value}) QUARTER
+            """
+    elif interval_type == "yearly":
+        # Group by calendar year
+        if interval_value == 1:
+            group_expr = f"DATE_TRUNC('year', to_timestamp(timestamp + {ist_offset}))"
+        else:
+            # For multi-year intervals
+            group_expr = f"""
+                DATE_TRUNC('year', to_timestamp(timestamp + {ist_offset})) -
+                INTERVAL ((EXTRACT(YEAR FROM to_timestamp(timestamp + {ist_offset})) % {interval_value})) YEAR
+            """
+    else:
+        return None
+
+    return group_expr
+
+
 def _get_daily_aggregated_ohlcv(
     symbol: str,
     exchange: str,
@@ -980,57 +1432,9 @@ def _get_daily_aggregated_ohlcv(
             logger.error(f"Cannot parse interval: {target_interval}")
             return pd.DataFrame()
 
-        interval_type = parsed["type"]
-        interval_value = parsed.get("value", 1)
-
-        # IST timezone offset from UTC (5 hours 30 minutes = 19800 seconds)
-        ist_offset = 19800
-
-        # Build the GROUP BY expression based on interval type
-        if interval_type == "weekly":
-            # Group by ISO week number, adjusting for multi-week intervals
-            # ISO week starts on Monday
-            if interval_value == 1:
-                group_expr = f"DATE_TRUNC('week', to_timestamp(timestamp + {ist_offset}))"
-            else:
-                # For multi-week intervals, group weeks together
-                group_expr = f"""
-                    DATE_TRUNC('week', to_timestamp(timestamp + {ist_offset})) -
-                    INTERVAL ((EXTRACT(WEEK FROM to_timestamp(timestamp + {ist_offset})) - 1) % {interval_value}) WEEK
-                """
-        elif interval_type == "monthly":
-            # Group by calendar month
-            if interval_value == 1:
-                group_expr = f"DATE_TRUNC('month', to_timestamp(timestamp + {ist_offset}))"
-            else:
-                # For multi-month intervals, group months together
-                group_expr = f"""
-                    DATE_TRUNC('month', to_timestamp(timestamp + {ist_offset})) -
-                    INTERVAL ((EXTRACT(MONTH FROM to_timestamp(timestamp + {ist_offset})) - 1) % {interval_value}) MONTH
-                """
-        elif interval_type == "quarterly":
-            # Group by calendar quarter (3 months)
-            months = parsed.get("months", 3)
-            if months == 3:
-                group_expr = f"DATE_TRUNC('quarter', to_timestamp(timestamp + {ist_offset}))"
-            else:
-                # For multi-quarter intervals
-                group_expr = f"""
-                    DATE_TRUNC('quarter', to_timestamp(timestamp + {ist_offset})) -
-                    INTERVAL ((EXTRACT(QUARTER FROM to_timestamp(timestamp + {ist_offset})) - 1) % {interval_value}) QUARTER
-                """
-        elif interval_type == "yearly":
-            # Group by calendar year
-            if interval_value == 1:
-                group_expr = f"DATE_TRUNC('year', to_timestamp(timestamp + {ist_offset}))"
-            else:
-                # For multi-year intervals
-                group_expr = f"""
-                    DATE_TRUNC('year', to_timestamp(timestamp + {ist_offset})) -
-                    INTERVAL ((EXTRACT(YEAR FROM to_timestamp(timestamp + {ist_offset})) % {interval_value})) YEAR
-                """
-        else:
-            logger.error(f"Unsupported interval type for daily aggregation: {interval_type}")
+        group_expr = _daily_group_sql(parsed)
+        if group_expr is None:
+            logger.error(f"Unsupported interval type for daily aggregation: {parsed['type']}")
             return pd.DataFrame()
 
         # Build the query - aggregate from D (daily) data
@@ -1063,7 +1467,7 @@ def _get_daily_aggregated_ohlcv(
             ORDER BY timestamp ASC
         """
 
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             result = conn.execute(query, params).fetchdf()
 
         return result
@@ -1073,6 +1477,328 @@ def _get_daily_aggregated_ohlcv(
         return pd.DataFrame()
 
 
+# =============================================================================
+# Rollup Tables
+# =============================================================================
+
+# Materialize the common chart intervals so opening a chart does not rescan the base table.
+# Rollups are refreshed for the touched tail after every upsert; get_ohlcv falls back to
+# on-the-fly aggregation for other intervals and for symbols without rollups yet.
+HISTORIFY_ENABLE_ROLLUPS = os.getenv("HISTORIFY_ENABLE_ROLLUPS", "true").lower() == "true"
+
+# Rollup interval -> storage interval it is aggregated from
+ROLLUP_INTERVALS = {"5m": "1m", "15m": "1m", "30m": "1m", "1h": "1m", "W": "D", "M": "D"}
+
+
+def _rollup_bucket_sql(interval: str, exchange: str) -> tuple[str, str, str, int]:
+    """
+    SQL expressions for a rollup interval in terms of the base `timestamp` column.
+
+    Returns:
+        Tuple of (label, bucket_start, bucket_end, anchor) where label is the candle
+        timestamp get_ohlcv returns, [bucket_start, bucket_end) the epoch range of base rows
+        in the candle, and anchor the alignment the rollup was built with.
+    """
+    if ROLLUP_INTERVALS[interval] == "1m":
+        market_open_seconds = _get_market_open_seconds(exchange)
+        interval_seconds = INTERVAL_MINUTES[interval] * 60
+        label = _intraday_bucket_sql(market_open_seconds, interval_seconds)
+        return label, label, f"{label} + {interval_seconds}", market_open_seconds
+
+    # W/M labels are the IST calendar date of the period start, expressed as a UTC epoch
+    ist_offset = 19800
+    group_expr = _daily_group_sql(parse_interval(interval))
+    unit = "WEEK" if interval == "W" else "MONTH"
+    return (
+        f"EPOCH({group_expr})",
+        f"EPOCH({group_expr}) - {ist_offset}",
+        f"EPOCH({group_expr} + INTERVAL 1 {unit}) - {ist_offset}",
+        0,
+    )
+
+
+def refresh_rollups(
+    symbol: str,
+    exchange: str,
+    base_interval: str,
+    start_timestamp: int | None = None,
+    end_timestamp: int | None = None,
+) -> int:
+    """
+    Refresh the rollups built from one symbol's base interval.
+
+    Only candles overlapping [start_timestamp, end_timestamp] are rebuilt. The full history
+    is rebuilt when no range is given, when the symbol has no rollup yet, or when the
+    exchange's market open time changed since the rollup was built.
+
+    Args:
+        symbol: Trading symbol
+        exchange: Exchange code
+        base_interval: Storage interval that changed (1m or D)
+        start_timestamp: First changed base timestamp (optional)
+        end_timestamp: Last changed base timestamp (optional)
+
+    Returns:
+        Number of rollup candles written
+    """
+    symbol = symbol.upper()
+    exchange = exchange.upper()
+    written = 0
+
+    for interval, source in ROLLUP_INTERVALS.items():
+        if source != base_interval:
+            continue
+
+        label, bucket_start, bucket_end, anchor = _rollup_bucket_sql(interval, exchange)
+        key = [symbol, exchange, interval]
+
+        with get_connection() as conn:
+            state = conn.execute(
+                """
+                SELECT anchor_seconds FROM market_data_rollup_state
+                WHERE symbol = ? AND exchange = ? AND interval = ?
+            """,
+                key,
+            ).fetchone()
+            incremental = (
+                state is not None
+                and state[0] == anchor
+                and start_timestamp is not None
+                and end_timestamp is not None
+            )
+
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                base_filter = ""
+                params = key + [symbol, exchange, source]
+                if incremental:
+                    # Candles touched by the changed rows and the base range they cover
+                    first_label, first_start = conn.execute(
+                        f"SELECT {label}, {bucket_start} FROM (SELECT ?::BIGINT AS timestamp)",
+                        [start_timestamp],
+                    ).fetchone()
+                    last_label, last_end = conn.execute(
+                        f"SELECT {label}, {bucket_end} FROM (SELECT ?::BIGINT AS timestamp)",
+                        [end_timestamp],
+                    ).fetchone()
+                    conn.execute(
+                        """
+                        DELETE FROM market_data_rollups
+                        WHERE symbol = ? AND exchange = ? AND interval = ?
+                          AND timestamp BETWEEN ? AND ?
+                    """,
+                        key + [int(first_label), int(last_label)],
+                    )
+                    base_filter = "AND timestamp >= ? AND timestamp < ?"
+                    params += [int(first_start), int(last_end)]
+                else:
+                    conn.execute(
+                        """
+                        DELETE FROM market_data_rollups
+                        WHERE symbol = ? AND exchange = ? AND interval = ?
+                    """,
+                        key,
+                    )
+
+                written += conn.execute(
+                    f"""
+                    INSERT INTO market_data_rollups
+                    (symbol, exchange, interval, timestamp, bucket_start, bucket_end,
+                     open, high, low, close, volume, oi)
+                    SELECT
+                        ?, ?, ?,
+                        CAST({label} AS BIGINT),
+                        CAST({bucket_start} AS BIGINT),
+                        CAST({bucket_end} AS BIGINT),
+                        FIRST(open ORDER BY timestamp),
+                        MAX(high),
+                        MIN(low),
+                        LAST(close ORDER BY timestamp),
+                        SUM(volume),
+                        LAST(oi ORDER BY timestamp)
+                    FROM market_data
+                    WHERE symbol = ? AND exchange = ? AND interval = ? {base_filter}
+                    GROUP BY {label}, {bucket_start}, {bucket_end}
+                """,
+                    params,
+                ).fetchone()[0]
+
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO market_data_rollup_state
+                    (symbol, exchange, interval, anchor_seconds, refreshed_at)
+                    VALUES (?, ?, ?, ?, current_timestamp)
+                """,
+                    key + [anchor],
+                )
+                conn.execute("COMMIT")
+
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    return written
+
+
+def _refresh_rollups_after_upsert(
+    symbol: str, exchange: str, base_interval: str, start_timestamp: int, end_timestamp: int
+):
+    """Refresh rollups for an upserted range; failures drop the rollup instead of raising."""
+    try:
+        refresh_rollups(symbol, exchange, base_interval, start_timestamp, end_timestamp)
+    except Exception as e:
+        # Reads fall back to on-the-fly aggregation until the next successful refresh
+        logger.exception(f"Error refreshing rollups for {symbol}:{exchange}:{base_interval}: {e}")
+        try:
+            with get_connection() as conn:
+                _delete_rollups(conn, symbol, exchange, base_interval)
+        except Exception:
+            pass
+
+
+def rebuild_rollups(symbol: str | None = None, exchange: str | None = None) -> int:
+    """
+    Rebuild rollups from scratch, e.g. for data stored before rollups were enabled.
+
+    Args:
+        symbol: Limit to one symbol (optional)
+        exchange: Limit to one exchange (optional)
+
+    Returns:
+        Number of rollup candles written
+    """
+    conditions = ["interval IN ('1m', 'D')"]
+    params = []
+    if symbol:
+        conditions.append("symbol = ?")
+        params.append(symbol.upper())
+    if exchange:
+        conditions.append("exchange = ?")
+        params.append(exchange.upper())
+
+    with get_read_connection() as conn:
+        entries = conn.execute(
+            f"SELECT symbol, exchange, interval FROM data_catalog WHERE {' AND '.join(conditions)}",
+            params,
+        ).fetchall()
+
+    written = 0
+    for entry_symbol, entry_exchange, base_interval in entries:
+        written += refresh_rollups(entry_symbol, entry_exchange, base_interval)
+
+    logger.info(f"Rebuilt {written} rollup candles for {len(entries)} catalog entries")
+    return written
+
+
+def _delete_rollups(conn, symbol: str, exchange: str, base_interval: str | None = None):
+    """Delete rollups (and their state) built from a symbol's base data."""
+    intervals = [
+        interval
+        for interval, source in ROLLUP_INTERVALS.items()
+        if base_interval is None or source == base_interval
+    ]
+    if not intervals:
+        return
+
+    placeholders = ", ".join("?" for _ in intervals)
+    for table in ("market_data_rollups", "market_data_rollup_state"):
+        conn.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE symbol = ? AND exchange = ? AND interval IN ({placeholders})
+        """,
+            [symbol.upper(), exchange.upper()] + intervals,
+        )
+
+
+def _get_rollup_ohlcv(
+    symbol: str,
+    exchange: str,
+    interval: str,
+    start_timestamp: int | None = None,
+    end_timestamp: int | None = None,
+) -> pd.DataFrame | None:
+    """
+    Read a rollup interval from the rollup table.
+
+    Candles that lie entirely inside the requested range come from the rollup table. Rows
+    at the range edges that fall in partially covered candles are aggregated on-the-fly,
+    so the result matches _get_aggregated_ohlcv/_get_daily_aggregated_ohlcv exactly.
+
+    Returns:
+        DataFrame, or None if the rollup is missing or stale and the caller should
+        aggregate from base data instead
+    """
+    try:
+        symbol = symbol.upper()
+        exchange = exchange.upper()
+        _, _, _, anchor = _rollup_bucket_sql(interval, exchange)
+
+        query = """
+            SELECT
+                CAST(timestamp AS DOUBLE) as timestamp,
+                open, high, low, close,
+                CAST(volume AS HUGEINT) as volume,
+                oi, bucket_start, bucket_end
+            FROM market_data_rollups
+            WHERE symbol = ? AND exchange = ? AND interval = ?
+        """
+        params = [symbol, exchange, interval]
+
+        if start_timestamp:
+            query += " AND bucket_start >= ?"
+            params.append(start_timestamp)
+
+        if end_timestamp:
+            query += " AND bucket_end - 1 <= ?"
+            params.append(end_timestamp)
+
+        query += " ORDER BY timestamp ASC"
+
+        with get_read_connection() as conn:
+            state = conn.execute(
+                """
+                SELECT anchor_seconds FROM market_data_rollup_state
+                WHERE symbol = ? AND exchange = ? AND interval = ?
+            """,
+                [symbol, exchange, interval],
+            ).fetchone()
+            if state is None or state[0] != anchor:
+                return None
+
+            result = conn.execute(query, params).fetchdf()
+
+        if result.empty:
+            # Range narrower than one candle (or no data) - aggregate on-the-fly
+            return None
+
+        first_start = int(result["bucket_start"].iloc[0])
+        last_end = int(result["bucket_end"].iloc[-1])
+        result = result.drop(columns=["bucket_start", "bucket_end"])
+
+        aggregate = (
+            _get_aggregated_ohlcv
+            if ROLLUP_INTERVALS[interval] == "1m"
+            else _get_daily_aggregated_ohlcv
+        )
+        parts = []
+        if start_timestamp and start_timestamp < first_start:
+            parts.append(aggregate(symbol, exchange, interval, start_timestamp, first_start - 1))
+        parts.append(result)
+        if end_timestamp and last_end <= end_timestamp:
+            parts.append(aggregate(symbol, exchange, interval, last_end, end_timestamp))
+
+        parts = [part for part in parts if not part.empty]
+        if len(parts) == 1:
+            return result
+
+        return pd.concat(parts, ignore_index=True).sort_values("timestamp", ignore_index=True)
+
+    except Exception as e:
+        logger.exception(f"Error reading {interval} rollup, aggregating on-the-fly: {e}")
+        return None
+
+
 def get_data_catalog() -> list[dict[str, Any]]:
     """
     Get summary of all available data in the database.
@@ -1081,7 +1807,7 @@ def get_data_catalog() -> list[dict[str, Any]]:
         List of dictionaries with symbol, exchange, interval, and data range info
     """
     try:
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             result = conn.execute("""
                 SELECT
                     symbol, exchange, interval,
@@ -1109,7 +1835,7 @@ def get_available_symbols() -> list[dict[str, str]]:
         List of dictionaries with symbol and exchange
     """
     try:
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             result = conn.execute("""
                 SELECT DISTINCT symbol, exchange
                 FROM data_catalog
@@ -1135,7 +1861,7 @@ def get_data_range(symbol: str, exchange: str, interval: str) -> dict[str, Any]
         or None if no data exists
     """
     try:
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             result = conn.execute(
                 """
                 SELECT first_timestamp, last_timestamp, record_count
@@ -1187,6 +1913,7 @@ def delete_market_data(symbol: str, exchange: str, interval: str | None = None)
                 """,
                     [symbol.upper(), exchange.upper(), interval],
                 )
+                _delete_rollups(conn, symbol, exchange, interval)
                 msg = f"Deleted {symbol}:{exchange}:{interval} data"
             else:
                 conn.execute(
@@ -1203,6 +1930,7 @@ def delete_market_data(symbol: str, exchange: str, interval: str | None = None)
                 """,
                     [symbol.upper(), exchange.upper()],
                 )
+                _delete_rollups(conn, symbol, exchange)
                 msg = f"Deleted all {symbol}:{exchange} data"
 
         logger.info(msg)
@@ -1282,7 +2010,7 @@ def export_to_csv(
         if not abs_output.startswith(os.path.abspath(temp_dir)):
             return False, "Invalid output path: must be within temp directory"
 
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             # Always use parameterized query and pandas to_csv for safety
             df = conn.execute(query, params).fetchdf()
             df.to_csv(output_path, index=False)
@@ -1337,12 +2065,13 @@ def get_database_stats() -> dict[str, Any]:
         db_path = get_db_path()
         db_size = os.path.getsize(db_path) if os.path.exists(db_path) else 0
 
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             total_records = conn.execute("SELECT COUNT(*) FROM market_data").fetchone()[0]
             total_symbols = conn.execute(
                 "SELECT COUNT(DISTINCT symbol || exchange) FROM market_data"
             ).fetchone()[0]
             watchlist_count = conn.execute("SELECT COUNT(*) FROM watchlist").fetchone()[0]
+            rollup_records = conn.execute("SELECT COUNT(*) FROM market_data_rollups").fetchone()[0]
 
         return {
             "database_path": db_path,
@@ -1350,6 +2079,8 @@ def get_database_stats() -> dict[str, Any]:
             "total_records": total_records,
             "total_symbols": total_symbols,
             "watchlist_count": watchlist_count,
+            "rollup_records": rollup_records,
+            "connection_pool": _connection_manager.get_stats(),
         }
 
     except Exception as e:
@@ -1360,6 +2091,8 @@ def get_database_stats() -> dict[str, Any]:
             "total_records": 0,
             "total_symbols": 0,
             "watchlist_count": 0,
+            "rollup_records": 0,
+            "connection_pool": _connection_manager.get_stats(),
         }
 
 
@@ -1413,6 +2146,281 @@ def get_supported_intervals(api_key: str) -> list[str]:
 # =============================================================================
 
 
+# Rows per Arrow batch when streaming CSV/Parquet imports from disk
+HISTORIFY_IMPORT_BATCH_ROWS = int(os.getenv("HISTORIFY_IMPORT_BATCH_ROWS", "250000"))
+
+# Datetime strings ending in a UTC offset ('Z', '+05:30') are parsed as TIMESTAMPTZ
+_UTC_OFFSET_PATTERN = r"\d:\d\d(:\d\d(\.\d+)?)?\s*(Z|[+-]\d\d:?\d\d)$"
+
+
+class _UnsupportedTimestampFormat(Exception):
+    """Raised when streamed timestamps need pandas' more lenient datetime parsing."""
+
+
+def _epoch_from_number_sql(expr: str) -> str:
+    """SQL for epoch seconds from a numeric timestamp in seconds or milliseconds."""
+    # Epoch milliseconds are > 1e12 (after year 2001 in ms)
+    # Epoch seconds are typically between 1e9 and 2e9 (1970-2033)
+    return f"CAST(TRUNC(CASE WHEN {expr} > 1e12 THEN {expr} / 1000 ELSE {expr} END) AS BIGINT)"
+
+
+def _epoch_from_string_sql(expr: str, allow_numeric: bool = True) -> str:
+    """SQL for epoch seconds from a datetime string (naive strings are read as UTC)."""
+    parsed = (
+        f"CASE WHEN regexp_matches({expr}, '{_UTC_OFFSET_PATTERN}') "
+        f"THEN EPOCH(TRY_CAST({expr} AS TIMESTAMPTZ)) "
+        f"ELSE EPOCH(TRY_CAST({expr} AS TIMESTAMP)) END"
+    )
+    parsed = f"CAST(FLOOR({parsed}) AS BIGINT)"
+    if not allow_numeric:
+        return parsed
+    number = f"TRY_CAST({expr} AS DOUBLE)"
+    return f"CASE WHEN {number} IS NOT NULL THEN {_epoch_from_number_sql(number)} ELSE {parsed} END"
+
+
+def _normalized_ohlcv_sql(schema: pa.Schema, source: str) -> str:
+    """
+    Build a SELECT over `source` that yields OHLCV_COLUMNS plus a `valid` flag and a
+    `bad_timestamp` flag, mirroring the normalization of the pandas import path.
+
+    Column names are matched case-insensitively. Accepts the same column sets as the
+    importers: timestamp, datetime, or date (+ time).
+
+    Raises:
+        ValueError: If the timestamp or required OHLCV columns are missing
+    """
+    columns = {field.name.lower().strip(): field for field in schema}
+
+    def ref(name: str) -> str:
+        return '"' + columns[name].name.replace('"', '""') + '"'
+
+    # Handle different timestamp formats
+    if "timestamp" in columns or "datetime" in columns:
+        name = "timestamp" if "timestamp" in columns else "datetime"
+        field_type = columns[name].type
+        raw = ref(name)
+        if pa.types.is_integer(field_type) or pa.types.is_floating(field_type):
+            timestamp = _epoch_from_number_sql(raw)
+        elif pa.types.is_timestamp(field_type) or pa.types.is_date(field_type):
+            timestamp = f"CAST(FLOOR(EPOCH(CAST({raw} AS TIMESTAMP))) AS BIGINT)"
+            if pa.types.is_timestamp(field_type) and field_type.tz:
+                timestamp = f"CAST(FLOOR(EPOCH({raw})) AS BIGINT)"
+        else:
+            timestamp = _epoch_from_string_sql(f"CAST({raw} AS VARCHAR)")
+    elif "date" in columns:
+        raw = ref("date")
+        text = f"CAST({raw} AS VARCHAR)"
+        if "time" in columns:
+            text = f"{text} || ' ' || CAST({ref('time')} AS VARCHAR)"
+        timestamp = _epoch_from_string_sql(text, allow_numeric=False)
+    else:
+        raise ValueError("must have 'timestamp', 'datetime', or 'date' column")
+
+    # Validate required OHLCV columns
+    required_cols = ["open", "high", "low", "close", "volume"]
+    missing_cols = [c for c in required_cols if c not in columns]
+    if missing_cols:
+        raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
+
+    prices = {c: f"TRY_CAST({ref(c)} AS DOUBLE)" for c in ("open", "high", "low", "close")}
+    volume = f"COALESCE(CAST(TRUNC(TRY_CAST({ref('volume')} AS DOUBLE)) AS BIGINT), 0)"
+    oi = (
+        f"COALESCE(CAST(TRUNC(TRY_CAST({ref('oi')} AS DOUBLE)) AS BIGINT), 0)"
+        if "oi" in columns
+        else "0"
+    )
+
+    return f"""
+        SELECT *,
+            timestamp IS NOT NULL AND open IS NOT NULL AND high IS NOT NULL
+                AND low IS NOT NULL AND close IS NOT NULL AS valid
+        FROM (
+            SELECT
+                {timestamp} AS timestamp,
+                {prices["open"]} AS open,
+                {prices["high"]} AS high,
+                {prices["low"]} AS low,
+                {prices["close"]} AS close,
+                {volume} AS volume,
+                {oi} AS oi,
+                {raw} IS NOT NULL AND {timestamp} IS NULL AS bad_timestamp
+            FROM {source}
+        )
+    """
+
+
+def _import_arrow_batches(
+    schema: pa.Schema, batches, symbol: str, exchange: str, interval: str
+) -> tuple[int, int]:
+    """
+    Normalize and merge a stream of Arrow record batches, one INSERT ... ON CONFLICT each.
+
+    Memory use is bounded by the batch size, so large files are never fully loaded.
+
+    Returns:
+        Tuple of (records imported, rows skipped due to invalid data)
+
+    Raises:
+        ValueError: If required columns are missing
+        _UnsupportedTimestampFormat: If timestamps need pandas parsing
+    """
+    normalized = _normalized_ohlcv_sql(schema, "_historify_import")
+    merge_sql = _MARKET_DATA_MERGE_SQL.format(source=f"({normalized}) AS normalized WHERE valid")
+    params = [symbol.upper(), exchange.upper(), interval]
+
+    imported = 0
+    skipped = 0
+    first_ts = None
+    last_ts = None
+
+    with get_connection() as conn:
+        for batch in batches:
+            if batch.num_rows == 0:
+                continue
+
+            # A registered RecordBatch can be scanned only once; a Table can be re-scanned
+            conn.register("_historify_import", pa.Table.from_batches([batch]))
+            try:
+                rows, valid, bad_timestamps, min_ts, max_ts = conn.execute(f"""
+                    SELECT COUNT(*), COUNT(*) FILTER (valid),
+                        COUNT(*) FILTER (bad_timestamp),
+                        MIN(timestamp) FILTER (valid), MAX(timestamp) FILTER (valid)
+                    FROM ({normalized})
+                """).fetchone()
+                if bad_timestamps:
+                    raise _UnsupportedTimestampFormat(f"{bad_timestamps} unparsed timestamps")
+
+                if valid:
+                    conn.execute(merge_sql, params)
+            finally:
+                conn.unregister("_historify_import")
+
+            imported += valid
+            skipped += rows - valid
+            if valid:
+                first_ts = min_ts if first_ts is None else min(first_ts, min_ts)
+                last_ts = max_ts if last_ts is None else max(last_ts, max_ts)
+
+        if imported:
+            _update_catalog(conn, symbol, exchange, interval)
+
+    if imported and HISTORIFY_ENABLE_ROLLUPS and interval in ROLLUP_INTERVALS.values():
+        _refresh_rollups_after_upsert(symbol, exchange, interval, first_ts, last_ts)
+
+    return imported, skipped
+
+
+def _import_dataframe(
+    df: pd.DataFrame, symbol: str, exchange: str, interval: str, file_type: str
+) -> tuple[bool, str, int]:
+    """Normalize a fully loaded CSV/Parquet DataFrame and upsert it."""
+    if df.empty:
+        return False, f"{file_type} file is empty", 0
+
+    # Normalize column names to lowercase
+    df.columns = df.columns.str.lower().str.strip()
+
+    # Handle different timestamp formats
+    if "timestamp" in df.columns:
+        # Check if timestamp is already epoch seconds or milliseconds
+        if pd.api.types.is_numeric_dtype(df["timestamp"]):
+            first_val = df["timestamp"].iloc[0]
+            # Epoch milliseconds are > 1e12 (after year 2001 in ms)
+            # Epoch seconds are typically between 1e9 and 2e9 (1970-2033)
+            if first_val > 1e12:
+                # Milliseconds - convert to seconds
+                df["timestamp"] = df["timestamp"] // 1000
+            # else: Already epoch seconds, no conversion needed
+        else:
+            # Parse as datetime string
+            df["timestamp"] = pd.to_datetime(df["timestamp"]).astype("int64") // 10**9
+    elif "datetime" in df.columns:
+        df["timestamp"] = pd.to_datetime(df["datetime"]).astype("int64") // 10**9
+    elif "date" in df.columns:
+        if "time" in df.columns:
+            df["datetime"] = df["date"].astype(str) + " " + df["time"].astype(str)
+        else:
+            df["datetime"] = df["date"].astype(str)
+        df["timestamp"] = pd.to_datetime(df["datetime"]).astype("int64") // 10**9
+    else:
+        return False, f"{file_type} must have 'timestamp', 'datetime', or 'date' column", 0
+
+    # Validate required OHLCV columns
+    required_cols = ["open", "high", "low", "close", "volume"]
+    missing_cols = [c for c in required_cols if c not in df.columns]
+    if missing_cols:
+        return False, f"Missing required columns: {', '.join(missing_cols)}", 0
+
+    # Add optional columns if missing
+    if "oi" not in df.columns:
+        df["oi"] = 0
+
+    # Select and order columns
+    df = df[OHLCV_COLUMNS]
+
+    # Convert data types
+    df["timestamp"] = df["timestamp"].astype("int64")
+    df["open"] = pd.to_numeric(df["open"], errors="coerce")
+    df["high"] = pd.to_numeric(df["high"], errors="coerce")
+    df["low"] = pd.to_numeric(df["low"], errors="coerce")
+    df["close"] = pd.to_numeric(df["close"], errors="coerce")
+    df["volume"] = pd.to_numeric(df["volume"], errors="coerce").fillna(0).astype("int64")
+    df["oi"] = pd.to_numeric(df["oi"], errors="coerce").fillna(0).astype("int64")
+
+    # Drop rows with NaN values in OHLC
+    initial_count = len(df)
+    df = df.dropna(subset=["open", "high", "low", "close"])
+    dropped_count = initial_count - len(df)
+
+    if df.empty:
+        return False, "No valid data rows after parsing", 0
+
+    # Insert into database
+    records = upsert_market_data(df, symbol, exchange, interval)
+    return True, _import_message(records, dropped_count), records
+
+
+def _import_message(records: int, dropped_count: int) -> str:
+    msg = f"Imported {records} records"
+    if dropped_count > 0:
+        msg += f" ({dropped_count} rows skipped due to invalid data)"
+    return msg
+
+
+def _import_stream(
+    open_stream, load_dataframe, symbol: str, exchange: str, interval: str, file_type: str
+) -> tuple[bool, str, int]:
+    """
+    Stream an import from disk, falling back to pandas for timestamp formats DuckDB
+    cannot parse (e.g. day-first dates).
+
+    Args:
+        open_stream: Callable returning (arrow schema, iterable of record batches)
+        load_dataframe: Callable loading the whole file into pandas for the fallback
+    """
+    try:
+        schema, batches = open_stream()
+        records, dropped_count = _import_arrow_batches(schema, batches, symbol, exchange, interval)
+    except pa.ArrowInvalid:
+        # Malformed file (ArrowInvalid is also a ValueError) - reported by the caller
+        raise
+    except ValueError as e:
+        message = str(e)
+        if message.startswith("must have"):
+            message = f"{file_type} {message}"
+        return False, message, 0
+    except _UnsupportedTimestampFormat as e:
+        logger.info(f"{file_type} import: {e}, re-reading with pandas")
+        return _import_dataframe(load_dataframe(), symbol, exchange, interval, file_type)
+
+    if records == 0:
+        if dropped_count == 0:
+            return False, f"{file_type} file is empty", 0
+        return False, "No valid data rows after parsing", 0
+
+    return True, _import_message(records, dropped_count), records
+
+
 def import_from_csv(
     file_path: str, symbol: str, exchange: str, interval: str
 ) -> tuple[bool, str, int]:
@@ -1425,6 +2433,7 @@ def import_from_csv(
         Option 3: datetime, open, high, low, close, volume
 
     The CSV must have headers. Column names are case-insensitive.
+    The file is streamed from disk in Arrow batches rather than loaded into pandas.
 
     Args:
         file_path: Path to the CSV file
@@ -1435,82 +2444,34 @@ def import_from_csv(
     Returns:
         Tuple of (success, message, records_imported)
     """
-    try:
-        # Read CSV with flexible parsing
-        df = pd.read_csv(file_path)
-
-        if df.empty:
-            return False, "CSV file is empty", 0
-
-        # Normalize column names to lowercase
-        df.columns = df.columns.str.lower().str.strip()
-
-        # Handle different timestamp formats
-        if "timestamp" in df.columns:
-            # Check if timestamp is already epoch seconds or milliseconds
-            if pd.api.types.is_numeric_dtype(df["timestamp"]):
-                first_val = df["timestamp"].iloc[0]
-                # Epoch milliseconds are > 1e12 (after year 2001 in ms)
-                # Epoch seconds are typically between 1e9 and 2e9 (1970-2033)
-                if first_val > 1e12:
-                    # Milliseconds - convert to seconds
-                    df["timestamp"] = df["timestamp"] // 1000
-                # else: Already epoch seconds, no conversion needed
-            else:
-                # Parse as datetime string
-                df["timestamp"] = pd.to_datetime(df["timestamp"]).astype("int64") // 10**9
-        elif "datetime" in df.columns:
-            df["timestamp"] = pd.to_datetime(df["datetime"]).astype("int64") // 10**9
-        elif "date" in df.columns:
-            if "time" in df.columns:
-                df["datetime"] = df["date"].astype(str) + " " + df["time"].astype(str)
-            else:
-                df["datetime"] = df["date"].astype(str)
-            df["timestamp"] = pd.to_datetime(df["datetime"]).astype("int64") // 10**9
-        else:
-            return False, "CSV must have 'timestamp', 'datetime', or 'date' column", 0
-
-        # Validate required OHLCV columns
-        required_cols = ["open", "high", "low", "close", "volume"]
-        missing_cols = [c for c in required_cols if c not in df.columns]
-        if missing_cols:
-            return False, f"Missing required columns: {', '.join(missing_cols)}", 0
-
-        # Add optional columns if missing
-        if "oi" not in df.columns:
-            df["oi"] = 0
-
-        # Select and order columns
-        df = df[["timestamp", "open", "high", "low", "close", "volume", "oi"]]
 
-        # Convert data types
-        df["timestamp"] = df["timestamp"].astype("int64")
-        df["open"] = pd.to_numeric(df["open"], errors="coerce")
-        df["high"] = pd.to_numeric(df["high"], errors="coerce")
-        df["low"] = pd.to_numeric(df["low"], errors="coerce")
-        df["close"] = pd.to_numeric(df["close"], errors="coerce")
-        df["volume"] = pd.to_numeric(df["volume"], errors="coerce").fillna(0).astype("int64")
-        df["oi"] = pd.to_numeric(df["oi"], errors="coerce").fillna(0).astype("int64")
+    def open_stream():
+        with open(file_path, newline="") as f:
+            header = next(csv.reader(f), None)
+        if not header:
+            raise ValueError("CSV file is empty")
+
+        # Read every column as text and let DuckDB cast, so a malformed value late in the
+        # file is skipped like the pandas path instead of failing type inference
+        reader = pa_csv.open_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(block_size=HISTORIFY_IMPORT_BATCH_ROWS * 64),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in header},
+                strings_can_be_null=True,
+            ),
+        )
+        return reader.schema, reader
 
-        # Drop rows with NaN values in OHLC
-        initial_count = len(df)
-        df = df.dropna(subset=["open", "high", "low", "close"])
-        dropped_count = initial_count - len(df)
-
-        if df.empty:
-            return False, "No valid data rows after parsing", 0
-
-        # Insert into database
-        records = upsert_market_data(df, symbol, exchange, interval)
-
-        msg = f"Imported {records} records"
-        if dropped_count > 0:
-            msg += f" ({dropped_count} rows skipped due to invalid data)"
-
-        logger.info(f"CSV import: {msg} for {symbol}:{exchange}:{interval}")
-        return True, msg, records
-
-    except pd.errors.ParserError as e:
+    try:
+        success, msg, records = _import_stream(
+            open_stream, lambda: pd.read_csv(file_path), symbol, exchange, interval, "CSV"
+        )
+        if success:
+            logger.info(f"CSV import: {msg} for {symbol}:{exchange}:{interval}")
+        return success, msg, records
+
+    except (pd.errors.ParserError, pa.ArrowInvalid) as e:
         logger.error(f"CSV parsing error: {e}")
         return False, f"CSV parsing error: {str(e)}", 0
     except Exception as e:
@@ -1527,6 +2488,8 @@ def import_from_parquet(
     Expected Parquet format - columns:
         timestamp (int64 epoch seconds), open, high, low, close, volume, oi (optional)
 
+    Row groups are streamed from disk in Arrow batches rather than loaded into pandas.
+
     Args:
         file_path: Path to the Parquet file
         symbol: Trading symbol
@@ -1536,75 +2499,20 @@ def import_from_parquet(
     Returns:
         Tuple of (success, message, records_imported)
     """
-    try:
-        # Read Parquet file
-        df = pd.read_parquet(file_path)
-
-        if df.empty:
-            return False, "Parquet file is empty", 0
-
-        # Normalize column names to lowercase
-        df.columns = df.columns.str.lower().str.strip()
-
-        # Handle timestamp column
-        if "timestamp" in df.columns:
-            # Check if timestamp is already epoch seconds or milliseconds
-            if pd.api.types.is_numeric_dtype(df["timestamp"]):
-                first_val = df["timestamp"].iloc[0]
-                if first_val > 1e12:
-                    df["timestamp"] = df["timestamp"] // 1000
-            else:
-                df["timestamp"] = pd.to_datetime(df["timestamp"]).astype("int64") // 10**9
-        elif "datetime" in df.columns:
-            df["timestamp"] = pd.to_datetime(df["datetime"]).astype("int64") // 10**9
-        elif "date" in df.columns:
-            if "time" in df.columns:
-                df["datetime"] = df["date"].astype(str) + " " + df["time"].astype(str)
-            else:
-                df["datetime"] = df["date"].astype(str)
-            df["timestamp"] = pd.to_datetime(df["datetime"]).astype("int64") // 10**9
-        else:
-            return False, "Parquet must have 'timestamp', 'datetime', or 'date' column", 0
-
-        # Validate required OHLCV columns
-        required_cols = ["open", "high", "low", "close", "volume"]
-        missing_cols = [c for c in required_cols if c not in df.columns]
-        if missing_cols:
-            return False, f"Missing required columns: {', '.join(missing_cols)}", 0
-
-        # Add optional columns if missing
-        if "oi" not in df.columns:
-            df["oi"] = 0
 
-        # Select and order columns
-        df = df[["timestamp", "open", "high", "low", "close", "volume", "oi"]]
+    def open_stream():
+        parquet_file = pq.ParquetFile(file_path)
+        return parquet_file.schema_arrow, parquet_file.iter_batches(
+            batch_size=HISTORIFY_IMPORT_BATCH_ROWS
+        )
 
-        # Convert data types
-        df["timestamp"] = df["timestamp"].astype("int64")
-        df["open"] = pd.to_numeric(df["open"], errors="coerce")
-        df["high"] = pd.to_numeric(df["high"], errors="coerce")
-        df["low"] = pd.to_numeric(df["low"], errors="coerce")
-        df["close"] = pd.to_numeric(df["close"], errors="coerce")
-        df["volume"] = pd.to_numeric(df["volume"], errors="coerce").fillna(0).astype("int64")
-        df["oi"] = pd.to_numeric(df["oi"], errors="coerce").fillna(0).astype("int64")
-
-        # Drop rows with NaN values in OHLC
-        initial_count = len(df)
-        df = df.dropna(subset=["open", "high", "low", "close"])
-        dropped_count = initial_count - len(df)
-
-        if df.empty:
-            return False, "No valid data rows after parsing", 0
-
-        # Insert into database
-        records = upsert_market_data(df, symbol, exchange, interval)
-
-        msg = f"Imported {records} records"
-        if dropped_count > 0:
-            msg += f" ({dropped_count} rows skipped due to invalid data)"
-
-        logger.info(f"Parquet import: {msg} for {symbol}:{exchange}:{interval}")
-        return True, msg, records
+    try:
+        success, msg, records = _import_stream(
+            open_stream, lambda: pd.read_parquet(file_path), symbol, exchange, interval, "Parquet"
+        )
+        if success:
+            logger.info(f"Parquet import: {msg} for {symbol}:{exchange}:{interval}")
+        return success, msg, records
 
     except Exception as e:
         logger.exception(f"Error importing Parquet: {e}")
@@ -2045,7 +2953,7 @@ def upsert_symbol_metadata(symbols: list[dict[str, Any]]) -> int:
 def get_symbol_metadata(symbol: str, exchange: str) -> dict[str, Any] | None:
     """Get metadata for a specific symbol."""
     try:
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             result = conn.execute(
                 """
                 SELECT symbol, exchange, name, expiry, strike, lotsize,
@@ -2083,7 +2991,7 @@ def get_catalog_with_metadata() -> list[dict[str, Any]]:
         List of catalog entries with metadata joined
     """
     try:
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             result = conn.execute("""
                 SELECT
                     c.symbol, c.exchange, c.interval,
@@ -2205,7 +3113,7 @@ def export_to_parquet(
         # Get record count first
         count_query = f"SELECT COUNT(*) FROM market_data WHERE {where_clause}"
 
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             record_count = conn.execute(count_query, params).fetchone()[0]
 
             if record_count == 0:
@@ -2329,7 +3237,7 @@ def export_to_txt(
             ORDER BY symbol, exchange, interval, timestamp
         """
 
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             df = conn.execute(query, params).fetchdf()
 
             if df.empty:
@@ -2400,7 +3308,7 @@ def export_to_zip(
         ist_offset = 19800
 
         with zipfile.ZipFile(abs_output, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
-            with get_connection() as conn:
+            with get_read_connection() as conn:
                 # Get symbols to export
                 if symbols and len(symbols) > 0:
                     symbols_list = [(s["symbol"].upper(), s["exchange"].upper()) for s in symbols]
@@ -2696,7 +3604,7 @@ def export_bulk_csv(
             ORDER BY symbol, exchange, interval, timestamp
         """
 
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             df = conn.execute(query, params).fetchdf()
 
             if df.empty:
@@ -2766,7 +3674,7 @@ def get_export_preview(
             WHERE {where_clause}
         """
 
-        with get_connection() as conn:
+        with get_read_connection() as conn:
             result = conn.execute(query, params).fetchone()
 
             if result[0] == 0:
@@ -8,6 +8,9 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import NullPool
 from sqlalchemy.sql import func
 
+from database.log_writer import BufferedLogWriter
+from utils.latency_histogram import WINDOWS, get_latency_histograms
+
 logger = logging.getLogger(__name__)
 
 # Use a separate database for latency logs
@@ -75,31 +78,26 @@ class OrderLatency(LatencyBase):
         status,
         error=None,
     ):
-        """Log order execution latency"""
-        try:
-            log = OrderLatency(
-                order_id=order_id,
-                user_id=user_id,
-                broker=broker,
-                symbol=symbol,
-                order_type=order_type,
-                rtt_ms=latencies.get("rtt", 0),
-                validation_latency_ms=latencies.get("validation", 0),
-                response_latency_ms=latencies.get("broker_response", 0),
-                overhead_ms=latencies.get("overhead", 0),
-                total_latency_ms=latencies.get("total", 0),
-                request_body=request_body,
-                response_body=response_body,
-                status=status,
-                error=error,
-            )
-            latency_session.add(log)
-            latency_session.commit()
-            return True
-        except Exception as e:
-            logger.exception(f"Error logging latency: {str(e)}")
-            latency_session.rollback()
-            return False
+        """Queue an order latency log for the background writer (returns False if dropped)"""
+        return latency_log_writer.submit(
+            {
+                "timestamp": datetime.utcnow(),
+                "order_id": order_id,
+                "user_id": user_id,
+                "broker": broker,
+                "symbol": symbol,
+                "order_type": order_type,
+                "rtt_ms": latencies.get("rtt", 0),
+                "validation_latency_ms": latencies.get("validation", 0),
+                "response_latency_ms": latencies.get("broker_response", 0),
+                "overhead_ms": latencies.get("overhead", 0),
+                "total_latency_ms": latencies.get("total", 0),
+                "request_body": request_body,
+                "response_body": response_body,
+                "status": status,
+                "error": error,
+            }
+        )
 
     @staticmethod
     def get_recent_logs(limit=100):
@@ -114,7 +112,6 @@ class OrderLatency(LatencyBase):
     def get_latency_stats():
         """Get latency statistics - optimized with minimal database queries"""
         try:
-            import numpy as np
             from sqlalchemy import case, func
 
             # OPTIMIZED: Single query for all overall stats using CASE statements
@@ -150,22 +147,13 @@ class OrderLatency(LatencyBase):
             sla_150ms = (orders_under_150ms / total_orders * 100) if total_orders else 0
             sla_200ms = (orders_under_200ms / total_orders * 100) if total_orders else 0
 
-            # OPTIMIZED: Single query for percentiles (still need all values for accurate percentiles)
-            # But now we only fetch one column instead of full rows
-            p50_total = p90_total = p95_total = p99_total = 0
-            if total_orders > 0:
-                total_latencies = [
-                    row[0]
-                    for row in latency_session.query(OrderLatency.total_latency_ms)
-                    .filter(OrderLatency.total_latency_ms.isnot(None))
-                    .all()
-                ]
-
-                if total_latencies:
-                    p50_total = float(np.percentile(total_latencies, 50))
-                    p90_total = float(np.percentile(total_latencies, 90))
-                    p95_total = float(np.percentile(total_latencies, 95))
-                    p99_total = float(np.percentile(total_latencies, 99))
+            # Percentiles come from the streaming histograms, not from every stored row
+            histograms = get_latency_histograms()
+            overall_summary = histograms.summary("all", stage="total")
+            p50_total = overall_summary["p50"]
+            p90_total = overall_summary["p90"]
+            p95_total = overall_summary["p95"]
+            p99_total = overall_summary["p99"]
 
             # OPTIMIZED: Single GROUP BY query for all broker stats
             # This replaces N x 7 queries (where N = number of brokers) with just 1
@@ -189,26 +177,6 @@ class OrderLatency(LatencyBase):
             # Build broker stats dict from aggregated results
             broker_stats = {}
 
-            # For percentiles, we need per-broker latency values
-            # OPTIMIZED: Single query to get all latencies grouped by broker
-            broker_latencies = {}
-            if broker_agg:
-                broker_names = [b.broker for b in broker_agg]
-                latency_rows = (
-                    latency_session.query(OrderLatency.broker, OrderLatency.total_latency_ms)
-                    .filter(
-                        OrderLatency.broker.in_(broker_names),
-                        OrderLatency.total_latency_ms.isnot(None),
-                    )
-                    .all()
-                )
-
-                # Group latencies by broker
-                for row in latency_rows:
-                    if row.broker not in broker_latencies:
-                        broker_latencies[row.broker] = []
-                    broker_latencies[row.broker].append(row.total_latency_ms)
-
             # Build final broker stats
             for broker_row in broker_agg:
                 broker = broker_row.broker
@@ -216,11 +184,7 @@ class OrderLatency(LatencyBase):
                 broker_under_150 = broker_row.under_150 or 0
                 broker_sla = (broker_under_150 / broker_total * 100) if broker_total else 0
 
-                # Calculate percentiles for this broker
-                broker_p50 = broker_p99 = 0
-                if broker in broker_latencies and broker_latencies[broker]:
-                    broker_p50 = float(np.percentile(broker_latencies[broker], 50))
-                    broker_p99 = float(np.percentile(broker_latencies[broker], 99))
+                broker_summary = histograms.summary("all", broker=broker, stage="total")
 
                 broker_stats[broker] = {
                     "total_orders": broker_total,
@@ -228,8 +192,8 @@ class OrderLatency(LatencyBase):
                     "avg_rtt": float(broker_row.avg_rtt or 0),
                     "avg_overhead": float(broker_row.avg_overhead or 0),
                     "avg_total": float(broker_row.avg_total or 0),
-                    "p50_total": broker_p50,
-                    "p99_total": broker_p99,
+                    "p50_total": broker_summary["p50"],
+                    "p99_total": broker_summary["p99"],
                     "sla_150ms": broker_sla,
                 }
 
@@ -250,6 +214,10 @@ class OrderLatency(LatencyBase):
                 "sla_150ms": float(sla_150ms),
                 "sla_200ms": float(sla_200ms),
                 "broker_stats": broker_stats,
+                # Total latency over the rolling windows (count, mean, p50/p90/p95/p99)
+                "windows": {
+                    window: histograms.summary(window, stage="total") for window in WINDOWS
+                },
             }
         except Exception as e:
             logger.exception(f"Error getting latency stats: {str(e)}")
@@ -268,9 +236,93 @@ class OrderLatency(LatencyBase):
                 "sla_150ms": 0,
                 "sla_200ms": 0,
                 "broker_stats": {},
+                "windows": {},
             }
 
 
+class LatencyHistogramSnapshot(LatencyBase):
+    """Persisted state of one streaming latency histogram (utils/latency_histogram.py)"""
+
+    __tablename__ = "latency_histogram_snapshot"
+
+    id = Column(Integer, primary_key=True)
+    broker = Column(String(50), nullable=False)
+    api_type = Column(String(20), nullable=False)
+    stage = Column(String(20), nullable=False)
+    data = Column(JSON, nullable=False)  # All-time bucket counts and rolling window slots
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+def save_latency_histograms(rows):
+    """Replace the persisted latency histograms with a registry snapshot"""
+    try:
+        now = datetime.utcnow()
+        with latency_engine.begin() as conn:
+            conn.execute(LatencyHistogramSnapshot.__table__.delete())
+            if rows:
+                conn.execute(
+                    LatencyHistogramSnapshot.__table__.insert(),
+                    [{**row, "updated_at": now} for row in rows],
+                )
+        return True
+    except Exception as e:
+        logger.exception(f"Error saving latency histograms: {str(e)}")
+        return False
+
+
+def load_latency_histograms():
+    """Persisted latency histogram rows (broker, api_type, stage, data)"""
+    try:
+        with latency_engine.connect() as conn:
+            table = LatencyHistogramSnapshot.__table__
+            result = conn.execute(
+                table.select().with_only_columns(
+                    table.c.broker, table.c.api_type, table.c.stage, table.c.data
+                )
+            )
+            return [dict(row) for row in result.mappings()]
+    except Exception as e:
+        logger.exception(f"Error loading latency histograms: {str(e)}")
+        return []
+
+
+_HISTORY_COLUMNS = (
+    OrderLatency.broker,
+    OrderLatency.order_type,
+    OrderLatency.timestamp,
+    OrderLatency.rtt_ms,
+    OrderLatency.validation_latency_ms,
+    OrderLatency.response_latency_ms,
+    OrderLatency.overhead_ms,
+    OrderLatency.total_latency_ms,
+)
+
+
+def _stage_latencies(row):
+    """Stage name -> latency of a _HISTORY_COLUMNS row (histogram stage names)"""
+    return {
+        "rtt": row.rtt_ms,
+        "validation": row.validation_latency_ms,
+        "broker_response": row.response_latency_ms,
+        "overhead": row.overhead_ms,
+        "total": row.total_latency_ms,
+    }
+
+
+def iter_latency_history():
+    """(broker, order_type, timestamp, stage latencies) of every logged order, oldest first"""
+    query = latency_session.query(*_HISTORY_COLUMNS).order_by(OrderLatency.id)
+    try:
+        for row in query.yield_per(5000):
+            yield row.broker, row.order_type, row.timestamp, _stage_latencies(row)
+    finally:
+        latency_session.remove()
+
+
+# Latency logs are written in batches off the order path
+latency_log_writer = BufferedLogWriter(latency_engine, OrderLatency.__table__, "order_latency")
+
+
 def init_latency_db():
     """Initialize the latency database"""
     # Extract directory from database URL and create if it doesn't exist
@@ -288,6 +340,10 @@ def purge_old_data_logs(days=7):
     """
     Purge non-order endpoint latency logs older than specified days.
     Order execution logs (PLACE, SMART, MODIFY, CANCEL, etc.) are kept forever.
+
+    Purged rows are also removed from the all-time latency histograms, and the
+    histograms are persisted, so dashboard percentiles and the SQL aggregates in
+    get_latency_stats cover the same rows.
     """
     # Order types to keep forever
     ORDER_TYPES = {
@@ -309,13 +365,24 @@ def purge_old_data_logs(days=7):
         cutoff = datetime.utcnow() - timedelta(days=days)
 
         # Delete non-order logs older than cutoff
+        purge_filter = (OrderLatency.timestamp < cutoff, ~OrderLatency.order_type.in_(ORDER_TYPES))
+        purged = [
+            (row.broker, row.order_type, _stage_latencies(row))
+            for row in latency_session.query(*_HISTORY_COLUMNS).filter(*purge_filter)
+        ]
         deleted = (
             latency_session.query(OrderLatency)
-            .filter(OrderLatency.timestamp < cutoff, ~OrderLatency.order_type.in_(ORDER_TYPES))
+            .filter(*purge_filter)
             .delete(synchronize_session=False)
         )
 
         latency_session.commit()
+
+        if purged:
+            histograms = get_latency_histograms()
+            for broker, api_type, latencies in purged:
+                histograms.forget(broker, api_type, latencies)
+            save_latency_histograms(histograms.snapshot())
         logger.debug(f"Purged {deleted} old data endpoint latency logs (older than {days} days)")
         return deleted
     except Exception as e:
@@ -0,0 +1,224 @@
+# database/log_writer.py
+
+"""
+Buffered background writer for append-only log tables.
+
+Request-path code (traffic logging, order latency) hands rows to a bounded in-memory
+queue instead of committing one row per request. A daemon thread drains the queue and
+inserts rows in batches (one executemany per batch) when a batch fills up or the
+oldest queued row has waited LOG_WRITER_FLUSH_MS. If a batch insert fails, its rows
+are retried one at a time so a single bad row does not lose the rest of the batch.
+
+When the queue is full new rows are dropped and counted rather than blocking the
+request; pending rows are flushed at interpreter shutdown.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Any
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Rows held in memory per table before new rows are dropped
+LOG_WRITER_QUEUE_SIZE = int(os.getenv("LOG_WRITER_QUEUE_SIZE", "10000"))
+# Rows inserted per executemany
+LOG_WRITER_BATCH_SIZE = int(os.getenv("LOG_WRITER_BATCH_SIZE", "500"))
+# Max time a queued row waits before its batch is written (milliseconds)
+LOG_WRITER_FLUSH_MS = int(os.getenv("LOG_WRITER_FLUSH_MS", "500"))
+
+_writers: list["BufferedLogWriter"] = []
+_writers_lock = threading.Lock()
+
+
+class BufferedLogWriter:
+    """
+    Batches inserts into one table on a background thread.
+
+    Args:
+        engine: SQLAlchemy engine of the table's database
+        table: SQLAlchemy Table (e.g. Model.__table__)
+        name: Name used in logs and stats
+        max_queue: Queue capacity (rows)
+        batch_size: Max rows per executemany
+        flush_interval: Max seconds a row waits before it is written
+    """
+
+    def __init__(
+        self,
+        engine,
+        table,
+        name: str,
+        max_queue: int = LOG_WRITER_QUEUE_SIZE,
+        batch_size: int = LOG_WRITER_BATCH_SIZE,
+        flush_interval: float = LOG_WRITER_FLUSH_MS / 1000,
+    ):
+        self.engine = engine
+        self.table = table
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stopping = False
+
+        # Updated from request threads and the writer thread
+        self._stats_lock = threading.Lock()
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+        with _writers_lock:
+            _writers.append(self)
+
+    def submit(self, row: dict[str, Any]) -> bool:
+        """
+        Queue a row (column name -> value) for insertion without blocking.
+
+        Returns:
+            True if queued, False if the row was dropped (queue full or writer closed)
+        """
+        if self._stopping:
+            self._count("dropped")
+            return False
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            dropped = self._count("dropped")
+            if dropped % 1000 == 1:
+                logger.warning(f"{self.name} log queue full, dropped {dropped} rows so far")
+            return False
+        self._count("queued")
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every row queued before the call has been written (or timeout)"""
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        try:
+            # Markers may wait for space; they never count against the dropped rows
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending rows and stop the writer thread"""
+        if self._stopping:
+            return
+        self.flush(timeout)
+        self._stopping = True
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+
+    def get_stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {**stats, "pending": self._queue.qsize()}
+
+    def _count(self, name: str, n: int = 1) -> int:
+        """Add n to a counter and return its new value"""
+        with self._stats_lock:
+            self.stats[name] += n
+            return self.stats[name]
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"log-writer-{self.name}", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: list[dict[str, Any]] = []
+            markers: list[threading.Event] = []
+            stop = False
+
+            # Collect until the batch is full or the first row has waited flush_interval
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.table.insert(), batch)
+        except Exception as e:
+            logger.warning(
+                f"Error writing {len(batch)} {self.name} log rows, retrying one by one: {e}"
+            )
+            self._write_rows(batch)
+            return
+        with self._stats_lock:
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+
+    def _write_rows(self, batch: list[dict[str, Any]]) -> None:
+        """Insert rows in their own transactions; only the rows that fail are lost"""
+        written = 0
+        error = None
+        for row in batch:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(self.table.insert(), row)
+                written += 1
+            except Exception as e:
+                error = e
+        with self._stats_lock:
+            self.stats["written"] += written
+            self.stats["failed"] += len(batch) - written
+        if error is not None:
+            logger.error(
+                f"Dropped {len(batch) - written} of {len(batch)} {self.name} log rows: {error}"
+            )
+
+
+def get_log_writer_stats() -> dict[str, dict[str, int]]:
+    """Counters of every buffered log writer, keyed by writer name"""
+    with _writers_lock:
+        return {writer.name: writer.get_stats() for writer in _writers}
+
+
+@atexit.register
+def close_log_writers() -> None:
+    """Flush and stop every buffered log writer (runs at interpreter shutdown)"""
+    with _writers_lock:
+        writers = list(_writers)
+    for writer in writers:
+        writer.close()
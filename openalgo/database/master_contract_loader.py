@@ -0,0 +1,330 @@
+# database/master_contract_loader.py
+
+"""
+Shared loader for broker master contracts.
+
+Every broker's master_contract_download() empties the symtoken table with
+delete_symtoken_table() and inserts the downloaded frames with
+copy_from_dataframe(). Both now go through this module:
+
+- delete_symtoken_table() -> begin_load(): clears the staging table
+  (symtoken_staging); the live table is left alone
+- copy_from_dataframe(df) -> stage_dataframe(df): the frame's columns are
+  normalised with vectorized pandas operations and loaded into the staging table
+  in one bulk statement (COPY on PostgreSQL/psycopg2, executemany otherwise).
+  Rows whose token was already staged by this load are skipped, as before
+- the caller of master_contract_download() then calls apply_load(broker), which
+  applies the staged contract as a diff in one transaction: rows that are no
+  longer listed are deleted and new or changed instruments inserted. Unchanged
+  rows (most of a daily refresh) are not rewritten, and lookups keep reading the
+  previous contract until the new one is committed.
+
+Brokers log and swallow errors from copy_from_dataframe(), so a failed or partial
+download would otherwise look complete. The load records every staging error;
+apply_load() keeps the live table and raises MasterContractLoadError when staging
+failed or staged no rows. Brokers therefore do not emit the "master_contract_download"
+success event themselves; the caller emits it once the contract is applied.
+
+apply_load() records per-phase timings (download, stage, apply) in
+master_contract_status.
+
+Vectorized helpers for the symbol formats shared by brokers (expiry date
+conversion, strike text) live here too.
+"""
+
+import io
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    text,
+)
+from sqlalchemy.pool import NullPool
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Conditionally create engine based on DB type
+if DATABASE_URL and "sqlite" in DATABASE_URL:
+    # SQLite: Use NullPool to prevent connection pool exhaustion
+    engine = create_engine(
+        DATABASE_URL, poolclass=NullPool, connect_args={"check_same_thread": False}
+    )
+else:
+    # For other databases like PostgreSQL, use connection pooling
+    engine = create_engine(DATABASE_URL, pool_size=50, max_overflow=100, pool_timeout=10)
+
+# symtoken columns, in insert order (id is assigned by the database)
+STRING_COLUMNS = ("symbol", "brsymbol", "name", "exchange", "brexchange", "token", "expiry")
+COLUMNS = (*STRING_COLUMNS, "strike", "lotsize", "instrumenttype", "tick_size")
+
+metadata = MetaData()
+staging_table = Table(
+    "symtoken_staging",
+    metadata,
+    *(Column(name, String) for name in STRING_COLUMNS),
+    Column("strike", Float),
+    Column("lotsize", Integer),
+    Column("instrumenttype", String),
+    Column("tick_size", Float),
+    Index("idx_symtoken_staging_token", "token"),
+)
+
+# State of the load in progress (one master contract download at a time)
+_lock = threading.Lock()
+_load: dict | None = None
+
+
+class MasterContractLoadError(Exception):
+    """The staged master contract is incomplete and was not applied"""
+
+
+def begin_load():
+    """Start staging a new master contract (clears the staging table)"""
+    global _load
+    start = time.perf_counter()
+    metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(staging_table.delete())
+    with _lock:
+        _load = {
+            "began": start,
+            "staged_keys": [],
+            "rows": 0,
+            "skipped": 0,
+            "errors": [],
+            "stage_seconds": time.perf_counter() - start,
+        }
+    logger.info("Staging master contract")
+
+
+def stage_dataframe(df, unique=("token",)):
+    """
+    Normalise a frame of instruments and bulk load it into the staging table
+
+    Args:
+        df: Frame with (a subset of) the symtoken columns; other columns are ignored
+        unique: Columns identifying an instrument. Rows whose key was already staged
+            by this load are skipped; None keeps every row
+
+    Returns:
+        int: Number of rows staged
+    """
+    if _load is None:
+        begin_load()
+    start = time.perf_counter()
+    try:
+        frame = normalise_frame(df)
+
+        if unique:
+            keys = _keys(frame, unique)
+            staged = _load["staged_keys"]
+            fresh = ~keys.isin(np.concatenate(staged)) if staged else None
+            if fresh is not None:
+                _load["skipped"] += int((~fresh).sum())
+                frame, keys = frame[fresh.to_numpy()], keys[fresh.to_numpy()]
+            staged.append(keys.to_numpy())
+
+        if len(frame):
+            with engine.begin() as conn:
+                _bulk_insert(conn, frame)
+    except Exception as e:
+        # Callers usually swallow this; apply_load() must not apply a partial contract
+        with _lock:
+            _load["errors"].append(str(e))
+        raise
+
+    elapsed = time.perf_counter() - start
+    with _lock:
+        _load["rows"] += len(frame)
+        _load["stage_seconds"] += elapsed
+    logger.info(f"Staged {len(frame)} instruments in {elapsed:.2f}s")
+    return len(frame)
+
+
+def apply_load(broker, started=None):
+    """
+    Apply the staged master contract to symtoken as a diff
+
+    Args:
+        broker: Broker whose status row receives the phase timings
+        started: time.perf_counter() value when the download started, if known
+
+    Returns:
+        dict with inserted/deleted/unchanged counts and phase timings, or None when
+        nothing was staged (the download failed before its table refresh)
+
+    Raises:
+        MasterContractLoadError: staging failed or staged no rows; symtoken is unchanged
+    """
+    global _load
+    with _lock:
+        load, _load = _load, None
+    if load is None:
+        logger.info("No staged master contract to apply")
+        return None
+
+    if load["errors"] or not load["rows"]:
+        reason = "; ".join(load["errors"]) or "no instruments were staged"
+        with engine.begin() as conn:
+            conn.execute(staging_table.delete())
+        logger.error(f"Not applying master contract for {broker}, keeping current: {reason}")
+        raise MasterContractLoadError(f"Master contract was not applied: {reason}")
+
+    start = time.perf_counter()
+    columns = ", ".join(COLUMNS)
+    target_columns, source_columns = columns, ", ".join(f"s.{name}" for name in COLUMNS)
+    if engine.dialect.name == "postgresql":
+        # symtoken.id draws from an explicit sequence, not a column default
+        target_columns = f"id, {columns}"
+        source_columns = f"nextval('symtoken_id_seq'), {source_columns}"
+
+    with engine.begin() as conn:
+        deleted = conn.execute(
+            text(
+                "DELETE FROM symtoken WHERE NOT EXISTS "
+                f"(SELECT 1 FROM symtoken_staging s WHERE {_matches('symtoken')})"
+            )
+        ).rowcount
+        inserted = conn.execute(
+            text(
+                f"INSERT INTO symtoken ({target_columns}) SELECT {source_columns} "
+                "FROM symtoken_staging s WHERE NOT EXISTS "
+                f"(SELECT 1 FROM symtoken t WHERE {_matches('t')})"
+            )
+        ).rowcount
+        conn.execute(staging_table.delete())
+    apply_seconds = time.perf_counter() - start
+
+    timings = {}
+    if started is not None:
+        timings["download"] = round(load["began"] - started, 3)
+    timings["stage"] = round(load["stage_seconds"], 3)
+    timings["apply"] = round(apply_seconds, 3)
+    if started is not None:
+        timings["total"] = round(time.perf_counter() - started, 3)
+    result = {
+        "staged": load["rows"],
+        "skipped": load["skipped"],
+        "inserted": inserted,
+        "deleted": deleted,
+        "unchanged": load["rows"] - inserted,
+        "timings": timings,
+    }
+    logger.info(
+        f"Applied master contract for {broker}: {inserted} inserted, {deleted} deleted, "
+        f"{result['unchanged']} unchanged ({timings})"
+    )
+
+    # Import here to avoid circular dependency
+    from database.master_contract_status_db import update_phase_timings
+
+    update_phase_timings(broker, timings)
+    return result
+
+
+def normalise_frame(df):
+    """
+    Frame with exactly the symtoken columns, typed for the database
+
+    Missing columns become NULL; NaN becomes NULL; string columns hold str (a
+    numeric token 2885 becomes "2885"); lotsize is an integer.
+    """
+    frame = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    for name in COLUMNS:
+        values = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        values = values.reset_index(drop=True)
+        if name in ("strike", "tick_size"):
+            values = pd.to_numeric(values, errors="coerce").astype(object)
+        elif name == "lotsize":
+            values = pd.to_numeric(values, errors="coerce").round().astype("Int64").astype(object)
+        else:
+            missing = values.isna()
+            values = values.astype(str).astype(object)
+            values[missing] = None
+        frame[name] = values.where(pd.notna(values), None)
+    return frame
+
+
+def format_expiry(expiry, source_format):
+    """
+    Expiry dates as DD-MON-YY (e.g. 19MAR2024 -> 19-MAR-24), vectorized
+
+    Values that do not parse with source_format are kept as they are.
+    """
+    parsed = pd.to_datetime(expiry, format=source_format, errors="coerce")
+    formatted = parsed.dt.strftime("%d-%b-%y").str.upper()
+    return formatted.where(parsed.notna(), expiry)
+
+
+def format_strike(strike):
+    """Strikes as integer text (24500.0 -> "24500"), vectorized"""
+    return pd.to_numeric(strike).astype(np.int64).astype(str)
+
+
+def _keys(frame, unique):
+    """One hashable key per row of the unique columns"""
+    if len(unique) == 1:
+        return frame[unique[0]]
+    return pd.Series(list(zip(*(frame[name] for name in unique), strict=True)), dtype=object)
+
+
+def _matches(target):
+    """
+    SQL condition: staged row s equals row `target` of symtoken in every column
+
+    Tokens are compared with plain equality so the token indexes can be used (a
+    row without a token is rewritten on every load); the other columns are
+    compared null-safely.
+    """
+    conditions = [f"s.token = {target}.token"]
+    for name in COLUMNS:
+        if name == "token":
+            continue
+        left, right = f"s.{name}", f"{target}.{name}"
+        if engine.dialect.name == "sqlite":
+            conditions.append(f"{left} IS {right}")
+        elif engine.dialect.name == "postgresql":
+            conditions.append(f"{left} IS NOT DISTINCT FROM {right}")
+        else:
+            conditions.append(f"({left} = {right} OR ({left} IS NULL AND {right} IS NULL))")
+    return " AND ".join(conditions)
+
+
+def _bulk_insert(conn, frame):
+    """Load a normalised frame into the staging table in one statement"""
+    cursor = conn.connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            # psycopg2: stream the frame as CSV through COPY
+            buffer = io.StringIO()
+            frame.to_csv(buffer, index=False, header=False, na_rep="\\N")
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY symtoken_staging ({', '.join(COLUMNS)}) FROM STDIN "
+                "WITH (FORMAT csv, NULL '\\N')",
+                buffer,
+            )
+        else:
+            placeholder = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+            cursor.executemany(
+                f"INSERT INTO symtoken_staging ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join([placeholder] * len(COLUMNS))})",
+                list(frame.itertuples(index=False, name=None)),
+            )
+    finally:
+        cursor.close()
@@ -1,3 +1,4 @@
+import json
 import logging
 import os
 from datetime import datetime
@@ -42,12 +43,35 @@ class MasterContractStatus(Base):
     last_updated = Column(DateTime, default=datetime.now)
     total_symbols = Column(String, default="0")
     is_ready = Column(Boolean, default=False)
+    # JSON: seconds per phase of the last load (download, stage, apply, total)
+    phase_timings = Column(String)
 
 
 # Create table if it doesn't exist
 Base.metadata.create_all(bind=engine)
 
 
+def _migrate_add_phase_timings_column():
+    """Add phase_timings column to master_contract_status if it doesn't exist"""
+    try:
+        from sqlalchemy import inspect
+
+        columns = [col["name"] for col in inspect(engine).get_columns("master_contract_status")]
+        if "phase_timings" not in columns:
+            with engine.connect() as conn:
+                conn.execute(
+                    text("ALTER TABLE master_contract_status ADD COLUMN phase_timings VARCHAR")
+                )
+                conn.commit()
+                logger.info("Migration: Added 'phase_timings' column to master_contract_status")
+    except Exception as e:
+        # Log but don't fail - column might already exist or other DB issue
+        logger.debug(f"Migration check for phase_timings column: {e}")
+
+
+_migrate_add_phase_timings_column()
+
+
 def init_broker_status(broker):
     """Initialize status for a broker when they login"""
     session = SessionLocal()
@@ -118,6 +142,30 @@ def update_status(broker, status, message, total_symbols=None):
         session.close()
 
 
+def update_phase_timings(broker, timings):
+    """Record per-phase timings (seconds) of the last master contract load"""
+    session = SessionLocal()
+    try:
+        broker_status = session.query(MasterContractStatus).filter_by(broker=broker).first()
+        if broker_status:
+            broker_status.phase_timings = json.dumps(timings)
+        else:
+            broker_status = MasterContractStatus(
+                broker=broker,
+                status="downloading",
+                message="Master contract download in progress",
+                last_updated=datetime.now(),
+                phase_timings=json.dumps(timings),
+            )
+            session.add(broker_status)
+        session.commit()
+    except Exception as e:
+        logger.exception(f"Error updating phase timings for {broker}: {str(e)}")
+        session.rollback()
+    finally:
+        session.close()
+
+
 def get_status(broker):
     """Get the current status for a broker"""
     session = SessionLocal()
@@ -132,6 +180,7 @@ def get_status(broker):
                 "last_updated": status.last_updated.isoformat() if status.last_updated else None,
                 "total_symbols": status.total_symbols,
                 "is_ready": status.is_ready,
+                "phase_timings": json.loads(status.phase_timings) if status.phase_timings else {},
             }
         else:
             return {
@@ -141,6 +190,7 @@ def get_status(broker):
                 "last_updated": None,
                 "total_symbols": "0",
                 "is_ready": False,
+                "phase_timings": {},
             }
     except Exception as e:
         logger.exception(f"Error getting status for {broker}: {str(e)}")
@@ -151,6 +201,7 @@ def get_status(broker):
             "last_updated": None,
             "total_symbols": "0",
             "is_ready": False,
+            "phase_timings": {},
         }
     finally:
         session.close()
@@ -0,0 +1,106 @@
+# database/symbol_cache_snapshot.py
+
+"""
+Snapshot files for the in-memory symbol cache.
+
+Building BrokerSymbolCache from the symtoken table means reading every row from the
+database and parsing the underlying out of every F&O symbol. The built SymbolTable
+(see database/symbol_table.py) is saved to a file, so the next process start - and
+every other process serving the same broker - maps the file instead of querying
+the database.
+
+A snapshot is keyed by broker and by the time of the broker's last successful
+master-contract download (master_contract_status.last_updated). A snapshot with a
+different key or format version is stale and is rebuilt from the database.
+"""
+
+import os
+from datetime import datetime
+
+from database.symbol_table import SymbolTable
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the cache layout changes so older files are rebuilt
+SNAPSHOT_VERSION = 2
+
+SYMBOL_CACHE_SNAPSHOT = os.getenv("SYMBOL_CACHE_SNAPSHOT", "TRUE").upper() == "TRUE"
+SYMBOL_CACHE_SNAPSHOT_DIR = os.getenv("SYMBOL_CACHE_SNAPSHOT_DIR", "db/symbol_cache")
+
+
+def get_contract_version(broker: str) -> str | None:
+    """
+    Key of the broker's current master contract (time of the last successful download)
+
+    Returns None when no successful download is recorded, in which case no snapshot
+    is read or written.
+    """
+    try:
+        from database.master_contract_status_db import MasterContractStatus, SessionLocal
+
+        session = SessionLocal()
+        try:
+            status = session.query(MasterContractStatus).filter_by(broker=broker).first()
+            if not status or status.status != "success" or not status.last_updated:
+                return None
+            return status.last_updated.isoformat()
+        finally:
+            session.close()
+    except Exception as e:
+        logger.exception(f"Error reading master contract status for {broker}: {e}")
+        return None
+
+
+def snapshot_path(broker: str) -> str:
+    """Snapshot file of a broker"""
+    return os.path.join(SYMBOL_CACHE_SNAPSHOT_DIR, f"{broker}.symtab")
+
+
+def write_snapshot(broker: str, contract_version: str, table: SymbolTable) -> bool:
+    """
+    Save a broker's symbol table
+
+    The file is written next to its final path and renamed into place, so readers
+    never see a partial snapshot and processes still mapping the old file keep it.
+    """
+    try:
+        table.metadata = {
+            "snapshot_version": SNAPSHOT_VERSION,
+            "broker": broker,
+            "contract_version": contract_version,
+            "created_at": datetime.now().isoformat(),
+        }
+        table.save(snapshot_path(broker))
+        logger.debug(f"Wrote symbol cache snapshot for {broker}: {len(table)} rows")
+        return True
+    except Exception as e:
+        logger.exception(f"Error writing symbol cache snapshot for {broker}: {e}")
+        return False
+
+
+def read_snapshot(broker: str, contract_version: str) -> SymbolTable | None:
+    """
+    Map the broker's snapshot
+
+    Returns None when the file is missing, unreadable, of another format version or
+    built from a different master contract.
+    """
+    path = snapshot_path(broker)
+    if not os.path.exists(path):
+        return None
+    try:
+        table = SymbolTable.open(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable symbol cache snapshot {path}: {e}")
+        return None
+
+    metadata = table.metadata
+    if (
+        metadata.get("snapshot_version") != SNAPSHOT_VERSION
+        or metadata.get("broker") != broker
+        or metadata.get("contract_version") != contract_version
+    ):
+        logger.debug(f"Symbol cache snapshot for {broker} is stale")
+        return None
+    return table
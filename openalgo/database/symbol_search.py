@@ -0,0 +1,609 @@
+# database/symbol_search.py
+
+"""
+Search index over the columnar symbol table.
+
+The index arrays are built together with the SymbolTable and saved in the same
+file, so a snapshot load maps them instead of rebuilding them:
+
+- search.text: "SYMBOL\\0BRSYMBOL\\0TOKEN\\0" per row, upper-cased (brsymbol left
+  empty when it equals the symbol), with search.row_starts
+- trigram postings over search.text (gram_keys, gram_starts, gram_positions): every
+  text position that is not a separator, keyed by the three bytes starting there.
+  A term of three or more bytes is located from the postings of its rarest trigram
+  and verified byte by byte with vectorized gathers; a shorter term reads the
+  contiguous key range of the trigrams it prefixes
+- alpha_order / alpha_rank: rows sorted by upper-cased symbol, so the exact and
+  prefix matches of a term are one binary-searched range, already in result order
+- name_order / name_starts: rows grouped by name code
+- chain_order: rows sorted by underlying, expiry date and strike, so the strike
+  ladder of an underlying and expiry is one contiguous, sorted range
+- strike_order / sorted_strikes: rows sorted by strike
+- suffix: per row, the index of the symbol's instrument suffix in SUFFIXES (FUT, CE,
+  PE), 0 for none
+
+Results are ranked by the first query term: exact symbol match, then symbol prefix,
+then any other match (substring of symbol, broker symbol, token or name, or equal
+strike), alphabetical within each tier. A query is planned from the estimated
+number of matches of each term:
+
+- a rare term drives the search: its rows are read from the postings, checked
+  against the other terms and ranked
+- otherwise rows are streamed in rank order in growing chunks and checked until
+  `limit` rows are found; moderately common terms are checked against a row mask
+  built from their postings, very common ones by scanning the chunk's text
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from database.symbol_table import SymbolTable
+
+_SEPARATOR = 0
+# Instrument types recognised from the symbol suffix; code 0 is "none of these"
+SUFFIXES = ("", "FUT", "CE", "PE")
+# A term expected to match at most this many rows drives the query
+_DRIVER_LIMIT = 4096
+# Terms expected to match at most this many rows are checked through a row mask,
+# more common ones by scanning the candidate rows' text
+_MASK_LIMIT = 32768
+# Rows streamed per step in rank order: the first chunk and the largest one
+_MIN_CHUNK = 256
+_MAX_CHUNK = 8192
+# Rows streamed before a query of moderately common terms switches to row masks
+_STREAM_BUDGET = 2048
+# Candidate sets up to this size are ranked with a sort, larger ones with a mask
+_SORT_LIMIT = 4096
+
+
+def _view(array: np.ndarray) -> memoryview:
+    return memoryview(array).cast("B").cast("i")
+
+
+def _strike_value(term: str) -> float | None:
+    """A numeric term as a strike to compare with (zero and NaN never match)"""
+    try:
+        value = float(term)
+    except ValueError:
+        return None
+    return value if value and value == value else None
+
+
+def _find_all(data: np.ndarray, term: bytes) -> np.ndarray:
+    """Start positions of term in a byte array"""
+    starts = np.flatnonzero(data[: max(len(data) - len(term) + 1, 0)] == term[0])
+    for i in range(1, len(term)):
+        starts = starts[data[starts + i] == term[i]]
+    return starts
+
+
+def _distinct(values: np.ndarray) -> np.ndarray:
+    """Sorted values without duplicates"""
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) < 2:
+        return values
+    return values[np.concatenate(([True], values[1:] != values[:-1]))]
+
+
+def _ranges(starts: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Concatenated index ranges starts[code]:starts[code + 1] of the codes"""
+    firsts = starts[codes]
+    counts = starts[codes + 1] - firsts
+    offsets = np.cumsum(counts) - counts
+    return np.arange(int(counts.sum())) + np.repeat(firsts - offsets, counts)
+
+
+def _inverse(order: np.ndarray) -> np.ndarray:
+    rank = np.empty(len(order), dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+    return rank
+
+
+def build_search_arrays(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Search index arrays for the table columns in arrays (see module docstring)"""
+    size = len(arrays["strike"])
+
+    def heap(name):
+        data = arrays[f"{name}.data"].tobytes()
+        offsets = arrays[f"{name}.offsets"].tolist()
+        return [data[a:b] for a, b in zip(offsets, offsets[1:], strict=False)]
+
+    symbols = [s.upper() for s in heap("symbol")]
+    parts = []
+    for symbol, brsymbol, token in zip(symbols, heap("brsymbol"), heap("token"), strict=True):
+        brsymbol = brsymbol.upper()
+        parts.append(b"%s\0%s\0%s\0" % (symbol, b"" if brsymbol == symbol else brsymbol, token))
+    row_starts = np.zeros(size + 1, dtype=np.int32)
+    np.cumsum([len(p) for p in parts], out=row_starts[1:])
+    # Two trailing separators so every position has a full trigram
+    text = np.frombuffer(b"".join(parts) + b"\0\0", dtype=np.uint8)
+
+    length = len(text) - 2
+    positions = np.flatnonzero(text[:length] != _SEPARATOR).astype(np.int32)
+    keys = (
+        (text[positions].astype(np.int32) << 16)
+        | (text[positions + 1].astype(np.int32) << 8)
+        | text[positions + 2]
+    )
+    order = np.argsort(keys, kind="stable")
+    gram_keys, first = np.unique(keys[order], return_index=True)
+
+    alpha_order = np.array(sorted(range(size), key=symbols.__getitem__), dtype=np.int32)
+    alpha_rank = _inverse(alpha_order)
+
+    names = arrays["name.codes"]
+    name_order = np.argsort(names, kind="stable").astype(np.int32)
+    name_order = name_order[np.count_nonzero(names < 0) :]
+    name_starts = np.zeros(len(arrays["name.values.offsets"]), dtype=np.int32)
+    np.cumsum(np.bincount(names[names >= 0], minlength=len(name_starts) - 1), out=name_starts[1:])
+
+    strikes = arrays["strike"]
+    expiry_days = arrays["expiry_date"].astype(np.int64)  # NaT sorts first
+    chain_order = np.lexsort(
+        (alpha_rank, strikes, arrays["expiry.codes"], expiry_days, arrays["underlying.codes"])
+    ).astype(np.int32)
+    strike_order = np.argsort(strikes, kind="stable").astype(np.int32)
+    suffix = np.zeros(size, dtype=np.int8)
+    for code, name in enumerate(SUFFIXES[1:], start=1):
+        suffix[[symbol.endswith(name.encode()) for symbol in symbols]] = code
+
+    return {
+        "search.text": text,
+        "search.row_starts": row_starts,
+        "search.gram_keys": gram_keys.astype(np.int32),
+        "search.gram_starts": np.append(first, len(order)).astype(np.int32),
+        "search.gram_positions": positions[order],
+        "search.alpha_order": alpha_order,
+        "search.alpha_rank": alpha_rank,
+        "search.name_order": name_order,
+        "search.name_starts": name_starts,
+        "search.chain_order": chain_order,
+        "search.strike_order": strike_order,
+        "search.sorted_strikes": strikes[strike_order],
+        "search.suffix": suffix,
+    }
+
+
+class SymbolSearchIndex:
+    """Ranked symbol search and F&O filtering over a SymbolTable (see module docstring)"""
+
+    def __init__(self, table: SymbolTable):
+        self.table = table
+        arrays = table.arrays
+        self.text = arrays["search.text"]
+        self.row_starts = arrays["search.row_starts"]
+        self.gram_keys = arrays["search.gram_keys"]
+        self.gram_starts = arrays["search.gram_starts"]
+        self.gram_positions = arrays["search.gram_positions"]
+        self.alpha_order = arrays["search.alpha_order"]
+        self.alpha_rank = arrays["search.alpha_rank"]
+        self.name_order = arrays["search.name_order"]
+        self.name_starts = arrays["search.name_starts"]
+        self.chain_order = arrays["search.chain_order"]
+        self.strike_order = arrays["search.strike_order"]
+        self.sorted_strikes = arrays["search.sorted_strikes"]
+        self.suffix = arrays["search.suffix"]
+        self.strikes = arrays["strike"]
+
+        # Plain-int views for the binary searches
+        self._text = memoryview(self.text)
+        self._row_starts = _view(self.row_starts)
+        self._alpha_order = _view(self.alpha_order)
+        self._symbol_offsets = _view(arrays["symbol.offsets"])
+
+        # Upper-cased distinct names, separated like search.text, for substring search
+        names = [name.upper().encode() for name in table.values["name"]]
+        self._names = np.frombuffer(b"".join(name + b"\0" for name in names), dtype=np.uint8)
+        self._name_starts = np.cumsum([0] + [len(name) + 1 for name in names])
+
+        # Chain ranges: underlying code -> (start, end) and (underlying, expiry) -> (start, end)
+        self.underlying_ranges: dict[int, tuple[int, int]] = {}
+        self.chain_ranges: dict[tuple[int, int], tuple[int, int]] = {}
+        underlyings = table.column_codes("underlying")[self.chain_order]
+        expiries = table.column_codes("expiry")[self.chain_order]
+        if len(underlyings):
+            breaks = np.flatnonzero(
+                (underlyings[1:] != underlyings[:-1]) | (expiries[1:] != expiries[:-1])
+            )
+            bounds = [0, *(breaks + 1).tolist(), len(underlyings)]
+            for start, end in zip(bounds, bounds[1:], strict=False):
+                underlying, expiry = int(underlyings[start]), int(expiries[start])
+                self.chain_ranges[(underlying, expiry)] = (start, end)
+                first, _ = self.underlying_ranges.get(underlying, (start, end))
+                self.underlying_ranges[underlying] = (first, end)
+
+    # ------------------------------------------------------------------ term matching
+
+    def _symbol_key(self, position: int) -> bytes:
+        """Upper-cased symbol at a position of alpha_order"""
+        row = self._alpha_order[position]
+        start = self._row_starts[row]
+        return bytes(
+            self._text[start : start + self._symbol_offsets[row + 1] - self._symbol_offsets[row]]
+        )
+
+    def prefix_range(self, term: bytes) -> tuple[int, int]:
+        """[lo, hi) of alpha_order whose symbols start with term; exact matches come first"""
+        lo, hi = 0, len(self.alpha_order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._symbol_key(mid) < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        end, hi = lo, len(self.alpha_order)
+        width = len(term)
+        while end < hi:
+            mid = (end + hi) // 2
+            if self._symbol_key(mid)[:width] <= term:
+                end = mid + 1
+            else:
+                hi = mid
+        return lo, end
+
+    def _gram_range(self, low: int, high: int) -> tuple[int, int]:
+        """Slice of gram_positions for the trigram keys in [low, high)"""
+        first, last = np.searchsorted(self.gram_keys, (low, high))
+        return int(self.gram_starts[first]), int(self.gram_starts[last])
+
+    def text_positions(self, term: bytes) -> np.ndarray:
+        """Positions in search.text where term starts"""
+        if len(term) == 1:
+            start, end = self._gram_range(term[0] << 16, (term[0] + 1) << 16)
+            return self.gram_positions[start:end]
+        if len(term) == 2:
+            key = term[0] << 16 | term[1] << 8
+            start, end = self._gram_range(key, key + 256)
+            return self.gram_positions[start:end]
+
+        # Rarest trigram of the term, then check every other byte in place
+        best = None
+        for offset in range(len(term) - 2):
+            key = term[offset] << 16 | term[offset + 1] << 8 | term[offset + 2]
+            start, end = self._gram_range(key, key + 1)
+            if best is None or end - start < best[2] - best[1]:
+                best = (offset, start, end)
+            if start == end:
+                return self.gram_positions[:0]
+        offset, start, end = best
+        starts = self.gram_positions[start:end] - offset
+        starts = starts[starts >= 0]
+        last = len(self.text) - 1
+        matched = np.ones(len(starts), dtype=bool)
+        for i, byte in enumerate(term):
+            if offset <= i < offset + 3:
+                continue
+            matched &= self.text[np.minimum(starts + i, last)] == byte
+        return starts[matched]
+
+    def _postings_estimate(self, term: bytes) -> int:
+        """Upper bound of the text positions matching term"""
+        if len(term) <= 2:
+            low = term[0] << 16 | (term[1] << 8 if len(term) == 2 else 0)
+            start, end = self._gram_range(low, low + (256 if len(term) == 2 else 1 << 16))
+            return end - start
+        keys = [term[i] << 16 | term[i + 1] << 8 | term[i + 2] for i in range(len(term) - 2)]
+        firsts = np.searchsorted(self.gram_keys, keys, "left")
+        lasts = np.searchsorted(self.gram_keys, keys, "right")
+        return int((self.gram_starts[lasts] - self.gram_starts[firsts]).min())
+
+    def _term(self, term: str, strike: bool = True) -> "_Term":
+        """A query term with its name matches and estimated row count"""
+        found = _find_all(self._names, term.encode())
+        name_codes = _distinct(np.searchsorted(self._name_starts, found, "right") - 1)
+        names = np.zeros(len(self._name_starts), dtype=bool)
+        names[name_codes] = True
+        estimate = self._postings_estimate(term.encode())
+        estimate += int((self.name_starts[name_codes + 1] - self.name_starts[name_codes]).sum())
+        value = _strike_value(term) if strike else None
+        if value is not None:
+            estimate += int(
+                np.searchsorted(self.sorted_strikes, value, "right")
+                - np.searchsorted(self.sorted_strikes, value, "left")
+            )
+        return _Term(term, term.encode(), names, name_codes, value, estimate)
+
+    def _term_parts(self, term: "_Term") -> list[np.ndarray]:
+        """Row arrays (unsorted, possibly overlapping) that together match term"""
+        positions = self.text_positions(term.encoded)
+        parts = [np.searchsorted(self.row_starts, positions, side="right") - 1]
+        parts.append(self.name_order[_ranges(self.name_starts, term.name_codes)])
+        if term.strike is not None:
+            lo = np.searchsorted(self.sorted_strikes, term.strike, "left")
+            hi = np.searchsorted(self.sorted_strikes, term.strike, "right")
+            parts.append(self.strike_order[lo:hi])
+        return parts
+
+    def term_rows(self, term: "_Term") -> np.ndarray:
+        """Sorted rows matching term in symbol, brsymbol, token or name (or strike)"""
+        if term.rows is None:
+            if term.mask is not None:
+                term.rows = np.flatnonzero(term.mask)
+            else:
+                term.rows = _distinct(np.sort(np.concatenate(self._term_parts(term))))
+        return term.rows
+
+    def term_mask(self, term: "_Term") -> np.ndarray:
+        """Boolean per row: does it match term"""
+        if term.mask is None:
+            term.mask = np.zeros(len(self.table), dtype=bool)
+            for part in self._term_parts(term) if term.rows is None else [term.rows]:
+                term.mask[part] = True
+        return term.mask
+
+    def _scan(self, rows: np.ndarray, term: "_Term") -> np.ndarray:
+        """Boolean per candidate row: term occurs in its text or name (or strike)"""
+        encoded = term.encoded
+        starts = self.row_starts[rows]
+        counts = np.maximum(self.row_starts[rows + 1] - starts - len(encoded) + 1, 0)
+        # Every candidate start position of every row, flattened; the first byte
+        # narrows the positions before the others are compared
+        ends = np.cumsum(counts)
+        flat = np.arange(int(ends[-1]) if len(ends) else 0)
+        positions = flat + np.repeat(starts - ends + counts, counts)
+        first = self.text[positions] == encoded[0]
+        flat, positions = flat[first], positions[first]
+        for i in range(1, len(encoded)):
+            found = self.text[positions + i] == encoded[i]
+            flat, positions = flat[found], positions[found]
+        hits = np.zeros(len(rows), dtype=bool)
+        hits[np.searchsorted(ends, flat, "right")] = True
+        hits |= term.names[self.table.column_codes("name")[rows]]
+        if term.strike is not None:
+            hits |= self.strikes[rows] == term.strike
+        return hits
+
+    def matches(self, rows: np.ndarray, term: "_Term") -> np.ndarray:
+        """Boolean per candidate row: does it match term (cheapest strategy)"""
+        if term.mask is not None or (len(rows) > _MIN_CHUNK and term.estimate <= _MASK_LIMIT):
+            return self.term_mask(term)[rows]
+        return self._scan(rows, term)
+
+    def alphabetical(self, rows: np.ndarray) -> np.ndarray:
+        """Distinct rows in symbol order"""
+        if len(rows) <= _SORT_LIMIT:
+            return self.alpha_order[_distinct(np.sort(self.alpha_rank[rows]))]
+        # Many rows: one pass over the symbol order instead of a sort
+        mask = np.zeros(len(self.table), dtype=bool)
+        mask[rows] = True
+        return self.alpha_order[mask[self.alpha_order]]
+
+    def _prefix_first(self, ranks: np.ndarray, lo: int, hi: int) -> list[tuple[np.ndarray, bool]]:
+        """Rank-ordered segments of sorted alpha ranks: those in [lo, hi), then the rest"""
+        first, last = np.searchsorted(ranks, (lo, hi))
+        return [
+            (self.alpha_order[ranks[first:last]], True),
+            (self.alpha_order[ranks[:first]], False),
+            (self.alpha_order[ranks[last:]], False),
+        ]
+
+    # ------------------------------------------------------------------ queries
+
+    def search(self, terms: list[str], exchange: str | None, limit: int) -> np.ndarray:
+        """
+        Rows matching every term (upper-cased), ranked by the first term
+
+        An exchange without symbols is ignored, like the previous full scan.
+        """
+        if not terms or limit <= 0:
+            return self.alpha_order[:0]
+        exchange_code = self.table.code("exchange", exchange) if exchange else -2
+        exchanges = self.table.column_codes("exchange")
+        planned = [self._term(term) for term in terms]
+        primary = planned[0]
+        lo, hi = self.prefix_range(primary.encoded)
+        by_estimate = sorted(planned, key=lambda term: term.estimate)
+
+        # A rare term: rank its rows, then check them against the rest
+        driver = by_estimate[0]
+        if driver.estimate <= _DRIVER_LIMIT:
+            rows = self.term_rows(driver)
+            if exchange_code >= 0:
+                rows = rows[exchanges[rows] == exchange_code]
+            segments = self._prefix_first(np.sort(self.alpha_rank[rows]), lo, hi)
+            return self._stream(segments, primary, by_estimate[1:], None, limit)
+
+        # Otherwise stream every row in rank order: the prefix range of the first
+        # term, then the other rows alphabetically
+        segments = [
+            (self.alpha_order[lo:hi], True),
+            (self.alpha_order[:lo], False),
+            (self.alpha_order[hi:], False),
+        ]
+        mask = exchanges == exchange_code if exchange_code >= 0 else None
+        # Rows in rank order usually match often enough to fill `limit` quickly.
+        # Unless a term is very common, give up after a budget of rows and read
+        # every term's rows through one mask instead
+        common = any(term.estimate > _MASK_LIMIT for term in planned)
+        rows = self._stream(
+            segments, primary, by_estimate, mask, limit, None if common else _STREAM_BUDGET
+        )
+        if rows is not None:
+            return rows
+        for term in by_estimate:
+            mask = self.term_mask(term) if mask is None else mask & self.term_mask(term)
+        segments = self._prefix_first(np.flatnonzero(mask[self.alpha_order]), lo, hi)
+        return self._stream(segments, primary, [], None, limit)
+
+    def _stream(
+        self,
+        segments: list[tuple[np.ndarray, bool]],
+        primary: "_Term",
+        checks: list["_Term"],
+        mask: np.ndarray | None,
+        limit: int,
+        budget: int | None = None,
+    ) -> np.ndarray | None:
+        """
+        The first `limit` rows of the rank-ordered segments that pass the mask and
+        the checks, read in growing chunks
+
+        Segments flagged True hold symbol prefix matches of the primary term, which
+        is not checked there. Returns None once more than `budget` rows were read
+        without finding `limit` matches.
+        """
+        found: list[np.ndarray] = []
+        count = read = 0
+        chunk = max(4 * limit, _MIN_CHUNK)
+        for segment, in_prefix in segments:
+            start = 0
+            while start < len(segment):
+                if budget is not None and read >= budget:
+                    return None
+                rows = segment[start : start + chunk]
+                start += chunk
+                read += len(rows)
+                chunk = min(2 * chunk, _MAX_CHUNK)
+                if mask is not None:
+                    rows = rows[mask[rows]]
+                for term in checks:
+                    if len(rows) and not (in_prefix and term is primary):
+                        rows = rows[self.matches(rows, term)]
+                found.append(rows)
+                count += len(rows)
+                if count >= limit:
+                    return np.concatenate(found)[:limit]
+        return np.concatenate(found)[:limit] if found else self.alpha_order[:0]
+
+    def fno_search(
+        self,
+        terms: list[str],
+        exchange: str | None,
+        expiry: str | None,
+        instrumenttype: str | None,
+        strike_min: float | None,
+        strike_max: float | None,
+        underlying: str | None,
+        limit: int,
+    ) -> np.ndarray:
+        """
+        Rows passing the F&O filters (arguments already normalised), in result order
+
+        Rows whose underlying equals, then starts with, the first term come first,
+        then rows whose symbol starts with it; ties are alphabetical.
+        """
+        table = self.table
+        strikes = self.strikes
+        exchange_code = table.code("exchange", exchange) if exchange else -2
+        suffix = SUFFIXES.index(instrumenttype) if instrumenttype in SUFFIXES[1:] else 0
+        filter_expiry = bool(expiry)
+        filter_strikes = strike_min is not None or strike_max is not None
+
+        if underlying:
+            underlying_code = table.code("underlying", underlying)
+            if expiry:
+                start, end = self.chain_ranges.get(
+                    (underlying_code, table.code("expiry", expiry)), (0, 0)
+                )
+                if filter_strikes:
+                    # The strike ladder of one expiry is sorted (missing strikes last)
+                    ladder = strikes[self.chain_order[start:end]]
+                    low = -np.inf if strike_min is None else strike_min
+                    high = np.inf if strike_max is None else strike_max
+                    start, end = (
+                        start + int(np.searchsorted(ladder, low, "left")),
+                        start + int(np.searchsorted(ladder, high, "right")),
+                    )
+                filter_expiry = filter_strikes = False
+            else:
+                start, end = self.underlying_ranges.get(underlying_code, (0, 0))
+            rows = self.chain_order[start : max(start, end)]
+            # Use exchange index if available
+            if exchange_code >= 0:
+                rows = rows[table.column_codes("exchange")[rows] == exchange_code]
+            if suffix:
+                rows = rows[self.suffix[rows] == suffix]
+        else:
+            # Whole-column comparisons first, then per-row filters on what is left
+            mask = np.ones(len(table), dtype=bool)
+            if exchange_code >= 0:
+                mask &= table.column_codes("exchange") == exchange_code
+            if expiry:
+                mask &= table.column_codes("expiry") == table.code("expiry", expiry)
+            if suffix:
+                mask &= self.suffix == suffix
+            rows = np.flatnonzero(mask)
+            filter_expiry = False
+
+        if filter_expiry:
+            rows = rows[table.column_codes("expiry")[rows] == table.code("expiry", expiry)]
+        # A missing strike is NaN and fails both comparisons
+        if filter_strikes and strike_min is not None:
+            rows = rows[strikes[rows] >= strike_min]
+        if filter_strikes and strike_max is not None:
+            rows = rows[strikes[rows] <= strike_max]
+        if not terms:
+            return self.alphabetical(rows)[:limit]
+
+        # All terms must match the text, or any numeric term must equal the strike
+        planned = sorted(
+            (self._term(term, strike=False) for term in terms), key=lambda term: term.estimate
+        )
+        values = [value for value in map(_strike_value, terms) if value is not None]
+        if all(term.estimate <= _MASK_LIMIT for term in planned):
+            # Every term has a cheap row mask: filter up front
+            keep = np.ones(len(rows), dtype=bool)
+            for term in planned:
+                keep &= self.matches(rows, term)
+            for value in values:
+                keep |= strikes[rows] == value
+            rows = rows[keep]
+            planned = []
+        elif not values:
+            # Rows failing a moderately common term are dropped up front
+            while planned[0].estimate <= _MASK_LIMIT and len(rows):
+                rows = rows[self.matches(rows, planned.pop(0))]
+        rows = self.alphabetical(rows)
+        if not len(rows):
+            return rows
+
+        primary = terms[0]
+        codes = table.column_codes("underlying")[rows]
+        starting = np.array(
+            [value.startswith(primary) for value in table.values["underlying"]] + [False]
+        )
+        lo, hi = self.prefix_range(primary.encode())
+        ranks = self.alpha_rank[rows]
+        tiers = (
+            (codes != table.code("underlying", primary)) * 4
+            + ~starting[codes] * 2
+            + ~((ranks >= lo) & (ranks < hi))
+        ).astype(np.int8)
+        rows = rows[np.argsort(tiers, kind="stable")]
+        if not planned:
+            return rows[:limit]
+
+        # The remaining checks run on the ranked rows in growing chunks until
+        # `limit` rows are found
+        found: list[np.ndarray] = []
+        count = 0
+        chunk = max(4 * limit, _MIN_CHUNK)
+        start = 0
+        while start < len(rows) and count < limit:
+            candidates = rows[start : start + chunk]
+            start += chunk
+            chunk = min(2 * chunk, _MAX_CHUNK)
+            text_match = np.ones(len(candidates), dtype=bool)
+            for term in planned:
+                if text_match.any():
+                    text_match[text_match] = self.matches(candidates[text_match], term)
+            for value in values:
+                text_match |= strikes[candidates] == value
+            found.append(candidates[text_match])
+            count += int(text_match.sum())
+        return np.concatenate(found)[:limit]
+
+
+@dataclass
+class _Term:
+    """One query term: its name matches, strike value and estimated match count"""
+
+    text: str
+    encoded: bytes
+    names: np.ndarray  # per name code, plus False for code -1
+    name_codes: np.ndarray
+    strike: float | None
+    estimate: int
+    rows: np.ndarray | None = field(default=None, repr=False)
+    mask: np.ndarray | None = field(default=None, repr=False)
@@ -0,0 +1,326 @@
+# database/symbol_table.py
+
+"""
+Array-backed symbol table for the in-memory symbol cache.
+
+Every column is a flat NumPy array instead of one Python object per instrument:
+
+- symbol, brsymbol, token: UTF-8 string heaps (one byte buffer plus row offsets),
+  each with an integer-row hash index (CRC32 buckets -> row numbers)
+- name, exchange, brexchange, expiry, instrumenttype, underlying: interned, i.e. an
+  int32 code per row into a small table of distinct strings (-1 for None)
+- strike, tick_size (float64, NaN for None), lotsize (int32), expiry_date
+  (datetime64[D], NaT when there is no or an unparseable expiry)
+
+plus the search index arrays of database/symbol_search.py ("search.*").
+
+A table is saved as one file (header + 64-byte aligned arrays) and opened with a
+read-only mmap, so every process that opens the same file (Flask workers, the
+WebSocket proxy) shares one copy of the pages instead of building its own.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+MAGIC = b"OASYMTB\x00"
+FORMAT_VERSION = 2
+_ALIGN = 64
+
+# Row layout, in SymbolData field order
+COLUMNS = (
+    "symbol",
+    "brsymbol",
+    "name",
+    "exchange",
+    "brexchange",
+    "token",
+    "expiry",
+    "strike",
+    "lotsize",
+    "instrumenttype",
+    "tick_size",
+    "underlying",
+)
+HEAP_COLUMNS = ("symbol", "brsymbol", "token")
+INTERNED_COLUMNS = ("name", "exchange", "brexchange", "expiry", "instrumenttype", "underlying")
+
+LOTSIZE_NULL = np.iinfo(np.int32).min
+EXPIRY_FORMATS = ("%d-%b-%y", "%d-%b-%Y")
+
+
+def parse_expiry(expiry: str | None) -> np.datetime64:
+    """Expiry string (e.g. "30-DEC-25") as a date, NaT if missing or unparseable"""
+    if expiry:
+        for fmt in EXPIRY_FORMATS:
+            try:
+                return np.datetime64(datetime.strptime(expiry, fmt).date(), "D")
+            except ValueError:
+                continue
+    return np.datetime64("NaT", "D")
+
+
+def _string_heap(values: list[bytes]) -> tuple[np.ndarray, np.ndarray]:
+    """(data, offsets) of byte strings; value i is data[offsets[i]:offsets[i + 1]]"""
+    offsets = np.zeros(len(values) + 1, dtype=np.int32)
+    np.cumsum([len(v) for v in values], out=offsets[1:])
+    return np.frombuffer(b"".join(values), dtype=np.uint8), offsets
+
+
+def _hash_index(values: list[bytes]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (order, starts) of a bucketed hash index
+
+    Rows of bucket b are order[starts[b]:starts[b + 1]], in ascending row order.
+    """
+    buckets = 1 << max(len(values) - 1, 1).bit_length()
+    hashes = np.fromiter((zlib.crc32(v) for v in values), dtype=np.uint32, count=len(values))
+    slots = (hashes & np.uint32(buckets - 1)).astype(np.int64)
+    order = np.argsort(slots, kind="stable").astype(np.int32)
+    starts = np.zeros(buckets + 1, dtype=np.int32)
+    np.cumsum(np.bincount(slots, minlength=buckets), out=starts[1:])
+    return order, starts
+
+
+def _intern(values: list[str | None]) -> tuple[np.ndarray, list[str]]:
+    """(codes, distinct values); None becomes code -1"""
+    table: dict[str, int] = {}
+    codes = np.fromiter(
+        (-1 if v is None else table.setdefault(v, len(table)) for v in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return codes, list(table)
+
+
+def _view(array: np.ndarray, fmt: str) -> memoryview:
+    """Flat memoryview of an array; indexing it returns plain Python numbers"""
+    return memoryview(array).cast("B").cast(fmt)
+
+
+class SymbolTable:
+    """
+    Columnar symbol table (see module docstring)
+
+    Build one with SymbolTable.build(columns) or open a saved one with
+    SymbolTable.open(path). Rows are numbered in build order.
+    """
+
+    def __init__(
+        self,
+        arrays: dict[str, np.ndarray],
+        metadata: dict[str, Any] | None = None,
+        mapping: mmap.mmap | None = None,
+    ):
+        self.arrays = arrays
+        self.metadata = metadata or {}
+        # File mapping backing the arrays
+        self._mapping = mapping
+        self.size = len(arrays["strike"])
+
+        # Distinct values of the interned columns, and value -> code
+        self.values: dict[str, list[str]] = {}
+        self.codes: dict[str, dict[str, int]] = {}
+        for name in INTERNED_COLUMNS:
+            values = self._decode_values(arrays, name)
+            self.values[name] = values
+            self.codes[name] = {value: code for code, value in enumerate(values)}
+
+        # Memoryviews for the per-row hot paths
+        self._heaps = {
+            name: (
+                memoryview(arrays[f"{name}.data"]),
+                _view(arrays[f"{name}.offsets"], "i"),
+                _view(arrays[f"{name}.order"], "i"),
+                _view(arrays[f"{name}.starts"], "i"),
+                len(arrays[f"{name}.starts"]) - 2,
+            )
+            for name in HEAP_COLUMNS
+        }
+        self._code_views = {name: _view(arrays[f"{name}.codes"], "i") for name in INTERNED_COLUMNS}
+        self._strike = _view(arrays["strike"], "d")
+        self._tick_size = _view(arrays["tick_size"], "d")
+        self._lotsize = _view(arrays["lotsize"], "i")
+
+    # ------------------------------------------------------------------ building
+
+    @classmethod
+    def build(
+        cls, columns: dict[str, list], metadata: dict[str, Any] | None = None
+    ) -> "SymbolTable":
+        """Build a table from Python lists (name -> list, see COLUMNS)"""
+        arrays: dict[str, np.ndarray] = {}
+        for name in HEAP_COLUMNS:
+            encoded = [(v or "").encode() for v in columns[name]]
+            arrays[f"{name}.data"], arrays[f"{name}.offsets"] = _string_heap(encoded)
+            arrays[f"{name}.order"], arrays[f"{name}.starts"] = _hash_index(encoded)
+        for name in INTERNED_COLUMNS:
+            codes, values = _intern(columns[name])
+            arrays[f"{name}.codes"] = codes
+            arrays[f"{name}.values.data"], arrays[f"{name}.values.offsets"] = _string_heap(
+                [v.encode() for v in values]
+            )
+
+        arrays["strike"] = np.array(columns["strike"], dtype=np.float64)
+        arrays["tick_size"] = np.array(columns["tick_size"], dtype=np.float64)
+        arrays["lotsize"] = np.array(
+            [LOTSIZE_NULL if v is None else v for v in columns["lotsize"]], dtype=np.int32
+        )
+        expiry_dates = np.array(
+            [parse_expiry(v) for v in cls._decode_values(arrays, "expiry")]
+            + [np.datetime64("NaT")],
+            dtype="datetime64[D]",
+        )
+        arrays["expiry_date"] = expiry_dates[arrays["expiry.codes"]]
+
+        # Import here to avoid circular dependency
+        from database.symbol_search import build_search_arrays
+
+        arrays.update(build_search_arrays(arrays))
+        return cls(arrays, metadata)
+
+    @staticmethod
+    def _decode_values(arrays: dict[str, np.ndarray], name: str) -> list[str]:
+        data = arrays[f"{name}.values.data"].tobytes()
+        offsets = arrays[f"{name}.values.offsets"].tolist()
+        return [data[start:end].decode() for start, end in zip(offsets, offsets[1:], strict=False)]
+
+    # ------------------------------------------------------------------ file format
+
+    def save(self, path: str) -> None:
+        """Write the table to path (atomically replaced)"""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        layout = {}
+        offset = 0
+        for name, array in self.arrays.items():
+            offset = -(-offset // _ALIGN) * _ALIGN
+            layout[name] = [array.dtype.str, len(array), offset]
+            offset += array.nbytes
+        header = json.dumps(
+            {"version": FORMAT_VERSION, "metadata": self.metadata, "arrays": layout}
+        ).encode()
+        prefix = MAGIC + struct.pack("<Q", len(header)) + header
+        base = -(-len(prefix) // _ALIGN) * _ALIGN
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(prefix)
+                for name, array in self.arrays.items():
+                    f.seek(base + layout[name][2])
+                    f.write(np.ascontiguousarray(array).tobytes())
+                f.truncate(base + offset)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def open(cls, path: str) -> "SymbolTable":
+        """Map a saved table read-only; raises ValueError on a malformed file"""
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapping[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a symbol table")
+        (header_len,) = struct.unpack_from("<Q", mapping, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(mapping[start : start + header_len])
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} has symbol table format {header.get('version')}")
+        base = -(-(start + header_len) // _ALIGN) * _ALIGN
+        arrays = {
+            name: np.frombuffer(mapping, dtype=np.dtype(dtype), count=count, offset=base + offset)
+            for name, (dtype, count, offset) in header["arrays"].items()
+        }
+        return cls(arrays, header.get("metadata"), mapping)
+
+    @property
+    def shared(self) -> bool:
+        """True when the arrays live in a file mapping shared with other processes"""
+        return self._mapping is not None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays.values())
+
+    # ------------------------------------------------------------------ row access
+
+    def __len__(self) -> int:
+        return self.size
+
+    def heap_value(self, name: str, row: int) -> str | None:
+        """Value of a string heap column (symbol, brsymbol, token)"""
+        data, offsets, _, _, _ = self._heaps[name]
+        start, end = offsets[row], offsets[row + 1]
+        return str(data[start:end], "utf-8") if end > start else None
+
+    def interned_value(self, name: str, row: int) -> str | None:
+        code = self._code_views[name][row]
+        return None if code < 0 else self.values[name][code]
+
+    def row(self, row: int) -> tuple:
+        """Values of a row in COLUMNS order"""
+        strike = self._strike[row]
+        tick_size = self._tick_size[row]
+        lotsize = self._lotsize[row]
+        return (
+            self.heap_value("symbol", row),
+            self.heap_value("brsymbol", row),
+            self.interned_value("name", row),
+            self.interned_value("exchange", row),
+            self.interned_value("brexchange", row),
+            self.heap_value("token", row),
+            self.interned_value("expiry", row),
+            None if strike != strike else strike,
+            None if lotsize == LOTSIZE_NULL else lotsize,
+            self.interned_value("instrumenttype", row),
+            None if tick_size != tick_size else tick_size,
+            self.interned_value("underlying", row),
+        )
+
+    def find(self, name: str, value: str, exchange: str | None = None) -> int:
+        """
+        Row holding value in a string heap column (and exchange, if given), or -1
+
+        When several rows match, the last one wins (like re-inserting into a dict).
+        """
+        exchange_code = -1
+        if exchange is not None:
+            exchange_code = self.codes["exchange"].get(exchange, -2)
+            if exchange_code == -2:
+                return -1
+        encoded = value.encode()
+        data, offsets, order, starts, mask = self._heaps[name]
+        exchanges = self._code_views["exchange"]
+        bucket = zlib.crc32(encoded) & mask
+        found = -1
+        for i in range(starts[bucket], starts[bucket + 1]):
+            row = order[i]
+            if (exchange_code == -1 or exchanges[row] == exchange_code) and data[
+                offsets[row] : offsets[row + 1]
+            ] == encoded:
+                found = row
+        return found
+
+    # ------------------------------------------------------------------ column access
+
+    def column_codes(self, name: str) -> np.ndarray:
+        """Per-row codes of an interned column"""
+        return self.arrays[f"{name}.codes"]
+
+    def code(self, name: str, value: str) -> int:
+        """Code of a value in an interned column, -2 if it never occurs"""
+        return self.codes[name].get(value, -2)
+
+    def rows_for(self, name: str, value: str) -> np.ndarray:
+        """Rows where an interned column equals value"""
+        return np.flatnonzero(self.column_codes(name) == self.code(name, value))
@@ -10,8 +10,17 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pytz
 
+from database.symbol_cache_snapshot import (
+    SYMBOL_CACHE_SNAPSHOT,
+    get_contract_version,
+    read_snapshot,
+    write_snapshot,
+)
+from database.symbol_search import SymbolSearchIndex
+from database.symbol_table import COLUMNS, SymbolTable
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -67,6 +76,8 @@ class CacheStats:
     last_loaded: datetime | None = None
     total_symbols: int = 0
     memory_usage_mb: float = 0.0
+    load_source: str | None = None  # "snapshot" or "database"
+    load_time_ms: float = 0.0
 
     def get_hit_rate(self) -> float:
         """Calculate cache hit rate"""
@@ -85,6 +96,8 @@ class CacheStats:
             "last_loaded": self.last_loaded.isoformat() if self.last_loaded else None,
             "total_symbols": self.total_symbols,
             "memory_usage_mb": f"{self.memory_usage_mb:.2f}",
+            "load_source": self.load_source,
+            "load_time_ms": round(self.load_time_ms, 2),
         }
 
 
@@ -110,6 +123,12 @@ class BrokerSymbolCache:
     """
     High-performance in-memory cache for broker symbols
     Designed to handle 100,000+ symbols with minimal memory footprint
+
+    Symbols live in a columnar SymbolTable (database/symbol_table.py) with
+    integer-row hash indexes; SymbolData objects are only created for the rows a
+    caller asks for. When the table comes from a snapshot file it is memory-mapped
+    and shared by every process serving the broker. Searches run on the table's
+    prebuilt index (database/symbol_search.py).
     """
 
     def __init__(self):
@@ -117,17 +136,11 @@ class BrokerSymbolCache:
         self.active_broker: str | None = None
         self.cache_loaded: bool = False
 
-        # Primary storage - all symbols in memory
-        self.symbols: dict[str, SymbolData] = {}
-
-        # Multi-index maps for O(1) lookups
-        self.by_symbol_exchange: dict[tuple[str, str], SymbolData] = {}
-        self.by_token_exchange: dict[tuple[str, str], SymbolData] = {}
-        self.by_brsymbol_exchange: dict[tuple[str, str], SymbolData] = {}
-        self.by_token: dict[str, SymbolData] = {}
+        # Primary storage - all symbols in one columnar table
+        self.table: SymbolTable | None = None
+        self.search_index: SymbolSearchIndex | None = None
 
         # Pre-computed indexes for FNO filter performance (O(1) lookups)
-        self.by_exchange: dict[str, list[SymbolData]] = defaultdict(list)
         self.expiries_by_exchange: dict[str, set[str]] = defaultdict(set)
         self.underlyings_by_exchange: dict[str, set[str]] = defaultdict(set)
         self.expiries_by_exchange_underlying: dict[tuple[str, str], set[str]] = defaultdict(set)
@@ -145,82 +158,50 @@ class BrokerSymbolCache:
         """
         Load all symbols for the active broker into memory
         This is called once after master contract download
+
+        The table is mapped from the broker's snapshot file when it matches the
+        current master contract, otherwise built from the database and saved as the
+        new snapshot. See database/symbol_cache_snapshot.py.
         """
         try:
-            from database.symbol import SymToken
-
             start_time = time.time()
             logger.debug(f"Loading all symbols for broker: {broker}")
 
             # Clear existing cache
             self.clear_cache()
 
-            # Query all symbols from database
-            symbols = SymToken.query.all()
-
-            if not symbols:
-                logger.warning(f"No symbols found in database for broker: {broker}")
-                return False
-
-            # Build in-memory structures
-            for sym in symbols:
-                # Extract underlying from OpenAlgo symbol format for FNO exchanges
-                underlying = None
-                if sym.exchange in FNO_EXCHANGES:
-                    underlying = extract_underlying_from_symbol(sym.symbol, sym.exchange)
-
-                # Create lightweight data object
-                symbol_data = SymbolData(
-                    symbol=sym.symbol,
-                    brsymbol=sym.brsymbol,
-                    name=sym.name,
-                    exchange=sym.exchange,
-                    brexchange=sym.brexchange,
-                    token=sym.token,
-                    expiry=sym.expiry,
-                    strike=sym.strike,
-                    lotsize=sym.lotsize,
-                    instrumenttype=sym.instrumenttype,
-                    tick_size=sym.tick_size,
-                    underlying=underlying,
-                )
-
-                # Store in primary dict
-                self.symbols[sym.token] = symbol_data
-
-                # Build indexes
-                self.by_symbol_exchange[(sym.symbol, sym.exchange)] = symbol_data
-                self.by_token_exchange[(sym.token, sym.exchange)] = symbol_data
-                self.by_brsymbol_exchange[(sym.brsymbol, sym.exchange)] = symbol_data
-                self.by_token[sym.token] = symbol_data
-
-                # Build FNO filter indexes for O(1) lookups
-                self.by_exchange[sym.exchange].append(symbol_data)
-                if sym.expiry:
-                    self.expiries_by_exchange[sym.exchange].add(sym.expiry)
-                    # Use extracted underlying for index (more reliable than broker's name field)
-                    if underlying:
-                        self.expiries_by_exchange_underlying[(sym.exchange, underlying)].add(sym.expiry)
-                # Use extracted underlying for underlyings index
-                if underlying:
-                    self.underlyings_by_exchange[sym.exchange].add(underlying)
+            contract_version = get_contract_version(broker) if SYMBOL_CACHE_SNAPSHOT else None
+            table = read_snapshot(broker, contract_version) if contract_version else None
+            if table is not None:
+                self.stats.load_source = "snapshot"
+            else:
+                columns = self._query_symbol_columns()
+                if not columns["symbol"]:
+                    logger.warning(f"No symbols found in database for broker: {broker}")
+                    return False
+                table = SymbolTable.build(columns)
+                self.stats.load_source = "database"
+                # Switch to the mapped file so this process shares it too
+                if contract_version and write_snapshot(broker, contract_version, table):
+                    table = read_snapshot(broker, contract_version) or table
+
+            self.table = table
+            self.search_index = SymbolSearchIndex(table)
+            self._build_filter_indexes()
 
             # Update cache metadata
             self.active_broker = broker
             self.cache_loaded = True
-            self.stats.total_symbols = len(symbols)
+            self.stats.total_symbols = len(table)
             self.stats.cache_loads += 1
             self.stats.last_loaded = datetime.now(pytz.timezone("Asia/Kolkata"))
-
-            # Calculate memory usage (rough estimate)
-            self.stats.memory_usage_mb = (
-                len(self.symbols) * 500  # ~500 bytes per symbol
-            ) / (1024 * 1024)
+            self.stats.memory_usage_mb = table.nbytes / (1024 * 1024)
 
             load_time = time.time() - start_time
+            self.stats.load_time_ms = load_time * 1000
             logger.debug(
                 f"Successfully loaded {self.stats.total_symbols} symbols "
-                f"in {load_time:.2f} seconds. "
+                f"from {self.stats.load_source} in {load_time:.2f} seconds. "
                 f"Memory usage: {self.stats.memory_usage_mb:.2f} MB"
             )
 
@@ -233,6 +214,84 @@ class BrokerSymbolCache:
             logger.exception(f"Error loading symbols into cache: {e}")
             return False
 
+    @staticmethod
+    def _query_symbol_columns() -> dict[str, list]:
+        """Read the symtoken table as columns (see symbol_table.COLUMNS)"""
+        from database.symbol import SymToken, db_session
+
+        # Plain column tuples: no ORM object per row
+        rows = db_session.query(
+            SymToken.symbol,
+            SymToken.brsymbol,
+            SymToken.name,
+            SymToken.exchange,
+            SymToken.brexchange,
+            SymToken.token,
+            SymToken.expiry,
+            SymToken.strike,
+            SymToken.lotsize,
+            SymToken.instrumenttype,
+            SymToken.tick_size,
+        ).all()
+
+        columns = {name: [] for name in COLUMNS}
+        if not rows:
+            return columns
+        for name, values in zip(COLUMNS[:-1], zip(*rows, strict=True), strict=True):
+            columns[name] = list(values)
+
+        # Extract underlying from OpenAlgo symbol format for FNO exchanges
+        columns["underlying"] = [
+            extract_underlying_from_symbol(symbol, exchange) if exchange in FNO_EXCHANGES else None
+            for symbol, exchange in zip(columns["symbol"], columns["exchange"], strict=True)
+        ]
+        return columns
+
+    def _build_filter_indexes(self) -> None:
+        """Distinct expiries / underlyings per exchange from the table's code columns"""
+        table = self.table
+        exchanges = table.column_codes("exchange")
+        expiries = table.column_codes("expiry")
+        # Use extracted underlying for indexes (more reliable than broker's name field)
+        underlyings = table.column_codes("underlying")
+        exchange_values = table.values["exchange"]
+        expiry_values = table.values["expiry"]
+        underlying_values = table.values["underlying"]
+
+        has_exchange = exchanges >= 0
+        has_expiry = has_exchange & (expiries >= 0)
+        has_underlying = has_exchange & (underlyings >= 0)
+
+        for exchange, expiry in np.unique(
+            np.stack([exchanges[has_expiry], expiries[has_expiry]]), axis=1
+        ).T:
+            self.expiries_by_exchange[exchange_values[exchange]].add(expiry_values[expiry])
+        for exchange, underlying in np.unique(
+            np.stack([exchanges[has_underlying], underlyings[has_underlying]]), axis=1
+        ).T:
+            self.underlyings_by_exchange[exchange_values[exchange]].add(
+                underlying_values[underlying]
+            )
+        both = has_expiry & has_underlying
+        for exchange, underlying, expiry in np.unique(
+            np.stack([exchanges[both], underlyings[both], expiries[both]]), axis=1
+        ).T:
+            self.expiries_by_exchange_underlying[
+                (exchange_values[exchange], underlying_values[underlying])
+            ].add(expiry_values[expiry])
+
+    def _symbol_data(self, row: int) -> SymbolData:
+        return SymbolData(*self.table.row(row))
+
+    def _lookup(self, column: str, value: str, exchange: str | None) -> int:
+        """Row of value in a hash-indexed column, counting the hit or miss"""
+        row = self.table.find(column, value, exchange) if self.table is not None else -1
+        if row < 0:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return row
+
     def _set_session_timing(self):
         """Set session start and next reset time from SESSION_EXPIRY_TIME env variable"""
         import os
@@ -268,79 +327,38 @@ class BrokerSymbolCache:
 
     def get_token(self, symbol: str, exchange: str) -> str | None:
         """Get token for symbol and exchange - O(1) lookup"""
-        self.stats.hits += 1
-        key = (symbol, exchange)
-        if key in self.by_symbol_exchange:
-            return self.by_symbol_exchange[key].token
-
-        self.stats.hits -= 1
-        self.stats.misses += 1
-        return None
+        row = self._lookup("symbol", symbol, exchange)
+        return self.table.heap_value("token", row) if row >= 0 else None
 
     def get_symbol(self, token: str, exchange: str) -> str | None:
         """Get symbol for token and exchange - O(1) lookup"""
-        self.stats.hits += 1
-        key = (token, exchange)
-        if key in self.by_token_exchange:
-            return self.by_token_exchange[key].symbol
-
-        self.stats.hits -= 1
-        self.stats.misses += 1
-        return None
+        row = self._lookup("token", token, exchange)
+        return self.table.heap_value("symbol", row) if row >= 0 else None
 
     def get_br_symbol(self, symbol: str, exchange: str) -> str | None:
         """Get broker symbol for symbol and exchange - O(1) lookup"""
-        self.stats.hits += 1
-        key = (symbol, exchange)
-        if key in self.by_symbol_exchange:
-            return self.by_symbol_exchange[key].brsymbol
-
-        self.stats.hits -= 1
-        self.stats.misses += 1
-        return None
+        row = self._lookup("symbol", symbol, exchange)
+        return self.table.heap_value("brsymbol", row) if row >= 0 else None
 
     def get_oa_symbol(self, brsymbol: str, exchange: str) -> str | None:
         """Get OpenAlgo symbol for broker symbol and exchange - O(1) lookup"""
-        self.stats.hits += 1
-        key = (brsymbol, exchange)
-        if key in self.by_brsymbol_exchange:
-            return self.by_brsymbol_exchange[key].symbol
-
-        self.stats.hits -= 1
-        self.stats.misses += 1
-        return None
+        row = self._lookup("brsymbol", brsymbol, exchange)
+        return self.table.heap_value("symbol", row) if row >= 0 else None
 
     def get_brexchange(self, symbol: str, exchange: str) -> str | None:
         """Get broker exchange for symbol and exchange - O(1) lookup"""
-        self.stats.hits += 1
-        key = (symbol, exchange)
-        if key in self.by_symbol_exchange:
-            return self.by_symbol_exchange[key].brexchange
-
-        self.stats.hits -= 1
-        self.stats.misses += 1
-        return None
+        row = self._lookup("symbol", symbol, exchange)
+        return self.table.interned_value("brexchange", row) if row >= 0 else None
 
     def get_symbol_info(self, symbol: str, exchange: str) -> SymbolData | None:
         """Get full symbol data for symbol and exchange - O(1) lookup"""
-        self.stats.hits += 1
-        key = (symbol, exchange)
-        if key in self.by_symbol_exchange:
-            return self.by_symbol_exchange[key]
-
-        self.stats.hits -= 1
-        self.stats.misses += 1
-        return None
+        row = self._lookup("symbol", symbol, exchange)
+        return self._symbol_data(row) if row >= 0 else None
 
     def get_symbol_data(self, token: str) -> SymbolData | None:
         """Get complete symbol data by token - O(1) lookup"""
-        self.stats.hits += 1
-        if token in self.by_token:
-            return self.by_token[token]
-
-        self.stats.hits -= 1
-        self.stats.misses += 1
-        return None
+        row = self._lookup("token", token, None)
+        return self._symbol_data(row) if row >= 0 else None
 
     def get_tokens_bulk(self, symbol_exchange_pairs: list[tuple[str, str]]) -> list[str | None]:
         """
@@ -348,36 +366,14 @@ class BrokerSymbolCache:
         Optimized for performance with single pass
         """
         self.stats.bulk_queries += 1
-        results = []
-
-        for symbol, exchange in symbol_exchange_pairs:
-            key = (symbol, exchange)
-            if key in self.by_symbol_exchange:
-                results.append(self.by_symbol_exchange[key].token)
-                self.stats.hits += 1
-            else:
-                results.append(None)
-                self.stats.misses += 1
-
-        return results
+        return [self.get_token(symbol, exchange) for symbol, exchange in symbol_exchange_pairs]
 
     def get_symbols_bulk(self, token_exchange_pairs: list[tuple[str, str]]) -> list[str | None]:
         """
         Bulk retrieve symbols for multiple token-exchange pairs
         """
         self.stats.bulk_queries += 1
-        results = []
-
-        for token, exchange in token_exchange_pairs:
-            key = (token, exchange)
-            if key in self.by_token_exchange:
-                results.append(self.by_token_exchange[key].symbol)
-                self.stats.hits += 1
-            else:
-                results.append(None)
-                self.stats.misses += 1
-
-        return results
+        return [self.get_symbol(token, exchange) for token, exchange in token_exchange_pairs]
 
     def search_symbols(
         self, query: str, exchange: str | None = None, limit: int = 50
@@ -385,59 +381,15 @@ class BrokerSymbolCache:
         """
         Search symbols by partial match with multi-term support.
         All terms must match (AND logic).
-        Returns list of matching SymbolData objects
-        Optimized to use exchange index when available
+        Returns list of matching SymbolData objects, ranked by the first term:
+        exact symbol, then symbol prefix, then any other match
         """
         # Split query into terms
         terms = [term.strip().upper() for term in query.split() if term.strip()]
-        if not terms:
+        if not terms or self.search_index is None:
             return []
-
-        matches = []
-
-        # Parse numeric terms for strike matching
-        num_terms = []
-        for term in terms:
-            try:
-                num_terms.append(float(term))
-            except ValueError:
-                pass
-
-        # Use exchange index if available - significantly faster
-        if exchange and exchange in self.by_exchange:
-            symbols_to_search = self.by_exchange[exchange]
-        else:
-            symbols_to_search = self.symbols.values()
-
-        for symbol_data in symbols_to_search:
-            # All terms must match
-            all_match = True
-            for term in terms:
-                term_match = (
-                    term in symbol_data.symbol.upper()
-                    or term in symbol_data.brsymbol.upper()
-                    or (symbol_data.name and term in symbol_data.name.upper())
-                    or (symbol_data.token and term in symbol_data.token)
-                )
-                # Also check numeric terms against strike
-                if not term_match and num_terms and symbol_data.strike:
-                    try:
-                        if float(term) == symbol_data.strike:
-                            term_match = True
-                    except ValueError:
-                        pass
-
-                if not term_match:
-                    all_match = False
-                    break
-
-            if all_match:
-                matches.append(symbol_data)
-
-                if len(matches) >= limit:
-                    break
-
-        return matches
+        rows = self.search_index.search(terms, exchange, limit)
+        return [self._symbol_data(row) for row in rows.tolist()]
 
     def fno_search_symbols(
         self,
@@ -452,7 +404,8 @@ class BrokerSymbolCache:
     ) -> list[SymbolData]:
         """
         FNO-specific search with advanced filters - in-memory cache search
-        Optimized to use exchange index for O(n/exchanges) instead of O(n) iteration
+        Filters are evaluated on the search index (strike ranges of one underlying
+        and expiry are sliced from its sorted strike ladder)
 
         Args:
             query: Optional search query string
@@ -465,125 +418,29 @@ class BrokerSymbolCache:
             limit: Maximum results to return
 
         Returns:
-            List of matching SymbolData objects
+            List of matching SymbolData objects; exact underlying matches first, then
+            underlying prefix, then symbol prefix, then alphabetical
         """
-        matches = []
-        query_upper = query.upper() if query else None
-        underlying_upper = underlying.strip().upper() if underlying else None
-        expiry_stripped = expiry.strip() if expiry else None
-        inst_type = instrumenttype.strip().upper() if instrumenttype else None
-
-        # Parse numeric terms from query for strike matching
-        query_terms = []
-        query_nums = []
-        if query_upper:
-            for term in query_upper.split():
-                term = term.strip()
-                if term:
-                    query_terms.append(term)
-                    try:
-                        query_nums.append(float(term))
-                    except ValueError:
-                        pass
-
-        # Use exchange index if available - significantly faster for FNO searches
-        if exchange and exchange in self.by_exchange:
-            symbols_to_search = self.by_exchange[exchange]
-        else:
-            # Fallback to all symbols if no exchange filter
-            symbols_to_search = self.symbols.values()
-
-        for symbol_data in symbols_to_search:
-            # Underlying filter (use extracted underlying from OpenAlgo symbol format)
-            if underlying_upper and (
-                not symbol_data.underlying or symbol_data.underlying != underlying_upper
-            ):
-                continue
-
-            # Expiry filter
-            if expiry_stripped and symbol_data.expiry != expiry_stripped:
-                continue
-
-            # Instrument type filter (based on symbol suffix)
-            if inst_type:
-                symbol_upper = symbol_data.symbol.upper()
-                if inst_type == "FUT" and not symbol_upper.endswith("FUT"):
-                    continue
-                elif inst_type == "CE" and not symbol_upper.endswith("CE"):
-                    continue
-                elif inst_type == "PE" and not symbol_upper.endswith("PE"):
-                    continue
-
-            # Strike range filter
-            if strike_min is not None and (
-                symbol_data.strike is None or symbol_data.strike < strike_min
-            ):
-                continue
-            if strike_max is not None and (
-                symbol_data.strike is None or symbol_data.strike > strike_max
-            ):
-                continue
-
-            # Query text search (if provided)
-            if query_terms:
-                # All terms must match
-                all_match = True
-                for term in query_terms:
-                    term_match = (
-                        term in symbol_data.symbol.upper()
-                        or term in symbol_data.brsymbol.upper()
-                        or (symbol_data.name and term in symbol_data.name.upper())
-                        or (symbol_data.token and term in symbol_data.token)
-                    )
-                    if not term_match:
-                        all_match = False
-                        break
-
-                # Also check numeric terms against strike
-                if not all_match and query_nums and symbol_data.strike:
-                    for num in query_nums:
-                        if symbol_data.strike == num:
-                            all_match = True
-                            break
-
-                if not all_match:
-                    continue
-
-            matches.append(symbol_data)
-
-        # Smart sorting: prioritize exact underlying matches, then alphabetical
-        # Extract the primary search term (first term) for relevance scoring
-        primary_term = query_terms[0] if query_terms else None
-
-        def sort_key(s):
-            # Priority 1: Exact match on underlying (e.g., "NIFTY" matches underlying="NIFTY" exactly)
-            underlying_exact = (
-                0 if (primary_term and s.underlying and s.underlying == primary_term) else 1
-            )
-
-            # Priority 2: Underlying starts with search term (e.g., "NIFTY" before "BANKNIFTY")
-            underlying_starts = (
-                0 if (primary_term and s.underlying and s.underlying.startswith(primary_term)) else 1
-            )
-
-            # Priority 3: Symbol starts with search term
-            symbol_starts = 0 if (primary_term and s.symbol.upper().startswith(primary_term)) else 1
-
-            # Priority 4: Alphabetical by symbol
-            return (underlying_exact, underlying_starts, symbol_starts, s.symbol)
-
-        matches.sort(key=sort_key)
-        return matches[:limit]
+        if self.search_index is None:
+            return []
+        terms = [term.strip() for term in query.upper().split() if term.strip()] if query else []
+        rows = self.search_index.fno_search(
+            terms,
+            exchange,
+            expiry.strip() if expiry else None,
+            instrumenttype.strip().upper() if instrumenttype else None,
+            strike_min,
+            strike_max,
+            underlying.strip().upper() if underlying else None,
+            limit,
+        )
+        return [self._symbol_data(row) for row in rows.tolist()]
 
     def clear_cache(self):
         """Clear all cached data"""
-        self.symbols.clear()
-        self.by_symbol_exchange.clear()
-        self.by_token_exchange.clear()
-        self.by_brsymbol_exchange.clear()
-        self.by_token.clear()
+        self.table = None
+        self.search_index = None
         # Clear FNO filter indexes
-        self.by_exchange.clear()
         self.expiries_by_exchange.clear()
         self.underlyings_by_exchange.clear()
         self.expiries_by_exchange_underlying.clear()
@@ -598,6 +455,7 @@ class BrokerSymbolCache:
             "cache_loaded": self.cache_loaded,
             "total_symbols": self.stats.total_symbols,
             "cache_valid": self.is_cache_valid(),
+            "shared_memory": self.table.shared if self.table is not None else False,
             "session_start": self.session_start.isoformat() if self.session_start else None,
             "next_reset": self.next_reset_time.isoformat() if self.next_reset_time else None,
             "stats": self.stats.to_dict(),
@@ -1029,7 +887,9 @@ def get_distinct_expiries_cached(
 
         if exchange and underlying_upper:
             # Use the combined index for exchange + underlying
-            expiries = cache.expiries_by_exchange_underlying.get((exchange, underlying_upper), set())
+            expiries = cache.expiries_by_exchange_underlying.get(
+                (exchange, underlying_upper), set()
+            )
         elif exchange:
             # Use the exchange-only index
             expiries = cache.expiries_by_exchange.get(exchange, set())
@@ -20,6 +20,7 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import NullPool
 from sqlalchemy.sql import func
 
+from database.log_writer import BufferedLogWriter
 from database.settings_db import get_security_settings
 
 logger = logging.getLogger(__name__)
@@ -75,25 +76,20 @@ class TrafficLog(LogBase):
     def log_request(
         client_ip, method, path, status_code, duration_ms, host=None, error=None, user_id=None
     ):
-        """Log a request to the database"""
-        try:
-            log = TrafficLog(
-                client_ip=client_ip,
-                method=method,
-                path=path,
-                status_code=status_code,
-                duration_ms=duration_ms,
-                host=host,
-                error=error,
-                user_id=user_id,
-            )
-            logs_session.add(log)
-            logs_session.commit()
-            return True
-        except Exception as e:
-            logger.exception(f"Error logging traffic: {str(e)}")
-            logs_session.rollback()
-            return False
+        """Queue a request log for the background writer (returns False if dropped)"""
+        return traffic_log_writer.submit(
+            {
+                "timestamp": datetime.utcnow(),
+                "client_ip": client_ip,
+                "method": method,
+                "path": path,
+                "status_code": status_code,
+                "duration_ms": duration_ms,
+                "host": host,
+                "error": error,
+                "user_id": user_id,
+            }
+        )
 
     @staticmethod
     def get_recent_logs(limit=100):
@@ -124,6 +120,10 @@ class TrafficLog(LogBase):
             return {"total_requests": 0, "error_requests": 0, "avg_duration": 0}
 
 
+# Traffic logs are written in batches off the request path
+traffic_log_writer = BufferedLogWriter(logs_engine, TrafficLog.__table__, "traffic")
+
+
 class IPBan(LogBase):
     """Model for banned IPs"""
 
@@ -219,6 +219,9 @@ class OptionChainSchema(Schema):
     strike_count = fields.Int(
         required=False, validate=validate.Range(min=1, max=100), allow_none=True
     )  # Number of strikes above/below ATM. If not provided, returns entire chain
+    since = fields.Int(
+        required=False, validate=validate.Range(min=0), allow_none=True
+    )  # "seq" from an earlier response: return only strikes changed since then
 
 
 class MarketHolidaysSchema(Schema):
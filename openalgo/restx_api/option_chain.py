@@ -12,7 +12,8 @@ Request Body:
     "underlying": "NIFTY",
     "exchange": "NSE_INDEX",
     "expiry_date": "30DEC25",
-    "strike_count": 10  // Optional: if not provided, returns entire chain
+    "strike_count": 10,  // Optional: if not provided, returns entire chain
+    "since": 1234  // Optional: "seq" of an earlier response, returns only changed strikes
 }
 
 Response:
@@ -49,7 +50,9 @@ Response:
             "pe": { "symbol": "...", "label": "ITM5", ... }
         },
         ...
-    ]
+    ],
+    "seq": 1240,  // Snapshot sequence number (streaming snapshot only)
+    "full": false  // Only with "since": false if "chain" holds just the changed strikes
 }
 
 Strike Labels (different for CE and PE):
@@ -96,6 +99,7 @@ class OptionChain(Resource):
             exchange = data["exchange"]
             expiry_date = data["expiry_date"]
             strike_count = data.get("strike_count")  # None means return entire chain
+            since = data.get("since")
 
             logger.info(
                 f"Option chain request: underlying={underlying}, exchange={exchange}, "
@@ -109,6 +113,7 @@ class OptionChain(Resource):
                 expiry_date=expiry_date,
                 strike_count=strike_count,
                 api_key=api_key,
+                since=since,
             )
 
             return response, status_code
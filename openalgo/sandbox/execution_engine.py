@@ -7,8 +7,9 @@ Features:
 - Real-time quote fetching from broker
 - Order execution based on price type (MARKET, LIMIT, SL, SL-M)
 - Trade creation and position updates
-- Rate limit compliance (10 orders/second, 50 API calls/second)
-- Batch processing for efficiency
+- Token-bucket rate limiting of broker quote calls (API_RATE_LIMIT per second);
+  orders evaluated against already fetched or locally cached quotes are not throttled
+- Per-pass latency metrics
 """
 
 import os
@@ -28,24 +29,44 @@ from database.sandbox_db import SandboxOrders, SandboxPositions, SandboxTrades,
 from sandbox.fund_manager import FundManager, reconcile_margin, validate_margin_consistency
 from services.quotes_service import get_multiquotes, get_quotes
 from utils.logging import get_logger
+from utils.token_bucket import TokenBucket
 
 logger = get_logger(__name__)
 
+# Read API rate limit from .env (same as API protection)
+API_RATE_LIMIT = int(os.getenv("API_RATE_LIMIT", "50 per second").split()[0])
+
+# Quotes from the MarketDataService cache younger than this are used without a broker call
+LOCAL_QUOTE_MAX_AGE = float(os.getenv("SANDBOX_LOCAL_QUOTE_MAX_AGE", "5"))
+
+# Broker quote calls from every ExecutionEngine instance (polling thread, order placement,
+# WebSocket fallback) draw from one bucket
+_quote_rate_limiter = TokenBucket(rate=API_RATE_LIMIT)
+
 
 class ExecutionEngine:
     """Executes pending orders based on market data"""
 
     def __init__(self):
-        # Read rate limits from .env (same as API protection)
-        self.order_rate_limit = int(os.getenv("ORDER_RATE_LIMIT", "10 per second").split()[0])
-        self.api_rate_limit = int(os.getenv("API_RATE_LIMIT", "50 per second").split()[0])
-        self.batch_delay = 1.0  # 1 second between batches
+        self.api_rate_limit = API_RATE_LIMIT
+        self.rate_limiter = _quote_rate_limiter
+
+        # Broker calls and rate-limit waits of the current pass
+        self._broker_calls = 0
+        self._throttle_wait = 0.0
+
+        # Metrics of the most recent pass
+        self.last_pass_metrics: dict | None = None
 
     def check_and_execute_pending_orders(self):
         """
         Main execution loop - checks all pending orders and executes if conditions met
-        Respects rate limits through batch processing
+        Only broker quote calls are rate limited; order evaluation runs unthrottled
         """
+        pass_start = time.perf_counter()
+        self._broker_calls = 0
+        self._throttle_wait = 0.0
+
         try:
             # Get all pending orders
             pending_orders = SandboxOrders.query.filter_by(order_status="open").all()
@@ -64,52 +85,96 @@ class ExecutionEngine:
                     orders_by_symbol[key] = []
                 orders_by_symbol[key].append(order)
 
-            # Fetch quotes using multiquotes (more efficient - single API call)
-            # Falls back to individual quotes if multiquotes fails
-            quote_cache = {}
             symbols_list = list(orders_by_symbol.keys())
+            quote_start = time.perf_counter()
 
-            # Try batch fetch using multiquotes
-            quote_cache = self._fetch_quotes_batch(symbols_list)
+            # Fresh quotes already streamed into MarketDataService need no broker call
+            quote_cache = self._get_local_quotes(symbols_list)
+            local_quotes = len(quote_cache)
+
+            # Fetch remaining quotes using multiquotes (more efficient - single API call)
+            # Falls back to individual quotes if multiquotes fails
+            remote_symbols = [s for s in symbols_list if s not in quote_cache]
+            quote_cache.update(self._fetch_quotes_batch(remote_symbols))
 
             # Fallback: For any symbols that failed in batch, try individual fetch
             failed_symbols = [
-                s for s in symbols_list if s not in quote_cache or quote_cache[s] is None
+                s for s in remote_symbols if s not in quote_cache or quote_cache[s] is None
             ]
             if failed_symbols:
                 logger.debug(
                     f"Fetching {len(failed_symbols)} symbols individually (multiquotes fallback)"
                 )
-                for i in range(0, len(failed_symbols), self.api_rate_limit):
-                    batch = failed_symbols[i : i + self.api_rate_limit]
-                    for symbol, exchange in batch:
-                        quote = self._fetch_quote(symbol, exchange)
-                        if quote:
-                            quote_cache[(symbol, exchange)] = quote
-                    # Wait 1 second before next batch if more symbols remain
-                    if i + self.api_rate_limit < len(failed_symbols):
-                        time.sleep(self.batch_delay)
-
-            # Process orders in batches (respecting order rate limit of 10/second)
-            orders_processed = 0
-            for i in range(0, len(pending_orders), self.order_rate_limit):
-                batch = pending_orders[i : i + self.order_rate_limit]
-
-                for order in batch:
-                    quote = quote_cache.get((order.symbol, order.exchange))
+                for symbol, exchange in failed_symbols:
+                    quote = self._fetch_quote(symbol, exchange)
                     if quote:
-                        self._process_order(order, quote)
-                        orders_processed += 1
+                        quote_cache[(symbol, exchange)] = quote
 
-                # Wait 1 second before next batch if more orders remain
-                if i + self.order_rate_limit < len(pending_orders):
-                    time.sleep(self.batch_delay)
+            quote_time = time.perf_counter() - quote_start
 
-            logger.info(f"Processed {orders_processed} orders")
+            # Orders are evaluated locally against the quote cache - no throttling needed
+            process_start = time.perf_counter()
+            orders_processed = 0
+            for order in pending_orders:
+                quote = quote_cache.get((order.symbol, order.exchange))
+                if quote:
+                    self._process_order(order, quote)
+                    orders_processed += 1
+            process_time = time.perf_counter() - process_start
+
+            self.last_pass_metrics = {
+                "orders": len(pending_orders),
+                "orders_processed": orders_processed,
+                "symbols": len(symbols_list),
+                "local_quotes": local_quotes,
+                "broker_calls": self._broker_calls,
+                "throttle_wait_ms": round(self._throttle_wait * 1000, 2),
+                "quote_ms": round(quote_time * 1000, 2),
+                "process_ms": round(process_time * 1000, 2),
+                "total_ms": round((time.perf_counter() - pass_start) * 1000, 2),
+            }
+            logger.info(
+                f"Processed {orders_processed} orders in {self.last_pass_metrics['total_ms']}ms "
+                f"(quotes {self.last_pass_metrics['quote_ms']}ms, "
+                f"{self._broker_calls} broker calls, {local_quotes} local quotes, "
+                f"throttled {self.last_pass_metrics['throttle_wait_ms']}ms)"
+            )
 
         except Exception as e:
             logger.exception(f"Error in execution engine: {e}")
 
+    def _get_local_quotes(self, symbols_list):
+        """
+        Get quotes for symbols with fresh LTPs in the MarketDataService cache.
+        Returns dict mapping (symbol, exchange) to quote data.
+        """
+        quote_cache = {}
+
+        if LOCAL_QUOTE_MAX_AGE <= 0 or not symbols_list:
+            return quote_cache
+
+        try:
+            from services.market_data_service import get_market_data_service
+
+            market_data_service = get_market_data_service()
+            for symbol, exchange in symbols_list:
+                if not market_data_service.is_data_fresh(symbol, exchange, LOCAL_QUOTE_MAX_AGE):
+                    continue
+                ltp = market_data_service.get_ltp_value(symbol, exchange)
+                if ltp:
+                    # No bid/ask in the LTP cache - MARKET orders fall back to LTP
+                    quote_cache[(symbol, exchange)] = {"ltp": ltp}
+
+        except Exception as e:
+            logger.debug(f"Could not read local quotes: {e}")
+
+        return quote_cache
+
+    def _throttle_broker_call(self):
+        """Wait for a broker API token and record the call for the pass metrics"""
+        self._throttle_wait += self.rate_limiter.acquire()
+        self._broker_calls += 1
+
     def _fetch_quote(self, symbol, exchange):
         """
         Fetch real-time quote for a symbol using API key
@@ -130,6 +195,7 @@ class ExecutionEngine:
             api_key = decrypt_token(api_key_obj.api_key_encrypted)
 
             # Use quotes service with API key authentication
+            self._throttle_broker_call()
             success, response, status_code = get_quotes(
                 symbol=symbol, exchange=exchange, api_key=api_key
             )
@@ -180,6 +246,7 @@ class ExecutionEngine:
             ]
 
             # Use multiquotes service
+            self._throttle_broker_call()
             success, response, status_code = get_multiquotes(
                 symbols=symbols_payload, api_key=api_key
             )
@@ -247,65 +314,73 @@ class ExecutionEngine:
                 logger.warning(f"Invalid LTP for order {order.orderid}: {ltp}")
                 return
 
-            # Determine if order should be executed based on price type
-            should_execute = False
-            execution_price = None
+            # Execute the order if conditions are met
+            execution_price = self._get_execution_price(order, ltp, bid, ask)
+            if execution_price is not None:
+                self._execute_order(order, execution_price)
+
+        except Exception as e:
+            logger.exception(f"Error processing order {order.orderid}: {e}")
 
-            if order.price_type == "MARKET":
-                # Market orders execute immediately at bid/ask (more realistic)
-                # BUY: Execute at ask price (pay seller's asking price)
-                # SELL: Execute at bid price (receive buyer's bid price)
-                # If bid/ask is 0, fall back to LTP
+    def _get_execution_price(self, order, ltp, bid, ask):
+        """
+        Decide whether an order executes at the given prices
+        Returns the execution price, or None if the order should keep resting
+        """
+        # Determine if order should be executed based on price type
+        should_execute = False
+        execution_price = None
+
+        if order.price_type == "MARKET":
+            # Market orders execute immediately at bid/ask (more realistic)
+            # BUY: Execute at ask price (pay seller's asking price)
+            # SELL: Execute at bid price (receive buyer's bid price)
+            # If bid/ask is 0, fall back to LTP
+            should_execute = True
+            if order.action == "BUY":
+                execution_price = ask if ask > 0 else ltp
+            else:  # SELL
+                execution_price = bid if bid > 0 else ltp
+
+        elif order.price_type == "LIMIT":
+            # Limit BUY: Execute if LTP <= Limit Price (you get filled at LTP or better)
+            # Limit SELL: Execute if LTP >= Limit Price (you get filled at LTP or better)
+            if order.action == "BUY" and ltp <= order.price:
                 should_execute = True
-                if order.action == "BUY":
-                    execution_price = ask if ask > 0 else ltp
-                else:  # SELL
-                    execution_price = bid if bid > 0 else ltp
-
-            elif order.price_type == "LIMIT":
-                # Limit BUY: Execute if LTP <= Limit Price (you get filled at LTP or better)
-                # Limit SELL: Execute if LTP >= Limit Price (you get filled at LTP or better)
-                if order.action == "BUY" and ltp <= order.price:
-                    should_execute = True
-                    execution_price = (
-                        ltp  # Execute at current market price (LTP), which is better than limit
-                    )
-                elif order.action == "SELL" and ltp >= order.price:
-                    should_execute = True
-                    execution_price = (
-                        ltp  # Execute at current market price (LTP), which is better than limit
-                    )
+                execution_price = (
+                    ltp  # Execute at current market price (LTP), which is better than limit
+                )
+            elif order.action == "SELL" and ltp >= order.price:
+                should_execute = True
+                execution_price = (
+                    ltp  # Execute at current market price (LTP), which is better than limit
+                )
 
-            elif order.price_type == "SL":
-                # Stop Loss Limit order
-                # SL BUY: When LTP >= trigger price, order activates. Execute at LTP if LTP <= limit price
-                # SL SELL: When LTP <= trigger price, order activates. Execute at LTP if LTP >= limit price
-                if order.action == "BUY" and ltp >= order.trigger_price:
-                    if ltp <= order.price:
-                        should_execute = True
-                        execution_price = ltp  # Execute at current market price (LTP)
-                elif order.action == "SELL" and ltp <= order.trigger_price:
-                    if ltp >= order.price:
-                        should_execute = True
-                        execution_price = ltp  # Execute at current market price (LTP)
-
-            elif order.price_type == "SL-M":
-                # Stop Loss Market order
-                # BUY: Execute at market when LTP >= trigger price
-                # SELL: Execute at market when LTP <= trigger price
-                if order.action == "BUY" and ltp >= order.trigger_price:
+        elif order.price_type == "SL":
+            # Stop Loss Limit order
+            # SL BUY: When LTP >= trigger price, order activates. Execute at LTP if LTP <= limit price
+            # SL SELL: When LTP <= trigger price, order activates. Execute at LTP if LTP >= limit price
+            if order.action == "BUY" and ltp >= order.trigger_price:
+                if ltp <= order.price:
                     should_execute = True
-                    execution_price = ltp
-                elif order.action == "SELL" and ltp <= order.trigger_price:
+                    execution_price = ltp  # Execute at current market price (LTP)
+            elif order.action == "SELL" and ltp <= order.trigger_price:
+                if ltp >= order.price:
                     should_execute = True
-                    execution_price = ltp
+                    execution_price = ltp  # Execute at current market price (LTP)
 
-            # Execute the order if conditions are met
-            if should_execute:
-                self._execute_order(order, execution_price)
+        elif order.price_type == "SL-M":
+            # Stop Loss Market order
+            # BUY: Execute at market when LTP >= trigger price
+            # SELL: Execute at market when LTP <= trigger price
+            if order.action == "BUY" and ltp >= order.trigger_price:
+                should_execute = True
+                execution_price = ltp
+            elif order.action == "SELL" and ltp <= order.trigger_price:
+                should_execute = True
+                execution_price = ltp
 
-        except Exception as e:
-            logger.exception(f"Error processing order {order.orderid}: {e}")
+        return execution_price if should_execute else None
 
     def _execute_order(self, order, execution_price):
         """
@@ -316,33 +391,9 @@ class ExecutionEngine:
                 f"Executing order {order.orderid}: {order.symbol} {order.action} {order.quantity} @ {execution_price}"
             )
 
-            # Generate trade ID
-            tradeid = self._generate_trade_id()
-
-            # Create trade record
-            trade = SandboxTrades(
-                tradeid=tradeid,
-                orderid=order.orderid,
-                user_id=order.user_id,
-                symbol=order.symbol,
-                exchange=order.exchange,
-                action=order.action,
-                quantity=order.quantity,
-                price=execution_price,
-                product=order.product,
-                strategy=order.strategy,
-                trade_timestamp=datetime.now(pytz.timezone("Asia/Kolkata")),
+            tradeid = self._record_fill(
+                order, execution_price, datetime.now(pytz.timezone("Asia/Kolkata"))
             )
-
-            db_session.add(trade)
-
-            # Update order status
-            order.order_status = "complete"
-            order.average_price = execution_price
-            order.filled_quantity = order.quantity
-            order.pending_quantity = 0
-            order.update_timestamp = datetime.now(pytz.timezone("Asia/Kolkata"))
-
             db_session.commit()
 
             # Update position
@@ -363,6 +414,111 @@ class ExecutionEngine:
             except:
                 db_session.rollback()
 
+    def _record_fill(self, order, execution_price, now):
+        """
+        Add the trade for a filled order and mark the order complete (caller commits)
+        Returns the trade ID
+        """
+        # Generate trade ID
+        tradeid = self._generate_trade_id()
+
+        # Create trade record
+        trade = SandboxTrades(
+            tradeid=tradeid,
+            orderid=order.orderid,
+            user_id=order.user_id,
+            symbol=order.symbol,
+            exchange=order.exchange,
+            action=order.action,
+            quantity=order.quantity,
+            price=execution_price,
+            product=order.product,
+            strategy=order.strategy,
+            trade_timestamp=now,
+        )
+
+        db_session.add(trade)
+
+        # Update order status
+        order.order_status = "complete"
+        order.average_price = execution_price
+        order.filled_quantity = order.quantity
+        order.pending_quantity = 0
+        order.update_timestamp = now
+
+        return tradeid
+
+    def process_orders_batch(self, orders, quote):
+        """
+        Process several orders for one symbol against the same quote
+        Trades and order status updates for all executed orders go out in a single commit.
+        Positions are still netted one order at a time since margin release commits via FundManager.
+        Returns the list of executed order IDs.
+        """
+        if not orders:
+            return []
+
+        ltp = Decimal(str(quote.get("ltp", 0)))
+        bid = Decimal(str(quote.get("bid", 0)))
+        ask = Decimal(str(quote.get("ask", 0)))
+
+        if ltp <= 0:
+            logger.warning(f"Invalid LTP for batch of {len(orders)} orders: {ltp}")
+            return []
+
+        # Orders that already have a trade go through the single-order path,
+        # which cleans up the race with immediate MARKET execution
+        order_ids = [order.orderid for order in orders]
+        traded_ids = {
+            row.orderid
+            for row in db_session.query(SandboxTrades.orderid)
+            .filter(SandboxTrades.orderid.in_(order_ids))
+            .all()
+        }
+
+        fills = []
+        for order in orders:
+            if order.orderid in traded_ids:
+                self._process_order(order, quote)
+                continue
+            try:
+                execution_price = self._get_execution_price(order, ltp, bid, ask)
+            except Exception as e:
+                logger.exception(f"Error processing order {order.orderid}: {e}")
+                continue
+            if execution_price is not None:
+                fills.append((order, execution_price))
+
+        if not fills:
+            return []
+
+        try:
+            now = datetime.now(pytz.timezone("Asia/Kolkata"))
+            for order, execution_price in fills:
+                self._record_fill(order, execution_price, now)
+
+            db_session.commit()
+
+        except Exception as e:
+            db_session.rollback()
+            logger.exception(
+                f"Error executing batch of {len(fills)} orders, retrying one by one: {e}"
+            )
+            for order, execution_price in fills:
+                self._execute_order(order, execution_price)
+            return [order.orderid for order, _ in fills if order.order_status == "complete"]
+
+        logger.info(f"Executed {len(fills)} orders in one batch @ LTP {ltp}")
+
+        for order, execution_price in fills:
+            try:
+                self._update_position(order, execution_price)
+            except Exception:
+                # Already logged by _update_position; the trade itself is committed
+                continue
+
+        return [order.orderid for order, _ in fills]
+
     def _update_position(self, order, execution_price):
         """
         Update or create position after trade execution
@@ -34,13 +34,14 @@ class ExecutionEngineThread(threading.Thread):
         super().__init__(daemon=True, name="SandboxExecutionEngine")
         self.stop_event = threading.Event()
         self.check_interval = int(get_config("order_check_interval", "5"))
+        self.engine = None
 
     def run(self):
         """Main thread loop"""
         from sandbox.execution_engine import ExecutionEngine
 
         logger.debug("Sandbox Execution Engine thread started")
-        engine = ExecutionEngine()
+        self.engine = engine = ExecutionEngine()
 
         while not self.stop_event.is_set():
             try:
@@ -253,6 +254,9 @@ def get_execution_engine_status():
     if _execution_thread is not None:
         status["thread_name"] = _execution_thread.name
         status["thread_alive"] = _execution_thread.is_alive()
+        if _execution_thread.engine is not None:
+            status["last_pass"] = _execution_thread.engine.last_pass_metrics
+            status["quote_rate_limiter"] = _execution_thread.engine.rate_limiter.get_stats()
 
     # Add WebSocket engine info if available
     if _websocket_engine is not None:
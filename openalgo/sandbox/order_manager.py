@@ -523,6 +523,10 @@ class OrderManager:
                     logger.exception(f"Error executing market order immediately: {e}")
                     # Order remains in 'open' status if execution fails
 
+            # Hand resting orders to the WebSocket execution engine's trigger book
+            if order.order_status == "open":
+                self._notify_execution_engine(order)
+
             return True, {"status": "success", "orderid": orderid, "mode": "analyze"}, 200
 
         except Exception as e:
@@ -599,6 +603,9 @@ class OrderManager:
 
             logger.info(f"Order modified: {orderid}")
 
+            # Re-book the order at its new price/trigger
+            self._notify_execution_engine(order)
+
             return (
                 True,
                 {
@@ -739,6 +746,8 @@ class OrderManager:
 
             logger.info(f"Order cancelled: {orderid}")
 
+            self._notify_execution_engine(order)
+
             return (
                 True,
                 {
@@ -900,6 +909,21 @@ class OrderManager:
                 500,
             )
 
+    def _notify_execution_engine(self, order):
+        """Keep the WebSocket execution engine's trigger book in sync with an order"""
+        try:
+            from sandbox.websocket_execution_engine import (
+                notify_order_completed,
+                notify_order_placed,
+            )
+
+            if order.order_status == "open":
+                notify_order_placed(order)
+            else:
+                notify_order_completed(order.orderid, f"{order.exchange}:{order.symbol}")
+        except Exception as e:
+            logger.debug(f"Could not notify WebSocket execution engine for {order.orderid}: {e}")
+
     def _validate_order(self, order_data):
         """Validate order parameters"""
         required_fields = ["symbol", "exchange", "action", "quantity", "price_type", "product"]
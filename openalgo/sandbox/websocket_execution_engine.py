@@ -7,15 +7,14 @@ Features:
 - Subscribes to MarketDataService for LTP updates
 - Immediate execution when price conditions are met (sub-second latency)
 - Automatic fallback to polling engine if WebSocket data is stale
-- Thread-safe order index management
+- Thread-safe in-memory trigger book: each tick pops only the orders whose price was crossed
 """
 
 import os
 import sys
 import threading
 import time
-from decimal import Decimal
-from typing import Dict, List, Optional, Set
+from bisect import bisect_left, bisect_right
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,6 +26,134 @@ from utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+class OrderTriggerBook:
+    """
+    Resting orders for one symbol, sorted by the price that makes them executable.
+
+    Orders that execute when LTP falls to a level (LIMIT BUY, SL/SL-M SELL) and orders
+    that execute when LTP rises to a level (LIMIT SELL, SL/SL-M BUY) are kept in two
+    sorted level arrays, so a tick finds the crossed orders with one bisect. MARKET orders
+    that are still open execute on the next tick.
+    """
+
+    FALLS_TO = "falls_to"  # executable when LTP <= level
+    RISES_TO = "rises_to"  # executable when LTP >= level
+    MARKET = "market"
+
+    def __init__(self):
+        # Parallel arrays sorted by level: levels[i] belongs to order_ids[i]
+        self._falls_levels: list[float] = []
+        self._falls_ids: list[str] = []
+        self._rises_levels: list[float] = []
+        self._rises_ids: list[str] = []
+        self._market_ids: list[str] = []
+
+        # order_id -> (side, level, limit) where limit is the SL limit price or None
+        self._orders: dict[str, tuple[str, float | None, float | None]] = {}
+
+    @classmethod
+    def get_trigger(cls, order) -> tuple[str, float | None, float | None] | None:
+        """Return (side, level, limit) for an order, or None if it can never trigger"""
+        try:
+            if order.price_type == "MARKET":
+                return cls.MARKET, None, None
+
+            buy = order.action == "BUY"
+            if order.price_type == "LIMIT":
+                return (cls.FALLS_TO if buy else cls.RISES_TO), float(order.price), None
+
+            if order.price_type in ("SL", "SL-M"):
+                limit = float(order.price) if order.price_type == "SL" else None
+                return (cls.RISES_TO if buy else cls.FALLS_TO), float(order.trigger_price), limit
+
+        except (TypeError, ValueError):
+            pass
+
+        return None
+
+    def add(self, order_id: str, side: str, level: float | None, limit: float | None = None):
+        """Add an order, replacing any previous entry for the same order ID"""
+        self.remove(order_id)
+        self._orders[order_id] = (side, level, limit)
+
+        if side == self.MARKET:
+            self._market_ids.append(order_id)
+            return
+
+        levels, ids = self._arrays(side)
+        # Falls-to orders are popped from the top of the array, rises-to orders from the
+        # bottom, so place ties so that orders at the same price keep arrival order
+        if side == self.FALLS_TO:
+            index = bisect_left(levels, level)
+        else:
+            index = bisect_right(levels, level)
+        levels.insert(index, level)
+        ids.insert(index, order_id)
+
+    def remove(self, order_id: str) -> bool:
+        """Remove an order from the book"""
+        entry = self._orders.pop(order_id, None)
+        if entry is None:
+            return False
+
+        side, level, _ = entry
+        if side == self.MARKET:
+            self._market_ids.remove(order_id)
+            return True
+
+        levels, ids = self._arrays(side)
+        lo = bisect_left(levels, level)
+        hi = bisect_right(levels, level)
+        index = ids.index(order_id, lo, hi)
+        del levels[index]
+        del ids[index]
+        return True
+
+    def pop_crossed(self, ltp: float) -> list[str]:
+        """
+        Remove and return the orders that are executable at this LTP.
+        SL orders whose trigger was crossed but whose limit is not satisfied stay in the book.
+        """
+        crossed = self._market_ids
+        self._market_ids = []
+
+        # LTP fell to or below these levels
+        index = bisect_left(self._falls_levels, ltp)
+        if index < len(self._falls_levels):
+            crossed.extend(reversed(self._falls_ids[index:]))
+            del self._falls_levels[index:]
+            del self._falls_ids[index:]
+
+        # LTP rose to or above these levels
+        index = bisect_right(self._rises_levels, ltp)
+        if index:
+            crossed.extend(self._rises_ids[:index])
+            del self._rises_levels[:index]
+            del self._rises_ids[:index]
+
+        executable = []
+        for order_id in crossed:
+            side, level, limit = self._orders.pop(order_id)
+            if limit is not None and (ltp > limit if side == self.RISES_TO else ltp < limit):
+                # Triggered SL order outside its limit price - keep it resting
+                self.add(order_id, side, level, limit)
+                continue
+            executable.append(order_id)
+
+        return executable
+
+    def _arrays(self, side: str) -> tuple[list[float], list[str]]:
+        if side == self.FALLS_TO:
+            return self._falls_levels, self._falls_ids
+        return self._rises_levels, self._rises_ids
+
+    def __len__(self):
+        return len(self._orders)
+
+    def __contains__(self, order_id: str):
+        return order_id in self._orders
+
+
 class WebSocketExecutionEngine:
     """
     Event-driven execution engine that uses WebSocket market data
@@ -39,13 +166,18 @@ class WebSocketExecutionEngine:
         self._running = False
         self._lock = threading.Lock()
 
-        # Index of pending orders by symbol key (exchange:symbol)
-        # Maps symbol_key -> list of order IDs
-        self._pending_orders_index: dict[str, list[str]] = {}
+        # Trigger book of pending orders by symbol key (exchange:symbol)
+        self._trigger_books: dict[str, OrderTriggerBook] = {}
+
+        # Orders popped from a book whose execution has not finished yet
+        self._in_flight: set[str] = set()
 
         # Track symbols we're monitoring
         self._monitored_symbols: set[str] = set()
 
+        # Periodically rebuild the books from the database to pick up out-of-band changes
+        self.book_resync_interval = int(os.getenv("SANDBOX_BOOK_RESYNC_INTERVAL", "60"))
+
         # Fallback settings
         self.fallback_enabled = os.getenv("SANDBOX_ENGINE_FALLBACK", "true").lower() == "true"
         self.stale_data_threshold = 30  # seconds
@@ -107,53 +239,67 @@ class WebSocketExecutionEngine:
         self._subscriber_id = None
 
     def _rebuild_order_index(self):
-        """Build index of pending orders from database"""
+        """Build the trigger books of pending orders from database"""
+        try:
+            pending_orders = SandboxOrders.query.filter_by(order_status="open").all()
+        except Exception as e:
+            logger.exception(f"Error building order index: {e}")
+            return
+        finally:
+            db_session.remove()
+
         with self._lock:
-            self._pending_orders_index.clear()
+            self._trigger_books.clear()
             self._monitored_symbols.clear()
 
-            try:
-                pending_orders = SandboxOrders.query.filter_by(order_status="open").all()
-
-                for order in pending_orders:
-                    symbol_key = f"{order.exchange}:{order.symbol}"
-                    if symbol_key not in self._pending_orders_index:
-                        self._pending_orders_index[symbol_key] = []
-                    self._pending_orders_index[symbol_key].append(order.orderid)
-                    self._monitored_symbols.add(symbol_key)
+            for order in pending_orders:
+                # Orders being executed right now are re-booked by their tick if still open
+                if order.orderid not in self._in_flight:
+                    self._book_order(order)
 
-                logger.info(
-                    f"Built order index: {len(pending_orders)} orders across {len(self._monitored_symbols)} symbols"
-                )
+            logger.info(
+                f"Built order index: {len(pending_orders)} orders across {len(self._monitored_symbols)} symbols"
+            )
 
-            except Exception as e:
-                logger.exception(f"Error building order index: {e}")
+    def _book_order(self, order):
+        """Add an order to its symbol's trigger book (caller holds _lock)"""
+        trigger = OrderTriggerBook.get_trigger(order)
+        if trigger is None:
+            logger.warning(f"Order {order.orderid} has no usable price/trigger, not monitored")
+            return
 
-    def notify_order_placed(self, order):
-        """Called when a new order is placed to update the index"""
         symbol_key = f"{order.exchange}:{order.symbol}"
+        book = self._trigger_books.get(symbol_key)
+        if book is None:
+            book = self._trigger_books[symbol_key] = OrderTriggerBook()
+            self._monitored_symbols.add(symbol_key)
 
-        with self._lock:
-            if symbol_key not in self._pending_orders_index:
-                self._pending_orders_index[symbol_key] = []
+        book.add(order.orderid, *trigger)
+
+    def _unbook_order(self, order_id: str, symbol_key: str):
+        """Remove an order from its symbol's trigger book (caller holds _lock)"""
+        book = self._trigger_books.get(symbol_key)
+        if book is None:
+            return
+
+        if book.remove(order_id):
+            logger.debug(f"Removed order {order_id} from index for {symbol_key}")
 
-            if order.orderid not in self._pending_orders_index[symbol_key]:
-                self._pending_orders_index[symbol_key].append(order.orderid)
-                self._monitored_symbols.add(symbol_key)
-                logger.debug(f"Added order {order.orderid} to index for {symbol_key}")
+        # Clean up empty symbol entries
+        if not book:
+            del self._trigger_books[symbol_key]
+            self._monitored_symbols.discard(symbol_key)
+
+    def notify_order_placed(self, order):
+        """Called when a new order is placed (or an open order modified) to update the index"""
+        with self._lock:
+            self._book_order(order)
+        logger.debug(f"Added order {order.orderid} to index for {order.exchange}:{order.symbol}")
 
     def notify_order_completed(self, order_id: str, symbol_key: str):
         """Called when an order is completed/cancelled to update the index"""
         with self._lock:
-            if symbol_key in self._pending_orders_index:
-                if order_id in self._pending_orders_index[symbol_key]:
-                    self._pending_orders_index[symbol_key].remove(order_id)
-                    logger.debug(f"Removed order {order_id} from index for {symbol_key}")
-
-                # Clean up empty symbol entries
-                if not self._pending_orders_index[symbol_key]:
-                    del self._pending_orders_index[symbol_key]
-                    self._monitored_symbols.discard(symbol_key)
+            self._unbook_order(order_id, symbol_key)
 
     def _on_market_data(self, data: dict):
         """
@@ -174,63 +320,75 @@ class WebSocketExecutionEngine:
 
             symbol_key = f"{exchange}:{symbol}"
 
-            # Check if we have pending orders for this symbol
+            # Pop only the orders whose trigger this LTP crossed
             with self._lock:
-                order_ids = self._pending_orders_index.get(symbol_key, []).copy()
+                book = self._trigger_books.get(symbol_key)
+                if book is None:
+                    return
 
-            if not order_ids:
-                return
+                order_ids = book.pop_crossed(float(ltp))
+                if not order_ids:
+                    return
 
-            # Process each pending order for this symbol
-            for order_id in order_ids:
-                try:
-                    self._check_and_execute_order(order_id, Decimal(str(ltp)))
-                except Exception as e:
-                    logger.exception(f"Error processing order {order_id}: {e}")
+                if not book:
+                    del self._trigger_books[symbol_key]
+                    self._monitored_symbols.discard(symbol_key)
+                self._in_flight.update(order_ids)
+
+            try:
+                self._execute_crossed_orders(order_ids, ltp)
+            finally:
+                with self._lock:
+                    self._in_flight.difference_update(order_ids)
 
         except Exception as e:
             logger.exception(f"Error in market data callback: {e}")
 
-    def _check_and_execute_order(self, order_id: str, ltp: Decimal):
+    def _execute_crossed_orders(self, order_ids: list[str], ltp: float):
         """
-        Check if an order should execute at the current LTP and execute if conditions are met.
+        Load the crossed orders in one query and execute them as a batch.
+        Orders that are still open afterwards (e.g. modified since they were booked) are re-booked
+        with their current prices.
         """
         try:
-            # Fetch the order from database
-            order = SandboxOrders.query.filter_by(orderid=order_id, order_status="open").first()
+            orders = SandboxOrders.query.filter(
+                SandboxOrders.orderid.in_(order_ids), SandboxOrders.order_status == "open"
+            ).all()
 
-            if not order:
-                # Order no longer pending, remove from index
-                symbol_key = f"{order.exchange if order else 'unknown'}:{order.symbol if order else 'unknown'}"
-                self.notify_order_completed(order_id, symbol_key)
-                return
+            # Keep the book's price-time order for execution
+            position = {order_id: i for i, order_id in enumerate(order_ids)}
+            orders.sort(key=lambda order: position[order.orderid])
 
-            # Create a mock quote for the execution engine's _process_order method
-            quote = {
-                "ltp": float(ltp),
-                "bid": float(ltp),  # Use LTP as bid/ask fallback
-                "ask": float(ltp),
-            }
+            # Use LTP as bid/ask fallback, as with single order processing
+            quote = {"ltp": float(ltp), "bid": float(ltp), "ask": float(ltp)}
+            self._execution_engine.process_orders_batch(orders, quote)
 
-            # Use the existing execution engine's order processing logic
-            self._execution_engine._process_order(order, quote)
-
-            # If order was executed, remove from index
-            # Refresh the order to check status
-            db_session.refresh(order)
-            if order.order_status != "open":
-                symbol_key = f"{order.exchange}:{order.symbol}"
-                self.notify_order_completed(order_id, symbol_key)
+            with self._lock:
+                for order in orders:
+                    if order.order_status == "open":
+                        self._book_order(order)
 
         except Exception as e:
-            logger.exception(f"Error checking/executing order {order_id}: {e}")
+            logger.exception(f"Error executing {len(order_ids)} crossed orders: {e}")
+            # Put the orders back so the next tick retries them
+            with self._lock:
+                self._in_flight.difference_update(order_ids)
+            self._rebuild_order_index()
+        finally:
+            db_session.remove()
 
     def _start_health_monitor(self):
         """Start a thread to monitor WebSocket health and trigger fallback if needed"""
 
         def monitor():
+            last_resync = time.time()
             while self._running:
                 try:
+                    # Pick up orders changed outside the notify hooks
+                    if time.time() - last_resync >= self.book_resync_interval:
+                        self._rebuild_order_index()
+                        last_resync = time.time()
+
                     # Check if market data is fresh
                     is_fresh = self.market_data_service.is_data_fresh(
                         max_age_seconds=self.stale_data_threshold
@@ -330,6 +488,22 @@ def stop_websocket_execution_engine():
         return True, "WebSocket execution engine not running"
 
 
+def notify_order_placed(order):
+    """Book a new or modified open order in the running WebSocket execution engine"""
+    with _engine_lock:
+        engine = _websocket_execution_engine
+    if engine is not None and engine._running:
+        engine.notify_order_placed(order)
+
+
+def notify_order_completed(order_id: str, symbol_key: str):
+    """Remove a completed/cancelled order from the running WebSocket execution engine"""
+    with _engine_lock:
+        engine = _websocket_execution_engine
+    if engine is not None and engine._running:
+        engine.notify_order_completed(order_id, symbol_key)
+
+
 def is_websocket_execution_engine_running() -> bool:
     """Check if WebSocket execution engine is running"""
     with _engine_lock:
@@ -18,6 +18,9 @@ OPENALGO_ROOT = os.path.join(PROJECT_ROOT, 'openalgo')
 
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+# Broker modules import OpenAlgo packages top-level (database.*, utils.*)
+if OPENALGO_ROOT not in sys.path:
+    sys.path.append(OPENALGO_ROOT)
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='[DAILY_PREP] %(message)s')
@@ -84,6 +87,8 @@ def check_login_and_refresh_instruments():
         try:
             from openalgo.database.auth_db import Auth, db_session
             from openalgo.broker.zerodha.database.master_contract_db import master_contract_download
+            # Same module the broker download stages into (not a second openalgo.* copy)
+            from database.master_contract_loader import apply_load
 
             # Check if we have valid users
             try:
@@ -103,6 +108,7 @@ def check_login_and_refresh_instruments():
                 logger.info("   Refreshing Zerodha instruments...")
                 try:
                     result = master_contract_download()
+                    apply_load("zerodha")
                     logger.info("✅ Instrument download triggered/completed.")
                 except Exception as e:
                     logger.error(f"❌ Instrument Refresh Failed: {e}")
@@ -27,6 +27,7 @@ from database.historify_db import (
     get_ohlcv,
     init_database,
     upsert_market_data,
+    upsert_market_data_batch,
 )
 from database.historify_db import add_to_watchlist as db_add_to_watchlist
 from database.historify_db import bulk_add_to_watchlist as db_bulk_add_to_watchlist
@@ -237,6 +238,59 @@ def bulk_add_to_watchlist(symbols: list[dict[str, str]]) -> tuple[bool, dict[str
 # =============================================================================
 
 
+def _fetch_history_frame(
+    symbol: str,
+    exchange: str,
+    interval: str,
+    start_date: str,
+    end_date: str,
+    api_key: str,
+    rate_limiter=None,
+) -> tuple[bool, pd.DataFrame | None, dict[str, Any], int]:
+    """
+    Fetch historical data from the broker as a DataFrame ready for upsert_market_data.
+
+    Args:
+        rate_limiter: Optional TokenBucket to acquire from before calling the broker
+
+    Returns:
+        Tuple of (success, dataframe or None when the broker returned no rows,
+        error response, status_code)
+    """
+    logger.info(f"Downloading {symbol}:{exchange}:{interval} from {start_date} to {end_date}")
+
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+
+    # Fetch data from broker via history_service
+    success, response, status_code = get_history(
+        symbol=symbol,
+        exchange=exchange,
+        interval=interval,
+        start_date=start_date,
+        end_date=end_date,
+        api_key=api_key,
+    )
+
+    if not success:
+        return False, None, response, status_code
+
+    data = response.get("data", [])
+    if not data:
+        return True, None, response, status_code
+
+    # Convert to DataFrame
+    df = pd.DataFrame(data)
+
+    # Normalize timestamp column
+    if "time" in df.columns:
+        df["timestamp"] = df["time"]
+    elif "timestamp" not in df.columns:
+        return False, None, {"status": "error", "message": "No timestamp column in data"}, 500
+
+    return True, df, response, status_code
+
+
 def download_data(
     symbol: str, exchange: str, interval: str, start_date: str, end_date: str, api_key: str
 ) -> tuple[bool, dict[str, Any], int]:
@@ -270,23 +324,13 @@ def download_data(
                 400,
             )
 
-        logger.info(f"Downloading {symbol}:{exchange}:{interval} from {start_date} to {end_date}")
-
-        # Fetch data from broker via history_service
-        success, response, status_code = get_history(
-            symbol=symbol,
-            exchange=exchange,
-            interval=interval,
-            start_date=start_date,
-            end_date=end_date,
-            api_key=api_key,
+        success, df, response, status_code = _fetch_history_frame(
+            symbol, exchange, interval, start_date, end_date, api_key
         )
-
         if not success:
             return False, response, status_code
 
-        data = response.get("data", [])
-        if not data:
+        if df is None:
             return (
                 True,
                 {
@@ -297,15 +341,6 @@ def download_data(
                 200,
             )
 
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
-
-        # Normalize timestamp column
-        if "time" in df.columns:
-            df["timestamp"] = df["time"]
-        elif "timestamp" not in df.columns:
-            return False, {"status": "error", "message": "No timestamp column in data"}, 500
-
         # Store in DuckDB
         records = upsert_market_data(df, symbol, exchange, interval)
 
@@ -1202,21 +1237,143 @@ def get_option_chain_symbols(
 # Download Job Operations
 # =============================================================================
 
-import random
+import queue
 import threading
-import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from utils.token_bucket import TokenBucket
 
 # Job executor pool - shared across all job operations
 _job_executor = ThreadPoolExecutor(max_workers=int(os.getenv("HISTORIFY_MAX_WORKERS", "5")))
 
+# Concurrent broker fetches per job (DuckDB writes are serialized by the writer thread)
+HISTORIFY_DOWNLOAD_WORKERS = int(os.getenv("HISTORIFY_DOWNLOAD_WORKERS", "4"))
+
+# History API budget per broker, shared by all jobs (requests per second, burst size)
+HISTORIFY_BROKER_RATE_LIMIT = float(os.getenv("HISTORIFY_BROKER_RATE_LIMIT", "3"))
+HISTORIFY_BROKER_BURST = float(
+    os.getenv("HISTORIFY_BROKER_BURST", str(HISTORIFY_BROKER_RATE_LIMIT))
+)
+
+# Max queued downloads merged into one writer pass
+HISTORIFY_WRITE_BATCH_SIZE = int(os.getenv("HISTORIFY_WRITE_BATCH_SIZE", "32"))
+
 # Track running jobs for cancellation and pause state
 _running_jobs: dict[str, bool] = {}
 _paused_jobs: dict[str, threading.Event] = {}  # Event is set when NOT paused
 
 # Lock for thread-safe access to job state dictionaries
-_job_state_lock = threading.Lock()
+# (re-entrant: cancel_job calls _cleanup_job while holding it)
+_job_state_lock = threading.RLock()
+
+_broker_rate_limiters: dict[str, TokenBucket] = {}
+_broker_rate_limiters_lock = threading.Lock()
+
+
+def _get_broker_rate_limiter(broker: str | None) -> TokenBucket:
+    """Get the history API token bucket shared by all jobs for a broker."""
+    key = broker or "default"
+    with _broker_rate_limiters_lock:
+        limiter = _broker_rate_limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucket(HISTORIFY_BROKER_RATE_LIMIT, HISTORIFY_BROKER_BURST)
+            _broker_rate_limiters[key] = limiter
+        return limiter
+
+
+class _DownloadWriter:
+    """
+    Single writer thread for downloaded market data.
+
+    Fetch workers hand their DataFrames to submit() and wait on the returned Future while the
+    writer drains the queue in batches. Frames for the same symbol are merged, and the whole
+    batch is written in one transaction (one symbol at a time if that transaction fails).
+    DuckDB allows one writer at a time, so funnelling writes through one thread keeps
+    concurrent downloads from contending on the database.
+    """
+
+    def __init__(self, batch_size: int = HISTORIFY_WRITE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="HistorifyWriter", daemon=True)
+        self._thread.start()
+
+        # Statistics
+        self.batches = 0
+        self.upserts = 0
+        self.frames = 0
+
+    def submit(self, df: pd.DataFrame, symbol: str, exchange: str, interval: str) -> Future:
+        """Queue a DataFrame for upsert; the Future resolves to the number of records stored."""
+        future = Future()
+        self._queue.put((df, symbol.upper(), exchange.upper(), interval, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: list):
+        groups: dict[tuple[str, str, str], list] = {}
+        for df, symbol, exchange, interval, future in batch:
+            groups.setdefault((symbol, exchange, interval), []).append((df, future))
+
+        merged = []
+        for (symbol, exchange, interval), entries in groups.items():
+            try:
+                frames = [df for df, _ in entries]
+                df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+                if len(frames) > 1:
+                    df = df.drop_duplicates(subset="timestamp", keep="last")
+                merged.append((df, symbol, exchange, interval, entries))
+            except Exception as e:
+                for _, future in entries:
+                    future.set_exception(e)
+
+        try:
+            upsert_market_data_batch([item[:4] for item in merged])
+            self.upserts += 1
+            done, retry = merged, []
+        except Exception:
+            # Retry symbol by symbol so one bad frame does not fail the whole batch
+            done, retry = [], merged
+
+        for df, symbol, exchange, interval, entries in retry:
+            try:
+                upsert_market_data(df, symbol, exchange, interval)
+                self.upserts += 1
+                done.append((df, symbol, exchange, interval, entries))
+            except Exception as e:
+                for _, future in entries:
+                    future.set_exception(e)
+
+        for *_, entries in done:
+            for frame, future in entries:
+                future.set_result(len(frame))
+
+        self.batches += 1
+        self.frames += len(batch)
+
+
+_download_writer: _DownloadWriter | None = None
+_download_writer_lock = threading.Lock()
+
+
+def _get_download_writer() -> _DownloadWriter:
+    """Get the process-wide download writer, starting its thread on first use."""
+    global _download_writer
+    if _download_writer is None:
+        with _download_writer_lock:
+            if _download_writer is None:
+                _download_writer = _DownloadWriter()
+    return _download_writer
 
 
 def cleanup_zombie_jobs():
@@ -1334,29 +1491,130 @@ def create_and_start_job(
         return False, {"status": "error", "message": str(e)}, 500
 
 
+def _download_job_item(
+    job: dict[str, Any],
+    item: dict[str, Any],
+    api_key: str,
+    incremental: bool,
+    rate_limiter: TokenBucket,
+) -> tuple[str, int, str | None]:
+    """
+    Download one job item on a fetch worker thread.
+
+    Broker calls are paced by the broker's token bucket and the data is stored through the
+    shared writer thread.
+
+    Returns:
+        Tuple of (item status, records stored, error message)
+    """
+    from database.historify_db import get_data_range
+
+    symbol = item["symbol"]
+    exchange = item["exchange"]
+    interval = job["interval"]
+    writer = _get_download_writer()
+
+    # Determine date ranges - use incremental if enabled
+    requested_start = job["start_date"]
+    requested_end = job["end_date"]
+    ranges = [(requested_start, requested_end, "Unknown error")]
+
+    if incremental:
+        # Check existing data range for this symbol
+        data_range = get_data_range(symbol, exchange, interval)
+
+        if data_range and data_range.get("first_timestamp") and data_range.get("last_timestamp"):
+            first_datetime = datetime.fromtimestamp(data_range["first_timestamp"])
+            last_datetime = datetime.fromtimestamp(data_range["last_timestamp"])
+
+            requested_start_dt = datetime.strptime(requested_start, "%Y-%m-%d")
+            requested_end_dt = datetime.strptime(requested_end, "%Y-%m-%d")
+
+            # Determine what needs to be downloaded:
+            # 1. Data BEFORE existing data (if requested_start < first_timestamp)
+            # 2. Data AFTER existing data (if requested_end > last_timestamp)
+
+            need_before = requested_start_dt.date() < first_datetime.date()
+            need_after = requested_end_dt.date() > last_datetime.date()
+
+            # For 1m data, be more precise about timing
+            if interval == "1m":
+                need_after = requested_end_dt.date() >= last_datetime.date()
+
+            if not need_before and not need_after:
+                # Data already covers the requested range
+                logger.info(f"Skipping {symbol} - data already covers requested range")
+                return "skipped", 0, "Data already covers requested range"
+
+            ranges = []
+
+            # Download data BEFORE existing range if needed
+            if need_before:
+                # End date for "before" download is the day before first existing data
+                if interval == "1m":
+                    before_end = first_datetime.strftime("%Y-%m-%d")
+                else:
+                    before_end = (first_datetime - timedelta(days=1)).strftime("%Y-%m-%d")
+
+                if requested_start <= before_end:
+                    logger.debug(
+                        f"Incremental (before): {symbol} from {requested_start} to {before_end}"
+                    )
+                    ranges.append((requested_start, before_end, "Error downloading earlier data"))
+
+            # Download data AFTER existing range if needed
+            if need_after:
+                # Start date for "after" download
+                if interval == "1m":
+                    after_start = last_datetime.strftime("%Y-%m-%d")
+                else:
+                    after_start = (last_datetime + timedelta(days=1)).strftime("%Y-%m-%d")
+
+                if after_start <= requested_end:
+                    logger.debug(
+                        f"Incremental (after): {symbol} from {after_start} to {requested_end}"
+                    )
+                    ranges.append((after_start, requested_end, "Error downloading later data"))
+
+    total_records = 0
+    for start_date, end_date, default_error in ranges:
+        success, df, response, _ = _fetch_history_frame(
+            symbol, exchange, interval, start_date, end_date, api_key, rate_limiter
+        )
+        if not success:
+            return "error", total_records, response.get("message", default_error)
+
+        if df is not None:
+            total_records += writer.submit(df, symbol, exchange, interval).result()
+
+    return "success", total_records, None
+
+
 def _process_download_job(job_id: str, api_key: str):
     """
     Background job processor with Socket.IO progress updates.
 
-    This runs in a separate thread and downloads data for each symbol.
+    This runs in a separate thread and downloads the job's symbols on a pool of fetch workers.
     Features:
-    - Random delay (1-3 seconds) between downloads to avoid rate limits
-    - Pause/resume support via threading.Event
+    - Up to HISTORIFY_DOWNLOAD_WORKERS broker fetches in flight at once
+    - Per-broker token bucket (shared across jobs) instead of fixed delays between downloads
+    - Writes funneled through one batched DuckDB writer thread
+    - Pause/resume support via threading.Event (in-flight downloads finish, no new ones start)
     - Checkpoint support - resumes from pending items
     - Incremental download - only fetches data after last available timestamp
     """
     import json
 
     from database.historify_db import (
-        get_data_range,
         get_download_job,
         get_job_items,
         update_job_item_status,
         update_job_progress,
         update_job_status,
-        upsert_symbol_metadata,
     )
 
+    fetch_pool = None
+
     try:
         # Get job details
         job = get_download_job(job_id)
@@ -1389,9 +1647,9 @@ def _process_download_job(job_id: str, api_key: str):
 
         incremental = config.get("incremental", False)
 
-        # Get delay settings from environment (min and max seconds)
-        delay_min = float(os.getenv("HISTORIFY_DELAY_MIN", "1"))
-        delay_max = float(os.getenv("HISTORIFY_DELAY_MAX", "3"))
+        # Pace broker calls with the broker's shared budget
+        _, broker = get_auth_token_broker(api_key)
+        rate_limiter = _get_broker_rate_limiter(broker)
 
         # Count already completed items
         already_completed = sum(1 for item in items if item["status"] == "success")
@@ -1402,186 +1660,91 @@ def _process_download_job(job_id: str, api_key: str):
         total_items = len(items)
         processed_count = already_completed + already_failed
 
+        workers = max(1, HISTORIFY_DOWNLOAD_WORKERS)
+        fetch_pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"historify-{job_id}"
+        )
+        in_flight: dict[Future, dict[str, Any]] = {}
+
+        def is_cancelled() -> bool:
+            with _job_state_lock:
+                return not _running_jobs.get(job_id, False)
+
+        def finish(done):
+            nonlocal completed, failed, processed_count
+            for future in done:
+                item = in_flight.pop(future)
+                try:
+                    status, records, error_msg = future.result()
+                except Exception as e:
+                    logger.exception(f"Error downloading {item['symbol']}: {e}")
+                    status, records, error_msg = "error", 0, str(e)
+
+                update_job_item_status(item["id"], status, records, error_msg)
+                if status == "success":
+                    completed += 1
+                elif status == "error":
+                    failed += 1
+
+                processed_count += 1
+                # Emit progress via Socket.IO
+                _emit_progress(job_id, processed_count, total_items, item["symbol"])
+
+            # Update progress counters in database
+            update_job_progress(job_id, completed, failed)
+
+        def stop_cancelled():
+            logger.info(f"Job {job_id} cancelled")
+            # Wait for running fetches so their writes land before the final status;
+            # items that never started go back to pending
+            fetch_pool.shutdown(wait=True, cancel_futures=True)
+            for future in [future for future in in_flight if future.cancelled()]:
+                update_job_item_status(in_flight.pop(future)["id"], "pending")
+            finish(list(in_flight))
+            update_job_status(job_id, "cancelled")
+            _cleanup_job(job_id)
+
         for item in pending_items:
             # Check for cancellation with thread-safe access
+            if is_cancelled():
+                stop_cancelled()
+                return
+
             with _job_state_lock:
-                is_cancelled = not _running_jobs.get(job_id, False)
                 pause_event = _paused_jobs.get(job_id)
 
-            if is_cancelled:
-                logger.info(f"Job {job_id} cancelled")
-                update_job_status(job_id, "cancelled")
-                _cleanup_job(job_id)
-                return
-
-            # Check for pause - wait if paused
+            # Check for pause - stop submitting while paused, let in-flight downloads finish
             if pause_event:
                 while not pause_event.is_set():
+                    if in_flight:
+                        finish(wait(in_flight, timeout=0)[0])
                     # Emit paused status
                     _emit_job_paused(job_id, processed_count, total_items)
                     # Wait for resume signal (check every 1 second)
                     pause_event.wait(timeout=1.0)
-                    # Check for cancellation while paused (with lock)
-                    with _job_state_lock:
-                        is_cancelled = not _running_jobs.get(job_id, False)
-                    if is_cancelled:
-                        logger.info(f"Job {job_id} cancelled while paused")
-                        update_job_status(job_id, "cancelled")
-                        _cleanup_job(job_id)
+                    # Check for cancellation while paused
+                    if is_cancelled():
+                        stop_cancelled()
                         return
 
+            # Keep at most one item per worker in flight so pause/cancel take effect promptly
+            while len(in_flight) >= workers:
+                finish(wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)[0])
+
             # Update item status
             update_job_item_status(item["id"], "downloading")
+            future = fetch_pool.submit(
+                _download_job_item, job, item, api_key, incremental, rate_limiter
+            )
+            in_flight[future] = item
 
-            processed_count += 1
-            # Emit progress via Socket.IO
-            _emit_progress(job_id, processed_count, total_items, item["symbol"])
-
-            try:
-                # Determine date ranges - use incremental if enabled
-                requested_start = job["start_date"]
-                requested_end = job["end_date"]
-                total_records = 0
-                download_error = None
-
-                if incremental:
-                    # Check existing data range for this symbol
-                    data_range = get_data_range(item["symbol"], item["exchange"], job["interval"])
-
-                    if (
-                        data_range
-                        and data_range.get("first_timestamp")
-                        and data_range.get("last_timestamp")
-                    ):
-                        first_ts = data_range["first_timestamp"]
-                        last_ts = data_range["last_timestamp"]
-                        first_datetime = datetime.fromtimestamp(first_ts)
-                        last_datetime = datetime.fromtimestamp(last_ts)
-
-                        requested_start_dt = datetime.strptime(requested_start, "%Y-%m-%d")
-                        requested_end_dt = datetime.strptime(requested_end, "%Y-%m-%d")
-
-                        # Determine what needs to be downloaded:
-                        # 1. Data BEFORE existing data (if requested_start < first_timestamp)
-                        # 2. Data AFTER existing data (if requested_end > last_timestamp)
-
-                        need_before = requested_start_dt.date() < first_datetime.date()
-                        need_after = requested_end_dt.date() > last_datetime.date()
-
-                        # For 1m data, be more precise about timing
-                        if job["interval"] == "1m":
-                            need_after = requested_end_dt.date() >= last_datetime.date()
-
-                        if not need_before and not need_after:
-                            # Data already covers the requested range
-                            update_job_item_status(
-                                item["id"], "skipped", 0, "Data already covers requested range"
-                            )
-                            logger.info(
-                                f"Skipping {item['symbol']} - data already covers requested range"
-                            )
-                            continue
-
-                        # Download data BEFORE existing range if needed
-                        if need_before:
-                            # End date for "before" download is the day before first existing data
-                            if job["interval"] == "1m":
-                                before_end = first_datetime.strftime("%Y-%m-%d")
-                            else:
-                                before_end = (first_datetime - timedelta(days=1)).strftime(
-                                    "%Y-%m-%d"
-                                )
-
-                            if requested_start <= before_end:
-                                logger.debug(
-                                    f"Incremental (before): {item['symbol']} from {requested_start} to {before_end}"
-                                )
-                                success_before, response_before, _ = download_data(
-                                    symbol=item["symbol"],
-                                    exchange=item["exchange"],
-                                    interval=job["interval"],
-                                    start_date=requested_start,
-                                    end_date=before_end,
-                                    api_key=api_key,
-                                )
-                                if success_before:
-                                    total_records += response_before.get("records", 0)
-                                else:
-                                    download_error = response_before.get(
-                                        "message", "Error downloading earlier data"
-                                    )
-
-                        # Download data AFTER existing range if needed
-                        if need_after and download_error is None:
-                            # Start date for "after" download
-                            if job["interval"] == "1m":
-                                after_start = last_datetime.strftime("%Y-%m-%d")
-                            else:
-                                after_start = (last_datetime + timedelta(days=1)).strftime(
-                                    "%Y-%m-%d"
-                                )
-
-                            if after_start <= requested_end:
-                                logger.debug(
-                                    f"Incremental (after): {item['symbol']} from {after_start} to {requested_end}"
-                                )
-                                success_after, response_after, _ = download_data(
-                                    symbol=item["symbol"],
-                                    exchange=item["exchange"],
-                                    interval=job["interval"],
-                                    start_date=after_start,
-                                    end_date=requested_end,
-                                    api_key=api_key,
-                                )
-                                if success_after:
-                                    total_records += response_after.get("records", 0)
-                                else:
-                                    download_error = response_after.get(
-                                        "message", "Error downloading later data"
-                                    )
-
-                        # Update status based on results
-                        if download_error:
-                            update_job_item_status(
-                                item["id"], "error", total_records, download_error
-                            )
-                            failed += 1
-                        else:
-                            update_job_item_status(item["id"], "success", total_records)
-                            completed += 1
-                        continue
-
-                # Non-incremental or no existing data: download full range
-                success, response, _ = download_data(
-                    symbol=item["symbol"],
-                    exchange=item["exchange"],
-                    interval=job["interval"],
-                    start_date=requested_start,
-                    end_date=requested_end,
-                    api_key=api_key,
-                )
-
-                if success:
-                    records = response.get("records", 0)
-                    update_job_item_status(item["id"], "success", records)
-                    completed += 1
-                else:
-                    error_msg = response.get("message", "Unknown error")
-                    update_job_item_status(item["id"], "error", 0, error_msg)
-                    failed += 1
-
-            except Exception as e:
-                logger.exception(f"Error downloading {item['symbol']}: {e}")
-                update_job_item_status(item["id"], "error", 0, str(e))
-                failed += 1
-
-            # Update progress counters in database
-            update_job_progress(job_id, completed, failed)
+        while in_flight:
+            if is_cancelled():
+                stop_cancelled()
+                return
+            finish(wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)[0])
 
-            # Random delay between 1-3 seconds (configurable)
-            delay = random.uniform(delay_min, delay_max)
-            logger.debug(f"Waiting {delay:.1f}s before next download...")
-            time.sleep(delay)
+        fetch_pool.shutdown()
 
         # Job completed
         final_status = "completed" if failed == 0 else "completed_with_errors"
@@ -1597,6 +1760,8 @@ def _process_download_job(job_id: str, api_key: str):
 
     except Exception as e:
         logger.exception(f"Error processing job {job_id}: {e}")
+        if fetch_pool is not None:
+            fetch_pool.shutdown(wait=False, cancel_futures=True)
         update_job_status(job_id, "failed", str(e))
         _cleanup_job(job_id)
 
@@ -11,6 +11,8 @@ Features:
 - Connection health monitoring
 - Data validation and stale data detection
 - Priority subscriber system (critical vs display)
+- Per-symbol subscriber index so ticks only reach interested subscribers
+- Columnar (NumPy) market data cache with lock-free seqlock reads
 - Auto-reconnection awareness
 - Health status API
 """
@@ -24,6 +26,8 @@ from datetime import datetime
 from enum import IntEnum
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+import numpy as np
+
 from utils.logging import get_logger
 
 # Initialize logger
@@ -270,6 +274,383 @@ class ConnectionHealthMonitor:
         self._running = False
 
 
+class ColumnarMarketDataCache:
+    """
+    Preallocated struct-of-arrays cache for LTP and quote data.
+
+    Each symbol_key owns a row (slot) in a set of NumPy columns, so a tick is an
+    allocation-free row write and multi-symbol reads are vectorized. Writers are
+    serialized by a lock; readers never take it. Consistency is provided by a
+    per-slot seqlock: the writer makes the slot's sequence odd while writing and
+    even when done, and readers retry if the sequence was odd or changed.
+
+    Depth levels are variable-length lists, so they are kept per slot in a dict
+    and replaced as a whole on each update.
+
+    Tick timestamps (ltp, quote and depth "timestamp") are epoch milliseconds
+    whatever format the broker sent; last_update is the ingest time in epoch seconds.
+    """
+
+    INITIAL_CAPACITY = 1024
+    READ_RETRIES = 100
+
+    # Float columns
+    F_LTP, F_OPEN, F_HIGH, F_LOW, F_CLOSE, F_QUOTE_LTP, F_CHANGE, F_CHANGE_PERCENT = range(8)
+    # Integer columns
+    I_LTP_VOLUME, I_LTP_TS, I_QUOTE_VOLUME, I_QUOTE_TS, I_LAST_UPDATE, I_FLAGS = range(6)
+
+    FLAG_USED = 1
+    FLAG_LTP = 2
+    FLAG_QUOTE = 4
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self._write_lock = threading.Lock()
+        self._slots: dict[str, int] = {}
+        self._free_slots: list[int] = []
+        # slot -> (symbol_key, symbol, exchange)
+        self._names: list[tuple[str, str, str] | None] = [None] * capacity
+        self._depth: dict[int, dict[str, Any]] = {}
+        self._next_slot = 0
+        # Readers grab this tuple once, so growing swaps all columns atomically
+        self._columns = self._allocate(capacity)
+
+    @staticmethod
+    def _allocate(capacity: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return (
+            np.zeros(capacity, dtype=np.uint64),  # seqlock sequence per slot
+            np.zeros((capacity, 8), dtype=np.float64),
+            np.zeros((capacity, 6), dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, symbol_key: str) -> bool:
+        return symbol_key in self._slots
+
+    def keys(self) -> list[str]:
+        return list(self._slots)
+
+    @staticmethod
+    def _as_int(value: Any, default: int) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def _parse_timestamp(value: Any, now: int) -> int:
+        """
+        Tick timestamp in epoch milliseconds, the unit of every cached timestamp
+
+        Epoch numbers and numeric strings below 1e12 are seconds and are scaled to
+        milliseconds; larger ones are already milliseconds. ISO date/time strings are
+        converted. Anything unparseable falls back to now (epoch seconds).
+        """
+        if isinstance(value, int | np.integer) and not isinstance(value, bool):
+            value = int(value)
+            return value * 1000 if value < 1e12 else value
+        if isinstance(value, str):
+            text = value.strip()
+            try:
+                value = float(text)
+            except ValueError:
+                try:
+                    parsed = datetime.fromisoformat(text)
+                except ValueError:
+                    try:
+                        # Time of day only (e.g. "09:15:02.123"): today's date
+                        parsed = datetime.combine(
+                            datetime.now().date(), datetime.strptime(text, "%H:%M:%S.%f").time()
+                        )
+                    except ValueError:
+                        return now * 1000
+                return int(parsed.timestamp() * 1000)
+        if isinstance(value, datetime):
+            return int(value.timestamp() * 1000)
+        if isinstance(value, float | np.floating) and value == value:
+            value = float(value)
+            return int(round(value * 1000 if value < 1e12 else value))
+        return now * 1000
+
+    @staticmethod
+    def _as_float(value: Any) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _acquire_slot(self, symbol_key: str, symbol: str, exchange: str) -> int:
+        """Get or create the slot for a symbol (caller must hold _write_lock)"""
+        slot = self._slots.get(symbol_key)
+        if slot is not None:
+            return slot
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = self._next_slot
+            seq, floats, ints = self._columns
+            if slot >= len(seq):
+                new_seq, new_floats, new_ints = self._allocate(len(seq) * 2)
+                new_seq[: len(seq)] = seq
+                new_floats[: len(seq)] = floats
+                new_ints[: len(seq)] = ints
+                self._names.extend([None] * len(seq))
+                self._columns = (new_seq, new_floats, new_ints)
+            self._next_slot += 1
+
+        self._names[slot] = (symbol_key, symbol, exchange)
+        self._slots[symbol_key] = slot
+        return slot
+
+    def update(
+        self, symbol_key: str, symbol: str, exchange: str, mode: int, market_data: dict, now: int
+    ) -> None:
+        """
+        Write one tick into the cache
+
+        Args:
+            symbol_key: Symbol key (exchange:symbol)
+            symbol: Trading symbol
+            exchange: Exchange name
+            mode: Update mode (1=LTP, 2=Quote, 3=Depth)
+            market_data: Tick payload
+            now: Ingest time (epoch seconds), used when the tick has no timestamp
+        """
+        get = market_data.get
+        tick_ts = self._parse_timestamp(get("timestamp", now), now)
+
+        with self._write_lock:
+            slot = self._acquire_slot(symbol_key, symbol, exchange)
+            seq, floats, ints = self._columns
+            row_f = floats[slot]
+            row_i = ints[slot]
+
+            seq[slot] += 1  # odd: write in progress
+            try:
+                flags = int(row_i[self.I_FLAGS]) | self.FLAG_USED
+
+                if mode == 1 or mode == 2:
+                    ltp = get("ltp", 0)
+                    volume = self._as_int(get("volume", 0), 0)
+                    row_f[self.F_LTP] = ltp
+                    row_i[self.I_LTP_VOLUME] = volume
+                    row_i[self.I_LTP_TS] = tick_ts
+                    flags |= self.FLAG_LTP
+
+                    if mode == 2:
+                        quote = (
+                            get("open", 0),
+                            get("high", 0),
+                            get("low", 0),
+                            get("close", 0),
+                            ltp,
+                            get("change", 0),
+                            get("change_percent", 0),
+                        )
+                        try:
+                            row_f[self.F_OPEN : self.F_CHANGE_PERCENT + 1] = quote
+                        except (TypeError, ValueError):
+                            # Broker sent a non-numeric field; store it as 0 like a missing one
+                            row_f[self.F_OPEN : self.F_CHANGE_PERCENT + 1] = [
+                                self._as_float(value) for value in quote
+                            ]
+                        row_i[self.I_QUOTE_VOLUME] = volume
+                        row_i[self.I_QUOTE_TS] = tick_ts
+                        flags |= self.FLAG_QUOTE
+                elif mode == 3:
+                    depth = get("depth", {})
+                    self._depth[slot] = {
+                        "buy": depth.get("buy", []),
+                        "sell": depth.get("sell", []),
+                        "ltp": get("ltp", 0),
+                        "timestamp": tick_ts,
+                    }
+
+                row_i[self.I_LAST_UPDATE] = now
+                row_i[self.I_FLAGS] = flags
+            finally:
+                seq[slot] += 1  # even: write complete
+
+    def _read_row(self, symbol_key: str) -> tuple[int, np.ndarray, np.ndarray] | None:
+        """Consistent copy of a slot's columns without taking the write lock"""
+        slot = self._slots.get(symbol_key)
+        if slot is None:
+            return None
+
+        seq, floats, ints = self._columns
+        for _ in range(self.READ_RETRIES):
+            before = seq[slot]
+            if before & 1:
+                continue
+            row_f = floats[slot].copy()
+            row_i = ints[slot].copy()
+            if seq[slot] == before:
+                break
+        else:
+            # Writer kept the slot busy; fall back to a locked read
+            with self._write_lock:
+                seq, floats, ints = self._columns
+                row_f = floats[slot].copy()
+                row_i = ints[slot].copy()
+
+        if not row_i[self.I_FLAGS] & self.FLAG_USED:
+            return None
+        return slot, row_f, row_i
+
+    def _ltp_dict(self, row_f: np.ndarray, row_i: np.ndarray) -> dict[str, Any]:
+        return {
+            "value": float(row_f[self.F_LTP]),
+            "timestamp": int(row_i[self.I_LTP_TS]),
+            "volume": int(row_i[self.I_LTP_VOLUME]),
+        }
+
+    def _quote_dict(self, row_f: np.ndarray, row_i: np.ndarray) -> dict[str, Any]:
+        return {
+            "open": float(row_f[self.F_OPEN]),
+            "high": float(row_f[self.F_HIGH]),
+            "low": float(row_f[self.F_LOW]),
+            "close": float(row_f[self.F_CLOSE]),
+            "ltp": float(row_f[self.F_QUOTE_LTP]),
+            "volume": int(row_i[self.I_QUOTE_VOLUME]),
+            "change": float(row_f[self.F_CHANGE]),
+            "change_percent": float(row_f[self.F_CHANGE_PERCENT]),
+            "timestamp": int(row_i[self.I_QUOTE_TS]),
+        }
+
+    def get_ltp(self, symbol_key: str) -> dict[str, Any] | None:
+        """LTP entry ({value, timestamp, volume}) or None"""
+        row = self._read_row(symbol_key)
+        if row is None or not row[2][self.I_FLAGS] & self.FLAG_LTP:
+            return None
+        return self._ltp_dict(row[1], row[2])
+
+    def get_quote(self, symbol_key: str) -> dict[str, Any] | None:
+        """Quote entry or None"""
+        row = self._read_row(symbol_key)
+        if row is None or not row[2][self.I_FLAGS] & self.FLAG_QUOTE:
+            return None
+        return self._quote_dict(row[1], row[2])
+
+    def get_depth(self, symbol_key: str) -> dict[str, Any] | None:
+        """Depth entry ({buy, sell, ltp, timestamp}) or None"""
+        slot = self._slots.get(symbol_key)
+        if slot is None:
+            return None
+        return self._depth.get(slot)
+
+    def get_last_update(self, symbol_key: str) -> int | None:
+        """Ingest time of the last update for a symbol, or None"""
+        row = self._read_row(symbol_key)
+        return None if row is None else int(row[2][self.I_LAST_UPDATE])
+
+    def get_entry(self, symbol_key: str) -> dict[str, Any] | None:
+        """All cached data for a symbol in the legacy nested-dict shape"""
+        row = self._read_row(symbol_key)
+        if row is None:
+            return None
+
+        slot, row_f, row_i = row
+        names = self._names[slot]
+        flags = row_i[self.I_FLAGS]
+        entry = {
+            "symbol": names[1] if names else None,
+            "exchange": names[2] if names else None,
+            "last_update": int(row_i[self.I_LAST_UPDATE]),
+        }
+        if flags & self.FLAG_LTP:
+            entry["ltp"] = self._ltp_dict(row_f, row_i)
+        if flags & self.FLAG_QUOTE:
+            entry["quote"] = self._quote_dict(row_f, row_i)
+        depth = self._depth.get(slot)
+        if depth is not None:
+            entry["depth"] = depth
+        return entry
+
+    def get_ltp_snapshot(self, symbol_keys: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized LTP read for many symbols in one pass
+
+        Args:
+            symbol_keys: Symbol keys (exchange:symbol)
+
+        Returns:
+            Tuple of (ltp, timestamp, volume) arrays aligned with symbol_keys.
+            Symbols without LTP data have NaN ltp.
+        """
+        get_slot = self._slots.get
+        slots = np.fromiter(
+            (get_slot(key, -1) for key in symbol_keys), dtype=np.int64, count=len(symbol_keys)
+        )
+        known = slots >= 0
+        idx = slots[known]
+
+        seq, floats, ints = self._columns
+        for _ in range(self.READ_RETRIES):
+            before = seq[idx]
+            if (before & 1).any():
+                continue
+            ltp = floats[idx, self.F_LTP]
+            meta = ints[idx][:, [self.I_LTP_TS, self.I_LTP_VOLUME, self.I_FLAGS]]
+            if np.array_equal(seq[idx], before):
+                break
+        else:
+            with self._write_lock:
+                seq, floats, ints = self._columns
+                ltp = floats[idx, self.F_LTP]
+                meta = ints[idx][:, [self.I_LTP_TS, self.I_LTP_VOLUME, self.I_FLAGS]]
+
+        ltp_out = np.full(len(symbol_keys), np.nan)
+        ts_out = np.zeros(len(symbol_keys), dtype=np.int64)
+        volume_out = np.zeros(len(symbol_keys), dtype=np.int64)
+
+        has_ltp = (meta[:, 2] & self.FLAG_LTP) != 0
+        positions = np.flatnonzero(known)[has_ltp]
+        ltp_out[positions] = ltp[has_ltp]
+        ts_out[positions] = meta[has_ltp, 0]
+        volume_out[positions] = meta[has_ltp, 1]
+        return ltp_out, ts_out, volume_out
+
+    def get_stale_keys(self, cutoff: float) -> list[str]:
+        """Symbol keys whose last update is older than cutoff (epoch seconds)"""
+        seq, floats, ints = self._columns
+        used = (ints[:, self.I_FLAGS] & self.FLAG_USED) != 0
+        stale_slots = np.flatnonzero(used & (ints[:, self.I_LAST_UPDATE] < cutoff))
+        names = self._names
+        return [names[slot][0] for slot in stale_slots if names[slot]]
+
+    def remove(self, symbol_key: str) -> bool:
+        """Remove a symbol and recycle its slot"""
+        with self._write_lock:
+            slot = self._slots.pop(symbol_key, None)
+            if slot is None:
+                return False
+
+            seq, floats, ints = self._columns
+            seq[slot] += 1
+            floats[slot] = 0
+            ints[slot] = 0
+            seq[slot] += 1
+            self._depth.pop(slot, None)
+            self._names[slot] = None
+            self._free_slots.append(slot)
+            return True
+
+    def clear(self) -> None:
+        """Remove all symbols"""
+        with self._write_lock:
+            seq, floats, ints = self._columns
+            seq += 2  # invalidate in-flight reads
+            floats[:] = 0
+            ints[:] = 0
+            self._slots.clear()
+            self._free_slots.clear()
+            self._depth.clear()
+            self._names = [None] * len(seq)
+            self._next_slot = 0
+
+
 class MarketDataService:
     """
     Enhanced singleton service for managing market data across the application.
@@ -284,6 +665,8 @@ class MarketDataService:
     _instance = None
     _lock = threading.Lock()
 
+    MODE_TO_EVENT = {1: "ltp", 2: "quote", 3: "depth"}
+
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
@@ -299,8 +682,8 @@ class MarketDataService:
         self._initialized = True
         self.data_lock = threading.Lock()
 
-        # Market data cache structure
-        self.market_data_cache: dict[str, dict[str, Any]] = {}
+        # Market data cache: columnar arrays, readers do not take data_lock
+        self.market_data_cache = ColumnarMarketDataCache()
 
         # Enhanced subscriber system with priorities
         # {priority: {subscriber_id: {callback, filter, name}}}
@@ -310,6 +693,17 @@ class MarketDataService:
         # Legacy subscribers (for backward compatibility)
         self.subscribers = defaultdict(dict)
 
+        # Fan-out index: symbol_key -> {subscriber_id: entry}, plus a wildcard bucket for
+        # subscribers without a symbol filter. Maintained on subscribe/unsubscribe so a
+        # tick only visits subscribers that asked for its symbol.
+        # entry = (order_key, event_type, callback, name)
+        self._symbol_index: dict[str, dict[int, tuple]] = defaultdict(dict)
+        self._wildcard_subscribers: dict[int, tuple] = {}
+
+        # Resolved dispatch lists: symbol_key -> {event_type: ((callback, name), ...)}
+        # Invalidated per symbol (or fully, for wildcard subscribers) when subscriptions change
+        self._fanout_cache: dict[str, dict[str, tuple]] = {}
+
         # User-specific data tracking
         self.user_access_tracking = defaultdict(dict)
 
@@ -322,7 +716,8 @@ class MarketDataService:
         self.health_monitor.on_connection_restored = self._on_connection_restored
         self.health_monitor.on_data_stale = self._on_data_stale
 
-        # Metrics
+        # Metrics; the read-path counters have their own lock so getters stay off data_lock
+        self._metrics_lock = threading.Lock()
         self.metrics = {
             "total_updates": 0,
             "cache_hits": 0,
@@ -382,57 +777,18 @@ class MarketDataService:
             timestamp = int(time.time())
 
             with self.data_lock:
-                # Initialize cache entry if needed
-                if symbol_key not in self.market_data_cache:
-                    self.market_data_cache[symbol_key] = {
-                        "symbol": symbol,
-                        "exchange": exchange,
-                        "last_update": timestamp,
-                    }
-
-                cache_entry = self.market_data_cache[symbol_key]
-
-                # Update based on mode
-                if mode == 1:  # LTP
-                    cache_entry["ltp"] = {
-                        "value": market_data.get("ltp", 0),
-                        "timestamp": market_data.get("timestamp", timestamp),
-                        "volume": market_data.get("volume", 0),
-                    }
-                elif mode == 2:  # Quote
-                    cache_entry["quote"] = {
-                        "open": market_data.get("open", 0),
-                        "high": market_data.get("high", 0),
-                        "low": market_data.get("low", 0),
-                        "close": market_data.get("close", 0),
-                        "ltp": market_data.get("ltp", 0),
-                        "volume": market_data.get("volume", 0),
-                        "change": market_data.get("change", 0),
-                        "change_percent": market_data.get("change_percent", 0),
-                        "timestamp": market_data.get("timestamp", timestamp),
-                    }
-                    # Also update LTP from quote
-                    cache_entry["ltp"] = {
-                        "value": market_data.get("ltp", 0),
-                        "timestamp": market_data.get("timestamp", timestamp),
-                        "volume": market_data.get("volume", 0),
-                    }
-                elif mode == 3:  # Depth
-                    cache_entry["depth"] = {
-                        "buy": market_data.get("depth", {}).get("buy", []),
-                        "sell": market_data.get("depth", {}).get("sell", []),
-                        "ltp": market_data.get("ltp", 0),
-                        "timestamp": market_data.get("timestamp", timestamp),
-                    }
-
-                cache_entry["last_update"] = timestamp
+                self.market_data_cache.update(
+                    symbol_key, symbol, exchange, mode, market_data, timestamp
+                )
                 self.metrics["total_updates"] += 1
 
-            # Broadcast to subscribers by priority (critical first)
-            self._broadcast_update_priority(symbol_key, mode, data)
+                # Resolve interested subscribers under the same lock acquisition
+                subscribers = self._get_fanout_subscribers(
+                    symbol_key, self.MODE_TO_EVENT.get(mode, "all")
+                )
 
-            # Also broadcast using legacy system for backward compatibility
-            self._broadcast_update(symbol_key, mode, data)
+            # Broadcast to priority subscribers (critical first), then legacy subscribers
+            self._broadcast_update(subscribers, data)
 
             return True
 
@@ -461,6 +817,9 @@ class MarketDataService:
         Returns:
             Subscriber ID for unsubscribing
         """
+        # Snapshot the filter so the fan-out index stays consistent with it
+        filter_symbols = set(filter_symbols) if filter_symbols else None
+
         with self.data_lock:
             self.subscriber_id_counter += 1
             subscriber_id = self.subscriber_id_counter
@@ -472,6 +831,14 @@ class MarketDataService:
                 "name": name or f"subscriber_{subscriber_id}",
                 "created_at": time.time(),
             }
+            self._index_subscriber(
+                subscriber_id,
+                (0, int(priority), subscriber_id),
+                event_type,
+                callback,
+                filter_symbols,
+                name or f"subscriber_{subscriber_id}",
+            )
 
         logger.info(
             f"Added priority subscriber {subscriber_id} ({name}) - priority={priority.name}, type={event_type}"
@@ -510,8 +877,9 @@ class MarketDataService:
         with self.data_lock:
             for priority in self.priority_subscribers:
                 if subscriber_id in self.priority_subscribers[priority]:
-                    name = self.priority_subscribers[priority][subscriber_id].get("name", "")
-                    del self.priority_subscribers[priority][subscriber_id]
+                    subscriber = self.priority_subscribers[priority].pop(subscriber_id)
+                    name = subscriber.get("name", "")
+                    self._unindex_subscriber(subscriber_id, subscriber["filter"])
                     logger.info(f"Removed priority subscriber {subscriber_id} ({name})")
                     return True
 
@@ -532,6 +900,9 @@ class MarketDataService:
         Returns:
             Subscriber ID for unsubscribing
         """
+        # Snapshot the filter so the fan-out index stays consistent with it
+        filter_symbols = set(filter_symbols) if filter_symbols else None
+
         with self.data_lock:
             self.subscriber_id_counter += 1
             subscriber_id = self.subscriber_id_counter
@@ -540,6 +911,14 @@ class MarketDataService:
                 "callback": callback,
                 "filter": filter_symbols,
             }
+            # Legacy subscribers run after priority subscribers, event-specific before 'all'
+            self._index_subscriber(
+                subscriber_id,
+                (1, int(event_type == "all"), subscriber_id),
+                event_type,
+                callback,
+                filter_symbols,
+            )
 
         logger.info(f"Added subscriber {subscriber_id} for {event_type} updates")
         return subscriber_id
@@ -562,12 +941,17 @@ class MarketDataService:
         with self.data_lock:
             for event_type in self.subscribers:
                 if subscriber_id in self.subscribers[event_type]:
-                    del self.subscribers[event_type][subscriber_id]
+                    subscriber = self.subscribers[event_type].pop(subscriber_id)
+                    self._unindex_subscriber(subscriber_id, subscriber["filter"])
                     logger.info(f"Removed subscriber {subscriber_id}")
                     return True
 
         return False
 
+    def _count_cache_access(self, hit: bool) -> None:
+        with self._metrics_lock:
+            self.metrics["cache_hits" if hit else "cache_misses"] += 1
+
     def get_ltp(self, symbol: str, exchange: str) -> dict[str, Any] | None:
         """
         Get latest LTP for a symbol
@@ -581,12 +965,11 @@ class MarketDataService:
         """
         symbol_key = f"{exchange}:{symbol}"
 
-        with self.data_lock:
-            if symbol_key in self.market_data_cache:
-                self.metrics["cache_hits"] += 1
-                return self.market_data_cache[symbol_key].get("ltp")
+        if symbol_key in self.market_data_cache:
+            self._count_cache_access(hit=True)
+            return self.market_data_cache.get_ltp(symbol_key)
 
-        self.metrics["cache_misses"] += 1
+        self._count_cache_access(hit=False)
         return None
 
     def get_ltp_value(self, symbol: str, exchange: str) -> float | None:
@@ -618,12 +1001,11 @@ class MarketDataService:
         """
         symbol_key = f"{exchange}:{symbol}"
 
-        with self.data_lock:
-            if symbol_key in self.market_data_cache:
-                self.metrics["cache_hits"] += 1
-                return self.market_data_cache[symbol_key].get("quote")
+        if symbol_key in self.market_data_cache:
+            self._count_cache_access(hit=True)
+            return self.market_data_cache.get_quote(symbol_key)
 
-        self.metrics["cache_misses"] += 1
+        self._count_cache_access(hit=False)
         return None
 
     def get_market_depth(self, symbol: str, exchange: str) -> dict[str, Any] | None:
@@ -639,12 +1021,11 @@ class MarketDataService:
         """
         symbol_key = f"{exchange}:{symbol}"
 
-        with self.data_lock:
-            if symbol_key in self.market_data_cache:
-                self.metrics["cache_hits"] += 1
-                return self.market_data_cache[symbol_key].get("depth")
+        if symbol_key in self.market_data_cache:
+            self._count_cache_access(hit=True)
+            return self.market_data_cache.get_depth(symbol_key)
 
-        self.metrics["cache_misses"] += 1
+        self._count_cache_access(hit=False)
         return None
 
     def get_all_data(self, symbol: str, exchange: str) -> dict[str, Any]:
@@ -660,11 +1041,7 @@ class MarketDataService:
         """
         symbol_key = f"{exchange}:{symbol}"
 
-        with self.data_lock:
-            if symbol_key in self.market_data_cache:
-                return dict(self.market_data_cache[symbol_key])
-
-        return {}
+        return self.market_data_cache.get_entry(symbol_key) or {}
 
     def get_multiple_ltps(self, symbols: list[dict[str, str]]) -> dict[str, Any]:
         """
@@ -676,18 +1053,21 @@ class MarketDataService:
         Returns:
             Dictionary mapping symbol_key to LTP data
         """
-        result = {}
+        symbol_keys = [
+            f"{symbol_info.get('exchange')}:{symbol_info.get('symbol')}"
+            for symbol_info in symbols
+            if symbol_info.get("symbol") and symbol_info.get("exchange")
+        ]
 
-        with self.data_lock:
-            for symbol_info in symbols:
-                symbol = symbol_info.get("symbol")
-                exchange = symbol_info.get("exchange")
-                if symbol and exchange:
-                    symbol_key = f"{exchange}:{symbol}"
-                    if symbol_key in self.market_data_cache:
-                        ltp_data = self.market_data_cache[symbol_key].get("ltp")
-                        if ltp_data:
-                            result[symbol_key] = ltp_data
+        # One vectorized snapshot read for all symbols
+        ltps, timestamps, volumes = self.market_data_cache.get_ltp_snapshot(symbol_keys)
+
+        result = {}
+        for symbol_key, ltp, ts, volume in zip(
+            symbol_keys, ltps.tolist(), timestamps.tolist(), volumes.tolist()
+        ):
+            if ltp == ltp:  # NaN marks symbols without LTP data
+                result[symbol_key] = {"value": ltp, "timestamp": ts, "volume": volume}
 
         return result
 
@@ -712,11 +1092,10 @@ class MarketDataService:
         # If specific symbol requested, check its freshness
         if symbol and exchange:
             symbol_key = f"{exchange}:{symbol}"
-            with self.data_lock:
-                if symbol_key in self.market_data_cache:
-                    last_update = self.market_data_cache[symbol_key].get("last_update", 0)
-                    return (time.time() - last_update) < max_age_seconds
+            last_update = self.market_data_cache.get_last_update(symbol_key)
+            if last_update is None:
                 return False
+            return (time.time() - last_update) < max_age_seconds
 
         return True
 
@@ -841,8 +1220,7 @@ class MarketDataService:
         with self.data_lock:
             if symbol and exchange:
                 symbol_key = f"{exchange}:{symbol}"
-                if symbol_key in self.market_data_cache:
-                    del self.market_data_cache[symbol_key]
+                if self.market_data_cache.remove(symbol_key):
                     self.validator.clear_price_history(symbol_key)
                     logger.info(f"Cleared cache for {symbol_key}")
             else:
@@ -850,69 +1228,83 @@ class MarketDataService:
                 self.validator.clear_price_history()
                 logger.info("Cleared entire market data cache")
 
-    def _broadcast_update_priority(self, symbol_key: str, mode: int, data: dict[str, Any]) -> None:
+    def _index_subscriber(
+        self,
+        subscriber_id: int,
+        order_key: tuple,
+        event_type: str,
+        callback: Callable,
+        filter_symbols: set[str] | None,
+        name: str | None = None,
+    ) -> None:
         """
-        Broadcast updates to priority subscribers (critical first)
+        Add a subscriber to the fan-out index (caller must hold data_lock)
 
-        Args:
-            symbol_key: Symbol key (exchange:symbol)
-            mode: Update mode (1=LTP, 2=Quote, 3=Depth)
-            data: Full data to broadcast
+        The symbol filter is captured at subscribe time; resubscribe to change it.
         """
-        mode_to_event = {1: "ltp", 2: "quote", 3: "depth"}
-        event_type = mode_to_event.get(mode, "all")
-
-        # Process subscribers by priority (CRITICAL first)
-        for priority in sorted(self.priority_subscribers.keys()):
-            with self.data_lock:
-                subscribers = list(self.priority_subscribers[priority].values())
-
-            for subscriber in subscribers:
-                try:
-                    # Check event type filter
-                    sub_event_type = subscriber.get("event_type", "all")
-                    if sub_event_type != "all" and sub_event_type != event_type:
-                        continue
-
-                    # Check symbol filter
-                    if subscriber["filter"] and symbol_key not in subscriber["filter"]:
-                        continue
+        entry = (order_key, event_type, callback, name)
+        if filter_symbols:
+            for symbol_key in filter_symbols:
+                self._symbol_index[symbol_key][subscriber_id] = entry
+                self._fanout_cache.pop(symbol_key, None)
+        else:
+            self._wildcard_subscribers[subscriber_id] = entry
+            self._fanout_cache.clear()
+
+    def _unindex_subscriber(self, subscriber_id: int, filter_symbols: set[str] | None) -> None:
+        """Remove a subscriber from the fan-out index (caller must hold data_lock)"""
+        if filter_symbols:
+            for symbol_key in filter_symbols:
+                bucket = self._symbol_index.get(symbol_key)
+                if bucket is not None:
+                    bucket.pop(subscriber_id, None)
+                    if not bucket:
+                        del self._symbol_index[symbol_key]
+                self._fanout_cache.pop(symbol_key, None)
+        else:
+            self._wildcard_subscribers.pop(subscriber_id, None)
+            self._fanout_cache.clear()
+
+    def _get_fanout_subscribers(self, symbol_key: str, event_type: str) -> tuple:
+        """
+        Get the ordered (callback, name) pairs interested in an update (caller must hold data_lock)
 
-                    # Call the callback
-                    subscriber["callback"](data)
+        Order: priority subscribers by priority (CRITICAL first), then legacy subscribers.
+        """
+        by_event = self._fanout_cache.get(symbol_key)
+        if by_event is None:
+            by_event = self._fanout_cache[symbol_key] = {}
+
+        subscribers = by_event.get(event_type)
+        if subscribers is None:
+            entries = list(self._wildcard_subscribers.values())
+            entries.extend(self._symbol_index.get(symbol_key, {}).values())
+            entries.sort(key=lambda entry: entry[0])
+            subscribers = tuple(
+                (callback, name)
+                for _, sub_event_type, callback, name in entries
+                if sub_event_type == "all" or sub_event_type == event_type
+            )
+            by_event[event_type] = subscribers
 
-                except Exception as e:
-                    logger.exception(
-                        f"Error in priority subscriber callback ({subscriber.get('name', 'unknown')}): {e}"
-                    )
+        return subscribers
 
-    def _broadcast_update(self, symbol_key: str, mode: int, data: dict[str, Any]) -> None:
+    def _broadcast_update(self, subscribers: tuple, data: dict[str, Any]) -> None:
         """
-        Broadcast updates to legacy subscribers (backward compatibility)
+        Broadcast an update to the subscribers resolved by _get_fanout_subscribers
 
         Args:
-            symbol_key: Symbol key (exchange:symbol)
-            mode: Update mode (1=LTP, 2=Quote, 3=Depth)
+            subscribers: Ordered (callback, name) pairs
             data: Full data to broadcast
         """
-        mode_to_event = {1: "ltp", 2: "quote", 3: "depth"}
-        event_type = mode_to_event.get(mode, "all")
-
-        # Broadcast to specific event subscribers
-        with self.data_lock:
-            subscribers = list(self.subscribers[event_type].values())
-            all_subscribers = list(self.subscribers["all"].values())
-
-        for subscriber in subscribers + all_subscribers:
+        for callback, name in subscribers:
             try:
-                # Check filter
-                if subscriber["filter"] and symbol_key not in subscriber["filter"]:
-                    continue
-
-                # Call the callback
-                subscriber["callback"](data)
+                callback(data)
             except Exception as e:
-                logger.exception(f"Error in subscriber callback: {e}")
+                if name is None:
+                    logger.exception(f"Error in subscriber callback: {e}")
+                else:
+                    logger.exception(f"Error in priority subscriber callback ({name}): {e}")
 
     def _on_connection_lost(self):
         """Handle connection lost event"""
@@ -945,13 +1337,13 @@ class MarketDataService:
 
                 with self.data_lock:
                     # Clean up stale market data
-                    stale_symbols = []
-                    for symbol_key, data in self.market_data_cache.items():
-                        if current_time - data.get("last_update", 0) > stale_threshold:
-                            stale_symbols.append(symbol_key)
+                    stale_symbols = self.market_data_cache.get_stale_keys(
+                        current_time - stale_threshold
+                    )
 
                     for symbol_key in stale_symbols:
-                        del self.market_data_cache[symbol_key]
+                        self.market_data_cache.remove(symbol_key)
+                        self._fanout_cache.pop(symbol_key, None)
                         self.validator.clear_price_history(symbol_key)
 
                     # Clean up old user access tracking
@@ -45,6 +45,7 @@ Strike Labels (different for CE and PE):
     - Strike ABOVE ATM: CE is OTM, PE is ITM
 """
 
+import os
 from typing import Any, Dict, List, Optional, Tuple
 
 from database.auth_db import get_auth_token_broker
@@ -61,6 +62,9 @@ from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Serve get_option_chain from the streaming snapshot table instead of per-call REST quotes
+OPTION_CHAIN_SNAPSHOT = os.getenv("OPTION_CHAIN_SNAPSHOT", "true").lower() == "true"
+
 
 def get_strikes_with_labels(
     available_strikes: list[float], atm_strike: float, strike_count: int | None = None
@@ -183,12 +187,126 @@ def get_option_symbols_for_chain(
     return chain_symbols
 
 
+def resolve_chain_underlying(
+    underlying: str, exchange: str, expiry_date: str | None
+) -> tuple[str, str | None, str, str]:
+    """
+    Resolve the underlying quote symbol/exchange and the chain expiry.
+
+    Returns:
+        Tuple of (base_symbol, expiry, quote_symbol, quote_exchange).
+        expiry is None if neither the underlying nor expiry_date carries one.
+    """
+    base_symbol, embedded_expiry = parse_underlying_symbol(underlying)
+    final_expiry = embedded_expiry or expiry_date
+
+    quote_exchange = exchange
+    if exchange.upper() in ["NFO", "BFO"]:
+        if base_symbol in [
+            "NIFTY",
+            "BANKNIFTY",
+            "FINNIFTY",
+            "MIDCPNIFTY",
+            "NIFTYNXT50",
+            "INDIAVIX",
+        ]:
+            quote_exchange = "NSE_INDEX"
+        elif base_symbol in ["SENSEX", "BANKEX", "SENSEX50"]:
+            quote_exchange = "BSE_INDEX"
+        else:
+            quote_exchange = "NSE" if exchange.upper() == "NFO" else "BSE"
+
+    # Use base symbol for index quotes
+    quote_symbol = base_symbol if embedded_expiry else underlying
+
+    return base_symbol, final_expiry, quote_symbol, quote_exchange
+
+
+def fetch_leg_quotes(
+    symbols_to_fetch: list[dict[str, str]], api_key: str
+) -> dict[str, dict[str, Any]]:
+    """Quotes for option legs with one multiquotes call, keyed by symbol"""
+    success, quotes_response, status_code = get_multiquotes(
+        symbols=symbols_to_fetch, api_key=api_key
+    )
+
+    quotes_map = {}
+    if success and "results" in quotes_response:
+        for result in quotes_response["results"]:
+            symbol = result.get("symbol")
+            if symbol:
+                # Handle both formats: direct data or nested data
+                if "data" in result:
+                    quotes_map[symbol] = result["data"]
+                elif "error" not in result:
+                    quotes_map[symbol] = result
+    return quotes_map
+
+
+def build_leg(leg: dict[str, Any], label: str, quote: dict[str, Any]) -> dict[str, Any]:
+    """Option chain entry for one CE/PE leg"""
+    return {
+        "symbol": leg["symbol"],
+        "label": label,
+        "ltp": quote.get("ltp", 0),
+        "bid": quote.get("bid", 0),
+        "ask": quote.get("ask", 0),
+        "open": quote.get("open", 0),
+        "high": quote.get("high", 0),
+        "low": quote.get("low", 0),
+        "prev_close": quote.get("prev_close", 0),
+        "volume": quote.get("volume", 0),
+        "oi": quote.get("oi", 0),
+        "lotsize": leg["lotsize"],
+        "tick_size": leg["tick_size"],
+    }
+
+
 def get_option_chain(
-    underlying: str, exchange: str, expiry_date: str, strike_count: int, api_key: str
+    underlying: str,
+    exchange: str,
+    expiry_date: str,
+    strike_count: int,
+    api_key: str,
+    since: int | None = None,
 ) -> tuple[bool, dict[str, Any], int]:
     """
     Main function to get option chain data.
 
+    With OPTION_CHAIN_SNAPSHOT enabled (default) the chain is served from the
+    streaming snapshot table (services/option_chain_snapshot_service.py), which only
+    calls the broker REST APIs to build the table. Otherwise every call fetches
+    fresh quotes from the broker.
+
+    Args:
+        underlying: Underlying symbol (e.g., NIFTY, BANKNIFTY, RELIANCE)
+        exchange: Exchange (NSE_INDEX, NSE, NFO, BSE_INDEX, BSE, BFO, MCX, CDS)
+        expiry_date: Expiry date in DDMMMYY format (e.g., 28NOV25)
+        strike_count: Number of strikes above and below ATM
+        api_key: OpenAlgo API key
+        since: Optional "seq" from an earlier snapshot response; only strikes changed
+            since then are returned (the REST path always returns the full chain)
+
+    Returns:
+        Tuple of (success, response_data, status_code)
+    """
+    if OPTION_CHAIN_SNAPSHOT:
+        # Import here to avoid circular dependency
+        from services.option_chain_snapshot_service import get_option_chain_snapshot
+
+        return get_option_chain_snapshot(
+            underlying, exchange, expiry_date, strike_count, api_key, since
+        )
+
+    return fetch_option_chain(underlying, exchange, expiry_date, strike_count, api_key)
+
+
+def fetch_option_chain(
+    underlying: str, exchange: str, expiry_date: str, strike_count: int, api_key: str
+) -> tuple[bool, dict[str, Any], int]:
+    """
+    Fetch option chain data from the broker (underlying quote + multiquotes for every leg).
+
     Args:
         underlying: Underlying symbol (e.g., NIFTY, BANKNIFTY, RELIANCE)
         exchange: Exchange (NSE_INDEX, NSE, NFO, BSE_INDEX, BSE, BFO, MCX, CDS)
@@ -200,33 +318,14 @@ def get_option_chain(
         Tuple of (success, response_data, status_code)
     """
     try:
-        # Step 1: Parse underlying symbol
-        base_symbol, embedded_expiry = parse_underlying_symbol(underlying)
-        final_expiry = embedded_expiry or expiry_date
+        # Step 1-2: Parse underlying symbol, determine quote exchange for underlying LTP
+        base_symbol, final_expiry, quote_symbol, quote_exchange = resolve_chain_underlying(
+            underlying, exchange, expiry_date
+        )
 
         if not final_expiry:
             return False, {"status": "error", "message": "Expiry date is required."}, 400
 
-        # Step 2: Determine quote exchange for underlying LTP
-        quote_exchange = exchange
-        if exchange.upper() in ["NFO", "BFO"]:
-            if base_symbol in [
-                "NIFTY",
-                "BANKNIFTY",
-                "FINNIFTY",
-                "MIDCPNIFTY",
-                "NIFTYNXT50",
-                "INDIAVIX",
-            ]:
-                quote_exchange = "NSE_INDEX"
-            elif base_symbol in ["SENSEX", "BANKEX", "SENSEX50"]:
-                quote_exchange = "BSE_INDEX"
-            else:
-                quote_exchange = "NSE" if exchange.upper() == "NFO" else "BSE"
-
-        # Use base symbol for index quotes
-        quote_symbol = base_symbol if embedded_expiry else underlying
-
         # Step 3: Fetch underlying LTP
         logger.info(f"Fetching LTP for {quote_symbol} on {quote_exchange}")
         success, quote_response, status_code = get_quotes(
@@ -310,21 +409,7 @@ def get_option_chain(
 
         # Step 8: Fetch quotes for all options using multiquotes
         logger.info(f"Fetching quotes for {len(symbols_to_fetch)} option symbols")
-        success, quotes_response, status_code = get_multiquotes(
-            symbols=symbols_to_fetch, api_key=api_key
-        )
-
-        # Build quote lookup map
-        quotes_map = {}
-        if success and "results" in quotes_response:
-            for result in quotes_response["results"]:
-                symbol = result.get("symbol")
-                if symbol:
-                    # Handle both formats: direct data or nested data
-                    if "data" in result:
-                        quotes_map[symbol] = result["data"]
-                    elif "error" not in result:
-                        quotes_map[symbol] = result
+        quotes_map = fetch_leg_quotes(symbols_to_fetch, api_key)
 
         # Step 9: Build final chain response
         chain = []
@@ -332,46 +417,16 @@ def get_option_chain(
             strike_data = {"strike": item["strike"]}
 
             # CE data (label inside CE object)
-            ce_symbol = item["ce"]["symbol"]
             if item["ce"]["exists"]:
-                ce_quote = quotes_map.get(ce_symbol, {})
-                strike_data["ce"] = {
-                    "symbol": ce_symbol,
-                    "label": item["ce"]["label"],
-                    "ltp": ce_quote.get("ltp", 0),
-                    "bid": ce_quote.get("bid", 0),
-                    "ask": ce_quote.get("ask", 0),
-                    "open": ce_quote.get("open", 0),
-                    "high": ce_quote.get("high", 0),
-                    "low": ce_quote.get("low", 0),
-                    "prev_close": ce_quote.get("prev_close", 0),
-                    "volume": ce_quote.get("volume", 0),
-                    "oi": ce_quote.get("oi", 0),
-                    "lotsize": item["ce"]["lotsize"],
-                    "tick_size": item["ce"]["tick_size"],
-                }
+                ce_quote = quotes_map.get(item["ce"]["symbol"], {})
+                strike_data["ce"] = build_leg(item["ce"], item["ce"]["label"], ce_quote)
             else:
                 strike_data["ce"] = None
 
             # PE data (label inside PE object)
-            pe_symbol = item["pe"]["symbol"]
             if item["pe"]["exists"]:
-                pe_quote = quotes_map.get(pe_symbol, {})
-                strike_data["pe"] = {
-                    "symbol": pe_symbol,
-                    "label": item["pe"]["label"],
-                    "ltp": pe_quote.get("ltp", 0),
-                    "bid": pe_quote.get("bid", 0),
-                    "ask": pe_quote.get("ask", 0),
-                    "open": pe_quote.get("open", 0),
-                    "high": pe_quote.get("high", 0),
-                    "low": pe_quote.get("low", 0),
-                    "prev_close": pe_quote.get("prev_close", 0),
-                    "volume": pe_quote.get("volume", 0),
-                    "oi": pe_quote.get("oi", 0),
-                    "lotsize": item["pe"]["lotsize"],
-                    "tick_size": item["pe"]["tick_size"],
-                }
+                pe_quote = quotes_map.get(item["pe"]["symbol"], {})
+                strike_data["pe"] = build_leg(item["pe"], item["pe"]["label"], pe_quote)
             else:
                 strike_data["pe"] = None
 
@@ -0,0 +1,619 @@
+"""
+Option Chain Snapshot Service
+
+Keeps each requested option chain (underlying + expiry) as an in-memory array table
+that is updated from the live market data stream, so repeated reads of the same chain
+(UI polling, strategy polling) do not go to the broker.
+
+Lifecycle of a chain:
+    1. Cold start: the underlying quote, the strike list and one multiquotes call for
+       every leg fill the table (the only broker REST calls in the normal path).
+    2. Every leg and the underlying are subscribed once through the WebSocket proxy,
+       and the table listens to MarketDataService for those symbols.
+    3. Readers get the current snapshot, or only the strikes that changed since a
+       sequence number they saw earlier.
+    4. Chains nobody has read for OPTION_CHAIN_IDLE_SECONDS are unsubscribed and dropped.
+
+If the WebSocket subscription is not available, or a subscribed chain has had no
+tick for OPTION_CHAIN_STALE_SECONDS (e.g. the proxy or broker feed dropped), the
+table is refreshed from REST at most every OPTION_CHAIN_REST_REFRESH_SECONDS,
+however many readers poll it.
+
+Sequence numbers:
+    Every change to a table takes the next number from one service-wide counter and
+    stamps the changed leg. A reader passes the "seq" of its last response as `since`
+    and gets the strikes with a newer stamp ("full": false). A full snapshot
+    ("full": true) is returned instead when `since` predates the table or the ATM
+    strike (and with it every label) moved after `since`.
+"""
+
+import itertools
+import os
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+from services.market_data_service import SubscriberPriority, get_market_data_service
+from services.option_chain_service import (
+    build_leg,
+    fetch_leg_quotes,
+    get_option_symbols_for_chain,
+    resolve_chain_underlying,
+)
+from services.option_symbol_service import get_available_strikes, get_option_exchange
+from services.quotes_service import get_quotes
+from services.websocket_client import get_websocket_client
+from services.websocket_service import WS_HOST, WS_PORT
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Without a live stream, refresh a chain from REST at most this often (seconds)
+REST_REFRESH_SECONDS = float(os.getenv("OPTION_CHAIN_REST_REFRESH_SECONDS", "1"))
+# Treat a subscribed chain as stale after this long without a tick (seconds)
+STALE_SECONDS = float(os.getenv("OPTION_CHAIN_STALE_SECONDS", "5"))
+# Retry a failed WebSocket subscription at most this often (seconds)
+RESUBSCRIBE_SECONDS = float(os.getenv("OPTION_CHAIN_RESUBSCRIBE_SECONDS", "30"))
+# Unsubscribe and drop chains nobody has read for this long (seconds)
+IDLE_SECONDS = float(os.getenv("OPTION_CHAIN_IDLE_SECONDS", "900"))
+
+# Per-leg value columns, in table order
+LEG_FIELDS = ("ltp", "bid", "ask", "open", "high", "low", "prev_close", "volume", "oi")
+INT_FIELDS = {"volume", "oi"}
+# Tick payload keys feeding each column (first one present wins)
+TICK_KEYS = {
+    "ltp": ("ltp",),
+    "bid": ("bid",),
+    "ask": ("ask",),
+    "open": ("open",),
+    "high": ("high",),
+    "low": ("low",),
+    "prev_close": ("prev_close", "close"),
+    "volume": ("volume",),
+    "oi": ("oi", "open_interest"),
+}
+LEGS = ("ce", "pe")
+
+
+def _as_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _tick_values(market_data: dict[str, Any]) -> list[tuple[int, float]]:
+    """(column, value) pairs present in a tick or quote payload"""
+    values = []
+    for column, field in enumerate(LEG_FIELDS):
+        for key in TICK_KEYS[field]:
+            if key in market_data:
+                value = _as_float(market_data[key])
+                if value is not None:
+                    values.append((column, value))
+                break
+
+    # Depth ticks carry bid/ask as the best book levels
+    depth = market_data.get("depth")
+    if isinstance(depth, dict):
+        for column, side in ((LEG_FIELDS.index("bid"), "buy"), (LEG_FIELDS.index("ask"), "sell")):
+            levels = depth.get(side) or []
+            if levels and isinstance(levels[0], dict):
+                value = _as_float(levels[0].get("price"))
+                if value is not None:
+                    values.append((column, value))
+    return values
+
+
+class ChainTable:
+    """
+    One option chain as arrays: values[row, leg, field] for every strike row and
+    CE/PE leg, plus leg_seq[row, leg], the sequence number of the leg's last change.
+    Writers and readers share a short lock; readers copy the arrays and build the
+    response outside it.
+    """
+
+    def __init__(
+        self,
+        base_symbol: str,
+        expiry: str,
+        quote_symbol: str,
+        quote_exchange: str,
+        options_exchange: str,
+        chain_symbols: list[dict[str, Any]],
+        counter: itertools.count,
+    ):
+        self.base_symbol = base_symbol
+        self.expiry = expiry
+        self.quote_symbol = quote_symbol
+        self.quote_exchange = quote_exchange
+        self.options_exchange = options_exchange
+        self.underlying_key = f"{quote_exchange}:{quote_symbol}"
+
+        self.strikes = np.array([item["strike"] for item in chain_symbols], dtype=np.float64)
+        self.strike_values = [item["strike"] for item in chain_symbols]
+        # Static leg metadata (symbol, exists, lotsize, tick_size) per row and leg
+        self.legs = [(item["ce"], item["pe"]) for item in chain_symbols]
+        self.positions: dict[str, tuple[int, int]] = {}
+        for row, legs in enumerate(self.legs):
+            for leg, meta in enumerate(legs):
+                if meta["exists"]:
+                    self.positions[f"{options_exchange}:{meta['symbol']}"] = (row, leg)
+
+        n = len(chain_symbols)
+        self.values = np.zeros((n, 2, len(LEG_FIELDS)), dtype=np.float64)
+        self.leg_seq = np.zeros((n, 2), dtype=np.int64)
+
+        self._counter = counter
+        self.lock = threading.Lock()
+        self.base_seq = next(counter)
+        self.seq = self.base_seq
+        self.underlying_ltp: float | None = None
+        self.underlying_prev_close: float = 0
+        self.atm_index: int | None = None
+        self.atm_seq = self.base_seq
+
+        # Stream / refresh state (owned by the service)
+        self.subscriber_id: int | None = None
+        self.ws_symbols: list[dict[str, str]] = []
+        self.ws_api_key: str | None = None
+        self.live = False
+        # Last tick received for the chain (or the time it was subscribed)
+        self.last_tick_at = 0.0
+        self.subscribe_attempted_at = 0.0
+        self.refreshed_at = 0.0
+        self.last_read = time.time()
+        self.refresh_lock = threading.Lock()
+
+    def is_stale(self, now: float) -> bool:
+        """True when the table has no live stream or the stream went quiet"""
+        return not self.live or now - self.last_tick_at >= STALE_SECONDS
+
+    def leg_symbols(self) -> list[dict[str, str]]:
+        return [
+            {"symbol": meta["symbol"], "exchange": self.options_exchange}
+            for legs in self.legs
+            for meta in legs
+            if meta["exists"]
+        ]
+
+    def _set_underlying(self, market_data: dict[str, Any], seq: int) -> bool:
+        ltp = _as_float(market_data.get("ltp"))
+        if ltp is None or ltp == self.underlying_ltp:
+            return False
+        self.underlying_ltp = ltp
+        prev_close = market_data.get("prev_close", market_data.get("close"))
+        if prev_close is not None:
+            self.underlying_prev_close = prev_close
+
+        # ATM is the strike closest to the LTP (first one on a tie, like min())
+        atm_index = int(np.argmin(np.abs(self.strikes - ltp))) if len(self.strikes) else None
+        if atm_index != self.atm_index:
+            self.atm_index = atm_index
+            self.atm_seq = seq
+        return True
+
+    def _set_leg(self, row: int, leg: int, market_data: dict[str, Any], seq: int) -> bool:
+        row_values = self.values[row, leg]
+        changed = False
+        for column, value in _tick_values(market_data):
+            if row_values[column] != value:
+                row_values[column] = value
+                changed = True
+        if changed:
+            self.leg_seq[row, leg] = seq
+        return changed
+
+    def apply(self, symbol_key: str, market_data: dict[str, Any]) -> bool:
+        """Apply one tick. Returns True if the table changed."""
+        with self.lock:
+            self.last_tick_at = time.time()
+            seq = next(self._counter)
+            if symbol_key == self.underlying_key:
+                changed = self._set_underlying(market_data, seq)
+            else:
+                position = self.positions.get(symbol_key)
+                changed = position is not None and self._set_leg(*position, market_data, seq)
+            if changed:
+                self.seq = seq
+            return changed
+
+    def load(self, underlying_quote: dict[str, Any], quotes_map: dict[str, dict[str, Any]]):
+        """Apply REST quotes for the underlying and every leg in one step"""
+        with self.lock:
+            seq = next(self._counter)
+            changed = self._set_underlying(underlying_quote, seq)
+            for row, legs in enumerate(self.legs):
+                for leg, meta in enumerate(legs):
+                    quote = quotes_map.get(meta["symbol"])
+                    if meta["exists"] and quote:
+                        changed = self._set_leg(row, leg, quote, seq) or changed
+            if changed:
+                self.seq = seq
+            self.refreshed_at = time.time()
+
+    def read(self, strike_count: int | None, since: int | None = None) -> dict[str, Any]:
+        """Chain response (same shape as get_option_chain) for the strikes around ATM"""
+        with self.lock:
+            values = self.values.copy()
+            leg_seq = self.leg_seq.copy()
+            seq = self.seq
+            atm_index = self.atm_index
+            atm_seq = self.atm_seq
+            underlying_ltp = self.underlying_ltp
+            underlying_prev_close = self.underlying_prev_close
+
+        n = len(self.strike_values)
+        if strike_count is None:
+            start, end = 0, n
+        else:
+            start, end = max(0, atm_index - strike_count), min(n, atm_index + strike_count + 1)
+
+        full = since is None or since < self.base_seq or since < atm_seq
+        rows = np.arange(start, end)
+        if not full:
+            rows = rows[(leg_seq[start:end] > since).any(axis=1)]
+
+        chain = []
+        for row in rows.tolist():
+            position = row - atm_index
+            if position == 0:
+                labels = ("ATM", "ATM")
+            elif position < 0:
+                # Strikes below ATM: CE is ITM, PE is OTM
+                labels = (f"ITM{-position}", f"OTM{-position}")
+            else:
+                # Strikes above ATM: CE is OTM, PE is ITM
+                labels = (f"OTM{position}", f"ITM{position}")
+
+            strike_data = {"strike": self.strike_values[row]}
+            for leg, name in enumerate(LEGS):
+                meta = self.legs[row][leg]
+                if not meta["exists"]:
+                    strike_data[name] = None
+                    continue
+                quote = {
+                    field: int(value) if field in INT_FIELDS else value
+                    for field, value in zip(LEG_FIELDS, values[row, leg].tolist(), strict=True)
+                }
+                strike_data[name] = build_leg(meta, labels[leg], quote)
+            chain.append(strike_data)
+
+        response = {
+            "status": "success",
+            "underlying": self.base_symbol,
+            "underlying_ltp": underlying_ltp,
+            "underlying_prev_close": underlying_prev_close,
+            "expiry_date": self.expiry,
+            "atm_strike": self.strike_values[atm_index],
+            "chain": chain,
+            "seq": seq,
+        }
+        if since is not None:
+            response["full"] = full
+        return response
+
+
+class OptionChainSnapshotService:
+    """
+    Registry of streaming option chain tables, keyed by underlying quote symbol,
+    options exchange and expiry.
+    """
+
+    def __init__(self):
+        self._tables: dict[tuple[str, str, str, str], ChainTable] = {}
+        self._lock = threading.Lock()
+        # Per-key build locks, dropped with the table (or after a failed build)
+        self._build_locks: dict[tuple[str, str, str, str], threading.Lock] = {}
+        self._counter = itertools.count(1)
+        # (api_key, symbol, exchange) -> number of tables using the WebSocket subscription
+        self._ws_refs: dict[tuple[str, str, str], int] = {}
+        self._metrics_lock = threading.Lock()
+        self.metrics = {"reads": 0, "cold_starts": 0, "rest_refreshes": 0, "ticks": 0}
+
+    def _count(self, name: str) -> None:
+        with self._metrics_lock:
+            self.metrics[name] += 1
+
+    def get_chain(
+        self,
+        underlying: str,
+        exchange: str,
+        expiry_date: str | None,
+        strike_count: int | None,
+        api_key: str,
+        since: int | None = None,
+    ) -> tuple[bool, dict[str, Any], int]:
+        """
+        Current option chain, or the strikes changed since sequence number `since`.
+
+        Args:
+            underlying: Underlying symbol (e.g., NIFTY, BANKNIFTY, RELIANCE)
+            exchange: Exchange (NSE_INDEX, NSE, NFO, BSE_INDEX, BSE, BFO, MCX, CDS)
+            expiry_date: Expiry date in DDMMMYY format (e.g., 28NOV25)
+            strike_count: Number of strikes above and below ATM (None for all)
+            api_key: OpenAlgo API key (used for the cold start and the subscription)
+            since: Optional "seq" from an earlier response
+
+        Returns:
+            Tuple of (success, response_data, status_code)
+        """
+        try:
+            base_symbol, final_expiry, quote_symbol, quote_exchange = resolve_chain_underlying(
+                underlying, exchange, expiry_date
+            )
+            if not final_expiry:
+                return False, {"status": "error", "message": "Expiry date is required."}, 400
+
+            options_exchange = get_option_exchange(quote_exchange)
+            key = (quote_exchange, quote_symbol, options_exchange, final_expiry.upper())
+
+            self._evict_idle()
+            table = self._tables.get(key)
+            if table is None:
+                table, error = self._get_or_build(
+                    key, base_symbol, final_expiry, quote_symbol, quote_exchange, api_key
+                )
+                if table is None:
+                    return error
+            elif table.is_stale(time.time()):
+                self._refresh(table, api_key)
+
+            table.last_read = time.time()
+            self._count("reads")
+            return True, table.read(strike_count, since), 200
+
+        except Exception as e:
+            logger.exception(f"Error in option chain snapshot: {e}")
+            return (
+                False,
+                {
+                    "status": "error",
+                    "message": f"An error occurred while fetching option chain: {str(e)}",
+                },
+                500,
+            )
+
+    def _get_or_build(
+        self,
+        key: tuple[str, str, str, str],
+        base_symbol: str,
+        expiry: str,
+        quote_symbol: str,
+        quote_exchange: str,
+        api_key: str,
+    ) -> tuple[ChainTable | None, tuple[bool, dict[str, Any], int] | None]:
+        """Build a table once per key; concurrent first readers wait for the same build"""
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            table = self._tables.get(key)
+            if table is not None:
+                return table, None
+
+            table, error = self._build(base_symbol, expiry, quote_symbol, quote_exchange, api_key)
+            if table is None:
+                with self._lock:
+                    if self._build_locks.get(key) is build_lock:
+                        del self._build_locks[key]
+                return None, error
+
+            self._subscribe(table, api_key)
+            with self._lock:
+                self._tables[key] = table
+            return table, None
+
+    def _build(
+        self,
+        base_symbol: str,
+        expiry: str,
+        quote_symbol: str,
+        quote_exchange: str,
+        api_key: str,
+    ) -> tuple[ChainTable | None, tuple[bool, dict[str, Any], int] | None]:
+        """Cold start: strike list from the symbol DB and quotes from the broker"""
+        logger.info(f"Building option chain snapshot for {quote_symbol} {expiry}")
+        self._count("cold_starts")
+
+        success, quote_response, status_code = get_quotes(
+            symbol=quote_symbol, exchange=quote_exchange, api_key=api_key
+        )
+        if not success:
+            return None, (
+                False,
+                {
+                    "status": "error",
+                    "message": f"Failed to fetch LTP for {quote_symbol}: {quote_response.get('message', 'Unknown error')}",
+                },
+                status_code,
+            )
+        underlying_data = quote_response.get("data", {})
+        if underlying_data.get("ltp") is None:
+            return None, (
+                False,
+                {"status": "error", "message": f"Could not determine LTP for {quote_symbol}"},
+                500,
+            )
+
+        options_exchange = get_option_exchange(quote_exchange)
+        available_strikes = get_available_strikes(base_symbol, expiry, "CE", options_exchange)
+        if not available_strikes:
+            return None, (
+                False,
+                {
+                    "status": "error",
+                    "message": f"No strikes found for {base_symbol} expiring {expiry}. Please check expiry date or update master contract.",
+                },
+                404,
+            )
+
+        chain_symbols = get_option_symbols_for_chain(
+            base_symbol,
+            expiry,
+            [{"strike": s, "ce_label": "", "pe_label": ""} for s in available_strikes],
+            options_exchange,
+        )
+        table = ChainTable(
+            base_symbol,
+            expiry,
+            quote_symbol,
+            quote_exchange,
+            options_exchange,
+            chain_symbols,
+            self._counter,
+        )
+        symbols_to_fetch = table.leg_symbols()
+        if not symbols_to_fetch:
+            return None, (
+                False,
+                {
+                    "status": "error",
+                    "message": "No valid option symbols found for the given parameters",
+                },
+                404,
+            )
+
+        logger.info(f"Fetching quotes for {len(symbols_to_fetch)} option symbols")
+        table.load(underlying_data, fetch_leg_quotes(symbols_to_fetch, api_key))
+        return table, None
+
+    def _refresh(self, table: ChainTable, api_key: str):
+        """Fallback while a table has no live (or a stale) stream: retry the subscription, else REST"""
+        now = time.time()
+        if not table.live and now - table.subscribe_attempted_at >= RESUBSCRIBE_SECONDS:
+            self._subscribe(table, api_key)
+            if table.live:
+                return
+
+        if now - table.refreshed_at < REST_REFRESH_SECONDS:
+            return
+        # One reader refreshes; the others serve the current table
+        if not table.refresh_lock.acquire(blocking=False):
+            return
+        try:
+            success, quote_response, _ = get_quotes(
+                symbol=table.quote_symbol, exchange=table.quote_exchange, api_key=api_key
+            )
+            underlying_data = quote_response.get("data", {}) if success else {}
+            table.load(underlying_data, fetch_leg_quotes(table.leg_symbols(), api_key))
+            self._count("rest_refreshes")
+        finally:
+            table.refresh_lock.release()
+
+    def _on_market_data(self, table: ChainTable, data: dict[str, Any]):
+        market_data = data.get("data") or {}
+        symbol_key = f"{data.get('exchange')}:{data.get('symbol')}"
+        if table.apply(symbol_key, market_data):
+            self._count("ticks")
+
+    def _subscribe(self, table: ChainTable, api_key: str):
+        """Listen to MarketDataService for the chain and subscribe its symbols via the proxy"""
+        table.subscribe_attempted_at = time.time()
+        if table.subscriber_id is None:
+            filter_symbols = set(table.positions) | {table.underlying_key}
+            table.subscriber_id = get_market_data_service().subscribe_with_priority(
+                SubscriberPriority.NORMAL,
+                "all",
+                lambda data: self._on_market_data(table, data),
+                filter_symbols=filter_symbols,
+                name=f"option_chain:{table.quote_symbol}:{table.expiry}",
+            )
+
+        symbols = [{"symbol": table.quote_symbol, "exchange": table.quote_exchange}]
+        symbols += table.leg_symbols()
+        table.live = self._ws_subscribe(api_key, symbols)
+        if table.live:
+            table.ws_symbols = symbols
+            table.ws_api_key = api_key
+            # Give the stream STALE_SECONDS to deliver its first tick
+            table.last_tick_at = max(table.last_tick_at, time.time())
+        else:
+            logger.warning(
+                f"Option chain {table.quote_symbol} {table.expiry} has no live stream, "
+                f"serving REST refreshes every {REST_REFRESH_SECONDS}s"
+            )
+
+    def _ws_subscribe(self, api_key: str, symbols: list[dict[str, str]]) -> bool:
+        """Subscribe symbols through the WebSocket proxy (reference counted across tables)"""
+        with self._lock:
+            new = [
+                s for s in symbols if not self._ws_refs.get((api_key, s["symbol"], s["exchange"]))
+            ]
+
+        if new:
+            try:
+                client = get_websocket_client(api_key, WS_HOST, WS_PORT)
+            except ConnectionError as e:
+                logger.warning(f"Option chain stream unavailable: {e}")
+                return False
+            result = client.subscribe(new, "Quote")
+            if result.get("status") != "success":
+                logger.warning(f"Option chain subscription failed: {result.get('message')}")
+                return False
+
+        with self._lock:
+            for s in symbols:
+                ref = (api_key, s["symbol"], s["exchange"])
+                self._ws_refs[ref] = self._ws_refs.get(ref, 0) + 1
+        return True
+
+    def _ws_unsubscribe(self, api_key: str, symbols: list[dict[str, str]]):
+        released = []
+        with self._lock:
+            for s in symbols:
+                ref = (api_key, s["symbol"], s["exchange"])
+                count = self._ws_refs.get(ref, 0) - 1
+                if count > 0:
+                    self._ws_refs[ref] = count
+                else:
+                    self._ws_refs.pop(ref, None)
+                    released.append(s)
+        if not released:
+            return
+        try:
+            get_websocket_client(api_key, WS_HOST, WS_PORT).unsubscribe(released, "Quote")
+        except ConnectionError as e:
+            logger.debug(f"Option chain unsubscribe skipped: {e}")
+
+    def _release(self, key: tuple[str, str, str, str], table: ChainTable):
+        with self._lock:
+            self._tables.pop(key, None)
+            self._build_locks.pop(key, None)
+        if table.subscriber_id is not None:
+            get_market_data_service().unsubscribe_priority(table.subscriber_id)
+            table.subscriber_id = None
+        if table.ws_symbols:
+            self._ws_unsubscribe(table.ws_api_key, table.ws_symbols)
+            table.ws_symbols = []
+
+    def _evict_idle(self):
+        cutoff = time.time() - IDLE_SECONDS
+        with self._lock:
+            idle = [(key, table) for key, table in self._tables.items() if table.last_read < cutoff]
+        for key, table in idle:
+            logger.info(f"Dropping idle option chain snapshot {table.quote_symbol} {table.expiry}")
+            self._release(key, table)
+
+
+_snapshot_service = OptionChainSnapshotService()
+
+
+def get_option_chain_snapshot_service() -> OptionChainSnapshotService:
+    return _snapshot_service
+
+
+def get_option_chain_snapshot(
+    underlying: str,
+    exchange: str,
+    expiry_date: str | None,
+    strike_count: int | None,
+    api_key: str,
+    since: int | None = None,
+) -> tuple[bool, dict[str, Any], int]:
+    """Option chain from the streaming snapshot table (see OptionChainSnapshotService.get_chain)"""
+    return _snapshot_service.get_chain(
+        underlying, exchange, expiry_date, strike_count, api_key, since
+    )
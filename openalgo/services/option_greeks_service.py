@@ -5,12 +5,18 @@ for options across all supported exchanges (NFO, BFO, CDS, MCX)
 
 Uses Black-76 model (py_vollib) - appropriate for options on futures/forwards
 which is the correct model for Indian F&O markets (NFO, BFO, MCX, CDS)
+
+Batch requests (get_multi_option_greeks) fetch every quote in one multiquotes call
+and price all options in one NumPy pass with the vectorized engine in utils/black76.py
 """
 
 import re
 from datetime import datetime
 from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
+
+from utils import black76
 from utils.logging import get_logger
 
 # Import py_vollib for Black-76 calculations
@@ -249,6 +255,49 @@ def calculate_time_to_expiry(expiry: datetime) -> tuple[float, float]:
     return years_to_expiry, days_to_expiry
 
 
+def _deep_itm_response(
+    option_symbol: str,
+    exchange: str,
+    base_symbol: str,
+    strike: float,
+    opt_type: str,
+    expiry: datetime,
+    time_to_expiry_days: float,
+    spot_price: float,
+    option_price: float,
+    interest_rate: float,
+    note: str,
+) -> dict[str, Any]:
+    """Theoretical Greeks (IV=0, Delta=+/-1, rest 0) for an option with no usable time value"""
+    intrinsic_value = (
+        max(spot_price - strike, 0) if opt_type == "CE" else max(strike - spot_price, 0)
+    )
+    return {
+        "status": "success",
+        "symbol": option_symbol,
+        "exchange": exchange,
+        "underlying": base_symbol,
+        "strike": round(strike, 2),
+        "option_type": opt_type,
+        "expiry_date": expiry.strftime("%d-%b-%Y"),
+        "days_to_expiry": round(time_to_expiry_days, 4),
+        "spot_price": round(spot_price, 2),
+        "option_price": round(option_price, 2),
+        "intrinsic_value": round(intrinsic_value, 2),
+        "time_value": round(max(option_price - intrinsic_value, 0), 2),
+        "interest_rate": round(interest_rate, 2),
+        "implied_volatility": 0,  # No IV for deep ITM
+        "greeks": {
+            "delta": 1.0 if opt_type == "CE" else -1.0,  # Deep ITM delta
+            "gamma": 0,
+            "theta": 0,
+            "vega": 0,
+            "rho": 0,
+        },
+        "note": note,
+    }
+
+
 def calculate_greeks(
     option_symbol: str,
     exchange: str,
@@ -336,30 +385,19 @@ def calculate_greeks(
             # Return theoretical Greeks: IV=0, Delta=+/-1, Gamma=0, Theta=0, Vega=0
             logger.info("Deep ITM option with no time value - returning theoretical Greeks")
 
-            response = {
-                "status": "success",
-                "symbol": option_symbol,
-                "exchange": exchange,
-                "underlying": base_symbol,
-                "strike": round(strike, 2),
-                "option_type": opt_type,
-                "expiry_date": expiry.strftime("%d-%b-%Y"),
-                "days_to_expiry": round(time_to_expiry_days, 4),
-                "spot_price": round(spot_price, 2),
-                "option_price": round(option_price, 2),
-                "intrinsic_value": round(intrinsic_value, 2),
-                "time_value": round(max(time_value, 0), 2),
-                "interest_rate": round(interest_rate, 2),
-                "implied_volatility": 0,  # No IV for deep ITM
-                "greeks": {
-                    "delta": 1.0 if opt_type == "CE" else -1.0,  # Deep ITM delta
-                    "gamma": 0,
-                    "theta": 0,
-                    "vega": 0,
-                    "rho": 0,
-                },
-                "note": "Deep ITM option with no time value - theoretical Greeks returned",
-            }
+            response = _deep_itm_response(
+                option_symbol,
+                exchange,
+                base_symbol,
+                strike,
+                opt_type,
+                expiry,
+                time_to_expiry_days,
+                spot_price,
+                option_price,
+                interest_rate,
+                "Deep ITM option with no time value - theoretical Greeks returned",
+            )
             return True, response, 200
 
         # Calculate Implied Volatility using Black-76 model
@@ -384,30 +422,19 @@ def calculate_greeks(
                 logger.info(
                     "IV calculation failed - returning theoretical Greeks for deep ITM option"
                 )
-                response = {
-                    "status": "success",
-                    "symbol": option_symbol,
-                    "exchange": exchange,
-                    "underlying": base_symbol,
-                    "strike": round(strike, 2),
-                    "option_type": opt_type,
-                    "expiry_date": expiry.strftime("%d-%b-%Y"),
-                    "days_to_expiry": round(time_to_expiry_days, 4),
-                    "spot_price": round(spot_price, 2),
-                    "option_price": round(option_price, 2),
-                    "intrinsic_value": round(intrinsic_value, 2),
-                    "time_value": round(max(time_value, 0), 2),
-                    "interest_rate": round(interest_rate, 2),
-                    "implied_volatility": 0,  # No IV calculable
-                    "greeks": {
-                        "delta": 1.0 if opt_type == "CE" else -1.0,
-                        "gamma": 0,
-                        "theta": 0,
-                        "vega": 0,
-                        "rho": 0,
-                    },
-                    "note": "IV calculation not possible - theoretical deep ITM Greeks returned",
-                }
+                response = _deep_itm_response(
+                    option_symbol,
+                    exchange,
+                    base_symbol,
+                    strike,
+                    opt_type,
+                    expiry,
+                    time_to_expiry_days,
+                    spot_price,
+                    option_price,
+                    interest_rate,
+                    "IV calculation not possible - theoretical deep ITM Greeks returned",
+                )
                 return True, response, 200
             return (
                 False,
@@ -621,6 +648,216 @@ def get_option_greeks(
         return False, {"status": "error", "message": f"Failed to get option Greeks: {str(e)}"}, 500
 
 
+def calculate_greeks_batch(
+    options: list[dict[str, Any]],
+    interest_rate: float | None = None,
+    expiry_time: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Calculate Greeks for many options at once with the vectorized Black-76 engine.
+
+    IV is solved for all options together and all Greeks come from one NumPy pass,
+    so a full option chain costs about as much as a handful of single calls.
+
+    Args:
+        options: List of dicts with 'symbol', 'exchange', 'spot_price' (underlying
+            futures/forward price) and 'option_price'
+        interest_rate: Optional interest rate (annualized %) for all options
+        expiry_time: Optional custom expiry time in "HH:MM" format for all options
+
+    Returns:
+        One response dict per option, in input order, shaped like calculate_greeks()
+    """
+    responses: list[dict[str, Any] | None] = [None] * len(options)
+    now = datetime.now()
+
+    def error(i, message):
+        responses[i] = {
+            "status": "error",
+            "symbol": options[i].get("symbol"),
+            "exchange": options[i].get("exchange"),
+            "message": message,
+        }
+
+    rows = []
+    for i, option in enumerate(options):
+        symbol = option.get("symbol")
+        exchange = option.get("exchange")
+        try:
+            base_symbol, expiry, strike, opt_type = parse_option_symbol(
+                symbol, exchange, expiry_time
+            )
+        except ValueError as e:
+            error(i, str(e))
+            continue
+
+        if expiry <= now:
+            error(i, f"Option has expired on {expiry.strftime('%d-%b-%Y')}")
+            continue
+
+        spot_price = option.get("spot_price") or 0
+        option_price = option.get("option_price") or 0
+        if spot_price <= 0 or option_price <= 0:
+            error(i, "Spot price and option price must be positive")
+            continue
+        if strike <= 0:
+            error(i, "Strike price must be positive")
+            continue
+
+        # Same minimum as calculate_time_to_expiry to avoid numerical issues
+        years_to_expiry = max((expiry - now).total_seconds() / (60 * 60 * 24 * 365.0), 0.0001)
+        rate = (
+            interest_rate if interest_rate is not None else DEFAULT_INTEREST_RATES.get(exchange, 0)
+        )
+        rows.append(
+            (
+                i,
+                symbol,
+                exchange,
+                base_symbol,
+                expiry,
+                strike,
+                opt_type,
+                years_to_expiry,
+                spot_price,
+                option_price,
+                rate,
+            )
+        )
+
+    if rows:
+        index, symbol, exchange, base_symbol, expiry, strike, opt_type, t, spot, price, rate = zip(
+            *rows, strict=True
+        )
+        strike_arr = np.array(strike, dtype=float)
+        spot_arr = np.array(spot, dtype=float)
+        price_arr = np.array(price, dtype=float)
+        t_arr = np.array(t, dtype=float)
+        r_arr = np.array(rate, dtype=float) / 100.0
+        is_call = np.array(opt_type) == "CE"
+
+        intrinsic = np.where(
+            is_call, np.maximum(spot_arr - strike_arr, 0), np.maximum(strike_arr - spot_arr, 0)
+        )
+        time_value = price_arr - intrinsic
+        # Deep ITM with no/negligible time value: theoretical Greeks (like Opstra does)
+        deep_itm = (time_value <= 0) | ((intrinsic > 0) & (time_value < 0.01))
+
+        iv = black76.implied_volatility(price_arr, spot_arr, strike_arr, t_arr, r_arr, is_call)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g = black76.greeks(spot_arr, strike_arr, t_arr, r_arr, iv, is_call)
+
+        # No IV above the price bound (forward for calls, strike for puts)
+        above_max = price_arr * np.exp(r_arr * t_arr) >= np.where(is_call, spot_arr, strike_arr)
+
+        # Round whole columns once; tolist() gives plain floats for the JSON response
+        columns = {
+            "implied_volatility": np.round(iv * 100.0, 2).tolist(),
+            "delta": np.round(g["delta"], 4).tolist(),
+            "gamma": np.round(g["gamma"], 6).tolist(),
+            "theta": np.round(g["theta"], 4).tolist(),
+            "vega": np.round(g["vega"], 4).tolist(),
+            "rho": np.round(g["rho"], 6).tolist(),
+        }
+        expiry_dates = {e: e.strftime("%d-%b-%Y") for e in set(expiry)}
+
+        for j, i in enumerate(index):
+            days_to_expiry = t[j] * 365.0
+            if deep_itm[j] or (np.isnan(iv[j]) and not above_max[j]):
+                note = (
+                    "Deep ITM option with no time value - theoretical Greeks returned"
+                    if deep_itm[j]
+                    else "IV calculation not possible - theoretical deep ITM Greeks returned"
+                )
+                responses[i] = _deep_itm_response(
+                    symbol[j],
+                    exchange[j],
+                    base_symbol[j],
+                    strike[j],
+                    opt_type[j],
+                    expiry[j],
+                    days_to_expiry,
+                    spot[j],
+                    price[j],
+                    rate[j],
+                    note,
+                )
+                continue
+
+            if np.isnan(iv[j]):
+                error(
+                    i,
+                    "Failed to calculate Implied Volatility: option price is above the maximum for its forward",
+                )
+                continue
+
+            responses[i] = {
+                "status": "success",
+                "symbol": symbol[j],
+                "exchange": exchange[j],
+                "underlying": base_symbol[j],
+                "strike": round(strike[j], 2),
+                "option_type": opt_type[j],
+                "expiry_date": expiry_dates[expiry[j]],
+                "days_to_expiry": round(days_to_expiry, 4),
+                "spot_price": round(spot[j], 2),
+                "option_price": round(price[j], 2),
+                "interest_rate": round(rate[j], 2),
+                "implied_volatility": columns["implied_volatility"][j],
+                "greeks": {
+                    "delta": columns["delta"][j],
+                    "gamma": columns["gamma"][j],
+                    "theta": columns["theta"][j],
+                    "vega": columns["vega"][j],
+                    "rho": columns["rho"][j],
+                },
+            }
+
+    return responses
+
+
+def _fetch_ltps(
+    keys: list[tuple[str, str]], api_key: str | None
+) -> tuple[dict[tuple[str, str], float], dict[tuple[str, str], str]]:
+    """
+    LTPs for (symbol, exchange) pairs with one multiquotes call.
+    Pairs missing from the multiquotes result are fetched one by one.
+
+    Returns:
+        ({(symbol, exchange): ltp}, {(symbol, exchange): error message})
+    """
+    # Import here to avoid circular dependency
+    from services.quotes_service import get_multiquotes, get_quotes
+
+    ltps = {}
+    errors = {}
+    success, response, _ = get_multiquotes(
+        [{"symbol": symbol, "exchange": exchange} for symbol, exchange in keys], api_key=api_key
+    )
+    if success:
+        for item in response.get("results", []):
+            key = (item.get("symbol"), item.get("exchange"))
+            if item.get("error"):
+                errors[key] = item["error"]
+            elif (item.get("data") or {}).get("ltp"):
+                ltps[key] = item["data"]["ltp"]
+    else:
+        logger.info(
+            f"Multiquotes unavailable ({response.get('message')}), fetching quotes individually"
+        )
+
+    for key in keys:
+        if key in ltps or key in errors:
+            continue
+        success, quote_response, _ = get_quotes(key[0], key[1], api_key)
+        if not success:
+            errors[key] = quote_response.get("message", "Unknown error")
+        elif quote_response.get("data", {}).get("ltp"):
+            ltps[key] = quote_response["data"]["ltp"]
+
+    return ltps, errors
+
+
 def get_multi_option_greeks(
     symbols: list,
     interest_rate: float | None = None,
@@ -629,7 +866,10 @@ def get_multi_option_greeks(
 ) -> tuple[bool, dict[str, Any], int]:
     """
     Get option Greeks for multiple symbols in a single call.
-    Uses concurrent execution for efficiency.
+
+    Underlying and option quotes are fetched together with one multiquotes call (each
+    underlying once, however many strikes reference it), then all Greeks are
+    calculated in one vectorized pass (calculate_greeks_batch).
 
     Args:
         symbols: List of dicts with 'symbol', 'exchange', optional 'underlying_symbol', 'underlying_exchange'
@@ -640,8 +880,6 @@ def get_multi_option_greeks(
     Returns:
         Tuple of (success, response_dict, status_code)
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-
     # Early return for empty symbols list
     if not symbols:
         return (
@@ -650,71 +888,77 @@ def get_multi_option_greeks(
             200,
         )
 
-    results = []
-    success_count = 0
-    failed_count = 0
-
-    def fetch_single_greeks(symbol_request):
-        """Fetch Greeks for a single symbol"""
+    results: list[dict[str, Any] | None] = [None] * len(symbols)
+    legs = []  # (position, symbol, exchange, underlying key)
+    for position, symbol_request in enumerate(symbols):
+        symbol = symbol_request.get("symbol")
+        exchange = symbol_request.get("exchange")
         try:
-            symbol = symbol_request.get("symbol")
-            exchange = symbol_request.get("exchange")
-            underlying_symbol = symbol_request.get("underlying_symbol")
-            underlying_exchange = symbol_request.get("underlying_exchange")
-
-            success, response, status_code = get_option_greeks(
-                option_symbol=symbol,
-                exchange=exchange,
-                interest_rate=interest_rate,
-                forward_price=None,  # Not supported in batch mode
-                underlying_symbol=underlying_symbol,
-                underlying_exchange=underlying_exchange,
-                expiry_time=expiry_time,
-                api_key=api_key,
-            )
-
-            return {
-                "success": success,
-                "response": response,
+            base_symbol, _, _, _ = parse_option_symbol(symbol, exchange, expiry_time)
+        except ValueError as e:
+            results[position] = {
+                "status": "error",
                 "symbol": symbol,
                 "exchange": exchange,
+                "message": str(e),
             }
-        except Exception as e:
-            logger.exception(f"Error fetching Greeks for {symbol_request.get('symbol')}: {e}")
-            return {
-                "success": False,
-                "response": {
-                    "status": "error",
-                    "symbol": symbol_request.get("symbol"),
-                    "exchange": symbol_request.get("exchange"),
-                    "message": str(e),
-                },
-                "symbol": symbol_request.get("symbol"),
-                "exchange": symbol_request.get("exchange"),
-            }
+            continue
 
-    # Use ThreadPoolExecutor for parallel execution
-    # Limit workers to avoid overwhelming the broker API
-    max_workers = min(len(symbols), 10)
+        underlying = (
+            symbol_request.get("underlying_symbol") or base_symbol,
+            symbol_request.get("underlying_exchange")
+            or get_underlying_exchange(base_symbol, exchange),
+        )
+        legs.append((position, symbol, exchange, underlying))
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_symbol = {executor.submit(fetch_single_greeks, sym): sym for sym in symbols}
+    try:
+        keys = list(dict.fromkeys([leg[3] for leg in legs] + [(leg[1], leg[2]) for leg in legs]))
+        ltps, errors = _fetch_ltps(keys, api_key) if keys else ({}, {})
+    except Exception as e:
+        logger.exception(f"Error fetching quotes for multi option Greeks: {e}")
+        return False, {"status": "error", "message": f"Failed to get option Greeks: {str(e)}"}, 500
 
-        # Collect results as they complete
-        for future in as_completed(future_to_symbol):
-            result = future.result()
+    options = []
+    positions = []
+    for position, symbol, exchange, underlying in legs:
+        message = None
+        if underlying in errors:
+            message = f"Failed to fetch underlying price: {errors[underlying]}"
+        elif underlying not in ltps:
+            message = "Underlying LTP not available"
+        elif (symbol, exchange) in errors:
+            message = f"Failed to fetch option price: {errors[(symbol, exchange)]}"
+        elif (symbol, exchange) not in ltps:
+            message = "Option LTP not available"
+
+        if message:
+            results[position] = {
+                "status": "error",
+                "symbol": symbol,
+                "exchange": exchange,
+                "message": message,
+            }
+            continue
 
-            if result["success"]:
-                success_count += 1
-                results.append(result["response"])
-            else:
-                failed_count += 1
-                results.append(result["response"])
+        options.append(
+            {
+                "symbol": symbol,
+                "exchange": exchange,
+                "spot_price": ltps[underlying],
+                "option_price": ltps[(symbol, exchange)],
+            }
+        )
+        positions.append(position)
+
+    for position, response in zip(
+        positions,
+        calculate_greeks_batch(options, interest_rate=interest_rate, expiry_time=expiry_time),
+        strict=True,
+    ):
+        results[position] = response
 
-    # Sort results to maintain original order
-    symbol_order = {sym["symbol"]: idx for idx, sym in enumerate(symbols)}
-    results.sort(key=lambda x: symbol_order.get(x.get("symbol"), 999))
+    success_count = sum(1 for result in results if result.get("status") == "success")
+    failed_count = len(results) - success_count
 
     response = {
         "status": "success" if failed_count == 0 else "partial" if success_count > 0 else "error",
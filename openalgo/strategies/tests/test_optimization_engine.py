@@ -0,0 +1,130 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add repo root to path
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from openalgo.strategies.utils import optimization_engine
+from openalgo.strategies.utils.historical_data_store import HistoricalDataStore
+from openalgo.strategies.utils.optimization_engine import GridSearchOptimizer
+
+import trading_utils
+
+PARENT_PID = os.getpid()
+PARAM_RANGES = {'LOOKBACK': [5, 10, 20, 30], 'THRESHOLD': [0.0, 0.5]}
+
+
+def make_bars(n=300, seed=5):
+    """Raw bars as returned by APIClient.history()"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'datetime': pd.date_range('2025-01-01 09:15', periods=n, freq='15min'),
+        'open': close + rng.normal(0, 0.2, n),
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': rng.integers(100, 1000, n),
+    })
+
+
+def make_strategy(strategy_name, params):
+    """Momentum strategy: trade in the direction of the move over LOOKBACK bars"""
+    lookback, threshold = params['LOOKBACK'], params['THRESHOLD']
+
+    def generate_signal(df, client=None, symbol=None):
+        move = df['close'].iloc[-1] - df['close'].iloc[-1 - lookback]
+        if move > threshold:
+            return 'BUY', 1.0, {'atr': 1.0}
+        if move < -threshold:
+            return 'SELL', 1.0, {'atr': 1.0}
+        return 'HOLD', 0.0, {}
+
+    return SimpleNamespace(generate_signal=generate_signal)
+
+
+class TestHistoricalDataStore(unittest.TestCase):
+    def test_round_trip(self):
+        df = make_bars(50).set_index('datetime')
+        df.index = df.index.tz_localize('Asia/Kolkata')
+        df['symbol'] = 'GOLD'
+        key = HistoricalDataStore.make_key('GOLD', 'MCX', '2025-01-01', '2025-01-31', '15m')
+        store = HistoricalDataStore.from_frame(df, key)
+        try:
+            attached = HistoricalDataStore.attach(store.share())
+            frame = attached.frame()
+            pd.testing.assert_frame_equal(frame, df.drop(columns=['symbol']))
+            self.assertEqual(len(attached), 50)
+            self.assertTrue(attached.covers('GOLD', 'MCX', '2025-01-01', '2025-01-31', '15m'))
+            self.assertFalse(attached.covers('GOLD', 'MCX', '2025-01-01', '2025-02-28', '15m'))
+            with self.assertRaises(ValueError):
+                attached.arrays['close'][0] = 0.0
+            attached.close()
+        finally:
+            store.close()
+
+
+class TestGridSearch(unittest.TestCase):
+    def setUp(self):
+        self.history_calls = 0
+        patches = [
+            patch.object(optimization_engine, 'get_grid_search_params', return_value=PARAM_RANGES),
+            patch.object(optimization_engine, 'create_strategy_with_params', make_strategy),
+            patch.object(trading_utils.APIClient, 'history', self.fake_history),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def fake_history(self, *args, **kwargs):
+        # Workers must read the shared store, not the API
+        if os.getpid() != PARENT_PID:
+            raise AssertionError("history() called in a worker")
+        self.history_calls += 1
+        return self.bars.copy()
+
+    def optimizer(self, **kwargs):
+        return GridSearchOptimizer('momentum', 'GOLD', 'MCX', '2025-01-01', '2025-01-31',
+                                   api_key='test', **kwargs)
+
+    def test_parallel_matches_serial(self):
+        self.bars = make_bars()
+        serial = self.optimizer(max_workers=1).optimize()
+        self.assertEqual(self.history_calls, 1)
+
+        progress = []
+        parallel = self.optimizer(max_workers=2).optimize(
+            progress_callback=lambda done, total, result: progress.append((done, total))
+        )
+        self.assertEqual(self.history_calls, 2)
+        self.assertEqual(len(parallel), 8)
+        self.assertTrue(all('error' not in r for r in parallel))
+        self.assertEqual([(r['parameters'], r['composite_score']) for r in parallel],
+                         [(r['parameters'], r['composite_score']) for r in serial])
+        self.assertEqual(progress[-1], (8, 8))
+
+    def test_early_stop(self):
+        self.bars = make_bars()
+        serial = self.optimizer(max_workers=1, early_stop_score=0.0).optimize()
+        self.assertEqual(len(serial), 1)
+
+        parallel = self.optimizer(max_workers=2, early_stop_score=0.0).optimize()
+        self.assertTrue(1 <= len(parallel) < 8)
+
+    def test_no_data(self):
+        self.bars = pd.DataFrame()
+        results = self.optimizer(max_workers=2).optimize()
+        self.assertEqual(self.history_calls, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(r['error'] == 'No data available' for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
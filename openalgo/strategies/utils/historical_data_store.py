@@ -0,0 +1,144 @@
+"""
+Historical Data Store
+---------------------
+Holds the bars of one historical data request in a shared memory block so that
+every backtest of an optimization run (and every worker process running those
+backtests) reads the bars from one read-only copy instead of fetching them from
+the OpenAlgo API again.
+
+The parent process loads the data once with HistoricalDataStore.load(), hands
+store.share() to its workers, and each worker opens the block with
+HistoricalDataStore.attach(handle). The parent unlinks the block when done.
+"""
+import logging
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("HistoricalDataStore")
+
+# Column data is laid out on 8-byte boundaries inside the shared block
+_ALIGN = 8
+
+
+class HistoricalDataStore:
+    """Read-only bars of one (symbol, exchange, interval, start, end) request"""
+
+    def __init__(self, key: Tuple[str, ...], shm: shared_memory.SharedMemory,
+                 layout: Dict[str, Any], owner: bool):
+        self.key = key
+        self.layout = layout
+        self.owner = owner
+        self._shm = shm
+        self._frame: Optional[pd.DataFrame] = None
+
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, dtype, offset in layout['columns']:
+            array = np.ndarray((layout['rows'],), dtype=np.dtype(dtype),
+                               buffer=shm.buf, offset=offset)
+            array.flags.writeable = False
+            self.arrays[name] = array
+
+    @staticmethod
+    def make_key(symbol: str, exchange: str, start_date: str, end_date: str,
+                 interval: str) -> Tuple[str, ...]:
+        return (symbol, exchange, start_date, end_date, interval)
+
+    @classmethod
+    def load(cls, engine, symbol: str, exchange: str, start_date: str, end_date: str,
+             interval: str = "15m") -> Optional["HistoricalDataStore"]:
+        """
+        Fetch the bars once through a SimpleBacktestEngine and store them.
+
+        Returns:
+            The store, or None if no data was returned
+        """
+        df = engine.load_historical_data(symbol, exchange, start_date, end_date, interval)
+        if df.empty:
+            return None
+        return cls.from_frame(df, cls.make_key(symbol, exchange, start_date, end_date, interval))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, key: Tuple[str, ...]) -> "HistoricalDataStore":
+        """Copy a DatetimeIndex-ed frame of numeric columns into a new shared block"""
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("Historical data must have a DatetimeIndex")
+
+        # Timestamps in UTC for tz-aware indexes, at the index's own resolution
+        index = df.index.tz_convert(None) if df.index.tz is not None else df.index
+        columns = {'__index__': index.to_numpy()}
+        for name in df.columns:
+            values = df[name].to_numpy()
+            if values.dtype.kind not in 'biuf':
+                logger.debug(f"Skipping non-numeric column {name}")
+                continue
+            columns[str(name)] = values
+
+        layout = {'rows': len(df), 'columns': [], 'tz': str(df.index.tz) if df.index.tz else None,
+                  'index_name': df.index.name}
+        size = 0
+        for name, values in columns.items():
+            layout['columns'].append((name, values.dtype.str, size))
+            size += -(-values.nbytes // _ALIGN) * _ALIGN
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for (name, dtype, offset), values in zip(layout['columns'], columns.values()):
+            target = np.ndarray(values.shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            target[:] = values
+            del target
+
+        logger.info(f"Stored {len(df)} bars of {key[0]} in shared memory ({size / 1024:.0f} KB)")
+        return cls(key, shm, layout, owner=True)
+
+    def share(self) -> Dict[str, Any]:
+        """Picklable handle for attach() in another process"""
+        return {'name': self._shm.name, 'key': self.key, 'layout': self.layout}
+
+    @classmethod
+    def attach(cls, handle: Dict[str, Any]) -> "HistoricalDataStore":
+        """Open a store created by another process"""
+        shm = shared_memory.SharedMemory(name=handle['name'])
+        return cls(tuple(handle['key']), shm, handle['layout'], owner=False)
+
+    def covers(self, symbol: str, exchange: str, start_date: str, end_date: str,
+               interval: str) -> bool:
+        """True if the store holds exactly this request"""
+        return self.key == self.make_key(symbol, exchange, start_date, end_date, interval)
+
+    def frame(self) -> pd.DataFrame:
+        """
+        The bars as a DataFrame, as returned by SimpleBacktestEngine.load_historical_data().
+
+        The frame is built once per process and owns a copy of the data, so the
+        shared block can be closed while backtests still hold it.
+        """
+        if self._frame is None:
+            index = pd.DatetimeIndex(self.arrays['__index__'].copy(),
+                                     name=self.layout['index_name'])
+            if self.layout['tz']:
+                index = index.tz_localize('UTC').tz_convert(self.layout['tz'])
+            self._frame = pd.DataFrame(
+                {name: values.copy() for name, values in self.arrays.items()
+                 if name != '__index__'},
+                index=index,
+            )
+        return self._frame
+
+    def __len__(self) -> int:
+        return self.layout['rows']
+
+    def close(self):
+        """Release this process's view of the block (the creator also frees it)"""
+        self._frame = None
+        self.arrays = {}
+        try:
+            self._shm.close()
+        except BufferError as e:
+            logger.debug(f"Shared block {self._shm.name} still in use: {e}")
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -2,12 +2,17 @@
 Optimization Engine for Strategy Parameters
 -------------------------------------------
 Implements grid search and Bayesian optimization for finding optimal strategy parameters.
+
+The historical data of an optimization run is fetched once into a shared
+HistoricalDataStore; grid search combinations are spread over a process pool
+whose workers all read that store.
 """
 import os
 import sys
 import logging
 import json
 import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
 import pandas as pd
@@ -20,6 +25,7 @@ if str(utils_path) not in sys.path:
     sys.path.insert(0, str(utils_path))
 
 from simple_backtest_engine import SimpleBacktestEngine
+from historical_data_store import HistoricalDataStore
 from strategy_param_injector import create_strategy_with_params, get_strategy_symbol
 from parameter_space import get_grid_search_params, get_continuous_ranges, normalize_weights, normalize_timeframe_weights
 
@@ -69,12 +75,30 @@ def calculate_composite_score(metrics: Dict[str, Any]) -> float:
     
     return composite
 
+def load_data_store(optimizer) -> Optional[HistoricalDataStore]:
+    """Fetch the historical data of an optimizer's date range once into a shared store"""
+    engine = SimpleBacktestEngine(
+        initial_capital=optimizer.initial_capital,
+        api_key=optimizer.api_key,
+        host=optimizer.host
+    )
+    return HistoricalDataStore.load(
+        engine, optimizer.symbol, optimizer.exchange,
+        optimizer.start_date, optimizer.end_date, interval="15m"
+    )
+
 class GridSearchOptimizer:
     """Grid search optimizer for strategy parameters"""
     
     def __init__(self, strategy_name: str, symbol: str, exchange: str, 
                  start_date: str, end_date: str, initial_capital: float = 1000000.0,
-                 api_key: str = None, host: str = "http://127.0.0.1:5001"):
+                 api_key: str = None, host: str = "http://127.0.0.1:5001",
+                 max_workers: Optional[int] = None, early_stop_score: Optional[float] = None):
+        """
+        Args:
+            max_workers: Worker processes for backtests (None = one per CPU, 1 = serial)
+            early_stop_score: Stop once a combination reaches this composite score
+        """
         self.strategy_name = strategy_name
         self.symbol = symbol
         self.exchange = exchange
@@ -83,7 +107,11 @@ class GridSearchOptimizer:
         self.initial_capital = initial_capital
         self.api_key = api_key or os.getenv('OPENALGO_APIKEY', 'demo_key')
         self.host = host
+        self.max_workers = max_workers
+        self.early_stop_score = early_stop_score
         
+        # Historical data shared by all backtests (loaded in optimize())
+        self.data_store: Optional[HistoricalDataStore] = None
         self.results: List[Dict[str, Any]] = []
     
     def generate_combinations(self, param_ranges: Dict[str, List]) -> List[Dict[str, Any]]:
@@ -107,7 +135,8 @@ class GridSearchOptimizer:
             engine = SimpleBacktestEngine(
                 initial_capital=self.initial_capital,
                 api_key=self.api_key,
-                host=self.host
+                host=self.host,
+                data_store=self.data_store
             )
             
             # Run backtest
@@ -147,12 +176,15 @@ class GridSearchOptimizer:
                 'composite_score': 0.0
             }
     
-    def optimize(self, max_combinations: Optional[int] = None) -> List[Dict[str, Any]]:
+    def optimize(self, max_combinations: Optional[int] = None,
+                 progress_callback=None) -> List[Dict[str, Any]]:
         """
         Run grid search optimization.
         
         Args:
             max_combinations: Maximum number of combinations to test (None = all)
+            progress_callback: Optional callable(completed, total, result) called after
+                each backtest
         
         Returns:
             List of results sorted by composite score (best first)
@@ -175,29 +207,128 @@ class GridSearchOptimizer:
             import random
             combinations = random.sample(combinations, max_combinations)
         
-        logger.info(f"Testing {len(combinations)} parameter combinations...")
+        # Fetch the historical data once for every combination
+        owns_store = self.data_store is None
+        if owns_store:
+            self.data_store = load_data_store(self)
+            if self.data_store is None:
+                logger.error("No data available for grid search")
+                self.results = [
+                    {'parameters': params, 'error': 'No data available', 'composite_score': 0.0}
+                    for params in combinations
+                ]
+                return self.results
+        
+        workers = self.max_workers if self.max_workers is not None else (os.cpu_count() or 1)
+        workers = min(workers, len(combinations))
+        logger.info(f"Testing {len(combinations)} parameter combinations ({max(workers, 1)} worker(s))...")
         
-        # Run backtests
-        for i, params in enumerate(combinations, 1):
-            logger.info(f"Testing combination {i}/{len(combinations)}: {params}")
-            result = self.run_backtest_with_params(params)
-            self.results.append(result)
-            
-            if i % 10 == 0:
-                logger.info(f"Progress: {i}/{len(combinations)} combinations tested")
-        
-        # Sort by composite score (best first)
+        try:
+            if workers > 1:
+                results = self._run_parallel(combinations, workers, progress_callback)
+            else:
+                results = self._run_serial(combinations, progress_callback)
+        finally:
+            if owns_store:
+                self.data_store.close()
+                self.data_store = None
+        
+        # Sort by composite score (best first); ties keep combination order
+        self.results.extend(result for result in results if result is not None)
         self.results.sort(key=lambda x: x.get('composite_score', 0), reverse=True)
         
-        logger.info(f"Grid search complete. Best score: {self.results[0].get('composite_score', 0):.2f}")
+        if self.results:
+            logger.info(f"Grid search complete. Best score: {self.results[0].get('composite_score', 0):.2f}")
         
         return self.results
     
+    def _run_serial(self, combinations: List[Dict[str, Any]],
+                    progress_callback=None) -> List[Optional[Dict[str, Any]]]:
+        """Run the backtests one after another in this process"""
+        results = []
+        for i, params in enumerate(combinations, 1):
+            logger.info(f"Testing combination {i}/{len(combinations)}: {params}")
+            result = self.run_backtest_with_params(params)
+            results.append(result)
+            if self._report_progress(i, len(combinations), result, progress_callback):
+                break
+        return results
+    
+    def _run_parallel(self, combinations: List[Dict[str, Any]], workers: int,
+                      progress_callback=None) -> List[Optional[Dict[str, Any]]]:
+        """Run the backtests on a process pool whose workers attach to the shared store"""
+        settings = {
+            'strategy_name': self.strategy_name,
+            'symbol': self.symbol,
+            'exchange': self.exchange,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'initial_capital': self.initial_capital,
+            'api_key': self.api_key,
+            'host': self.host,
+        }
+        results: List[Optional[Dict[str, Any]]] = [None] * len(combinations)
+        
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(settings, self.data_store.share())
+        )
+        try:
+            futures = {
+                executor.submit(_run_combination, params): index
+                for index, params in enumerate(combinations)
+            }
+            for completed, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Worker failed for params {combinations[index]}: {e}")
+                    result = {'parameters': combinations[index], 'error': str(e), 'composite_score': 0.0}
+                results[index] = result
+                if self._report_progress(completed, len(combinations), result, progress_callback):
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        return results
+    
+    def _report_progress(self, completed: int, total: int, result: Dict[str, Any],
+                         progress_callback=None) -> bool:
+        """Log progress; True if the early-stop score has been reached"""
+        if progress_callback is not None:
+            progress_callback(completed, total, result)
+        
+        if completed % 10 == 0 or completed == total:
+            logger.info(f"Progress: {completed}/{total} combinations tested")
+        
+        score = result.get('composite_score', 0)
+        if (self.early_stop_score is not None and 'error' not in result
+                and score >= self.early_stop_score):
+            logger.info(f"Early stop: score {score:.2f} reached {self.early_stop_score:.2f} "
+                        f"after {completed}/{total} combinations")
+            return True
+        return False
+    
     def get_best_parameters(self, top_n: int = 1) -> List[Dict[str, Any]]:
         """Get top N best parameter configurations"""
         valid_results = [r for r in self.results if 'error' not in r]
         return valid_results[:top_n]
 
+# Grid search worker state: one optimizer per worker process, reading the shared store
+_worker_optimizer: Optional[GridSearchOptimizer] = None
+
+def _init_worker(settings: Dict[str, Any], store_handle: Dict[str, Any]):
+    """Process pool initializer: attach to the parent's historical data store"""
+    global _worker_optimizer
+    _worker_optimizer = GridSearchOptimizer(max_workers=1, **settings)
+    _worker_optimizer.data_store = HistoricalDataStore.attach(store_handle)
+
+def _run_combination(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Process pool task: backtest one parameter combination"""
+    return _worker_optimizer.run_backtest_with_params(parameters)
+
 class BayesianOptimizer:
     """Bayesian optimization for strategy parameters"""
     
@@ -215,6 +346,8 @@ class BayesianOptimizer:
         self.host = host
         self.initial_params = initial_params or {}
         
+        # Historical data shared by all evaluations (loaded in optimize())
+        self.data_store: Optional[HistoricalDataStore] = None
         self.history: List[Dict[str, Any]] = []
         self.best_score = -float('inf')
         self.best_params = None
@@ -270,7 +403,8 @@ class BayesianOptimizer:
             engine = SimpleBacktestEngine(
                 initial_capital=self.initial_capital,
                 api_key=self.api_key,
-                host=self.host
+                host=self.host,
+                data_store=self.data_store
             )
             
             results = engine.run_backtest(
@@ -319,6 +453,22 @@ class BayesianOptimizer:
         Returns:
             Best parameters and score
         """
+        # Fetch the historical data once for every evaluation
+        owns_store = self.data_store is None
+        if owns_store:
+            self.data_store = load_data_store(self)
+            if self.data_store is None:
+                logger.error("No data available for Bayesian optimization")
+                return {'error': 'No data available'}
+        
+        try:
+            return self._optimize(n_iterations, n_initial_points)
+        finally:
+            if owns_store:
+                self.data_store.close()
+                self.data_store = None
+    
+    def _optimize(self, n_iterations: int, n_initial_points: int) -> Dict[str, Any]:
         if not SKOPT_AVAILABLE:
             logger.warning("scikit-optimize not available, using random search fallback")
             return self._random_search(n_iterations)
@@ -405,7 +555,8 @@ class BayesianOptimizer:
                 engine = SimpleBacktestEngine(
                     initial_capital=self.initial_capital,
                     api_key=self.api_key,
-                    host=self.host
+                    host=self.host,
+                    data_store=self.data_store
                 )
                 
                 results = engine.run_backtest(
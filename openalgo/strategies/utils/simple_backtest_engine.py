@@ -78,7 +78,8 @@ class SimpleBacktestEngine:
         self,
         initial_capital: float = 1000000.0,
         api_key: str = None,
-        host: str = "http://127.0.0.1:5001"
+        host: str = "http://127.0.0.1:5001",
+        data_store=None
     ):
         """
         Initialize backtest engine.
@@ -87,6 +88,8 @@ class SimpleBacktestEngine:
             initial_capital: Starting capital in rupees
             api_key: OpenAlgo API key
             host: OpenAlgo API host
+            data_store: Optional HistoricalDataStore; requests it covers are served
+                from it instead of the API
         """
         # #region agent log
         import json
@@ -111,6 +114,7 @@ class SimpleBacktestEngine:
         # #endregion
         
         self.client = APIClient(api_key=api_key, host=host)
+        self.data_store = data_store
         
         # State
         self.positions: List[Position] = []
@@ -141,6 +145,9 @@ class SimpleBacktestEngine:
         Returns:
             DataFrame with OHLCV data
         """
+        if self.data_store is not None and self.data_store.covers(symbol, exchange, start_date, end_date, interval):
+            return self.data_store.frame()
+        
         # #region agent log
         import json
         try:
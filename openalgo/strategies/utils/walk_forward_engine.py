@@ -83,13 +83,20 @@ class WalkForwardOptimizer:
 
         return windows
 
-    def run(self, optimization_method: str = 'grid', max_evals: int = 20) -> Dict[str, Any]:
+    def run(self, optimization_method: str = 'grid', max_evals: int = 20,
+            max_workers: Optional[int] = None,
+            early_stop_score: Optional[float] = None) -> Dict[str, Any]:
         """
         Run the Walk-Forward Analysis.
 
+        Each training window's data is fetched once and shared by all of its
+        evaluations; grid search spreads them over max_workers processes.
+
         Args:
             optimization_method: 'grid' or 'bayesian'
             max_evals: Max evaluations per training window
+            max_workers: Grid search worker processes (None = one per CPU, 1 = serial)
+            early_stop_score: Stop a window's grid search at this composite score
         """
         windows = self.generate_windows()
         logger.info(f"Generated {len(windows)} Walk-Forward windows.")
@@ -126,7 +133,8 @@ class WalkForwardOptimizer:
                     self.strategy_name, self.symbol, self.exchange,
                     train_start_str, train_end_str,
                     initial_capital=current_capital,
-                    api_key=self.api_key, host=self.host
+                    api_key=self.api_key, host=self.host,
+                    max_workers=max_workers, early_stop_score=early_stop_score
                 )
                 res = opt.optimize(max_combinations=max_evals)
                 if res:
@@ -0,0 +1,102 @@
+"""
+Benchmark for Historify CSV/Parquet imports
+
+Measures rows/sec for importing 1m bars into a scratch DuckDB database, comparing the
+pandas load + DataFrame upsert path with the Arrow streaming import.
+
+Usage:
+    python test/bench_historify_import.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TMP_DIR = tempfile.mkdtemp(prefix="historify_bench_")
+os.environ["HISTORIFY_DATABASE_PATH"] = os.path.join(TMP_DIR, "historify.duckdb")
+# Measure ingestion only
+os.environ["HISTORIFY_ENABLE_ROLLUPS"] = "false"
+
+import numpy as np
+import pandas as pd
+
+from database import historify_db
+
+
+def make_bars(rows):
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    return pd.DataFrame(
+        {
+            "timestamp": np.arange(1704067200, 1704067200 + rows * 60, 60, dtype="int64"),
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": rng.integers(100, 10000, rows),
+            "oi": 0,
+        }
+    )
+
+
+def bench(rows=1_000_000):
+    historify_db.init_database()
+    bars = make_bars(rows)
+    csv_path = os.path.join(TMP_DIR, "bars.csv")
+    parquet_path = os.path.join(TMP_DIR, "bars.parquet")
+    bars.to_csv(csv_path, index=False)
+    bars.to_parquet(parquet_path, row_group_size=100_000)
+
+    cases = [
+        (
+            "CSV",
+            "pandas",
+            lambda symbol: historify_db._import_dataframe(
+                pd.read_csv(csv_path), symbol, "NSE", "1m", "CSV"
+            ),
+        ),
+        (
+            "CSV",
+            "stream",
+            lambda symbol: historify_db.import_from_csv(csv_path, symbol, "NSE", "1m"),
+        ),
+        (
+            "Parquet",
+            "pandas",
+            lambda symbol: historify_db._import_dataframe(
+                pd.read_parquet(parquet_path), symbol, "NSE", "1m", "Parquet"
+            ),
+        ),
+        (
+            "Parquet",
+            "stream",
+            lambda symbol: historify_db.import_from_parquet(parquet_path, symbol, "NSE", "1m"),
+        ),
+    ]
+
+    print(f"Importing {rows:,} rows")
+    print(f"{'File':<10}{'Path':<10}{'Insert rows/sec':>18}{'Upsert rows/sec':>18}")
+    print("-" * 56)
+    for file_type, path, run in cases:
+        symbol = f"BENCH_{file_type}_{path}".upper()
+        rates = []
+        # First run inserts, second run hits ON CONFLICT for every row
+        for _ in range(2):
+            start = time.perf_counter()
+            success, msg, records = run(symbol)
+            elapsed = time.perf_counter() - start
+            assert success and records == rows, msg
+            rates.append(rows / elapsed)
+        print(f"{file_type:<10}{path:<10}{rates[0]:>18,.0f}{rates[1]:>18,.0f}")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,77 @@
+"""
+Benchmark for option chain Greeks
+
+Measures the time to compute IV and Greeks for a whole chain with the per-symbol
+py_vollib path (calculate_greeks) and the vectorized Black-76 path
+(calculate_greeks_batch). Quote fetching is not included.
+
+Usage:
+    python test/bench_option_greeks.py [strikes]
+"""
+
+import logging
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from test_option_greeks_batch import EXPIRY
+
+from services.option_greeks_service import calculate_greeks, calculate_greeks_batch
+
+
+def build_chain(strikes, spot=24150.0):
+    atm = round(spot / 50) * 50
+    options = []
+    for k in range(-(strikes // 2), strikes - strikes // 2):
+        strike = atm + 50 * k
+        for opt_type in ("CE", "PE"):
+            intrinsic = max(spot - strike, 0) if opt_type == "CE" else max(strike - spot, 0)
+            options.append(
+                {
+                    "symbol": f"NIFTY{EXPIRY}{strike}{opt_type}",
+                    "exchange": "NFO",
+                    "spot_price": spot,
+                    "option_price": round(intrinsic + 5 + 175 * 0.997 ** abs(strike - spot), 2),
+                }
+            )
+    return options
+
+
+def bench(strikes=100, repeats=5):
+    # Per-symbol parse/IV logs would dominate the timings
+    logging.disable(logging.INFO)
+    options = build_chain(strikes)
+
+    def single():
+        for option in options:
+            calculate_greeks(
+                option["symbol"], "NFO", option["spot_price"], option["option_price"], 6.5
+            )
+
+    def batch():
+        calculate_greeks_batch(options, interest_rate=6.5)
+
+    print(f"{len(options)} options ({strikes} strikes, CE + PE)")
+    print(f"{'Path':<10}{'ms/chain':>12}{'Options/sec':>14}{'Speedup':>10}")
+    print("-" * 46)
+    baseline = None
+    for name, func in (("single", single), ("batch", batch)):
+        func()
+        start = time.perf_counter()
+        for _ in range(repeats):
+            func()
+        elapsed = (time.perf_counter() - start) / repeats
+        baseline = baseline or elapsed
+        rate = len(options) / elapsed
+        print(f"{name:<10}{elapsed * 1000:>12.2f}{rate:>14,.0f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
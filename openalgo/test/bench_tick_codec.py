@@ -0,0 +1,66 @@
+"""
+Benchmark for the ZeroMQ tick wire format
+
+Measures ticks/sec for the publisher encode + proxy decode round trip of LTP, Quote and
+Depth ticks in the JSON fallback format and the binary format.
+
+Usage:
+    python test/bench_tick_codec.py [iterations]
+"""
+
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from test_tick_codec import DEPTH_TICK, LTP_TICK, QUOTE_TICK
+
+from websocket_proxy.tick_codec import (
+    FORMAT_BINARY,
+    FORMAT_JSON,
+    decode_tick,
+    encode_tick,
+    is_binary_tick,
+    parse_topic,
+)
+
+
+def round_trip(topic, tick, tick_format):
+    """Publisher encode followed by the proxy's decode path"""
+    payload = encode_tick(topic, tick, tick_format)
+    if is_binary_tick(payload):
+        return decode_tick(payload)
+    market_data = json.loads(payload.decode("utf-8"))
+    return (*parse_topic(topic), market_data)
+
+
+def bench(iterations=100000):
+    cases = [
+        ("LTP", "angel_NSE_RELIANCE_LTP", LTP_TICK),
+        ("QUOTE", "angel_NSE_RELIANCE_QUOTE", QUOTE_TICK),
+        ("DEPTH", "angel_NSE_RELIANCE_DEPTH", DEPTH_TICK),
+    ]
+
+    print(f"{'Mode':<8}{'Format':<10}{'Bytes':>8}{'Ticks/sec':>14}{'Speedup':>10}")
+    print("-" * 50)
+    for name, topic, tick in cases:
+        baseline = None
+        for tick_format in (FORMAT_JSON, FORMAT_BINARY):
+            size = len(encode_tick(topic, tick, tick_format))
+            start = time.perf_counter()
+            for _ in range(iterations):
+                round_trip(topic, tick, tick_format)
+            rate = iterations / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f"{name:<8}{tick_format:<10}{size:>8}{rate:>14,.0f}{rate / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
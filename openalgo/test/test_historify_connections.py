@@ -0,0 +1,163 @@
+"""
+Test suite for Historify DuckDB connection reuse
+
+Tests:
+- Chart and catalog reads borrow pooled connections (pool hits in get_database_stats)
+- Concurrent readers and a writer thread share the process-wide database
+- A failed statement does not poison the thread's connection
+- The database file is released when idle, so another process can open it
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+os.environ["HISTORIFY_DATABASE_PATH"] = os.path.join(
+    tempfile.mkdtemp(prefix="historify_test_"), "historify.duckdb"
+)
+
+import pandas as pd
+
+from database import historify_db
+
+
+def _bars(start, count, price=100.0):
+    timestamps = [start + i * 60 for i in range(count)]
+    return pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            "open": price,
+            "high": price + 1,
+            "low": price - 1,
+            "close": price,
+            "volume": 1000,
+        }
+    )
+
+
+def test_reads_reuse_pooled_connections():
+    """Test repeated reads are served from the read pool"""
+    historify_db.init_database()
+    historify_db.upsert_market_data(_bars(1718000000, 30), "POOLTEST", "NSE", "1m")
+
+    before = historify_db.get_database_stats()["connection_pool"]
+    for _ in range(10):
+        assert len(historify_db.get_ohlcv("POOLTEST", "NSE", "1m")) == 30
+        assert historify_db.get_data_range("POOLTEST", "NSE", "1m")["record_count"] == 30
+
+    stats = historify_db.get_database_stats()["connection_pool"]
+    assert stats["root_opens"] == before["root_opens"]
+    assert stats["read_pool_hits"] - before["read_pool_hits"] >= 19
+    assert stats["read_pool_hit_rate"] > 0
+    assert stats["avg_acquire_ms"] >= 0
+
+
+def test_concurrent_readers_and_writer():
+    """Test readers keep working while another thread upserts"""
+    historify_db.init_database()
+    historify_db.upsert_market_data(_bars(1718000000, 10), "CONCTEST", "NSE", "1m")
+    errors = []
+
+    def writer():
+        try:
+            for batch in range(20):
+                historify_db.upsert_market_data(
+                    _bars(1718000000 + batch * 600, 10, 100.0 + batch), "CONCTEST", "NSE", "1m"
+                )
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(50):
+                assert len(historify_db.get_ohlcv("CONCTEST", "NSE", "1m")) >= 10
+                historify_db.get_data_catalog()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(historify_db.get_ohlcv("CONCTEST", "NSE", "1m")) == 200
+
+
+def test_failed_statement_recovers():
+    """Test a failed transaction does not leave the thread's connection unusable"""
+    historify_db.init_database()
+
+    try:
+        with historify_db.get_connection() as conn:
+            conn.execute("BEGIN TRANSACTION")
+            conn.execute("SELECT * FROM missing_table")
+    except Exception:
+        pass
+
+    with historify_db.get_connection() as conn:
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+
+    try:
+        with historify_db.get_read_connection() as conn:
+            conn.execute("SELECT * FROM missing_table")
+    except Exception:
+        pass
+
+    assert isinstance(historify_db.get_watchlist(), list)
+
+
+def _open_in_other_process():
+    """Whether a second process can open the database file read-write"""
+    script = "import duckdb, sys; duckdb.connect(sys.argv[1]).close()"
+    result = subprocess.run(
+        [sys.executable, "-c", script, historify_db.get_db_path()], capture_output=True
+    )
+    return result.returncode == 0
+
+
+def test_idle_connection_releases_file():
+    """Test the file lock is dropped once idle and the connection reopens on demand"""
+    historify_db.init_database()
+    historify_db.close_connections()
+    manager = historify_db._ConnectionManager(idle_close_seconds=0.2)
+
+    with patch.object(historify_db, "_connection_manager", manager):
+        with historify_db.get_connection() as conn:
+            conn.execute("SELECT 1")
+            time.sleep(0.3)
+            # In use: the idle timer must not close it, and the file stays locked
+            assert not _open_in_other_process()
+        assert historify_db.get_watchlist() is not None
+
+        time.sleep(0.5)
+        stats = manager.get_stats()
+        assert stats["idle_closes"] == 1
+        assert _open_in_other_process()
+
+        # Reopened on the next call
+        assert isinstance(historify_db.get_watchlist(), list)
+        assert manager.get_stats()["root_opens"] == 2
+    manager.close()
+
+
+if __name__ == "__main__":
+    test_reads_reuse_pooled_connections()
+    test_concurrent_readers_and_writer()
+    test_failed_statement_recovers()
+    test_idle_connection_releases_file()
+    print("✅ All Historify connection tests passed")
@@ -0,0 +1,258 @@
+"""
+Test suite for the Historify download job executor
+
+Tests:
+- Broker fetches for a job run concurrently and all data reaches DuckDB
+- The per-broker token bucket paces broker calls
+- Pause stops new downloads until resume; cancel stops the job
+- Cancel waits for running downloads and leaves no item marked downloading
+- The writer stores a batch in one transaction, merging frames for the same symbol
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import ExitStack, contextmanager
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+os.environ["HISTORIFY_DATABASE_PATH"] = os.path.join(
+    tempfile.mkdtemp(prefix="historify_test_"), "historify.duckdb"
+)
+
+import pandas as pd
+
+from database import historify_db
+from services import historify_service
+from utils.token_bucket import TokenBucket
+
+
+class FakeBroker:
+    """Stand-in for services.history_service.get_history with a fixed latency"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol, exchange, interval, start_date, end_date, api_key):
+        with self._lock:
+            self.calls.append((symbol, time.monotonic()))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+
+        data = [
+            {
+                "timestamp": 1718000000 + i * 60,
+                "open": 1,
+                "high": 2,
+                "low": 0.5,
+                "close": 1.5,
+                "volume": 100,
+            }
+            for i in range(10)
+        ]
+        return True, {"status": "success", "data": data}, 200
+
+
+@contextmanager
+def _fake_broker(broker, rate=1000.0, capacity=None, workers=4, progress=None):
+    """Route the job executor's broker calls to `broker` and record progress events"""
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(historify_service, "get_history", broker))
+        stack.enter_context(
+            patch.object(historify_service, "get_auth_token_broker", lambda key: ("t", "fake"))
+        )
+        stack.enter_context(patch.object(historify_service, "HISTORIFY_DOWNLOAD_WORKERS", workers))
+        stack.enter_context(
+            patch.dict(
+                historify_service._broker_rate_limiters, {"fake": TokenBucket(rate, capacity)}
+            )
+        )
+        stack.enter_context(
+            patch.object(
+                historify_service,
+                "_emit_progress",
+                lambda job_id, current, total, symbol: (
+                    progress.append((current, symbol)) if progress is not None else None
+                ),
+            )
+        )
+        yield
+
+
+def _start_job(symbols):
+    historify_db.init_database()
+    success, response, _ = historify_service.create_and_start_job(
+        job_type="custom",
+        symbols=[{"symbol": symbol, "exchange": "NSE"} for symbol in symbols],
+        interval="1m",
+        start_date="2024-06-10",
+        end_date="2024-06-10",
+        api_key="key",
+    )
+    assert success
+    return response["job_id"]
+
+
+def _wait_for_status(job_id, statuses, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = historify_db.get_download_job(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not reach {statuses}")
+
+
+FINISHED = ("completed", "completed_with_errors", "failed")
+
+
+def test_concurrent_fetches():
+    """Test a job downloads symbols concurrently and stores every item"""
+    broker = FakeBroker(latency=0.2)
+    progress = []
+    symbols = [f"PAR{i}" for i in range(8)]
+
+    with _fake_broker(broker, progress=progress):
+        start = time.monotonic()
+        job = _wait_for_status(_start_job(symbols), FINISHED)
+        elapsed = time.monotonic() - start
+
+    assert job["status"] == "completed"
+    assert job["completed_symbols"] == len(symbols)
+    assert broker.max_active > 1
+    assert elapsed < 0.2 * len(symbols)
+    assert sorted(current for current, _ in progress) == list(range(1, len(symbols) + 1))
+    for symbol in symbols:
+        assert len(historify_db.get_ohlcv(symbol, "NSE", "1m")) == 10
+
+
+def test_broker_rate_limit():
+    """Test broker calls are paced by the broker's token bucket"""
+    broker = FakeBroker()
+    symbols = [f"RATE{i}" for i in range(6)]
+
+    with _fake_broker(broker, rate=10.0, capacity=1):
+        job = _wait_for_status(_start_job(symbols), FINISHED)
+
+    assert job["status"] == "completed"
+    times = sorted(t for _, t in broker.calls)
+    assert len(times) == len(symbols)
+    # One token up front, then one every 100ms
+    assert times[-1] - times[0] >= 0.45
+
+
+def test_pause_resume_cancel():
+    """Test pause holds new downloads, resume continues and cancel stops the job"""
+    broker = FakeBroker(latency=0.1)
+    progress = []
+    symbols = [f"PAUSE{i}" for i in range(30)]
+
+    with _fake_broker(broker, workers=2, progress=progress):
+        job_id = _start_job(symbols)
+        while not progress:
+            time.sleep(0.01)
+
+        assert historify_service.pause_job(job_id)[0]
+        time.sleep(0.4)  # In-flight downloads drain
+        calls_while_paused = len(broker.calls)
+        time.sleep(0.3)
+        assert len(broker.calls) == calls_while_paused
+        assert historify_db.get_download_job(job_id)["status"] == "paused"
+
+        assert historify_service.resume_job(job_id)[0]
+        time.sleep(0.3)
+        assert len(broker.calls) > calls_while_paused
+
+        assert historify_service.cancel_job(job_id)[0]
+        _wait_for_status(job_id, ("cancelled",))
+        time.sleep(0.3)
+
+    assert len(broker.calls) < len(symbols)
+    assert job_id not in historify_service._running_jobs
+
+    # Running downloads finish and are recorded; items that never started are pending again
+    deadline = time.monotonic() + 5.0
+    while True:
+        items = historify_db.get_job_items(job_id)
+        if not any(item["status"] == "downloading" for item in items):
+            break
+        assert time.monotonic() < deadline, "items left downloading after cancel"
+        time.sleep(0.05)
+    assert {item["status"] for item in items} <= {"success", "pending"}
+    for item in items:
+        if item["status"] == "success":
+            assert len(historify_db.get_ohlcv(item["symbol"], "NSE", "1m")) == 10
+
+
+def test_writer_merges_frames():
+    """Test a writer batch is stored in one transaction, merging frames per symbol"""
+    historify_db.init_database()
+    # A private writer, so downloads still draining from other tests do not move its counters
+    writer = historify_service._DownloadWriter()
+    upserts = writer.upserts
+    frames = [
+        pd.DataFrame(
+            {
+                "timestamp": [1718000000 + (i * 5 + j) * 60 for j in range(5)],
+                "open": 1.0,
+                "high": 2.0,
+                "low": 0.5,
+                "close": 1.5,
+                "volume": 100,
+            }
+        )
+        for i in range(4)
+    ]
+
+    # Overlapping re-download of the last bar wins
+    overlap = frames[-1].tail(1).assign(close=9.0)
+    batch = [(df, "MERGE", "NSE", "1m", Future()) for df in frames + [overlap]]
+    writer._write_batch(batch)
+
+    assert [entry[-1].result(timeout=5) for entry in batch] == [5, 5, 5, 5, 1]
+    assert writer.upserts == upserts + 1
+    stored = historify_db.get_ohlcv("MERGE", "NSE", "1m")
+    assert len(stored) == 20
+    assert stored["close"].iloc[-1] == 9.0
+
+    # Frames for different symbols share one transaction
+    batch = [(frames[0], f"MULTI{i}", "NSE", "1m", Future()) for i in range(3)]
+    writer._write_batch(batch)
+    assert [entry[-1].result(timeout=5) for entry in batch] == [5, 5, 5]
+    assert writer.upserts == upserts + 2
+    assert all(len(historify_db.get_ohlcv(f"MULTI{i}", "NSE", "1m")) == 5 for i in range(3))
+
+    # A bad frame fails only its own symbol
+    bad = pd.DataFrame({"timestamp": ["not a time"], "open": [1.0]})
+    batch = [
+        (frames[1], "GOOD", "NSE", "1m", Future()),
+        (bad, "BAD", "NSE", "1m", Future()),
+    ]
+    writer._write_batch(batch)
+    assert batch[0][-1].result(timeout=5) == 5
+    assert batch[1][-1].exception(timeout=5) is not None
+    assert len(historify_db.get_ohlcv("GOOD", "NSE", "1m")) == 5
+
+
+if __name__ == "__main__":
+    test_concurrent_fetches()
+    test_broker_rate_limit()
+    test_pause_resume_cancel()
+    test_writer_merges_frames()
+    print("✅ All Historify download job tests passed")
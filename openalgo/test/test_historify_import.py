@@ -0,0 +1,180 @@
+"""
+Test suite for Historify Arrow ingestion and streaming imports
+
+Tests:
+- upsert_market_data merges DataFrames (with and without oi) and updates the catalog
+- CSV imports stream epoch, millisecond, ISO datetime and date + time columns
+- Invalid rows are skipped and reported; missing columns and empty files are rejected
+- Parquet imports stream row groups, including native timestamp columns
+- Day-first dates fall back to pandas parsing
+"""
+
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TMP_DIR = tempfile.mkdtemp(prefix="historify_test_")
+os.environ["HISTORIFY_DATABASE_PATH"] = os.path.join(TMP_DIR, "historify.duckdb")
+
+import pandas as pd
+
+from database import historify_db
+
+# 2024-06-10 09:15:00 UTC
+BASE_TS = 1718010900
+
+
+def _write(name, text):
+    path = os.path.join(TMP_DIR, name)
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+def _stored(symbol, interval="1m"):
+    return historify_db.get_ohlcv(symbol, "NSE", interval)
+
+
+def test_upsert_dataframe():
+    """Test DataFrame upserts merge on conflict and keep the catalog current"""
+    historify_db.init_database()
+    df = pd.DataFrame(
+        {
+            "timestamp": [BASE_TS + i * 60 for i in range(5)],
+            "open": [100.0] * 5,
+            "high": [101.0] * 5,
+            "low": [99.0] * 5,
+            "close": [100.5] * 5,
+            "volume": [1000.0] * 5,
+            "extra": ["ignored"] * 5,
+        }
+    )
+    assert historify_db.upsert_market_data(df, "upsert", "nse", "1m") == 5
+
+    update = df.iloc[3:].assign(close=200.0, oi=7)
+    update = pd.concat([update, update.iloc[-1:].assign(timestamp=BASE_TS + 300)])
+    assert historify_db.upsert_market_data(update, "UPSERT", "NSE", "1m") == 3
+
+    stored = _stored("UPSERT")
+    assert len(stored) == 6
+    assert stored["close"].tolist() == [100.5] * 3 + [200.0] * 3
+    assert stored["oi"].tolist() == [0] * 3 + [7] * 3
+
+    data_range = historify_db.get_data_range("UPSERT", "NSE", "1m")
+    assert data_range["record_count"] == 6
+    assert data_range["last_timestamp"] == BASE_TS + 300
+
+
+def test_csv_timestamp_formats():
+    """Test CSV imports parse each supported timestamp layout to UTC epoch seconds"""
+    historify_db.init_database()
+    rows = "100,101,99,100.5,1000"
+    cases = {
+        "EPOCH": f"Timestamp,Open,High,Low,Close,Volume\n{BASE_TS},{rows}\n",
+        "EPOCHMS": f"timestamp,open,high,low,close,volume\n{BASE_TS * 1000},{rows}\n",
+        "ISO": f"datetime,open,high,low,close,volume\n2024-06-10 09:15:00,{rows}\n",
+        "OFFSET": f"datetime,open,high,low,close,volume\n2024-06-10T14:45:00+05:30,{rows}\n",
+        "DATETIME": f"date,time,open,high,low,close,volume,oi\n2024-06-10,09:15:00,{rows},5\n",
+    }
+
+    for symbol, text in cases.items():
+        success, msg, records = historify_db.import_from_csv(
+            _write(f"{symbol}.csv", text), symbol, "NSE", "1m"
+        )
+        assert success and records == 1, (symbol, msg)
+        stored = _stored(symbol)
+        assert stored["timestamp"].tolist() == [BASE_TS], symbol
+        assert stored["volume"].tolist() == [1000], symbol
+
+
+def test_csv_invalid_rows_and_errors():
+    """Test invalid rows are skipped and malformed files are rejected"""
+    historify_db.init_database()
+    lines = ["timestamp,open,high,low,close,volume,oi"]
+    lines += [f"{BASE_TS + i * 60},100,101,99,100.5,1000,0" for i in range(10)]
+    lines.append(f"{BASE_TS + 600},bad,101,99,100.5,1000,0")
+    lines.append(f"{BASE_TS + 660},100,101,99,,,")
+
+    success, msg, records = historify_db.import_from_csv(
+        _write("invalid.csv", "\n".join(lines) + "\n"), "INVALID", "NSE", "1m"
+    )
+    assert success and records == 10
+    assert "2 rows skipped" in msg
+    assert len(_stored("INVALID")) == 10
+
+    success, msg, _ = historify_db.import_from_csv(
+        _write("missing.csv", f"timestamp,open,close\n{BASE_TS},1,2\n"), "MISSING", "NSE", "1m"
+    )
+    assert not success and "Missing required columns: high, low, volume" in msg
+
+    success, msg, _ = historify_db.import_from_csv(
+        _write("notime.csv", "open,high,low,close,volume\n1,2,0,1,5\n"), "NOTIME", "NSE", "1m"
+    )
+    assert not success and "must have 'timestamp'" in msg
+
+    for name, text in (("empty.csv", ""), ("header.csv", "timestamp,open,high,low,close,volume\n")):
+        success, msg, _ = historify_db.import_from_csv(_write(name, text), "EMPTY", "NSE", "1m")
+        assert not success and "empty" in msg
+
+
+def test_parquet_streaming():
+    """Test Parquet imports stream row groups into market_data"""
+    historify_db.init_database()
+    count = 1000
+    df = pd.DataFrame(
+        {
+            "timestamp": [BASE_TS + i * 60 for i in range(count)],
+            "open": 100.0,
+            "high": 101.0,
+            "low": 99.0,
+            "close": 100.5,
+            "volume": 1000,
+        }
+    )
+    path = os.path.join(TMP_DIR, "bars.parquet")
+    df.to_parquet(path, row_group_size=100)
+
+    native = df.assign(timestamp=pd.to_datetime(df["timestamp"], unit="s"))
+    native_path = os.path.join(TMP_DIR, "native.parquet")
+    native.to_parquet(native_path)
+
+    original_batch_rows = historify_db.HISTORIFY_IMPORT_BATCH_ROWS
+    historify_db.HISTORIFY_IMPORT_BATCH_ROWS = 128
+    try:
+        for symbol, file_path in (("PARQ", path), ("PARQNATIVE", native_path)):
+            success, msg, records = historify_db.import_from_parquet(file_path, symbol, "NSE", "1m")
+            assert success and records == count, msg
+            stored = _stored(symbol)
+            assert stored["timestamp"].tolist() == df["timestamp"].tolist()
+    finally:
+        historify_db.HISTORIFY_IMPORT_BATCH_ROWS = original_batch_rows
+
+    assert historify_db.get_data_range("PARQ", "NSE", "1m")["record_count"] == count
+
+
+def test_day_first_dates_fall_back_to_pandas():
+    """Test timestamps DuckDB cannot parse are imported through pandas"""
+    historify_db.init_database()
+    text = "date,open,high,low,close,volume\n10-Jun-2024,100,101,99,100.5,1000\n"
+
+    success, msg, records = historify_db.import_from_csv(
+        _write("dayfirst.csv", text), "DAYFIRST", "NSE", "D"
+    )
+    assert success and records == 1, msg
+    assert len(_stored("DAYFIRST", "D")) == 1
+
+
+if __name__ == "__main__":
+    test_upsert_dataframe()
+    test_csv_timestamp_formats()
+    test_csv_invalid_rows_and_errors()
+    test_parquet_streaming()
+    test_day_first_dates_fall_back_to_pandas()
+    print("✅ All Historify import tests passed")
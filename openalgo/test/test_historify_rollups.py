@@ -0,0 +1,144 @@
+"""
+Test suite for Historify materialized rollups
+
+Tests:
+- Rollup reads match on-the-fly aggregation, including partially covered edge candles
+- Incremental upserts keep rollups in sync with the base data
+- Custom intervals and symbols without rollups fall back to on-the-fly aggregation
+- Deleting market data removes the rollups built from it
+"""
+
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+os.environ["HISTORIFY_DATABASE_PATH"] = os.path.join(
+    tempfile.mkdtemp(prefix="historify_test_"), "historify.duckdb"
+)
+
+import numpy as np
+import pandas as pd
+
+from database import historify_db
+
+# 2024-06-10 09:15 IST (NSE open)
+SESSION_START = 1717991100
+
+
+def _minute_bars(start, count, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(count).cumsum()
+    return pd.DataFrame(
+        {
+            "timestamp": np.arange(start, start + count * 60, 60, dtype="int64"),
+            "open": close + rng.random(count),
+            "high": close + 2,
+            "low": close - 2,
+            "close": close,
+            "volume": rng.integers(100, 10000, count),
+            "oi": rng.integers(0, 500, count),
+        }
+    )
+
+
+def _daily_bars(start, days, seed=0):
+    bars = _minute_bars(start, days, seed)
+    bars["timestamp"] = np.arange(start, start + days * 86400, 86400, dtype="int64")
+    return bars
+
+
+def _on_the_fly(symbol, interval, start=None, end=None):
+    if interval in ("W", "M"):
+        return historify_db._get_daily_aggregated_ohlcv(symbol, "NSE", interval, start, end)
+    return historify_db._get_aggregated_ohlcv(symbol, "NSE", interval, start, end)
+
+
+def _assert_matches(symbol, interval, start=None, end=None):
+    expected = _on_the_fly(symbol, interval, start, end)
+    assert historify_db._get_rollup_ohlcv(symbol, "NSE", interval, start, end) is not None
+    pd.testing.assert_frame_equal(
+        historify_db.get_ohlcv(symbol, "NSE", interval, start, end), expected
+    )
+
+
+def test_rollups_match_on_the_fly():
+    """Test rollup reads equal on-the-fly aggregation for full and partial ranges"""
+    historify_db.init_database()
+    historify_db.upsert_market_data(_minute_bars(SESSION_START, 375 * 3), "ROLLUP", "NSE", "1m")
+    historify_db.upsert_market_data(_daily_bars(1704067200, 200), "ROLLUP", "NSE", "D")
+
+    unaligned_start = SESSION_START + 7 * 60 + 13
+    unaligned_end = SESSION_START + 86400 + 200 * 60 + 7
+    for interval in ("5m", "15m", "30m", "1h"):
+        _assert_matches("ROLLUP", interval)
+        _assert_matches("ROLLUP", interval, unaligned_start, unaligned_end)
+
+    for interval in ("W", "M"):
+        _assert_matches("ROLLUP", interval)
+        _assert_matches("ROLLUP", interval, 1704067200 + 3 * 86400, 1704067200 + 150 * 86400)
+
+
+def test_incremental_refresh():
+    """Test upserting new and corrected bars refreshes only the touched candles"""
+    historify_db.init_database()
+    historify_db.upsert_market_data(_minute_bars(SESSION_START, 100), "INCR", "NSE", "1m")
+
+    # Append a tail that starts mid-candle, then correct bars inside an existing candle
+    historify_db.upsert_market_data(
+        _minute_bars(SESSION_START + 100 * 60, 50, seed=1), "INCR", "NSE", "1m"
+    )
+    historify_db.upsert_market_data(
+        _minute_bars(SESSION_START + 30 * 60, 3, seed=2), "INCR", "NSE", "1m"
+    )
+
+    for interval in ("5m", "15m", "30m", "1h"):
+        _assert_matches("INCR", interval)
+
+
+def test_fallback_without_rollups():
+    """Test custom intervals and unmaterialized symbols use on-the-fly aggregation"""
+    historify_db.init_database()
+    historify_db.upsert_market_data(_minute_bars(SESSION_START, 120), "FALLBACK", "NSE", "1m")
+
+    assert len(historify_db.get_ohlcv("FALLBACK", "NSE", "25m")) == 5
+
+    with historify_db.get_connection() as conn:
+        historify_db._delete_rollups(conn, "FALLBACK", "NSE")
+    assert historify_db._get_rollup_ohlcv("FALLBACK", "NSE", "15m") is None
+    pd.testing.assert_frame_equal(
+        historify_db.get_ohlcv("FALLBACK", "NSE", "15m"), _on_the_fly("FALLBACK", "15m")
+    )
+
+    assert historify_db.rebuild_rollups("FALLBACK", "NSE") > 0
+    _assert_matches("FALLBACK", "15m")
+
+
+def test_delete_removes_rollups():
+    """Test deleting a symbol's data clears its rollups"""
+    historify_db.init_database()
+    historify_db.upsert_market_data(_minute_bars(SESSION_START, 60), "DELROLL", "NSE", "1m")
+    assert historify_db._get_rollup_ohlcv("DELROLL", "NSE", "5m") is not None
+
+    historify_db.delete_market_data("DELROLL", "NSE", "1m")
+
+    with historify_db.get_read_connection() as conn:
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM market_data_rollups WHERE symbol = 'DELROLL'"
+        ).fetchone()[0]
+    assert remaining == 0
+    assert historify_db.get_ohlcv("DELROLL", "NSE", "5m").empty
+
+
+if __name__ == "__main__":
+    test_rollups_match_on_the_fly()
+    test_incremental_refresh()
+    test_fallback_without_rollups()
+    test_delete_removes_rollups()
+    print("✅ All Historify rollup tests passed")
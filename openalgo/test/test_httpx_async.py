@@ -0,0 +1,148 @@
+"""
+Test suite for the async HTTP client path and pool metrics
+
+Tests:
+- fan_out returns responses in request order and reuses pooled connections
+- Concurrency is bounded and failed requests come back as exceptions
+- The shared sync client records new vs reused connections per host
+- Both clients keep honouring HTTP_PROXY from the environment
+
+Runs against a local HTTP/1.1 server, no broker needed.
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import httpx
+
+from utils import httpx_client
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with EchoHandler.lock:
+            EchoHandler.in_flight += 1
+            EchoHandler.max_in_flight = max(EchoHandler.max_in_flight, EchoHandler.in_flight)
+        time.sleep(0.02)
+        with EchoHandler.lock:
+            EchoHandler.in_flight -= 1
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_fan_out_order_and_reuse():
+    server, base = start_server()
+    httpx_client._pool_metrics.reset()
+    EchoHandler.max_in_flight = 0
+    try:
+        requests = [{"method": "GET", "url": f"{base}/item/{i}"} for i in range(60)]
+        responses = httpx_client.fan_out(requests, concurrency=5)
+    finally:
+        server.shutdown()
+
+    assert [r.text for r in responses] == [f"/item/{i}" for i in range(60)]
+    assert EchoHandler.max_in_flight <= 5
+
+    metrics = httpx_client.get_http_pool_metrics()["127.0.0.1"]
+    assert metrics["requests"] == 60 and metrics["errors"] == 0
+    assert metrics["new_connections"] <= 5
+    assert metrics["reused_connections"] >= 55
+    assert metrics["pool_wait_ms_max"] >= metrics["pool_wait_ms_avg"] >= 0
+
+
+def test_fan_out_returns_exceptions():
+    server, base = start_server()
+    try:
+        responses = httpx_client.fan_out(
+            [
+                {"method": "GET", "url": f"{base}/ok"},
+                # Nothing listens on port 9 (discard) locally
+                {"method": "GET", "url": "http://127.0.0.1:9/down", "timeout": 2},
+            ]
+        )
+    finally:
+        server.shutdown()
+
+    assert responses[0].status_code == 200
+    assert isinstance(responses[1], httpx.HTTPError)
+    assert httpx_client.get_http_pool_metrics()["127.0.0.1"]["errors"] >= 1
+    assert httpx_client.fan_out([]) == []
+
+
+def test_sync_client_pool_metrics():
+    server, base = start_server()
+    httpx_client._pool_metrics.reset()
+    client = httpx_client._create_http_client()
+    try:
+        for i in range(5):
+            assert client.get(f"{base}/sync/{i}").text == f"/sync/{i}"
+    finally:
+        client.close()
+        server.shutdown()
+
+    metrics = httpx_client.get_http_pool_metrics()["127.0.0.1"]
+    assert metrics["requests"] == 5
+    assert metrics["new_connections"] == 1 and metrics["reused_connections"] == 4
+    assert metrics["reuse_ratio"] == 0.8
+
+
+def test_env_proxy_is_used():
+    # The echo server doubles as a forward proxy: it answers with the absolute request URI
+    server, base = start_server()
+    names = ("HTTP_PROXY", "http_proxy", "NO_PROXY", "no_proxy")
+    previous = {name: os.environ.pop(name, None) for name in names}
+    os.environ["HTTP_PROXY"] = base
+    client = httpx_client._create_http_client()
+    try:
+        assert client.get("http://upstream.invalid/sync").text == "http://upstream.invalid/sync"
+        responses = httpx_client.fan_out(
+            [{"method": "GET", "url": "http://upstream-async.invalid/a"}]
+        )
+        assert responses[0].text == "http://upstream-async.invalid/a"
+    finally:
+        client.close()
+        server.shutdown()
+        for name, value in previous.items():
+            os.environ.pop(name, None)
+            if value is not None:
+                os.environ[name] = value
+
+    metrics = httpx_client.get_http_pool_metrics()
+    assert metrics["upstream.invalid"]["requests"] == 1
+    assert metrics["upstream-async.invalid"]["errors"] == 0
+
+
+if __name__ == "__main__":
+    test_fan_out_order_and_reuse()
+    test_fan_out_returns_exceptions()
+    test_sync_client_pool_metrics()
+    test_env_proxy_is_used()
+    httpx_client.cleanup_httpx_client()
+    print("✅ All async HTTP client tests passed")
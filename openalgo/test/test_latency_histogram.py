@@ -0,0 +1,182 @@
+"""
+Test suite for the streaming latency histograms
+
+Tests:
+- Percentiles stay within the bucket precision of exact NumPy percentiles
+- Rolling windows drop values older than the window
+- Summaries filter and aggregate by broker and API type
+- Snapshots round-trip through the latency database
+- Purging old data-API logs removes them from the all-time histograms
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import numpy as np
+from sqlalchemy import create_engine
+
+from database import latency_db
+from utils.latency_histogram import (
+    GAMMA,
+    LatencyHistogram,
+    LatencyHistogramRegistry,
+)
+
+NOW = 1_750_000_000.0
+
+
+def test_percentiles_match_numpy():
+    rng = np.random.default_rng(3)
+    values = rng.lognormal(mean=np.log(80), sigma=0.6, size=20000)
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.add(float(value))
+
+    summary = histogram.summary((50, 90, 99))
+    assert summary["count"] == len(values)
+    assert abs(summary["mean"] - values.mean()) < 1e-6 * values.mean()
+    for q in (50, 90, 99):
+        exact = np.percentile(values, q, method="inverted_cdf")
+        assert abs(summary[f"p{q}"] / exact - 1) <= GAMMA - 1, q
+
+    assert LatencyHistogram().summary((50,)) == {"count": 0, "mean": 0.0, "p50": 0.0}
+
+
+def test_rolling_windows_expire():
+    registry = LatencyHistogramRegistry()
+    registry.record("zerodha", "PLACE", {"total": 500.0}, now=NOW - 7200)
+    registry.record("zerodha", "PLACE", {"total": 50.0}, now=NOW - 120)
+    registry.record("zerodha", "PLACE", {"total": 20.0}, now=NOW - 10)
+
+    assert registry.summary("1m", now=NOW)["count"] == 1
+    assert registry.summary("1h", now=NOW)["count"] == 2
+    assert registry.summary("1d", now=NOW)["count"] == 3
+    assert registry.summary("all", now=NOW)["count"] == 3
+
+    hour = registry.summary("1h", now=NOW)
+    assert abs(hour["mean"] - 35.0) < 1e-9
+    assert abs(hour["p99"] / 50.0 - 1) <= GAMMA - 1
+
+    # A day later only the all-time histogram remembers them
+    later = NOW + 86400 * 2
+    assert registry.summary("1d", now=later) == {
+        "count": 0,
+        "mean": 0.0,
+        "p50": 0.0,
+        "p90": 0.0,
+        "p95": 0.0,
+        "p99": 0.0,
+    }
+    assert registry.summary("all", now=later)["count"] == 3
+
+    try:
+        registry.summary("5m")
+        raise AssertionError("unknown window accepted")
+    except ValueError:
+        pass
+
+
+def test_summary_filters():
+    registry = LatencyHistogramRegistry()
+    for _ in range(100):
+        registry.record("zerodha", "PLACE", {"rtt": 40.0, "total": 50.0}, now=NOW)
+        registry.record("angel", "QUOTES", {"rtt": 80.0, "total": 100.0}, now=NOW)
+    registry.record(None, "PLACE", {"total": 70.0, "rtt": None}, now=NOW)
+
+    assert registry.summary("1h", stage="total", now=NOW)["count"] == 201
+    assert registry.summary("1h", broker="angel", now=NOW)["count"] == 100
+    assert registry.summary("1h", api_type="PLACE", now=NOW)["count"] == 101
+    assert registry.summary("1h", broker="unknown", now=NOW)["count"] == 1
+    assert registry.summary("1h", stage="rtt", now=NOW)["count"] == 200
+    rtt = registry.summary("1h", broker="zerodha", stage="rtt", now=NOW)
+    assert abs(rtt["p50"] / 40.0 - 1) <= GAMMA - 1
+
+
+def test_snapshot_persistence():
+    registry = LatencyHistogramRegistry()
+    for i in range(50):
+        registry.record("zerodha", "PLACE", {"total": 10.0 + i}, now=NOW - i * 30)
+
+    path = os.path.join(tempfile.mkdtemp(), "latency.db")
+    engine = create_engine(f"sqlite:///{path}")
+    latency_db.LatencyBase.metadata.create_all(engine)
+    original_engine = latency_db.latency_engine
+    latency_db.latency_engine = engine
+    try:
+        assert latency_db.save_latency_histograms(registry.snapshot())
+        # Saving again replaces the previous snapshot
+        assert latency_db.save_latency_histograms(registry.snapshot())
+        rows = latency_db.load_latency_histograms()
+    finally:
+        latency_db.latency_engine = original_engine
+
+    assert len(rows) == 1
+    restored = LatencyHistogramRegistry()
+    restored.restore(rows, now=NOW)
+    for window in ("1m", "1h", "all"):
+        assert restored.summary(window, now=NOW) == registry.summary(window, now=NOW), window
+
+    # Restoring later drops the window slots that expired meanwhile
+    restored.restore(rows, now=NOW + 7200)
+    assert restored.summary("1h", now=NOW + 7200)["count"] == 0
+    assert restored.summary("all", now=NOW + 7200)["count"] == 50
+
+
+def test_purge_forgets_rows():
+    latency_db.init_latency_db()
+    registry = LatencyHistogramRegistry()
+    old = datetime.utcnow() - timedelta(days=8)
+    rows = [("QUOTES", old, 5.0), ("QUOTES", datetime.utcnow(), 6.0), ("PLACE", old, 40.0)]
+    for order_type, timestamp, total in rows:
+        latency_db.latency_session.add(
+            latency_db.OrderLatency(
+                timestamp=timestamp,
+                order_id="purgetest",
+                broker="purgetest",
+                order_type=order_type,
+                rtt_ms=total,
+                overhead_ms=0.0,
+                total_latency_ms=total,
+            )
+        )
+        registry.record("purgetest", order_type, {"rtt": total, "total": total}, now=NOW)
+    latency_db.latency_session.commit()
+
+    original_registry = latency_db.get_latency_histograms
+    latency_db.get_latency_histograms = lambda: registry
+    try:
+        assert latency_db.purge_old_data_logs(days=7) >= 1
+        remaining = (
+            latency_db.OrderLatency.query.filter_by(broker="purgetest")
+            .with_entities(latency_db.OrderLatency.total_latency_ms)
+            .all()
+        )
+    finally:
+        latency_db.get_latency_histograms = original_registry
+        latency_db.OrderLatency.query.filter_by(broker="purgetest").delete()
+        latency_db.latency_session.commit()
+
+    assert sorted(total for (total,) in remaining) == [6.0, 40.0]
+    # The all-time histograms now describe the same rows as the table
+    quotes = registry.summary("all", broker="purgetest", api_type="QUOTES", now=NOW)
+    assert quotes["count"] == 1 and abs(quotes["mean"] - 6.0) < 1e-9
+    assert registry.summary("all", broker="purgetest", stage="rtt", now=NOW)["count"] == 2
+    assert registry.summary("all", broker="purgetest", api_type="PLACE", now=NOW)["count"] == 1
+
+
+if __name__ == "__main__":
+    test_percentiles_match_numpy()
+    test_rolling_windows_expire()
+    test_summary_filters()
+    test_snapshot_persistence()
+    test_purge_forgets_rows()
+    print("✅ All latency histogram tests passed")
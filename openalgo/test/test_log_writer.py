@@ -0,0 +1,180 @@
+"""
+Test suite for the buffered log writer
+
+Tests:
+- Rows are written in batches on the size trigger and the time trigger
+- A full queue drops rows and counts them instead of blocking
+- close() flushes pending rows
+- A bad row fails only itself: the rest of its batch is retried row by row
+- TrafficLog.log_request and OrderLatency.log_latency go through the writers
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine, event, select
+
+from database.log_writer import BufferedLogWriter
+
+
+def make_table():
+    path = os.path.join(tempfile.mkdtemp(), "logs.db")
+    engine = create_engine(f"sqlite:///{path}")
+    metadata = MetaData()
+    table = Table(
+        "rows",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50)),
+        Column("value", Float),
+    )
+    metadata.create_all(engine)
+
+    executemany_sizes = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            executemany_sizes.append(len(parameters) if executemany else 1)
+
+    return engine, table, executemany_sizes
+
+
+def count_rows(engine, table):
+    with engine.connect() as conn:
+        return len(conn.execute(select(table.c.id)).all())
+
+
+def test_size_and_time_triggers():
+    engine, table, inserts = make_table()
+    writer = BufferedLogWriter(engine, table, "test_batches", batch_size=50, flush_interval=0.2)
+
+    for i in range(120):
+        assert writer.submit({"name": f"row{i}", "value": float(i)})
+    assert writer.flush()
+    assert count_rows(engine, table) == 120
+    # Two full batches, then the remainder on the time trigger or the flush
+    assert inserts[:2] == [50, 50] and sum(inserts) == 120
+
+    # A single row is written once flush_interval has passed, without flush()
+    writer.submit({"name": "late", "value": 1.0})
+    time.sleep(0.5)
+    assert count_rows(engine, table) == 121
+
+    writer.close()
+    stats = writer.get_stats()
+    assert stats["written"] == 121 and stats["dropped"] == 0 and stats["pending"] == 0
+
+
+def test_full_queue_sheds_load():
+    engine, table, _ = make_table()
+    writer = BufferedLogWriter(
+        engine, table, "test_shed", max_queue=10, batch_size=100, flush_interval=5
+    )
+
+    # Hold the writer inside a batch so the queue cannot drain
+    original_write = writer._write
+    release = []
+
+    def slow_write(batch):
+        while not release:
+            time.sleep(0.01)
+        original_write(batch)
+
+    writer._write = slow_write
+    accepted = sum(writer.submit({"name": "x", "value": 0.0}) for _ in range(200))
+    release.append(True)
+
+    stats = writer.get_stats()
+    assert accepted < 200
+    assert stats["dropped"] == 200 - accepted and stats["queued"] == accepted
+
+    writer.close()
+    assert count_rows(engine, table) == accepted
+    assert writer.submit({"name": "after_close", "value": 0.0}) is False
+
+
+def test_close_flushes_pending_rows():
+    engine, table, inserts = make_table()
+    writer = BufferedLogWriter(engine, table, "test_close", batch_size=1000, flush_interval=60)
+    for i in range(25):
+        writer.submit({"name": f"row{i}", "value": float(i)})
+    writer.close()
+    assert count_rows(engine, table) == 25
+    assert inserts == [25]
+
+
+def test_bad_row_does_not_lose_batch():
+    engine, table, inserts = make_table()
+    writer = BufferedLogWriter(engine, table, "test_bad_row", batch_size=1000, flush_interval=60)
+    for i in range(5):
+        writer.submit({"id": 1 if i == 3 else 100 + i, "name": f"row{i}", "value": float(i)})
+    writer.submit({"id": 1, "name": "duplicate", "value": 0.0})
+    writer.close()
+
+    # The batch insert hit the duplicate key; every other row was written on retry
+    assert inserts[0] == 6
+    with engine.connect() as conn:
+        names = sorted(conn.execute(select(table.c.name)).scalars())
+    assert names == ["row0", "row1", "row2", "row3", "row4"]
+    stats = writer.get_stats()
+    assert stats["written"] == 5 and stats["failed"] == 1 and stats["batches"] == 0
+
+
+def test_traffic_and_latency_logs_are_buffered():
+    from database import latency_db, traffic_db
+
+    for module, writer, model in (
+        (traffic_db, traffic_db.traffic_log_writer, traffic_db.TrafficLog),
+        (latency_db, latency_db.latency_log_writer, latency_db.OrderLatency),
+    ):
+        engine, _, _ = make_table()
+        model.__table__.create(engine)
+        original_engine = writer.engine
+        writer.engine = engine
+        try:
+            if module is traffic_db:
+                ok = model.log_request("127.0.0.1", "POST", "/api/v1/placeorder", 200, 12.5)
+            else:
+                ok = model.log_latency(
+                    "123",
+                    1,
+                    "zerodha",
+                    "SBIN",
+                    "PLACE",
+                    {"rtt": 40.0, "overhead": 2.0, "total": 42.0},
+                    None,
+                    None,
+                    "SUCCESS",
+                )
+            assert ok is True
+            assert writer.flush()
+            with engine.connect() as conn:
+                rows = conn.execute(select(model.__table__)).mappings().all()
+        finally:
+            writer.engine = original_engine
+
+        assert len(rows) == 1
+        assert rows[0]["timestamp"] is not None
+        if module is traffic_db:
+            assert rows[0]["path"] == "/api/v1/placeorder" and rows[0]["duration_ms"] == 12.5
+        else:
+            assert rows[0]["total_latency_ms"] == 42.0 and rows[0]["validation_latency_ms"] == 0
+
+
+if __name__ == "__main__":
+    test_size_and_time_triggers()
+    test_full_queue_sheds_load()
+    test_close_flushes_pending_rows()
+    test_bad_row_does_not_lose_batch()
+    test_traffic_and_latency_logs_are_buffered()
+    print("✅ All log writer tests passed")
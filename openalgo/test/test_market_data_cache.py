@@ -0,0 +1,155 @@
+"""
+Test suite for the columnar MarketDataService cache
+
+Tests:
+- LTP, Quote and Depth updates read back in the legacy dict shape
+- Integer, float and string tick timestamps are all stored as epoch milliseconds
+- Vectorized multi-symbol LTP snapshot
+- Slot growth and slot recycling
+- Stale key detection
+- Readers see consistent rows while a writer thread updates them
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import numpy as np
+
+from services.market_data_service import ColumnarMarketDataCache
+
+QUOTE = {
+    "ltp": 1424.5,
+    "open": 1410.0,
+    "high": 1430.25,
+    "low": 1405.0,
+    "close": 1412.0,
+    "volume": 1234567,
+    "change": 12.5,
+    "change_percent": 0.88,
+    "timestamp": 1718000000123,
+}
+
+
+def test_update_and_read():
+    """Test each mode is stored and returned like the old nested dicts"""
+    cache = ColumnarMarketDataCache(capacity=4)
+    cache.update("NSE:RELIANCE", "RELIANCE", "NSE", 2, QUOTE, 1718000000)
+
+    assert cache.get_ltp("NSE:RELIANCE") == {
+        "value": 1424.5,
+        "timestamp": 1718000000123,
+        "volume": 1234567,
+    }
+    assert cache.get_quote("NSE:RELIANCE") == {key: QUOTE[key] for key in QUOTE}
+    assert cache.get_depth("NSE:RELIANCE") is None
+
+    depth = {"buy": [{"price": 1424.4, "quantity": 10, "orders": 1}], "sell": []}
+    cache.update("NSE:RELIANCE", "RELIANCE", "NSE", 3, {"ltp": 1425.0, "depth": depth}, 1718000001)
+    entry = cache.get_entry("NSE:RELIANCE")
+    assert entry["symbol"] == "RELIANCE" and entry["exchange"] == "NSE"
+    assert entry["last_update"] == 1718000001
+    assert entry["depth"]["buy"] == depth["buy"]
+    assert entry["depth"]["timestamp"] == 1718000001000
+    # Depth ticks do not touch the LTP row
+    assert entry["ltp"]["value"] == 1424.5
+
+    # LTP-only symbols have no quote
+    cache.update("NSE:TCS", "TCS", "NSE", 1, {"ltp": 3900.0}, 1718000002)
+    assert cache.get_quote("NSE:TCS") is None
+    assert cache.get_ltp("NSE:TCS")["timestamp"] == 1718000002000
+
+
+def test_timestamp_formats():
+    """Test every timestamp format is converted to epoch ms, not replaced by ingest time"""
+    cache = ColumnarMarketDataCache(capacity=4)
+    iso = datetime(2024, 6, 10, 9, 15, 2, 500000)
+    for value, expected in [
+        (1718000000, 1718000000000),
+        (np.int64(1718000000), 1718000000000),
+        (1718000000123, 1718000000123),
+        (1718000000.25, 1718000000250),
+        (1718000000123.0, 1718000000123),
+        ("1718000000.5", 1718000000500),
+        (iso.isoformat(), int(iso.timestamp() * 1000)),
+        (iso.strftime("%Y-%m-%d %H:%M:%S"), int(iso.replace(microsecond=0).timestamp() * 1000)),
+        ("not a time", 1718000009000),
+    ]:
+        cache.update("NSE:SBIN", "SBIN", "NSE", 1, {"ltp": 800.0, "timestamp": value}, 1718000009)
+        assert cache.get_ltp("NSE:SBIN")["timestamp"] == expected, value
+
+
+def test_same_instant_same_timestamp():
+    """Test an int epoch and an ISO string for the same instant are stored alike"""
+    cache = ColumnarMarketDataCache(capacity=4)
+    instant = datetime(2024, 6, 10, 9, 15, 2)
+    cache.update("NSE:A", "A", "NSE", 2, {"ltp": 1.0, "timestamp": int(instant.timestamp())}, 0)
+    cache.update("NSE:B", "B", "NSE", 2, {"ltp": 1.0, "timestamp": instant.isoformat()}, 0)
+
+    assert cache.get_ltp("NSE:A")["timestamp"] == cache.get_ltp("NSE:B")["timestamp"]
+    assert cache.get_quote("NSE:A")["timestamp"] == cache.get_quote("NSE:B")["timestamp"]
+    assert cache.get_ltp("NSE:A")["timestamp"] == int(instant.timestamp()) * 1000
+
+
+def test_snapshot_growth_and_recycling():
+    """Test vectorized reads across growth and slot reuse"""
+    cache = ColumnarMarketDataCache(capacity=2)
+    keys = [f"NSE:SYM{i}" for i in range(10)]
+    for i, key in enumerate(keys):
+        cache.update(key, f"SYM{i}", "NSE", 1, {"ltp": 100.0 + i, "volume": i}, 1000 + i)
+
+    ltps, timestamps, volumes = cache.get_ltp_snapshot(keys + ["NSE:MISSING"])
+    assert ltps[:10].tolist() == [100.0 + i for i in range(10)]
+    assert np.isnan(ltps[10])
+    assert volumes[:10].tolist() == list(range(10))
+
+    assert cache.get_stale_keys(1003) == ["NSE:SYM0", "NSE:SYM1", "NSE:SYM2"]
+
+    assert cache.remove("NSE:SYM0")
+    assert cache.get_ltp("NSE:SYM0") is None
+    cache.update("NSE:NEW", "NEW", "NSE", 1, {"ltp": 1.0}, 2000)
+    assert len(cache) == 10
+    assert cache.get_entry("NSE:NEW")["symbol"] == "NEW"
+
+    cache.clear()
+    assert len(cache) == 0 and cache.get_ltp("NSE:NEW") is None
+
+
+def test_concurrent_readers_see_consistent_rows():
+    """Test the seqlock keeps quote rows internally consistent during writes"""
+    cache = ColumnarMarketDataCache(capacity=8)
+    cache.update("NSE:X", "X", "NSE", 2, {"ltp": 1.0, "open": 1.0, "high": 1.0}, 0)
+    stop = threading.Event()
+
+    def writer():
+        value = 1.0
+        while not stop.is_set():
+            value += 1.0
+            cache.update("NSE:X", "X", "NSE", 2, {"ltp": value, "open": value, "high": value}, 0)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(20000):
+            quote = cache.get_quote("NSE:X")
+            assert quote["ltp"] == quote["open"] == quote["high"]
+    finally:
+        stop.set()
+        thread.join()
+
+
+if __name__ == "__main__":
+    test_update_and_read()
+    test_timestamp_formats()
+    test_same_instant_same_timestamp()
+    test_snapshot_growth_and_recycling()
+    test_concurrent_readers_see_consistent_rows()
+    print("✅ All market data cache tests passed")
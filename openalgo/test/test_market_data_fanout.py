@@ -0,0 +1,113 @@
+"""
+Test suite for MarketDataService subscriber fan-out
+
+Tests:
+- Ticks only reach subscribers filtered on that symbol, plus wildcard subscribers
+- Priority ordering (CRITICAL first, legacy subscribers last)
+- Event type filtering
+- Unsubscribe removes subscribers from the index
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from services.market_data_service import SubscriberPriority, get_market_data_service
+
+
+def _tick(symbol, mode=1, ltp=100.0):
+    return {
+        "symbol": symbol,
+        "exchange": "NSE",
+        "mode": mode,
+        "data": {"ltp": ltp, "timestamp": int(time.time())},
+    }
+
+
+def test_symbol_filtered_fanout():
+    """Test ticks reach only matching filtered subscribers and wildcard subscribers"""
+    service = get_market_data_service()
+    calls = []
+
+    ids = [
+        service.subscribe_with_priority(
+            SubscriberPriority.NORMAL,
+            "all",
+            lambda d: calls.append(("fanout_a", d["symbol"])),
+            {"NSE:FANOUTA"},
+            "fanout_a",
+        ),
+        service.subscribe_with_priority(
+            SubscriberPriority.NORMAL,
+            "all",
+            lambda d: calls.append(("fanout_b", d["symbol"])),
+            {"NSE:FANOUTB"},
+            "fanout_b",
+        ),
+        service.subscribe_with_priority(
+            SubscriberPriority.LOW,
+            "all",
+            lambda d: calls.append(("wildcard", d["symbol"])),
+            None,
+            "wildcard",
+        ),
+    ]
+
+    try:
+        assert service.process_market_data(_tick("FANOUTA"))
+        assert calls == [("fanout_a", "FANOUTA"), ("wildcard", "FANOUTA")]
+    finally:
+        for subscriber_id in ids:
+            service.unsubscribe_from_updates(subscriber_id)
+
+
+def test_priority_order_and_event_filter():
+    """Test CRITICAL runs first, legacy last, and event types are honoured"""
+    service = get_market_data_service()
+    calls = []
+
+    ids = [
+        service.subscribe_to_updates("ltp", lambda d: calls.append("legacy_ltp"), {"NSE:ORDERX"}),
+        service.subscribe_with_priority(
+            SubscriberPriority.LOW, "ltp", lambda d: calls.append("low"), {"NSE:ORDERX"}
+        ),
+        service.subscribe_critical(lambda d: calls.append("critical"), {"NSE:ORDERX"}),
+        service.subscribe_with_priority(
+            SubscriberPriority.HIGH, "depth", lambda d: calls.append("depth"), {"NSE:ORDERX"}
+        ),
+    ]
+
+    try:
+        service.process_market_data(_tick("ORDERX", mode=1))
+        assert calls == ["critical", "low", "legacy_ltp"]
+    finally:
+        for subscriber_id in ids:
+            service.unsubscribe_from_updates(subscriber_id)
+
+
+def test_unsubscribe_updates_index():
+    """Test unsubscribed callbacks no longer receive ticks"""
+    service = get_market_data_service()
+    calls = []
+
+    subscriber_id = service.subscribe_critical(lambda d: calls.append(d["symbol"]), {"NSE:UNSUBX"})
+    service.process_market_data(_tick("UNSUBX"))
+    assert service.unsubscribe_from_updates(subscriber_id)
+    service.process_market_data(_tick("UNSUBX"))
+
+    assert calls == ["UNSUBX"]
+    assert "NSE:UNSUBX" not in service._symbol_index
+
+
+if __name__ == "__main__":
+    test_symbol_filtered_fanout()
+    test_priority_order_and_event_filter()
+    test_unsubscribe_updates_index()
+    print("✅ All market data fan-out tests passed")
@@ -0,0 +1,204 @@
+"""
+Test suite for the shared master contract loader
+
+Tests:
+- Staged frames are normalised (NULLs, text tokens) and de-duplicated by token
+- Applying a new contract writes only the changed rows; unchanged rows keep their ids
+- Nothing staged leaves symtoken alone; phase timings reach master_contract_status
+- A load with a staging error or no rows is not applied
+- Vectorized expiry / strike formatting
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from database import master_contract_loader, symbol
+from database.master_contract_loader import (
+    MasterContractLoadError,
+    apply_load,
+    begin_load,
+    format_expiry,
+    format_strike,
+    stage_dataframe,
+)
+from database.master_contract_status_db import get_status
+
+BROKER = "loader_test"
+
+
+def setup_database():
+    """Point the loader at a fresh database with an empty symtoken table"""
+    path = os.path.join(tempfile.mkdtemp(), "symbols.db")
+    engine = create_engine(f"sqlite:///{path}")
+    symbol.Base.metadata.create_all(engine)
+    master_contract_loader.engine = engine
+    return engine
+
+
+def make_frame(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "symbol": [f"SYM{i}" for i in range(n)],
+            "brsymbol": [f"SYM{i}-EQ" for i in range(n)],
+            "name": [f"Company {i}" for i in range(n)],
+            "exchange": "NSE",
+            "brexchange": "NSE",
+            "token": np.arange(1000, 1000 + n),
+            "expiry": "",
+            "strike": rng.choice([-1.0, np.nan], n),
+            "lotsize": 1,
+            "instrumenttype": "EQ",
+            "tick_size": 0.05,
+            "segment": "EQ",
+        }
+    )
+
+
+def read_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(
+            text(f"SELECT id, {', '.join(master_contract_loader.COLUMNS)} FROM symtoken")
+        ).fetchall()
+
+
+def test_stage_and_apply():
+    engine = setup_database()
+    frame = make_frame(1000)
+    begin_load()
+    assert stage_dataframe(frame) == 1000
+    # A token already staged by this load is skipped, as it was in copy_from_dataframe
+    repeat = frame.iloc[:10].assign(exchange="BSE")
+    assert stage_dataframe(pd.concat([repeat, make_frame(1).assign(token=[5])])) == 1
+    result = apply_load(BROKER)
+    assert result["inserted"] == 1001 and result["deleted"] == 0 and result["skipped"] == 10
+
+    rows = read_rows(engine)
+    assert len(rows) == 1001
+    first = next(row for row in rows if row.token == "1000")
+    assert first.symbol == "SYM0" and first.lotsize == 1 and first.expiry == ""
+    assert first.strike in (-1.0, None) and isinstance(first.token, str)
+    assert sum(row.strike is None for row in rows) > 0
+
+
+def test_diff_apply_writes_changed_rows_only():
+    engine = setup_database()
+    frame = make_frame(2000)
+    begin_load()
+    stage_dataframe(frame)
+    apply_load(BROKER)
+    ids = {row.token: row.id for row in read_rows(engine)}
+
+    # Next day: one lot size changed, one instrument delisted, one listed
+    updated = frame.copy()
+    updated.loc[5, "lotsize"] = 50
+    updated = updated.drop(index=7)
+    updated = pd.concat([updated, make_frame(1).assign(token=[99999], symbol=["NEW"])])
+    begin_load()
+    stage_dataframe(updated.iloc[:1000])
+    stage_dataframe(updated.iloc[1000:])
+    result = apply_load(BROKER, started=time.perf_counter())
+    assert (result["inserted"], result["deleted"], result["unchanged"]) == (2, 2, 1998)
+
+    rows = {row.token: row for row in read_rows(engine)}
+    assert len(rows) == 2000 and "1007" not in rows
+    assert rows["1005"].lotsize == 50 and rows["1005"].id != ids["1005"]
+    assert rows["99999"].symbol == "NEW"
+    assert all(rows[token].id == ids[token] for token in ("1000", "1006", "2999"))
+
+    # Identical contract: nothing is written
+    begin_load()
+    stage_dataframe(updated)
+    result = apply_load(BROKER)
+    assert (result["inserted"], result["deleted"]) == (0, 0)
+
+
+def test_nothing_staged_and_timings():
+    engine = setup_database()
+    started = time.perf_counter() - 1
+    begin_load()
+    stage_dataframe(make_frame(10))
+    apply_load(BROKER, started)
+    timings = get_status(BROKER)["phase_timings"]
+    assert set(timings) == {"download", "stage", "apply", "total"}
+    assert timings["download"] >= 1 and timings["total"] >= timings["apply"]
+
+    # A download that fails before its table refresh stages nothing
+    assert apply_load(BROKER) is None
+    assert len(read_rows(engine)) == 10
+
+
+def test_failed_staging_keeps_live_table():
+    engine = setup_database()
+    begin_load()
+    stage_dataframe(make_frame(10))
+    apply_load(BROKER)
+    live = read_rows(engine)
+
+    # Second exchange fails to stage (broker code logs and continues)
+    begin_load()
+    stage_dataframe(make_frame(5))
+    original_insert = master_contract_loader._bulk_insert
+
+    def failing_insert(conn, frame):
+        raise ValueError("bad row")
+
+    master_contract_loader._bulk_insert = failing_insert
+    try:
+        stage_dataframe(make_frame(20).iloc[10:])
+    except ValueError:
+        pass
+    finally:
+        master_contract_loader._bulk_insert = original_insert
+
+    try:
+        apply_load(BROKER)
+        raise AssertionError("partial contract was applied")
+    except MasterContractLoadError as e:
+        assert "bad row" in str(e)
+    assert read_rows(engine) == live
+
+    # An empty download is not applied either
+    begin_load()
+    stage_dataframe(make_frame(0))
+    try:
+        apply_load(BROKER)
+        raise AssertionError("empty contract was applied")
+    except MasterContractLoadError:
+        pass
+    assert read_rows(engine) == live
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM symtoken_staging")).scalar() == 0
+
+
+def test_vectorized_formatting():
+    expiry = pd.Series(["19MAR2024", "30DEC2025", "", None, "weekly"])
+    assert format_expiry(expiry, "%d%b%Y").str.upper().tolist()[:3] == [
+        "19-MAR-24",
+        "30-DEC-25",
+        "",
+    ]
+    assert format_expiry(expiry, "%d%b%Y").tolist()[4] == "weekly"
+    assert format_strike(pd.Series([24500.0, 100.0, 7])).tolist() == ["24500", "100", "7"]
+
+
+if __name__ == "__main__":
+    test_stage_and_apply()
+    test_diff_apply_writes_changed_rows_only()
+    test_nothing_staged_and_timings()
+    test_failed_staging_keeps_live_table()
+    test_vectorized_formatting()
+    print("✅ All master contract loader tests passed")
@@ -0,0 +1,283 @@
+"""
+Test suite for the streaming option chain snapshot service
+
+Tests:
+- Cold start builds the chain from REST once and matches the REST chain shape and labels
+- Ticks from MarketDataService update the table without further REST calls
+- Diffs since a sequence number return only changed strikes (full snapshot on ATM shift)
+- Without a live stream, reads trigger at most one REST refresh per interval
+- A subscribed chain whose stream went quiet is refreshed from REST until ticks resume
+- Idle chains are unsubscribed from MarketDataService and the WebSocket proxy
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from services import option_chain_snapshot_service as snapshot_module
+from services.market_data_service import get_market_data_service
+from services.option_chain_service import get_strikes_with_labels
+
+EXPIRY = "30DEC25"
+STRIKES = [24000.0 + 50 * i for i in range(11)]
+
+
+class FakeBroker:
+    """REST hooks for the snapshot module and a recording WebSocket subscription"""
+
+    def __init__(self, underlying_ltp=24160.0, live=True):
+        self.underlying_ltp = underlying_ltp
+        self.live = live
+        self.quote_calls = 0
+        self.multiquote_calls = 0
+        self.subscribed = []
+        self.unsubscribed = []
+
+    def get_quotes(self, symbol, exchange, api_key):
+        self.quote_calls += 1
+        return (
+            True,
+            {"status": "success", "data": {"ltp": self.underlying_ltp, "prev_close": 24000.0}},
+            200,
+        )
+
+    def get_available_strikes(self, base_symbol, expiry, option_type, exchange):
+        return list(STRIKES)
+
+    def get_option_symbols_for_chain(self, base_symbol, expiry, strikes_with_labels, exchange):
+        chain = []
+        for info in strikes_with_labels:
+            strike = int(info["strike"])
+            legs = {}
+            for opt_type in ("ce", "pe"):
+                legs[opt_type] = {
+                    "symbol": f"{base_symbol}{expiry}{strike}{opt_type.upper()}",
+                    "label": info[f"{opt_type}_label"],
+                    # One missing PE to check None legs
+                    "exists": not (opt_type == "pe" and strike == 24350),
+                    "lotsize": 75,
+                    "tick_size": 0.05,
+                }
+            chain.append({"strike": info["strike"], **legs})
+        return chain
+
+    def fetch_leg_quotes(self, symbols_to_fetch, api_key):
+        self.multiquote_calls += 1
+        return {
+            item["symbol"]: {"ltp": 100.0, "bid": 99.5, "ask": 100.5, "volume": 1000, "oi": 5000}
+            for item in symbols_to_fetch
+        }
+
+
+def make_service(broker):
+    service = snapshot_module.OptionChainSnapshotService()
+
+    def ws_subscribe(api_key, symbols):
+        if broker.live:
+            broker.subscribed.extend(symbols)
+        return broker.live
+
+    service._ws_subscribe = ws_subscribe
+    service._ws_unsubscribe = lambda api_key, symbols: broker.unsubscribed.extend(symbols)
+    return service
+
+
+def patched(broker):
+    names = (
+        "get_quotes",
+        "get_available_strikes",
+        "get_option_symbols_for_chain",
+        "fetch_leg_quotes",
+    )
+    original = {name: getattr(snapshot_module, name) for name in names}
+    for name in names:
+        setattr(snapshot_module, name, getattr(broker, name))
+    return original
+
+
+def restore(original):
+    for name, func in original.items():
+        setattr(snapshot_module, name, func)
+
+
+def tick(symbol, exchange, **data):
+    get_market_data_service().process_market_data(
+        {
+            "symbol": symbol,
+            "exchange": exchange,
+            "mode": 2,
+            "data": {"timestamp": int(time.time()), **data},
+        }
+    )
+
+
+def test_cold_start_matches_rest_chain():
+    broker = FakeBroker()
+    original = patched(broker)
+    service = make_service(broker)
+    try:
+        ok, response, status = service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test")
+        ok2, response2, _ = service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test")
+    finally:
+        restore(original)
+        for key, table in list(service._tables.items()):
+            service._release(key, table)
+
+    assert ok and ok2 and status == 200
+    assert broker.quote_calls == 1 and broker.multiquote_calls == 1
+    # Underlying plus every existing leg, subscribed once
+    assert len(broker.subscribed) == 1 + 2 * len(STRIKES) - 1
+
+    assert response["underlying"] == "NIFTY" and response["expiry_date"] == EXPIRY
+    assert response["underlying_ltp"] == 24160.0 and response["atm_strike"] == 24150.0
+    labels = get_strikes_with_labels(STRIKES, 24150.0, 2)
+    assert [row["strike"] for row in response["chain"]] == [item["strike"] for item in labels]
+    for row, item in zip(response["chain"], labels, strict=True):
+        assert row["ce"]["label"] == item["ce_label"]
+        assert row["pe"]["label"] == item["pe_label"]
+        assert row["ce"]["ltp"] == 100.0 and row["ce"]["oi"] == 5000
+        assert row["ce"]["lotsize"] == 75
+    assert response2["chain"] == response["chain"]
+
+
+def test_ticks_and_diffs():
+    broker = FakeBroker()
+    original = patched(broker)
+    service = make_service(broker)
+    try:
+        _, first, _ = service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test")
+        seq = first["seq"]
+
+        # Nothing changed yet
+        _, diff, _ = service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test", since=seq)
+        assert diff["full"] is False and diff["chain"] == [] and diff["seq"] == seq
+
+        # A quote tick on one leg and a depth tick on another
+        tick(f"NIFTY{EXPIRY}24200CE", "NFO", ltp=120.0, volume=1500, close=90.0)
+        tick(
+            f"NIFTY{EXPIRY}24100PE",
+            "NFO",
+            ltp=80.0,
+            depth={
+                "buy": [{"price": 79.5, "quantity": 75}],
+                "sell": [{"price": 80.5, "quantity": 75}],
+            },
+        )
+        # A strike outside the window changes the table but not this reader's diff
+        tick(f"NIFTY{EXPIRY}24500CE", "NFO", ltp=10.0)
+
+        _, diff, _ = service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test", since=seq)
+        assert diff["full"] is False and diff["seq"] > seq
+        assert [row["strike"] for row in diff["chain"]] == [24100.0, 24200.0]
+        ce = diff["chain"][1]["ce"]
+        assert ce["ltp"] == 120.0 and ce["volume"] == 1500 and ce["prev_close"] == 90.0
+        assert ce["oi"] == 5000  # untouched fields keep their value
+        pe = diff["chain"][0]["pe"]
+        assert (pe["bid"], pe["ask"]) == (79.5, 80.5)
+
+        # Underlying moves to a new ATM: every label changes, so the reader gets a full chain
+        seq = diff["seq"]
+        tick("NIFTY", "NSE_INDEX", ltp=24240.0)
+        _, diff, _ = service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test", since=seq)
+        assert diff["full"] is True and diff["atm_strike"] == 24250.0
+        assert diff["underlying_ltp"] == 24240.0 and len(diff["chain"]) == 5
+        assert diff["chain"][2]["ce"]["label"] == "ATM"
+        assert diff["chain"][-1]["pe"] is None
+
+        # All ticks came from the stream
+        assert broker.quote_calls == 1 and broker.multiquote_calls == 1
+    finally:
+        restore(original)
+        for key, table in list(service._tables.items()):
+            service._release(key, table)
+
+
+def test_rest_fallback_without_stream():
+    broker = FakeBroker(live=False)
+    original = patched(broker)
+    service = make_service(broker)
+    interval = snapshot_module.REST_REFRESH_SECONDS
+    snapshot_module.REST_REFRESH_SECONDS = 60
+    try:
+        for _ in range(5):
+            service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test")
+        # Cold start only; the refresh interval has not passed
+        assert broker.quote_calls == 1 and broker.multiquote_calls == 1
+
+        table = next(iter(service._tables.values()))
+        assert table.live is False
+        table.refreshed_at -= 61
+        broker.underlying_ltp = 24390.0
+        _, response, _ = service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test")
+        assert broker.quote_calls == 2 and broker.multiquote_calls == 2
+        assert response["atm_strike"] == 24400.0
+    finally:
+        snapshot_module.REST_REFRESH_SECONDS = interval
+        restore(original)
+        for key, table in list(service._tables.items()):
+            service._release(key, table)
+
+
+def test_stale_stream_falls_back_to_rest():
+    broker = FakeBroker()
+    original = patched(broker)
+    service = make_service(broker)
+    try:
+        service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test")
+        table = next(iter(service._tables.values()))
+        assert table.live is True
+
+        # No tick for longer than the stale threshold
+        table.last_tick_at -= snapshot_module.STALE_SECONDS + 1
+        table.refreshed_at -= snapshot_module.REST_REFRESH_SECONDS + 1
+        broker.underlying_ltp = 24390.0
+        _, response, _ = service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test")
+        assert broker.quote_calls == 2 and broker.multiquote_calls == 2
+        assert response["atm_strike"] == 24400.0
+        # Still subscribed: no second subscription for the same symbols
+        assert table.live is True and len(broker.subscribed) == 1 + 2 * len(STRIKES) - 1
+
+        # Ticks resume; reads are served from the table again
+        tick("NIFTY", "NSE_INDEX", ltp=24395.0)
+        table.refreshed_at -= snapshot_module.REST_REFRESH_SECONDS + 1
+        service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test")
+        assert broker.quote_calls == 2 and service.metrics["rest_refreshes"] == 1
+    finally:
+        restore(original)
+        for key, table in list(service._tables.items()):
+            service._release(key, table)
+
+
+def test_idle_chain_is_released():
+    broker = FakeBroker()
+    original = patched(broker)
+    service = make_service(broker)
+    try:
+        service.get_chain("NIFTY", "NFO", EXPIRY, 2, "test")
+        table = next(iter(service._tables.values()))
+        subscriber_id = table.subscriber_id
+
+        table.last_read -= snapshot_module.IDLE_SECONDS + 1
+        service._evict_idle()
+    finally:
+        restore(original)
+
+    assert service._tables == {} and service._build_locks == {}
+    assert broker.unsubscribed == broker.subscribed
+    assert get_market_data_service().unsubscribe_priority(subscriber_id) is False
+
+
+if __name__ == "__main__":
+    test_cold_start_matches_rest_chain()
+    test_ticks_and_diffs()
+    test_rest_fallback_without_stream()
+    test_stale_stream_falls_back_to_rest()
+    test_idle_chain_is_released()
+    print("✅ All option chain snapshot tests passed")
@@ -0,0 +1,188 @@
+"""
+Test suite for the vectorized Black-76 option Greeks engine
+
+Tests:
+- Batch IV recovers the volatility used to price a chain (calls and puts, ITM to far OTM)
+- Batch Greeks match py_vollib's Black model
+- calculate_greeks_batch matches calculate_greeks response by response
+- get_multi_option_greeks fetches every quote (each underlying once) in one multiquotes call
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import numpy as np
+
+import services.quotes_service as quotes_service
+from services import option_greeks_service
+from utils import black76
+
+EXPIRY = (datetime.now() + timedelta(days=20)).strftime("%d%b%y").upper()
+
+
+def test_implied_volatility_round_trip():
+    rng = np.random.default_rng(7)
+    n = 5000
+    F = rng.uniform(100, 60000, n)
+    K = F * np.exp(rng.normal(0, 0.25, n))
+    t = rng.uniform(1 / 365, 1.5, n)
+    r = rng.uniform(0, 0.08, n)
+    sigma = rng.uniform(0.05, 1.5, n)
+    is_call = rng.random(n) < 0.5
+
+    price = black76.black76_price(F, K, t, r, sigma, is_call)
+    iv = black76.implied_volatility(price, F, K, t, r, is_call)
+
+    # Deep ITM options whose time value is lost to rounding have no well-defined IV
+    time_value = price * np.exp(r * t) - np.where(
+        is_call, np.maximum(F - K, 0), np.maximum(K - F, 0)
+    )
+    measurable = time_value > 1e-9 * price
+    assert np.isfinite(iv[measurable]).all()
+    assert np.allclose(iv[measurable], sigma[measurable], atol=1e-7)
+
+    # Prices outside the arbitrage bounds have no IV
+    bad = black76.implied_volatility(
+        [0.5, 120.0, 10.0],
+        [100.0, 100.0, 100.0],
+        [99.0, 100.0, 100.0],
+        0.1,
+        0.0,
+        [True, True, False],
+    )
+    assert np.isnan(bad[0]) and np.isnan(bad[1]) and np.isfinite(bad[2])
+
+
+def test_greeks_match_py_vollib():
+    if not option_greeks_service.PYVOLLIB_AVAILABLE:
+        print("py_vollib not installed, skipping")
+        return
+
+    F, K, t, r, sigma = 24150.0, np.array([23500.0, 24000.0, 24500.0, 25000.0]), 0.05, 0.065, 0.14
+    for flag in ("c", "p"):
+        batch = black76.greeks(F, K, t, r, sigma, flag == "c")
+        for name, func in (
+            ("delta", option_greeks_service.black_delta),
+            ("gamma", option_greeks_service.black_gamma),
+            ("theta", option_greeks_service.black_theta),
+            ("vega", option_greeks_service.black_vega),
+            ("rho", option_greeks_service.black_rho),
+        ):
+            expected = [func(flag, F, k, t, r, sigma) for k in K]
+            assert np.allclose(batch[name], expected, rtol=1e-9, atol=1e-12), name
+
+
+def chain(spot=24150.0):
+    options = []
+    for strike in range(23000, 25400, 100):
+        for opt_type in ("CE", "PE"):
+            intrinsic = max(spot - strike, 0) if opt_type == "CE" else max(strike - spot, 0)
+            options.append(
+                {
+                    "symbol": f"NIFTY{EXPIRY}{strike}{opt_type}",
+                    "exchange": "NFO",
+                    "spot_price": spot,
+                    "option_price": round(intrinsic + 180 * np.exp(-abs(strike - spot) / 600), 2),
+                }
+            )
+    # Deep ITM without time value, and a price above the forward
+    options.append(
+        {
+            "symbol": f"NIFTY{EXPIRY}22000CE",
+            "exchange": "NFO",
+            "spot_price": spot,
+            "option_price": 2150.0,
+        }
+    )
+    options.append(
+        {
+            "symbol": f"NIFTY{EXPIRY}24000CE",
+            "exchange": "NFO",
+            "spot_price": spot,
+            "option_price": 30000.0,
+        }
+    )
+    return options
+
+
+def test_batch_matches_single_symbol_responses():
+    if not option_greeks_service.PYVOLLIB_AVAILABLE:
+        print("py_vollib not installed, skipping")
+        return
+
+    options = chain()
+    batch = option_greeks_service.calculate_greeks_batch(options, interest_rate=6.5)
+    assert len(batch) == len(options)
+
+    for option, response in zip(options, batch, strict=True):
+        ok, single, _ = option_greeks_service.calculate_greeks(
+            option["symbol"], "NFO", option["spot_price"], option["option_price"], interest_rate=6.5
+        )
+        assert response["status"] == single["status"], option["symbol"]
+        if not ok:
+            continue
+        assert response.get("note") == single.get("note")
+        assert abs(response["implied_volatility"] - single["implied_volatility"]) <= 0.01
+        for name, value in single["greeks"].items():
+            assert abs(response["greeks"][name] - value) <= 1e-3 * max(1.0, abs(value)), name
+
+
+def test_multi_option_greeks_fetches_quotes_once():
+    prices = {(o["symbol"], "NFO"): o["option_price"] for o in chain()[:20]}
+    prices[("NIFTY", "NSE_INDEX")] = 24150.0
+    calls = []
+
+    def fake_multiquotes(symbols, api_key=None, **kwargs):
+        calls.append(symbols)
+        results = []
+        for item in symbols:
+            ltp = prices.get((item["symbol"], item["exchange"]))
+            if ltp is None:
+                results.append({**item, "error": "Symbol not found"})
+            else:
+                results.append({**item, "data": {"ltp": ltp}})
+        return True, {"status": "success", "results": results}, 200
+
+    def fake_quotes(*args, **kwargs):
+        raise AssertionError("individual quote fetched")
+
+    original = quotes_service.get_multiquotes, quotes_service.get_quotes
+    quotes_service.get_multiquotes, quotes_service.get_quotes = fake_multiquotes, fake_quotes
+    try:
+        requests = [
+            {"symbol": symbol, "exchange": exchange}
+            for symbol, exchange in prices
+            if exchange == "NFO"
+        ]
+        requests.append({"symbol": f"NIFTY{EXPIRY}99999CE", "exchange": "NFO"})
+        requests.append({"symbol": "NOTANOPTION", "exchange": "NFO"})
+        ok, response, status = option_greeks_service.get_multi_option_greeks(
+            requests, api_key="test"
+        )
+    finally:
+        quotes_service.get_multiquotes, quotes_service.get_quotes = original
+
+    assert ok and status == 200
+    assert len(calls) == 1
+    assert [s["symbol"] for s in calls[0]].count("NIFTY") == 1
+    assert response["status"] == "partial"
+    assert response["summary"] == {"total": 22, "success": 20, "failed": 2}
+    assert [item["symbol"] for item in response["data"]] == [r["symbol"] for r in requests]
+    assert response["data"][-2]["message"].startswith("Failed to fetch option price")
+    assert response["data"][0]["greeks"]["delta"] > 0
+
+
+if __name__ == "__main__":
+    test_implied_volatility_round_trip()
+    test_greeks_match_py_vollib()
+    test_batch_matches_single_symbol_responses()
+    test_multi_option_greeks_fetches_quotes_once()
+    print("✅ All option Greeks batch tests passed")
@@ -0,0 +1,148 @@
+"""
+Test suite for the sandbox WebSocket execution engine's trigger book
+
+Tests:
+- LIMIT and SL-M orders sorted by level, only crossed orders are popped
+- SL orders stay resting while LTP is outside their limit price
+- Remove/replace of booked orders and MARKET orders
+- A tick executes crossed orders as one batch and leaves the rest booked
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add parent directory to path ahead of test/, whose sandbox/ folder would shadow the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database.sandbox_db import SandboxOrders, SandboxTrades, db_session, init_db
+from sandbox.fund_manager import FundManager
+from sandbox.websocket_execution_engine import OrderTriggerBook, WebSocketExecutionEngine
+
+
+def _order(orderid, action, price_type, price=None, trigger_price=None):
+    return SimpleNamespace(
+        orderid=orderid,
+        action=action,
+        price_type=price_type,
+        price=price,
+        trigger_price=trigger_price,
+    )
+
+
+def _book(*orders):
+    book = OrderTriggerBook()
+    for order in orders:
+        book.add(order.orderid, *OrderTriggerBook.get_trigger(order))
+    return book
+
+
+def test_pop_crossed_limit_and_stop():
+    """Test a tick pops only the orders whose level it crossed"""
+    book = _book(
+        _order("buy_99", "BUY", "LIMIT", price=Decimal("99")),
+        _order("buy_100", "BUY", "LIMIT", price=Decimal("100")),
+        _order("sell_101", "SELL", "LIMIT", price=Decimal("101")),
+        _order("slm_buy_102", "BUY", "SL-M", trigger_price=Decimal("102")),
+        _order("slm_sell_98", "SELL", "SL-M", trigger_price=Decimal("98")),
+    )
+
+    assert book.pop_crossed(100.5) == []
+    assert book.pop_crossed(100.0) == ["buy_100"]
+    assert book.pop_crossed(102.0) == ["sell_101", "slm_buy_102"]
+    assert book.pop_crossed(97.0) == ["buy_99", "slm_sell_98"]
+    assert len(book) == 0
+
+
+def test_stop_limit_band():
+    """Test triggered SL orders only execute inside their limit price"""
+    book = _book(_order("sl_buy", "BUY", "SL", price=Decimal("105"), trigger_price=Decimal("100")))
+
+    assert book.pop_crossed(99.0) == []
+    assert book.pop_crossed(106.0) == []  # Triggered but above limit
+    assert "sl_buy" in book
+    assert book.pop_crossed(104.0) == ["sl_buy"]
+
+
+def test_remove_replace_and_market():
+    """Test re-adding an order moves it and MARKET orders pop on any tick"""
+    book = _book(
+        _order("a", "BUY", "LIMIT", price=Decimal("100")),
+        _order("b", "BUY", "LIMIT", price=Decimal("100")),
+        _order("mkt", "SELL", "MARKET"),
+    )
+
+    # Modified order moves to its new price
+    book.add("a", OrderTriggerBook.FALLS_TO, 90.0)
+    assert book.pop_crossed(150.0) == ["mkt"]
+    assert book.pop_crossed(100.0) == ["b"]
+    assert book.remove("a")
+    assert not book.remove("a")
+    assert OrderTriggerBook.get_trigger(_order("bad", "BUY", "LIMIT")) is None
+
+
+def test_tick_executes_crossed_orders():
+    """Test a tick executes crossed orders in one batch and keeps the rest booked"""
+    init_db()
+    user_id = f"trigger_book_{uuid.uuid4().hex[:8]}"
+    FundManager(user_id).initialize_funds()
+
+    symbol = f"TB{uuid.uuid4().hex[:6].upper()}"
+    prices = [Decimal("100"), Decimal("99"), Decimal("95")]
+    orderids = [f"{symbol}-{i}" for i in range(len(prices))]
+    for orderid, price in zip(orderids, prices):
+        db_session.add(
+            SandboxOrders(
+                orderid=orderid,
+                user_id=user_id,
+                symbol=symbol,
+                exchange="NSE",
+                action="BUY",
+                quantity=1,
+                price=price,
+                price_type="LIMIT",
+                product="MIS",
+                order_status="open",
+                pending_quantity=1,
+                margin_blocked=Decimal("0"),
+                order_timestamp=datetime.now(),
+            )
+        )
+    db_session.commit()
+
+    engine = WebSocketExecutionEngine()
+    engine._running = True
+    try:
+        engine._rebuild_order_index()
+        engine._on_market_data({"symbol": symbol, "exchange": "NSE", "data": {"ltp": 98.5}})
+
+        statuses = {
+            order.orderid: order.order_status
+            for order in SandboxOrders.query.filter(SandboxOrders.orderid.in_(orderids))
+        }
+        assert statuses == {orderids[0]: "complete", orderids[1]: "complete", orderids[2]: "open"}
+        trades = SandboxTrades.query.filter(SandboxTrades.orderid.in_(orderids)).all()
+        assert sorted(trade.orderid for trade in trades) == orderids[:2]
+        assert all(trade.price == Decimal("98.5") for trade in trades)
+        assert orderids[2] in engine._trigger_books[f"NSE:{symbol}"]
+        assert not engine._in_flight
+    finally:
+        engine._running = False
+        SandboxOrders.query.filter(SandboxOrders.user_id == user_id).delete()
+        db_session.commit()
+        db_session.remove()
+
+
+if __name__ == "__main__":
+    test_pop_crossed_limit_and_stop()
+    test_stop_limit_band()
+    test_remove_replace_and_market()
+    test_tick_executes_crossed_orders()
+    print("✅ All sandbox trigger book tests passed")
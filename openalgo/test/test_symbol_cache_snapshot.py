@@ -0,0 +1,185 @@
+"""
+Test suite for the symbol cache snapshot file
+
+Tests:
+- The first load builds from the database and writes the snapshot
+- The next load reads the snapshot without querying the database
+- A new master contract download (or a corrupt file) makes the snapshot stale
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import create_engine
+
+from database import symbol, symbol_cache_snapshot, token_db_enhanced
+from database.master_contract_status_db import update_status
+from database.token_db_enhanced import BrokerSymbolCache
+
+BROKER = "snapshot_test"
+
+ROWS = [
+    {
+        "symbol": "SBIN",
+        "brsymbol": "SBIN-EQ",
+        "name": "STATE BANK OF INDIA",
+        "exchange": "NSE",
+        "brexchange": "NSE",
+        "token": "3045",
+        "expiry": None,
+        "strike": -1.0,
+        "lotsize": 1,
+        "instrumenttype": "EQ",
+        "tick_size": 0.05,
+    },
+    {
+        "symbol": "NIFTY30DEC2524000CE",
+        "brsymbol": "NIFTY25DEC24000CE",
+        "name": "NIFTY",
+        "exchange": "NFO",
+        "brexchange": "NFO",
+        "token": "41001",
+        "expiry": "30-DEC-25",
+        "strike": 24000.0,
+        "lotsize": 75,
+        "instrumenttype": "CE",
+        "tick_size": 0.05,
+    },
+    {
+        "symbol": "NIFTY30DEC25FUT",
+        "brsymbol": "NIFTY25DECFUT",
+        "name": "NIFTY",
+        "exchange": "NFO",
+        "brexchange": "NFO",
+        "token": "41000",
+        "expiry": "30-DEC-25",
+        "strike": None,
+        "lotsize": 75,
+        "instrumenttype": "FUT",
+        "tick_size": None,
+    },
+]
+
+
+def setup_database(rows):
+    """Point the symtoken session at a fresh database holding rows"""
+    directory = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'symbols.db')}")
+    symbol.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(symbol.SymToken.__table__.insert(), rows)
+    symbol.db_session.remove()
+    symbol.db_session.configure(bind=engine)
+    symbol_cache_snapshot.SYMBOL_CACHE_SNAPSHOT_DIR = os.path.join(directory, "snapshots")
+
+
+def download_master_contract():
+    update_status(BROKER, "success", "Master contract download completed successfully")
+    # last_updated has microsecond resolution; keep consecutive downloads distinct
+    time.sleep(0.01)
+
+
+def assert_same_cache(a, b):
+    assert a.stats.total_symbols == b.stats.total_symbols
+    assert [a.table.row(i) for i in range(len(a.table))] == [
+        b.table.row(i) for i in range(len(b.table))
+    ]
+    assert a.expiries_by_exchange_underlying == b.expiries_by_exchange_underlying
+    assert a.underlyings_by_exchange == b.underlyings_by_exchange
+
+
+def test_snapshot_round_trip():
+    original_bind = symbol.db_session.get_bind()
+    setup_database(ROWS)
+    download_master_contract()
+    try:
+        from_db = BrokerSymbolCache()
+        assert from_db.load_all_symbols(BROKER)
+        assert from_db.stats.load_source == "database"
+        assert os.path.exists(symbol_cache_snapshot.snapshot_path(BROKER))
+
+        # The second load must not touch the database
+        original_query = BrokerSymbolCache._query_symbol_columns
+
+        def fail():
+            raise AssertionError("database queried despite a fresh snapshot")
+
+        BrokerSymbolCache._query_symbol_columns = staticmethod(fail)
+        try:
+            from_snapshot = BrokerSymbolCache()
+            assert from_snapshot.load_all_symbols(BROKER)
+        finally:
+            BrokerSymbolCache._query_symbol_columns = staticmethod(original_query)
+    finally:
+        symbol.db_session.remove()
+        symbol.db_session.configure(bind=original_bind)
+
+    assert from_snapshot.stats.load_source == "snapshot"
+    assert from_snapshot.table.shared and from_snapshot.get_cache_info()["shared_memory"]
+    assert_same_cache(from_db, from_snapshot)
+    info = from_snapshot.get_symbol_info("NIFTY30DEC2524000CE", "NFO")
+    assert info.underlying == "NIFTY" and info.strike == 24000.0 and info.lotsize == 75
+    assert from_snapshot.get_symbol_info("NIFTY30DEC25FUT", "NFO").tick_size is None
+    assert from_snapshot.get_br_symbol("SBIN", "NSE") == "SBIN-EQ"
+    assert from_snapshot.get_symbol("3045", "NSE") == "SBIN"
+
+
+def test_stale_snapshot_is_rebuilt():
+    original_bind = symbol.db_session.get_bind()
+    setup_database(ROWS)
+    download_master_contract()
+    try:
+        assert BrokerSymbolCache().load_all_symbols(BROKER)
+
+        # A new master contract download changes the symbols and the snapshot key
+        snapshot_dir = symbol_cache_snapshot.SYMBOL_CACHE_SNAPSHOT_DIR
+        setup_database(ROWS[:1])
+        symbol_cache_snapshot.SYMBOL_CACHE_SNAPSHOT_DIR = snapshot_dir
+        download_master_contract()
+        cache = BrokerSymbolCache()
+        assert cache.load_all_symbols(BROKER)
+        assert cache.stats.load_source == "database" and cache.stats.total_symbols == 1
+
+        # A corrupt file is ignored and replaced
+        with open(symbol_cache_snapshot.snapshot_path(BROKER), "wb") as f:
+            f.write(b"not a symbol table")
+        cache = BrokerSymbolCache()
+        assert cache.load_all_symbols(BROKER)
+        assert cache.stats.load_source == "database"
+        cache = BrokerSymbolCache()
+        assert cache.load_all_symbols(BROKER)
+        assert cache.stats.load_source == "snapshot" and cache.stats.total_symbols == 1
+
+        # Without a successful download there is no key, so no snapshot is used
+        update_status(BROKER, "downloading", "Master contract download in progress")
+        cache = BrokerSymbolCache()
+        assert cache.load_all_symbols(BROKER)
+        assert cache.stats.load_source == "database"
+
+        # Disabled snapshots always load from the database
+        download_master_contract()
+        token_db_enhanced.SYMBOL_CACHE_SNAPSHOT = False
+        try:
+            cache = BrokerSymbolCache()
+            assert cache.load_all_symbols(BROKER)
+            assert cache.stats.load_source == "database"
+        finally:
+            token_db_enhanced.SYMBOL_CACHE_SNAPSHOT = True
+    finally:
+        symbol.db_session.remove()
+        symbol.db_session.configure(bind=original_bind)
+
+
+if __name__ == "__main__":
+    test_snapshot_round_trip()
+    test_stale_snapshot_is_rebuilt()
+    print("✅ All symbol cache snapshot tests passed")
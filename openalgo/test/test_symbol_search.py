@@ -0,0 +1,226 @@
+"""
+Test suite for the symbol search index
+
+Tests:
+- Ranked search matches a row-by-row scan (exact, then prefix, then other matches)
+- F&O filters match a row-by-row scan, including strike ranges sliced from the
+  sorted strike ladder of one underlying and expiry
+
+Search latency on a full-size master is measured by test/bench_symbol_search.py.
+"""
+
+import os
+import random
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database.symbol_search import SymbolSearchIndex
+from database.symbol_table import COLUMNS, SymbolTable
+from database.token_db_enhanced import (
+    BrokerSymbolCache,
+    SymbolData,
+    extract_underlying_from_symbol,
+)
+
+EXPIRIES = ["30-DEC-25", "06-JAN-26", "27-JAN-26", "24-FEB-26", "31-MAR-26"]
+
+
+def make_master(stocks=2000, seed=11):
+    """Equities plus futures and option ladders for NFO, BFO and MCX"""
+    rng = random.Random(seed)
+    rows = []
+    token = 1000
+
+    def add(symbol, brsymbol, name, exchange, expiry=None, strike=-1.0, kind="EQ"):
+        nonlocal token
+        token += 1
+        rows.append(
+            (symbol, brsymbol, name, exchange, exchange, str(token), expiry, strike)
+            + (1 if kind == "EQ" else rng.choice([15, 75, 250]), kind, 0.05)
+        )
+
+    names = [f"STK{i:04d}" for i in range(stocks)]
+    for name in names:
+        add(name, f"{name}-EQ", f"{name} Industries Ltd", "NSE")
+        add(name, name, f"{name} Industries Ltd", "BSE")
+
+    underlyings = [("NFO", u) for u in ["NIFTY", "BANKNIFTY", "FINNIFTY", *names[:180]]]
+    underlyings += [("BFO", u) for u in ["SENSEX", "BANKEX"]]
+    underlyings += [("MCX", u) for u in ["CRUDEOIL", "GOLD", "SILVER", "NATURALGAS"]]
+    for exchange, underlying in underlyings:
+        base = rng.randrange(100, 50000)
+        step = max(base // 100, 1)
+        expiries = EXPIRIES if underlying in ("NIFTY", "BANKNIFTY", "SENSEX") else EXPIRIES[::2]
+        for expiry in expiries:
+            date = expiry.replace("-", "")
+            prefix = f"{underlying}{date[:5]}{date[-2:]}"
+            add(
+                f"{prefix}FUT",
+                f"{underlying}{date[-2:]}{date[2:5]}FUT",
+                underlying,
+                exchange,
+                expiry,
+                0.0,
+                "FUT",
+            )
+            for k in range(-50, 51):
+                strike = float(base + k * step)
+                for kind in ("CE", "PE"):
+                    add(
+                        f"{prefix}{strike:g}{kind}",
+                        f"{underlying}{date[-2:]}{date[2:5]}{strike:g}{kind}",
+                        underlying,
+                        exchange,
+                        expiry,
+                        strike,
+                        kind,
+                    )
+    return rows
+
+
+def load_cache(rows):
+    columns = {
+        name: list(values)
+        for name, values in zip(COLUMNS[:-1], zip(*rows, strict=True), strict=True)
+    }
+    columns["underlying"] = [
+        extract_underlying_from_symbol(symbol, exchange)
+        if exchange in ("NFO", "BFO", "MCX")
+        else None
+        for symbol, exchange in zip(columns["symbol"], columns["exchange"], strict=True)
+    ]
+    table = SymbolTable.build(columns)
+    cache = BrokerSymbolCache()
+    cache.table = table
+    cache.search_index = SymbolSearchIndex(table)
+    cache._build_filter_indexes()
+    cache.cache_loaded = True
+    records = [SymbolData(*values) for values in zip(*columns.values(), strict=True)]
+    return cache, records
+
+
+def matches(record, term):
+    if (
+        term in record.symbol.upper()
+        or term in record.brsymbol.upper()
+        or (record.name and term in record.name.upper())
+        or term in record.token
+    ):
+        return True
+    try:
+        value = float(term)
+    except ValueError:
+        return False
+    return bool(record.strike) and record.strike == value
+
+
+def scan_search(records, query, exchange, limit):
+    terms = query.upper().split()
+    if exchange and any(r.exchange == exchange for r in records):
+        records = [r for r in records if r.exchange == exchange]
+    found = [r for r in records if all(matches(r, term) for term in terms)]
+    found.sort(key=lambda r: (not r.symbol.upper().startswith(terms[0]), r.symbol.upper()))
+    return found[:limit]
+
+
+def scan_fno(records, query, exchange, expiry, instrumenttype, strike_min, strike_max, underlying):
+    terms = query.upper().split() if query else []
+    found = []
+    for r in records:
+        if exchange and r.exchange != exchange:
+            continue
+        if underlying and r.underlying != underlying.upper():
+            continue
+        if expiry and r.expiry != expiry:
+            continue
+        if instrumenttype and not r.symbol.upper().endswith(instrumenttype):
+            continue
+        if strike_min is not None and not (r.strike is not None and r.strike >= strike_min):
+            continue
+        if strike_max is not None and not (r.strike is not None and r.strike <= strike_max):
+            continue
+        if terms:
+            text = all(
+                t in r.symbol.upper()
+                or t in r.brsymbol.upper()
+                or (r.name and t in r.name.upper())
+                or t in r.token
+                for t in terms
+            )
+            numeric = False
+            for t in terms:
+                try:
+                    numeric = numeric or (float(t) != 0 and r.strike == float(t))
+                except ValueError:
+                    pass
+            if not (text or numeric):
+                continue
+        found.append(r)
+    return found
+
+
+def test_search_matches_scan():
+    cache, records = load_cache(make_master(stocks=300))
+    for query, exchange, limit in [
+        ("nifty", None, 50),
+        ("NIFTY 06JAN", "NFO", 20),
+        ("banknifty 30dec", None, 500),
+        ("stk0042", None, 10),
+        ("stk0042", "BSE", 10),
+        ("industries", "NSE", 25),
+        ("s", None, 40),
+        ("ce 27jan26", "NFO", 30),
+        ("crude", "MCX", 5),
+        ("1005", None, 10),
+        ("sensex fut", "BFO", 10),
+        ("nothing", None, 10),
+        ("gold", "XYZ", 10),
+    ]:
+        assert cache.search_symbols(query, exchange, limit) == scan_search(
+            records, query, exchange, limit
+        ), query
+
+    # Exact symbol first, then prefix matches, then substrings (BANKNIFTY after NIFTY...)
+    results = cache.search_symbols("nifty30dec25fut", limit=5)
+    assert results[0].symbol == "NIFTY30DEC25FUT"
+    results = cache.search_symbols("NIFTY", exchange="NFO", limit=2000)
+    first_other = next(i for i, r in enumerate(results) if not r.symbol.startswith("NIFTY"))
+    assert all(not r.symbol.startswith("NIFTY") for r in results[first_other:])
+
+
+def test_fno_search_matches_scan():
+    cache, records = load_cache(make_master(stocks=300))
+    ladder = sorted({r.strike for r in records if r.underlying == "BANKNIFTY" and r.strike})
+    low, high = ladder[20], ladder[60]
+    for args in [
+        (None, "NFO", "27-JAN-26", "CE", low, high, "banknifty"),
+        (None, None, "27-JAN-26", None, low, None, "BANKNIFTY"),
+        (None, None, "27-JAN-26", "PE", None, high, "BANKNIFTY"),
+        (None, None, "31-MAR-26", None, None, None, "BANKNIFTY"),
+        (None, "NFO", None, "FUT", None, None, None),
+        ("nifty", "NFO", "30-DEC-25", "CE", low, high, None),
+        (f"nifty {ladder[30]:g}", "NFO", None, None, None, None, None),
+        ("gold", "MCX", None, None, None, None, "GOLD"),
+        (None, None, "06-JAN-26", None, None, None, "NOSUCH"),
+        (None, None, "01-JAN-20", None, None, None, "NIFTY"),
+    ]:
+        results = cache.fno_search_symbols(*args, limit=100000)
+        expected = scan_fno(records, *args)
+        key = lambda r: (r.symbol, r.exchange)  # noqa: E731
+        assert sorted(results, key=key) == sorted(expected, key=key), args
+
+    results = cache.fno_search_symbols(query="NIFTY", exchange="NFO", limit=50)
+    assert all(r.underlying == "NIFTY" for r in results)
+    assert [r.symbol for r in results] == sorted(r.symbol for r in results)
+
+
+if __name__ == "__main__":
+    test_search_matches_scan()
+    test_fno_search_matches_scan()
+    print("✅ All symbol search tests passed")
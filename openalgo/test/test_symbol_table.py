@@ -0,0 +1,213 @@
+"""
+Test suite for the columnar symbol table
+
+Tests:
+- Hash-index lookups match dict lookups (last duplicate wins, unknown keys miss)
+- Rows round-trip through a saved, memory-mapped table, including None values
+- search_symbols / fno_search_symbols match a row-by-row scan (ranked by the first term)
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import numpy as np
+
+from database.symbol_search import SymbolSearchIndex
+from database.symbol_table import COLUMNS, SymbolTable
+from database.token_db_enhanced import (
+    BrokerSymbolCache,
+    SymbolData,
+    extract_underlying_from_symbol,
+)
+
+
+def make_rows(n=3000, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        kind = rng.choice(["EQ", "FUT", "CE", "PE"])
+        if kind == "EQ":
+            symbol = f"STOCK{i}"
+            row = (symbol, f"{symbol}-EQ", f"Stock {i} Ltd", "NSE", "NSE", str(1000 + i))
+            row += (None, -1.0, 1, "EQ", 0.05)
+        else:
+            base = rng.choice(["NIFTY", "BANKNIFTY", "CRUDEOIL"])
+            exchange = "MCX" if base == "CRUDEOIL" else "NFO"
+            expiry = rng.choice(["30-DEC-25", "27-JAN-26"])
+            date = expiry.replace("-", "")
+            strike = float(rng.randrange(20000, 26000, 50))
+            suffix = "FUT" if kind == "FUT" else f"{strike:g}{kind}"
+            symbol = f"{base}{date[:5]}{date[-2:]}{suffix}"
+            row = (symbol, symbol.lower(), base, exchange, exchange, str(50000 + i))
+            row += (expiry, None if kind == "FUT" else strike, rng.choice([15, 75, None]))
+            row += (kind, None)
+        rows.append(row)
+    # A re-listed symbol (last row wins) and a token shared across exchanges
+    rows.append(rows[5][:5] + ("99999",) + rows[5][6:])
+    rows.append(("STOCK5", "STOCK5-BE", "Stock 5 Ltd", "BSE", "BSE", "1005") + rows[5][6:])
+    return rows
+
+
+def to_columns(rows):
+    columns = {
+        name: list(values)
+        for name, values in zip(COLUMNS[:-1], zip(*rows, strict=True), strict=True)
+    }
+    columns["underlying"] = [
+        extract_underlying_from_symbol(symbol, exchange)
+        for symbol, exchange in zip(columns["symbol"], columns["exchange"], strict=True)
+    ]
+    return columns
+
+
+def load_cache(table):
+    cache = BrokerSymbolCache()
+    cache.table = table
+    cache.search_index = SymbolSearchIndex(table)
+    cache._build_filter_indexes()
+    cache.cache_loaded = True
+    return cache
+
+
+def test_lookups_match_dicts():
+    rows = make_rows()
+    columns = to_columns(rows)
+    table = SymbolTable.build(columns)
+    records = [SymbolData(*values) for values in zip(*columns.values(), strict=True)]
+    by_symbol = {(r.symbol, r.exchange): r for r in records}
+    by_token = {(r.token, r.exchange): r for r in records}
+    by_brsymbol = {(r.brsymbol, r.exchange): r for r in records}
+    cache = load_cache(table)
+
+    for (symbol, exchange), record in by_symbol.items():
+        assert cache.get_token(symbol, exchange) == record.token
+        assert cache.get_br_symbol(symbol, exchange) == record.brsymbol
+        assert cache.get_symbol_info(symbol, exchange) == record
+    for (token, exchange), record in by_token.items():
+        assert cache.get_symbol(token, exchange) == record.symbol
+    for (brsymbol, exchange), record in by_brsymbol.items():
+        assert cache.get_oa_symbol(brsymbol, exchange) == record.symbol
+
+    assert cache.get_token("STOCK5", "NSE") == "99999"
+    assert cache.get_token("STOCK5", "BSE") == "1005"
+    assert cache.get_symbol_data("1005").exchange == "BSE"
+    assert cache.get_token("STOCK5", "MCX") is None
+    assert cache.get_token("MISSING", "NSE") is None
+    assert cache.get_tokens_bulk([("STOCK1", "NSE"), ("MISSING", "NSE")]) == ["1001", None]
+    assert cache.stats.misses >= 3
+
+    assert cache.expiries_by_exchange_underlying[("MCX", "CRUDEOIL")] == {
+        "30-DEC-25",
+        "27-JAN-26",
+    }
+    assert cache.underlyings_by_exchange["NFO"] == {"NIFTY", "BANKNIFTY"}
+
+
+def test_saved_table_is_mapped():
+    columns = to_columns(make_rows(500))
+    built = SymbolTable.build(columns, {"broker": "test"})
+    path = os.path.join(tempfile.mkdtemp(), "test.symtab")
+    built.save(path)
+    mapped = SymbolTable.open(path)
+
+    assert mapped.shared and not built.shared
+    assert mapped.metadata == {"broker": "test"}
+    assert [mapped.row(i) for i in range(len(mapped))] == [
+        tuple(values) for values in zip(*columns.values(), strict=True)
+    ]
+    assert np.array_equal(mapped.arrays["expiry_date"], built.arrays["expiry_date"], equal_nan=True)
+    assert str(mapped.arrays["expiry_date"][1]) in ("NaT", "2025-12-30", "2026-01-27")
+
+    with open(path, "r+b") as f:
+        f.write(b"garbage!")
+    try:
+        SymbolTable.open(path)
+        raise AssertionError("malformed file accepted")
+    except ValueError:
+        pass
+
+
+def scan_search(records, query, exchange, limit):
+    terms = query.upper().split()
+    pool = [r for r in records if r.exchange == exchange] if exchange else records
+    found = []
+    for r in pool:
+        ok = True
+        for term in terms:
+            match = (
+                term in r.symbol.upper()
+                or term in r.brsymbol.upper()
+                or (r.name and term in r.name.upper())
+                or (r.token and term in r.token)
+            )
+            if not match and r.strike:
+                try:
+                    match = float(term) == r.strike
+                except ValueError:
+                    pass
+            ok = ok and match
+        if ok:
+            found.append(r)
+    # Symbol prefix matches (exact first) before other matches, then alphabetical
+    found.sort(key=lambda r: (not r.symbol.upper().startswith(terms[0]), r.symbol.upper()))
+    return found[:limit]
+
+
+def test_search_matches_scan():
+    rows = make_rows()
+    columns = to_columns(rows)
+    records = [SymbolData(*values) for values in zip(*columns.values(), strict=True)]
+    cache = load_cache(SymbolTable.build(columns))
+
+    for query, exchange in [
+        ("nifty dec", "NFO"),
+        ("banknifty 24500", None),
+        ("ltd", "NSE"),
+        ("1005", None),
+        ("crudeoil", "MCX"),
+        ("nothing", None),
+    ]:
+        assert cache.search_symbols(query, exchange, limit=50) == scan_search(
+            records, query, exchange, 50
+        ), query
+
+    results = cache.fno_search_symbols(
+        query="NIFTY",
+        exchange="NFO",
+        expiry="30-DEC-25",
+        instrumenttype="CE",
+        strike_min=22000,
+        strike_max=24000,
+        limit=1000,
+    )
+    expected = [
+        r
+        for r in records
+        if r.exchange == "NFO"
+        and r.expiry == "30-DEC-25"
+        and r.symbol.endswith("CE")
+        and r.strike is not None
+        and 22000 <= r.strike <= 24000
+        and "NIFTY" in r.symbol
+    ]
+    assert sorted(results, key=lambda r: r.symbol) == sorted(expected, key=lambda r: r.symbol)
+    # Exact underlying matches rank before BANKNIFTY
+    assert results[0].underlying == "NIFTY"
+    futures = cache.fno_search_symbols(underlying="crudeoil", instrumenttype="FUT", limit=1000)
+    assert futures and all(r.symbol.endswith("FUT") and r.exchange == "MCX" for r in futures)
+
+
+if __name__ == "__main__":
+    test_lookups_match_dicts()
+    test_saved_table_is_mapped()
+    test_search_matches_scan()
+    print("✅ All symbol table tests passed")
@@ -0,0 +1,132 @@
+"""
+Test suite for the ZeroMQ tick wire format (websocket_proxy/tick_codec.py)
+
+Tests:
+- Topic parsing for broker, legacy and index topics
+- Binary round trip for LTP, Quote and Depth ticks
+- Int/float type preservation
+- Fallback of non-numeric fields to the extras section
+- JSON fallback format
+"""
+
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from websocket_proxy.tick_codec import (
+    FORMAT_JSON,
+    decode_tick,
+    encode_tick,
+    is_binary_tick,
+    parse_topic,
+)
+
+LTP_TICK = {
+    "symbol": "RELIANCE",
+    "exchange": "NSE",
+    "mode": 1,
+    "ltp": 1424.5,
+    "ltt": 1718000000,
+    "timestamp": 1718000000123,
+}
+
+QUOTE_TICK = {
+    "symbol": "RELIANCE",
+    "exchange": "NSE",
+    "mode": 2,
+    "ltp": 1424.5,
+    "open": 1410.0,
+    "high": 1430.25,
+    "low": 1405.0,
+    "close": 1412.0,
+    "volume": 1234567,
+    "average_price": 1419.33,
+    "total_buy_quantity": 5000,
+    "total_sell_quantity": 4200,
+    "timestamp": 1718000000123,
+}
+
+DEPTH_TICK = {
+    **QUOTE_TICK,
+    "mode": 3,
+    "oi": 0,
+    "depth": {
+        "buy": [{"price": 1424.4 - i * 0.05, "quantity": 100 + i, "orders": 3} for i in range(5)],
+        "sell": [{"price": 1424.6 + i * 0.05, "quantity": 200 + i, "orders": 4} for i in range(5)],
+    },
+}
+
+
+def test_parse_topic():
+    """Test topic parsing matches the proxy's routing rules"""
+    assert parse_topic("NSE_RELIANCE_LTP") == ("unknown", "NSE", "RELIANCE", "LTP")
+    assert parse_topic("angel_NSE_RELIANCE_QUOTE") == ("angel", "NSE", "RELIANCE", "QUOTE")
+    assert parse_topic("NSE_INDEX_NIFTY_LTP") == ("unknown", "NSE_INDEX", "NIFTY", "LTP")
+    assert parse_topic("BSE_INDEX_SENSEX_DEPTH") == ("unknown", "BSE_INDEX", "SENSEX", "DEPTH")
+    assert parse_topic("BADTOPIC") is None
+
+
+def test_binary_round_trip():
+    """Test LTP, Quote and Depth ticks survive the binary round trip unchanged"""
+    for topic, tick, mode in (
+        ("NSE_RELIANCE_LTP", LTP_TICK, 1),
+        ("angel_NSE_RELIANCE_QUOTE", QUOTE_TICK, 2),
+        ("angel_NSE_RELIANCE_DEPTH", DEPTH_TICK, 3),
+    ):
+        payload = encode_tick(topic, tick)
+        assert is_binary_tick(payload)
+        broker_name, exchange, symbol, decoded_mode, data = decode_tick(payload)
+        assert (exchange, symbol, decoded_mode) == ("NSE", "RELIANCE", mode)
+        assert data == tick
+        assert len(payload) < len(json.dumps(tick))
+
+
+def test_type_preservation():
+    """Test ints stay ints and floats stay floats"""
+    _, _, _, _, data = decode_tick(encode_tick("NSE_RELIANCE_DEPTH", DEPTH_TICK))
+    assert type(data["volume"]) is int
+    assert type(data["ltp"]) is float
+    assert type(data["depth"]["buy"][0]["quantity"]) is int
+    assert type(data["depth"]["buy"][0]["price"]) is float
+
+
+def test_extras_fallback():
+    """Test fields outside the fixed layout are carried as extras"""
+    tick = {
+        "ltp": 100.0,
+        "ltt": "2024-06-10 09:15:00",  # string timestamps do not fit the numeric layout
+        "token": "2885",
+        "symbol": "OTHER",  # differs from the topic symbol
+        "is_fallback": True,
+        "depth": {"buy": [{"price": 1.0, "quantity": 1}], "sell": []},  # missing orders
+    }
+    _, _, symbol, _, data = decode_tick(encode_tick("NSE_RELIANCE_DEPTH", tick))
+    assert symbol == "RELIANCE"
+    assert data == tick
+
+
+def test_json_fallback():
+    """Test JSON payloads for the json format and for unroutable topics"""
+    payload = encode_tick("NSE_RELIANCE_LTP", LTP_TICK, FORMAT_JSON)
+    assert not is_binary_tick(payload)
+    assert json.loads(payload) == LTP_TICK
+
+    payload = encode_tick("NSE_RELIANCE_FULL", LTP_TICK)
+    assert not is_binary_tick(payload)
+    assert json.loads(payload) == LTP_TICK
+
+
+if __name__ == "__main__":
+    test_parse_topic()
+    test_binary_round_trip()
+    test_type_preservation()
+    test_extras_fallback()
+    test_json_fallback()
+    print("✅ All tick codec tests passed")
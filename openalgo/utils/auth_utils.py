@@ -1,5 +1,6 @@
 import importlib
 import re
+import time
 from threading import Thread
 
 from flask import current_app as app
@@ -7,7 +8,9 @@ from flask import jsonify, redirect, request, session, url_for
 
 from database.auth_db import get_feed_token as db_get_feed_token
 from database.auth_db import upsert_auth
+from database.master_contract_loader import apply_load
 from database.master_contract_status_db import init_broker_status, update_status
+from extensions import socketio
 from utils.logging import get_logger
 from utils.session import get_session_expiry_time, set_session_login_time
 
@@ -107,10 +110,16 @@ def async_master_contract_download(broker):
 
     # Use the dynamically imported module's master_contract_download function
     try:
+        started = time.perf_counter()
         master_contract_status = master_contract_module.master_contract_download()
 
-        # Most brokers return the socketio.emit result, we need to check completion
-        # by looking at the module's actual completion
+        # The broker module stages the new contract; write only what changed.
+        # Raises (keeping the current symbols) if staging failed or staged nothing.
+        if apply_load(broker, started) is None:
+            # The download failed before staging; the broker module has emitted the error
+            message = "Master contract download failed before any instruments were staged"
+            update_status(broker, "error", message)
+            return {"status": "error", "message": message}
 
         # Try to get the symbol count from the database
         try:
@@ -120,10 +129,13 @@ def async_master_contract_download(broker):
         except:
             total_symbols = None
 
-        # Since socketio.emit doesn't return a meaningful value, we check if no exception was raised
+        # Brokers only stage the contract, so success is reported once it is applied
         update_status(
             broker, "success", "Master contract download completed successfully", total_symbols
         )
+        socketio.emit(
+            "master_contract_download", {"status": "success", "message": "Successfully Downloaded"}
+        )
         logger.info(f"Master contract download completed for {broker}")
 
         # Load symbols into memory cache after successful download
@@ -148,6 +160,7 @@ def async_master_contract_download(broker):
     except Exception as e:
         logger.exception(f"Error during master contract download for {broker}: {str(e)}")
         update_status(broker, "error", f"Master contract download error: {str(e)}")
+        socketio.emit("master_contract_download", {"status": "error", "message": str(e)})
         return {"status": "error", "message": str(e)}
 
     logger.info("Master Contract Database Processing Completed")
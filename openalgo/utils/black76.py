@@ -0,0 +1,159 @@
+"""
+Vectorized Black-76 pricing, implied volatility and Greeks
+
+Every function takes NumPy arrays (or scalars that broadcast) so a whole option chain
+is priced in one pass. Greeks use the same units as py_vollib's Black model, which the
+single-symbol path in services/option_greeks_service.py uses:
+- theta: per calendar day
+- vega: per 1 volatility point (0.01)
+- rho: per 1 percentage point of interest rate (0.01)
+"""
+
+import numpy as np
+from scipy.special import ndtr
+
+SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+# Total volatility (sigma * sqrt(t)) search range for the IV solver
+MIN_TOTAL_VOL = 1e-12
+MAX_TOTAL_VOL = 50.0
+
+
+def _pdf(x):
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def _d1_d2(F, K, t, sigma):
+    total_vol = sigma * np.sqrt(t)
+    d1 = (np.log(F / K) + 0.5 * total_vol * total_vol) / total_vol
+    return d1, d1 - total_vol
+
+
+def black76_price(F, K, t, r, sigma, is_call):
+    """Discounted Black-76 option price"""
+    F, K, t, r, sigma, is_call = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (F, K, t, r, sigma)), np.asarray(is_call, dtype=bool)
+    )
+    d1, d2 = _d1_d2(F, K, t, sigma)
+    call = F * ndtr(d1) - K * ndtr(d2)
+    put = K * ndtr(-d2) - F * ndtr(-d1)
+    return np.exp(-r * t) * np.where(is_call, call, put)
+
+
+def _otm_price(F, K, x, s, is_call):
+    """Undiscounted out-of-the-money price and its derivative with respect to total vol s"""
+    d1 = x / s + 0.5 * s
+    d2 = d1 - s
+    call = F * ndtr(d1) - K * ndtr(d2)
+    put = K * ndtr(-d2) - F * ndtr(-d1)
+    return np.where(is_call, call, put), F * _pdf(d1)
+
+
+def implied_volatility(price, F, K, t, r, is_call, tol=1e-12, max_iter=100):
+    """
+    Black-76 implied volatility (decimal) for arrays of option prices.
+
+    Prices are reduced to the out-of-the-money option by put-call parity, then solved for
+    total volatility with a bracketed Newton iteration started at the inflection point
+    sqrt(2|ln(F/K)|) (Jäckel's initial guess). Below the inflection price the iteration
+    runs on log(price), where the price curve is close to linear in total volatility.
+    Steps that leave the bracket fall back to bisection, so every element converges.
+
+    Returns NaN where no volatility reproduces the price (at or below intrinsic value,
+    at or above the forward/strike bound, or non-positive inputs).
+    """
+    price, F, K, t, r = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (price, F, K, t, r))
+    )
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), price.shape)
+
+    undiscounted = price * np.exp(r * t)
+    intrinsic = np.where(is_call, np.maximum(F - K, 0.0), np.maximum(K - F, 0.0))
+    upper = np.where(is_call, F, K)
+    valid = (F > 0) & (K > 0) & (t > 0) & (undiscounted > intrinsic) & (undiscounted < upper)
+
+    result = np.full(price.shape, np.nan)
+    if not valid.any():
+        return result
+
+    F = F[valid]
+    K = K[valid]
+    t = t[valid]
+    x = np.log(F / K)
+    otm_call = x <= 0
+    target = undiscounted[valid] - intrinsic[valid]
+
+    # Price at the inflection point, where vega (in total vol) peaks
+    inflection = np.maximum(np.sqrt(2.0 * np.abs(x)), MIN_TOTAL_VOL)
+    inflection_price, _ = _otm_price(F, K, x, inflection, otm_call)
+    low_branch = target < inflection_price
+
+    lo = np.where(low_branch, MIN_TOTAL_VOL, inflection)
+    hi = np.where(low_branch, inflection, MAX_TOTAL_VOL)
+    # At the money the inflection is at zero; start from the Brenner-Subrahmanyam estimate
+    s = np.where(x == 0, np.clip(SQRT_2PI * target / F, MIN_TOTAL_VOL, MAX_TOTAL_VOL), inflection)
+    log_target = np.log(target)
+
+    active = np.ones(s.shape, dtype=bool)
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+
+        si = s[idx]
+        value, vega = _otm_price(F[idx], K[idx], x[idx], si, otm_call[idx])
+        low = low_branch[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            residual = np.where(low, np.log(value) - log_target[idx], value - target[idx])
+            slope = np.where(low, vega / value, vega)
+            step = residual / slope
+
+        # Shrink the bracket using the sign of the residual (price increases with vol)
+        above = residual > 0
+        hi[idx] = np.where(above, si, hi[idx])
+        lo[idx] = np.where(above, lo[idx], si)
+
+        candidate = si - step
+        inside = np.isfinite(candidate) & (candidate >= lo[idx]) & (candidate <= hi[idx])
+        converged = inside & (np.abs(step) <= tol * np.maximum(si, 1.0))
+
+        s[idx] = np.where(inside, candidate, 0.5 * (lo[idx] + hi[idx]))
+        active[idx[converged]] = False
+
+    result[valid] = s / np.sqrt(t)
+    return result
+
+
+def greeks(F, K, t, r, sigma, is_call):
+    """
+    Black-76 Greeks for arrays of options.
+
+    Returns a dict of arrays: delta, gamma, theta (per day), vega (per 1% vol) and
+    rho (per 1% rate), matching py_vollib.black.greeks.analytical.
+    """
+    F, K, t, r, sigma = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (F, K, t, r, sigma))
+    )
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), F.shape)
+
+    d1, d2 = _d1_d2(F, K, t, sigma)
+    discount = np.exp(-r * t)
+    sqrt_t = np.sqrt(t)
+    pdf_d1 = _pdf(d1)
+
+    n_d1 = ndtr(np.where(is_call, d1, -d1))
+    n_d2 = ndtr(np.where(is_call, d2, -d2))
+    sign = np.where(is_call, 1.0, -1.0)
+    price = discount * sign * (F * n_d1 - K * n_d2)
+
+    decay = F * discount * pdf_d1 * sigma / (2.0 * sqrt_t)
+    carry = r * discount * (F * n_d1 - K * n_d2)
+
+    return {
+        "price": price,
+        "delta": sign * discount * n_d1,
+        "gamma": discount * pdf_d1 / (F * sigma * sqrt_t),
+        "theta": (-decay + sign * carry) / 365.0,
+        "vega": F * discount * pdf_d1 * sqrt_t * 0.01,
+        "rho": -t * price * 0.01,
+    }
@@ -1,9 +1,24 @@
 """
 Shared httpx client module with connection pooling support for all broker APIs
 with automatic protocol negotiation (HTTP/2 when available, HTTP/1.1 fallback)
+
+Besides the shared synchronous client, bulk operations (fan-out of many broker calls)
+can use the async path: one httpx.AsyncClient per broker host, each with its own pool
+limits, running on a background event loop. fan_out() runs a list of requests there
+with bounded concurrency and returns the responses in order.
+
+Both paths record per-host pool metrics (new vs reused connections, time spent
+waiting for a pool connection); see get_http_pool_metrics(). The metrics come from
+event hooks and the httpcore "trace" request extension, so the clients keep httpx's
+default transports, including proxies from HTTP_PROXY / HTTPS_PROXY / NO_PROXY.
 """
 
-from typing import Optional
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlsplit
 
 import httpx
 
@@ -15,6 +30,132 @@ logger = get_logger(__name__)
 # Global httpx client for connection pooling
 _httpx_client = None
 
+# Async client pool limits (per broker host) and fan-out concurrency
+ASYNC_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTPX_ASYNC_MAX_CONNECTIONS_PER_HOST", "20"))
+ASYNC_MAX_KEEPALIVE_PER_HOST = int(os.getenv("HTTPX_ASYNC_MAX_KEEPALIVE_PER_HOST", "10"))
+ASYNC_KEEPALIVE_EXPIRY = float(os.getenv("HTTPX_ASYNC_KEEPALIVE_EXPIRY", "60"))
+FANOUT_CONCURRENCY = int(os.getenv("HTTPX_FANOUT_CONCURRENCY", "10"))
+
+# Trace events that mark the end of the wait for a pool connection
+_NEW_CONNECTION_EVENT = "connection.connect_tcp.started"
+_REUSED_CONNECTION_EVENTS = (
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+
+class PoolMetrics:
+    """Per-host connection reuse and pool wait counters for the shared clients"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: dict[str, dict[str, float]] = {}
+
+    def record(self, host: str, reused: bool | None, wait_ms: float | None, error: bool = False):
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                stats = self._hosts[host] = {
+                    "requests": 0,
+                    "errors": 0,
+                    "new_connections": 0,
+                    "reused_connections": 0,
+                    "pool_wait_ms_total": 0.0,
+                    "pool_wait_ms_max": 0.0,
+                }
+            stats["requests"] += 1
+            if error:
+                stats["errors"] += 1
+            if reused is not None:
+                stats["reused_connections" if reused else "new_connections"] += 1
+            if wait_ms is not None:
+                stats["pool_wait_ms_total"] += wait_ms
+                stats["pool_wait_ms_max"] = max(stats["pool_wait_ms_max"], wait_ms)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            hosts = {host: dict(stats) for host, stats in self._hosts.items()}
+        for stats in hosts.values():
+            connections = stats["new_connections"] + stats["reused_connections"]
+            stats["reuse_ratio"] = stats["reused_connections"] / connections if connections else 0.0
+            stats["pool_wait_ms_avg"] = (
+                stats["pool_wait_ms_total"] / connections if connections else 0.0
+            )
+        return hosts
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+_pool_metrics = PoolMetrics()
+
+
+def get_http_pool_metrics() -> dict[str, dict[str, float]]:
+    """
+    Connection pool metrics per broker host for the sync and async clients:
+    requests, errors, new/reused connections, reuse_ratio and pool wait (ms).
+    """
+    return _pool_metrics.snapshot()
+
+
+def _connection_trace(request: httpx.Request):
+    """
+    Trace callback (and its state) timing the wait for a pool connection.
+    A failed connection or exchange ("*.failed" event) is recorded as an error here;
+    successful requests are recorded by the response hook.
+    """
+    state = {"start": time.perf_counter(), "reused": None, "wait_ms": None, "recorded": False}
+    previous = request.extensions.get("trace")
+    host = request.url.host
+
+    def on_event(name: str, info: dict):
+        if state["reused"] is None:
+            if name == _NEW_CONNECTION_EVENT:
+                state["reused"] = False
+            elif name in _REUSED_CONNECTION_EVENTS:
+                state["reused"] = True
+            if state["reused"] is not None:
+                state["wait_ms"] = (time.perf_counter() - state["start"]) * 1000
+        if name.endswith(".failed") and not state["recorded"]:
+            state["recorded"] = True
+            _pool_metrics.record(host, state["reused"], state["wait_ms"], error=True)
+        return previous(name, info) if previous else None
+
+    return on_event, state
+
+
+def _trace_pool_metrics(request: httpx.Request):
+    """Request hook: attach the pool metrics trace"""
+    trace, state = _connection_trace(request)
+    request.extensions["trace"] = trace
+    request.extensions["pool_metrics"] = state
+
+
+async def _trace_pool_metrics_async(request: httpx.Request):
+    """Async request hook: attach the pool metrics trace (httpcore awaits async traces)"""
+    trace, state = _connection_trace(request)
+
+    async def async_trace(name: str, info: dict):
+        result = trace(name, info)
+        if asyncio.iscoroutine(result):
+            await result
+
+    request.extensions["trace"] = async_trace
+    request.extensions["pool_metrics"] = state
+
+
+def _record_pool_metrics(response: httpx.Response):
+    """Response hook: record a completed request"""
+    state = response.request.extensions.get("pool_metrics")
+    if state is not None and not state["recorded"]:
+        state["recorded"] = True
+        _pool_metrics.record(response.request.url.host, state["reused"], state["wait_ms"])
+
+
+async def _record_pool_metrics_async(response: httpx.Response):
+    _record_pool_metrics(response)
+
 
 def get_httpx_client() -> httpx.Client:
     """
@@ -67,9 +208,9 @@ def request(method: str, url: str, **kwargs) -> httpx.Response:
         g.broker_api_time = broker_api_time_ms
         logger.debug(f"Broker API call took {broker_api_time_ms:.2f}ms")
 
-    # Log the actual HTTP version used (info level for visibility)
+    # Log the actual HTTP version used
     if response.http_version:
-        logger.info(f"Request used {response.http_version} - URL: {url[:50]}...")
+        logger.debug(f"Request used {response.http_version} - URL: {url[:50]}...")
 
     return response
 
@@ -152,8 +293,11 @@ def _create_http_client() -> httpx.Client:
             ),
             # Add verify parameter to handle SSL/TLS issues in standalone mode
             verify=True,  # Can be set to False for debugging SSL issues (not recommended for production)
-            # Add event hooks for latency tracking
-            event_hooks={"request": [log_request], "response": [log_response]},
+            # Add event hooks for latency tracking and pool metrics
+            event_hooks={
+                "request": [log_request, _trace_pool_metrics],
+                "response": [log_response, _record_pool_metrics],
+            },
         )
 
         if is_standalone:
@@ -168,14 +312,148 @@ def _create_http_client() -> httpx.Client:
         raise
 
 
+# Async clients (one per broker host) and the event loop they run on
+_async_loop: asyncio.AbstractEventLoop | None = None
+_async_loop_thread: threading.Thread | None = None
+_async_loop_lock = threading.Lock()
+_async_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _get_async_loop() -> asyncio.AbstractEventLoop:
+    """Background event loop shared by the async clients (started on first use)"""
+    global _async_loop, _async_loop_thread
+
+    with _async_loop_lock:
+        if _async_loop is None or _async_loop.is_closed():
+            _async_loop = asyncio.new_event_loop()
+            _async_loop_thread = threading.Thread(
+                target=_async_loop.run_forever, name="httpx-async-loop", daemon=True
+            )
+            _async_loop_thread.start()
+        return _async_loop
+
+
+def run_async(coro, timeout: float | None = None):
+    """
+    Run a coroutine on the async client loop from synchronous code and return its result.
+    Must not be called from the loop itself (await the coroutine there instead).
+    """
+    loop = _get_async_loop()
+    if threading.current_thread() is _async_loop_thread:
+        coro.close()
+        raise RuntimeError("run_async() called from the async client loop; await instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+def get_async_client(url_or_host: str) -> httpx.AsyncClient:
+    """
+    Returns the AsyncClient for a broker host, creating it on first use.
+    Each host has its own pool (HTTPX_ASYNC_MAX_CONNECTIONS_PER_HOST connections,
+    HTTPX_ASYNC_MAX_KEEPALIVE_PER_HOST kept alive for HTTPX_ASYNC_KEEPALIVE_EXPIRY s),
+    so a burst to one broker cannot starve another.
+
+    Must be used on the async client loop (inside coroutines run with run_async/fan_out).
+    """
+    host = urlsplit(url_or_host).hostname or url_or_host
+    client = _async_clients.get(host)
+    if client is None or client.is_closed:
+        app_mode = os.environ.get("APP_MODE", "integrated").strip().strip("'\"")
+        client = _async_clients[host] = httpx.AsyncClient(
+            http2=app_mode != "standalone",
+            http1=True,
+            timeout=120.0,
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=ASYNC_MAX_KEEPALIVE_PER_HOST,
+                keepalive_expiry=ASYNC_KEEPALIVE_EXPIRY,
+            ),
+            verify=True,
+            event_hooks={
+                "request": [_trace_pool_metrics_async],
+                "response": [_record_pool_metrics_async],
+            },
+        )
+        logger.debug(f"Created async HTTP client for {host}")
+    return client
+
+
+async def async_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Make an HTTP request with the async client of the URL's host"""
+    return await get_async_client(url).request(method, url, **kwargs)
+
+
+async def gather_bounded(coroutines, concurrency: int = FANOUT_CONCURRENCY) -> list:
+    """
+    Await coroutines with at most `concurrency` running at once.
+    Results are in input order; exceptions are returned in place of results.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(bounded(c) for c in coroutines), return_exceptions=True)
+
+
+def fan_out(
+    requests: list[dict[str, Any]],
+    concurrency: int = FANOUT_CONCURRENCY,
+    timeout: float | None = None,
+) -> list[httpx.Response | Exception]:
+    """
+    Send many requests concurrently through the per-host async clients.
+
+    Args:
+        requests: Dicts with "method" and "url" plus any httpx request arguments
+            (headers, params, json, data, content, timeout)
+        concurrency: Maximum requests in flight at once
+        timeout: Overall timeout in seconds for the whole batch (None to wait)
+
+    Returns:
+        One item per request, in order: the httpx.Response, or the exception raised
+    """
+    if not requests:
+        return []
+
+    def send(spec: dict[str, Any]):
+        spec = dict(spec)
+        return async_request(spec.pop("method"), spec.pop("url"), **spec)
+
+    start = time.time()
+    results = run_async(gather_bounded([send(spec) for spec in requests], concurrency), timeout)
+    logger.debug(
+        f"Fan-out of {len(requests)} requests (concurrency {concurrency}) took "
+        f"{(time.time() - start) * 1000:.1f}ms"
+    )
+    return results
+
+
+async def _close_async_clients():
+    clients = list(_async_clients.values())
+    _async_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
 def cleanup_httpx_client():
     """
-    Closes the global httpx client and releases its resources.
+    Closes the global httpx client (and the async clients) and releases their resources.
     Should be called when the application is shutting down.
     """
-    global _httpx_client
+    global _httpx_client, _async_loop
 
     if _httpx_client is not None:
         _httpx_client.close()
         _httpx_client = None
         logger.info("Closed HTTP client")
+
+    with _async_loop_lock:
+        loop, _async_loop = _async_loop, None
+    if loop is not None and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(_close_async_clients(), loop).result(10)
+        loop.call_soon_threadsafe(loop.stop)
+        if _async_loop_thread is not None:
+            _async_loop_thread.join(5)
+        loop.close()
+        logger.info("Closed async HTTP clients")
@@ -0,0 +1,319 @@
+"""
+Streaming latency histograms
+
+Order latencies are recorded into log-bucketed histograms (HDR-style: fixed buckets
+whose width grows with the value, so every value is kept within ~1% relative error)
+per broker, API type and stage. Percentiles are read from the bucket counts, so the
+cost of p50/p90/p99 depends on the number of buckets, not on the number of orders.
+
+Each key keeps an all-time histogram plus rolling windows (1m, 1h, 1d). A window is
+a ring of sparse time slots and a dense running total: recording adds to both, and
+slots that fall out of the window are subtracted from the total. Orders purged from
+the latency database are subtracted from the all-time histogram (see forget), so it
+describes the same rows as the SQL aggregates.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any
+
+import numpy as np
+
+# Bucket layout: bucket i covers [MIN_VALUE_MS * GAMMA**(i-1), MIN_VALUE_MS * GAMMA**i)
+# Bucket 0 holds everything below MIN_VALUE_MS, the last bucket everything above the max
+MIN_VALUE_MS = 0.01
+MAX_VALUE_MS = 1_000_000.0
+GAMMA = 1.02
+_LOG_GAMMA = math.log(GAMMA)
+NUM_BUCKETS = int(math.ceil(math.log(MAX_VALUE_MS / MIN_VALUE_MS) / _LOG_GAMMA)) + 2
+
+# Representative value of each bucket (geometric midpoint of its bounds)
+_BUCKET_VALUES = np.concatenate(([0.0], MIN_VALUE_MS * GAMMA ** (np.arange(1, NUM_BUCKETS) - 0.5)))
+
+# Window name -> (span in seconds, number of slots)
+WINDOWS = {"1m": (60, 12), "1h": (3600, 60), "1d": (86400, 96)}
+
+STAGES = ("rtt", "validation", "broker_response", "overhead", "total")
+DEFAULT_QUANTILES = (50, 90, 95, 99)
+
+
+def bucket_index(value_ms: float) -> int:
+    """Histogram bucket of a latency in milliseconds"""
+    if not value_ms >= MIN_VALUE_MS:
+        return 0
+    return min(int(math.log(value_ms / MIN_VALUE_MS) / _LOG_GAMMA) + 1, NUM_BUCKETS - 1)
+
+
+class LatencyHistogram:
+    """Dense bucket counts plus the exact count and sum of recorded values"""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = np.zeros(NUM_BUCKETS, dtype=np.int64)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value_ms: float, bucket: int | None = None) -> None:
+        self.counts[bucket_index(value_ms) if bucket is None else bucket] += 1
+        self.count += 1
+        self.sum += value_ms
+
+    def remove(self, value_ms: float) -> None:
+        """Take back a recorded value (no-op if its bucket is already empty)"""
+        bucket = bucket_index(value_ms)
+        if self.counts[bucket] > 0:
+            self.counts[bucket] -= 1
+            self.count -= 1
+            self.sum = self.sum - value_ms if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts += other.counts
+        self.count += other.count
+        self.sum += other.sum
+
+    def percentiles(self, quantiles=DEFAULT_QUANTILES) -> dict[str, float]:
+        """Nearest-rank percentiles, e.g. {"p50": ..., "p99": ...} (0 when empty)"""
+        if not self.count:
+            return {f"p{q:g}": 0.0 for q in quantiles}
+        cumulative = np.cumsum(self.counts)
+        ranks = np.maximum(np.ceil(np.asarray(quantiles, dtype=float) / 100 * self.count), 1)
+        buckets = np.searchsorted(cumulative, ranks)
+        return {
+            f"p{q:g}": float(value)
+            for q, value in zip(quantiles, _BUCKET_VALUES[buckets], strict=True)
+        }
+
+    def values(self) -> tuple[np.ndarray, np.ndarray]:
+        """(representative value, count) of every non-empty bucket, ascending"""
+        nonzero = np.flatnonzero(self.counts)
+        return _BUCKET_VALUES[nonzero], self.counts[nonzero]
+
+    def summary(self, quantiles=DEFAULT_QUANTILES) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            **self.percentiles(quantiles),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        nonzero = np.flatnonzero(self.counts)
+        return {
+            "counts": dict(zip(nonzero.tolist(), self.counts[nonzero].tolist(), strict=True)),
+            "sum": self.sum,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        for bucket, n in data.get("counts", {}).items():
+            histogram.counts[int(bucket)] += n
+            histogram.count += n
+        histogram.sum = float(data.get("sum", 0.0))
+        return histogram
+
+
+class RollingWindow:
+    """Histogram of the values recorded during the last `span` seconds (slot granularity)"""
+
+    def __init__(self, span: int, slots: int):
+        self.span = span
+        self.slot_width = span / slots
+        self.histogram = LatencyHistogram()
+        # (slot_start, {bucket: count}, sum), oldest first
+        self.slots: deque[tuple[float, dict[int, int], float]] = deque()
+
+    def advance(self, now: float) -> None:
+        """Drop slots that have fallen out of the window"""
+        cutoff = now - self.span
+        slots = self.slots
+        histogram = self.histogram
+        while slots and slots[0][0] + self.slot_width <= cutoff:
+            _, counts, total = slots.popleft()
+            for bucket, n in counts.items():
+                histogram.counts[bucket] -= n
+                histogram.count -= n
+            histogram.sum -= total
+        if not slots:
+            histogram.sum = 0.0
+
+    def add(self, value_ms: float, bucket: int, now: float) -> None:
+        self.advance(now)
+        slot_start = now - now % self.slot_width
+        # A value stamped slightly earlier than the newest slot is counted in that slot
+        if not self.slots or self.slots[-1][0] < slot_start:
+            self.slots.append((slot_start, {}, 0.0))
+        start, counts, total = self.slots[-1]
+        counts[bucket] = counts.get(bucket, 0) + 1
+        self.slots[-1] = (start, counts, total + value_ms)
+        self.histogram.add(value_ms, bucket)
+
+    def to_list(self) -> list[list[Any]]:
+        return [[start, dict(counts), total] for start, counts, total in self.slots]
+
+    def load(self, slots: list[list[Any]], now: float) -> None:
+        for start, counts, total in slots:
+            counts = {int(bucket): n for bucket, n in counts.items()}
+            self.slots.append((start, counts, total))
+            for bucket, n in counts.items():
+                self.histogram.counts[bucket] += n
+                self.histogram.count += n
+            self.histogram.sum += total
+        self.advance(now)
+
+
+class RollingLatencyHistogram:
+    """All-time histogram plus the rolling WINDOWS for one (broker, API type, stage)"""
+
+    def __init__(self):
+        self.all = LatencyHistogram()
+        self.windows = {name: RollingWindow(span, slots) for name, (span, slots) in WINDOWS.items()}
+
+    def add(self, value_ms: float, now: float, record_time: float | None = None) -> None:
+        """Record a value; record_time (default now) places backfilled values in the windows"""
+        bucket = bucket_index(value_ms)
+        self.all.add(value_ms, bucket)
+        record_time = now if record_time is None else record_time
+        for window in self.windows.values():
+            if record_time > now - window.span:
+                window.add(value_ms, bucket, record_time)
+
+    def get(self, window: str, now: float) -> LatencyHistogram:
+        if window == "all":
+            return self.all
+        rolling = self.windows[window]
+        rolling.advance(now)
+        return rolling.histogram
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "all": self.all.to_dict(),
+            "windows": {name: window.to_list() for name, window in self.windows.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], now: float) -> "RollingLatencyHistogram":
+        histogram = cls()
+        histogram.all = LatencyHistogram.from_dict(data.get("all", {}))
+        for name, slots in data.get("windows", {}).items():
+            if name in histogram.windows:
+                histogram.windows[name].load(slots, now)
+        return histogram
+
+
+class LatencyHistogramRegistry:
+    """Rolling latency histograms keyed by (broker, API type, stage)"""
+
+    def __init__(self):
+        self._histograms: dict[tuple[str, str, str], RollingLatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        broker: str | None,
+        api_type: str,
+        latencies: dict[str, float],
+        now: float | None = None,
+        record_time: float | None = None,
+    ) -> None:
+        """Record one order's stage latencies (milliseconds), e.g. {"rtt": ..., "total": ...}"""
+        broker = broker or "unknown"
+        with self._lock:
+            now = time.time() if now is None else now
+            for stage, value in latencies.items():
+                if value is None:
+                    continue
+                key = (broker, api_type, stage)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = RollingLatencyHistogram()
+                histogram.add(float(value), now, record_time)
+
+    def forget(self, broker: str | None, api_type: str, latencies: dict[str, float]) -> None:
+        """
+        Remove one purged order from the all-time histograms
+
+        Purged orders are older than every rolling window, so only "all" still holds them.
+        """
+        broker = broker or "unknown"
+        with self._lock:
+            for stage, value in latencies.items():
+                histogram = self._histograms.get((broker, api_type, stage))
+                if histogram is not None and value is not None:
+                    histogram.all.remove(float(value))
+
+    def merged(
+        self,
+        window: str = "1h",
+        broker: str | None = None,
+        api_type: str | None = None,
+        stage: str = "total",
+        now: float | None = None,
+    ) -> LatencyHistogram:
+        """One histogram over a window ("1m", "1h", "1d" or "all") for the matching keys
+
+        broker / api_type of None aggregate over every broker / API type.
+        """
+        if window != "all" and window not in WINDOWS:
+            raise ValueError(f"Unknown window {window!r}, expected one of {[*WINDOWS, 'all']}")
+        merged = LatencyHistogram()
+        with self._lock:
+            now = time.time() if now is None else now
+            for (key_broker, key_api_type, key_stage), histogram in self._histograms.items():
+                if key_stage != stage:
+                    continue
+                if broker is not None and key_broker != broker:
+                    continue
+                if api_type is not None and key_api_type != api_type:
+                    continue
+                merged.merge(histogram.get(window, now))
+        return merged
+
+    def summary(
+        self,
+        window: str = "1h",
+        broker: str | None = None,
+        api_type: str | None = None,
+        stage: str = "total",
+        quantiles=DEFAULT_QUANTILES,
+        now: float | None = None,
+    ) -> dict[str, float]:
+        """Count, mean and percentiles over a window (see merged)"""
+        return self.merged(window, broker, api_type, stage, now).summary(quantiles)
+
+    def keys(self) -> list[tuple[str, str, str]]:
+        with self._lock:
+            return list(self._histograms)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Serializable state of every histogram (see restore)"""
+        with self._lock:
+            return [
+                {"broker": broker, "api_type": api_type, "stage": stage, "data": h.to_dict()}
+                for (broker, api_type, stage), h in self._histograms.items()
+            ]
+
+    def restore(self, rows: list[dict[str, Any]], now: float | None = None) -> None:
+        """Replace the histograms with a snapshot, dropping window slots that have expired"""
+        now = time.time() if now is None else now
+        histograms = {
+            (row["broker"], row["api_type"], row["stage"]): RollingLatencyHistogram.from_dict(
+                row["data"], now
+            )
+            for row in rows
+        }
+        with self._lock:
+            self._histograms = histograms
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+_registry = LatencyHistogramRegistry()
+
+
+def get_latency_histograms() -> LatencyHistogramRegistry:
+    return _registry
@@ -1,3 +1,7 @@
+import atexit
+import calendar
+import os
+import threading
 import time
 from functools import wraps
 
@@ -5,11 +9,23 @@ from flask import g, request
 from flask_restx import Resource
 
 from database.auth_db import get_broker_name
-from database.latency_db import OrderLatency, init_latency_db, latency_session, purge_old_data_logs
+from database.latency_db import (
+    OrderLatency,
+    init_latency_db,
+    iter_latency_history,
+    latency_session,
+    load_latency_histograms,
+    purge_old_data_logs,
+    save_latency_histograms,
+)
+from utils.latency_histogram import get_latency_histograms
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# How often the streaming latency histograms are persisted (seconds)
+LATENCY_HISTOGRAM_SNAPSHOT_SECONDS = int(os.getenv("LATENCY_HISTOGRAM_SNAPSHOT_SECONDS", "60"))
+
 
 class LatencyTracker:
     """Helper class to track latencies across different stages of order execution"""
@@ -54,6 +70,13 @@ class LatencyTracker:
         """Get total overhead from our processing"""
         return self.stage_times.get("validation", 0) + self.stage_times.get("broker_response", 0)
 
+    def record(self, broker, api_type, latencies):
+        """Add this order's stage latencies to the streaming histograms"""
+        try:
+            get_latency_histograms().record(broker, api_type, latencies)
+        except Exception as e:
+            logger.exception(f"Error recording latency histograms: {e}")
+
 
 def track_latency(api_type):
     """Decorator to track latency for API endpoints"""
@@ -145,19 +168,22 @@ def track_latency(api_type):
                 if "apikey" in request_data:
                     broker_name = get_broker_name(request_data["apikey"])
 
+                latencies = {
+                    "rtt": rtt,  # Round-trip time (comparable to Postman/Bruno)
+                    "validation": tracker.stage_times.get("validation", 0),
+                    "broker_response": tracker.stage_times.get("broker_response", 0),
+                    "overhead": overhead,
+                    "total": total,
+                }
+                tracker.record(broker_name, api_type, latencies)
+
                 OrderLatency.log_latency(
                     order_id=order_id,
                     user_id=g.get("user_id"),
                     broker=broker_name,
                     symbol=request_data.get("symbol"),
                     order_type=api_type,
-                    latencies={
-                        "rtt": rtt,  # Round-trip time (comparable to Postman/Bruno)
-                        "validation": tracker.stage_times.get("validation", 0),
-                        "broker_response": tracker.stage_times.get("broker_response", 0),
-                        "overhead": overhead,
-                        "total": total,
-                    },
+                    latencies=latencies,
                     request_body=None,  # Not storing to save database space
                     response_body=None,  # Not storing to save database space
                     status="SUCCESS" if status_code < 400 else "FAILED",
@@ -186,19 +212,22 @@ def track_latency(api_type):
                 if "request_data" in locals() and "apikey" in request_data:
                     broker_name = get_broker_name(request_data["apikey"])
 
+                latencies = {
+                    "rtt": rtt,
+                    "validation": tracker.stage_times.get("validation", 0),
+                    "broker_response": 0,
+                    "overhead": overhead,
+                    "total": total_time,
+                }
+                tracker.record(broker_name, api_type, latencies)
+
                 OrderLatency.log_latency(
                     order_id="error",
                     user_id=g.get("user_id"),
                     broker=broker_name,
                     symbol=request_data.get("symbol") if "request_data" in locals() else None,
                     order_type=api_type,
-                    latencies={
-                        "rtt": rtt,
-                        "validation": tracker.stage_times.get("validation", 0),
-                        "broker_response": 0,
-                        "overhead": overhead,
-                        "total": total_time,
-                    },
+                    latencies=latencies,
                     request_body=None,  # Not storing to save database space
                     response_body=None,  # Not storing to save database space
                     status="FAILED",
@@ -224,12 +253,62 @@ def wrap_resource_methods(resource_class, api_type):
             setattr(resource_class, method, track_latency(api_type)(original_method))
 
 
+def restore_latency_histograms():
+    """
+    Load the persisted latency histograms. On first start (nothing persisted yet) they
+    are built once from the logged orders instead.
+    """
+    histograms = get_latency_histograms()
+    rows = load_latency_histograms()
+    if rows:
+        histograms.restore(rows)
+        logger.debug(f"Restored {len(rows)} latency histograms")
+        return
+
+    now = time.time()
+    count = 0
+    for broker, api_type, timestamp, latencies in iter_latency_history():
+        # Timestamps are stored as naive UTC
+        record_time = calendar.timegm(timestamp.timetuple()) if timestamp else 0
+        histograms.record(broker, api_type, latencies, now=now, record_time=record_time)
+        count += 1
+    if count:
+        logger.info(f"Built latency histograms from {count} logged orders")
+        save_latency_histograms(histograms.snapshot())
+
+
+def _persist_latency_histograms_loop(interval):
+    while True:
+        time.sleep(interval)
+        save_latency_histograms(get_latency_histograms().snapshot())
+
+
+def start_latency_histogram_persistence(interval=LATENCY_HISTOGRAM_SNAPSHOT_SECONDS):
+    """Persist the latency histograms every `interval` seconds and at shutdown"""
+    thread = threading.Thread(
+        target=_persist_latency_histograms_loop,
+        args=(interval,),
+        name="latency-histogram-snapshot",
+        daemon=True,
+    )
+    thread.start()
+    atexit.register(lambda: save_latency_histograms(get_latency_histograms().snapshot()))
+
+
 def init_latency_monitoring(app):
     """Initialize latency monitoring"""
     # Initialize the latency database
     init_latency_db()
 
+    # Streaming latency histograms (percentiles for the dashboard without table scans)
+    try:
+        restore_latency_histograms()
+    except Exception as e:
+        logger.exception(f"Error restoring latency histograms: {e}")
+    start_latency_histogram_persistence()
+
     # Auto-purge old data endpoint logs (keep order logs forever, purge data logs after 7 days)
+    # After the restore, so the purged rows are also taken out of the histograms
     purge_old_data_logs(days=7)
 
     # Import all RESTX API resources
@@ -0,0 +1,87 @@
+"""
+Thread-safe token bucket rate limiter
+
+Tokens refill continuously at `rate` per second up to `capacity`, so short bursts go
+through immediately and only sustained traffic above the rate is delayed. Callers wait
+just long enough for the next token instead of sleeping a fixed interval per batch.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` calls per second with bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float):
+        """Add tokens earned since the last refill (caller holds _lock)"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if available without waiting"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.acquired += 1
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens, waiting until they are available.
+
+        Returns:
+            float: Seconds spent waiting (0.0 when a token was available)
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.capacity}")
+
+        start = None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.acquired += 1
+                    if start is None:
+                        return 0.0
+                    waited = now - start
+                    self.throttled += 1
+                    self.total_wait += waited
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+
+            if start is None:
+                start = now
+            time.sleep(delay)
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "available": round(self._tokens, 3),
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "total_wait_seconds": round(self.total_wait, 3),
+            }
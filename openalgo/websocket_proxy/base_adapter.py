@@ -1,4 +1,3 @@
-import json
 import os
 import random
 import socket
@@ -9,6 +8,8 @@ import zmq
 
 from utils.logging import get_logger
 
+from .tick_codec import encode_tick, get_tick_format
+
 # Initialize logger
 logger = get_logger(__name__)
 
@@ -31,6 +32,10 @@ MAX_WEBSOCKET_CONNECTIONS = int(os.getenv("MAX_WEBSOCKET_CONNECTIONS", "3"))
 # When disabled, falls back to single connection per broker
 ENABLE_CONNECTION_POOLING = os.getenv("ENABLE_CONNECTION_POOLING", "true").lower() == "true"
 
+# Tick payload format on the ZeroMQ hop to the proxy ("binary" or "json")
+# The proxy auto-detects the format per message, so json is only needed as a fallback
+ZMQ_TICK_FORMAT = get_tick_format()
+
 
 def is_port_available(port):
     """
@@ -327,7 +332,7 @@ class BaseBrokerWebSocketAdapter(ABC):
             elif self.socket:
                 # Use own socket
                 self.socket.send_multipart(
-                    [topic.encode("utf-8"), json.dumps(data).encode("utf-8")]
+                    [topic.encode("utf-8"), encode_tick(topic, data, ZMQ_TICK_FORMAT)]
                 )
             else:
                 self.logger.warning("No ZMQ socket available for publishing")
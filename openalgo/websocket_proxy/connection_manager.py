@@ -8,9 +8,9 @@ This module manages connection pooling transparently without modifying broker ad
 Configuration:
     MAX_SYMBOLS_PER_WEBSOCKET: Maximum symbols per single WebSocket connection (default: 1000)
     MAX_WEBSOCKET_CONNECTIONS: Maximum WebSocket connections per user/broker (default: 3)
+    ZMQ_TICK_FORMAT: Tick payload format on the ZeroMQ hop, binary or json (default: binary)
 """
 
-import json
 import os
 import threading
 from collections import defaultdict
@@ -21,6 +21,8 @@ import zmq
 
 from utils.logging import get_logger
 
+from .tick_codec import encode_tick, get_tick_format
+
 logger = get_logger(__name__)
 
 # Thread-local storage for pooled adapter creation context
@@ -86,6 +88,7 @@ class SharedZmqPublisher:
         self.zmq_port = None
         self._bound = False
         self._publish_lock = threading.Lock()
+        self.tick_format = get_tick_format()
 
     def bind(self, port: int | None = None) -> int:
         """
@@ -144,13 +147,13 @@ class SharedZmqPublisher:
             self.logger.error("Cannot publish: ZMQ socket not bound")
             return
 
-        with self._publish_lock:
-            try:
-                self.socket.send_multipart(
-                    [topic.encode("utf-8"), json.dumps(data).encode("utf-8")]
-                )
-            except Exception as e:
-                self.logger.exception(f"Error publishing to ZMQ: {e}")
+        try:
+            # Encode outside the lock so concurrent adapters only serialize on the send
+            payload = encode_tick(topic, data, self.tick_format)
+            with self._publish_lock:
+                self.socket.send_multipart([topic.encode("utf-8"), payload])
+        except Exception as e:
+            self.logger.exception(f"Error publishing to ZMQ: {e}")
 
     def cleanup(self):
         """Clean up ZeroMQ resources"""
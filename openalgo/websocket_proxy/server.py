@@ -21,6 +21,7 @@ from utils.logging import get_logger, highlight_url
 from .base_adapter import BaseBrokerWebSocketAdapter
 from .broker_factory import create_broker_adapter
 from .port_check import find_available_port, is_port_in_use
+from .tick_codec import decode_tick, is_binary_tick, parse_topic
 
 # Initialize logger
 logger = get_logger("websocket_proxy")
@@ -1294,6 +1295,7 @@ class WebSocketProxy:
         1. Increased timeout from 0.1s to 0.3s (reduces busy-waiting by 66%)
         2. Use subscription_index for O(1) lookup instead of O(n²) iteration
         3. Batch message sending with asyncio.gather
+        4. Binary tick frames (see tick_codec) skip JSON parsing and topic splitting
 
         Also handles cache invalidation messages from Flask process for cross-process
         cache synchronization (see GitHub issue #765).
@@ -1318,65 +1320,40 @@ class WebSocketProxy:
 
                 # Parse the message
                 topic_str = topic.decode("utf-8")
-                data_str = data.decode("utf-8")
 
-                # Handle cache invalidation messages (from Flask process)
-                # These messages clear stale auth tokens after re-login
-                # See GitHub issue #765 for details
-                if topic_str.startswith("CACHE_INVALIDATE"):
-                    try:
-                        self._handle_cache_invalidation(topic_str, data_str)
-                    except Exception as e:
-                        logger.exception(f"Error handling cache invalidation: {e}")
-                    continue  # Skip market data processing for cache messages
-
-                market_data = json.loads(data_str)
-
-                # Extract topic components
-                # Support both formats:
-                # New format: BROKER_EXCHANGE_SYMBOL_MODE (with broker name)
-                # Old format: EXCHANGE_SYMBOL_MODE (without broker name)
-                # Special case: NSE_INDEX_SYMBOL_MODE (exchange contains underscore)
-                parts = topic_str.split("_")
-
-                # Special case handling for NSE_INDEX and BSE_INDEX
-                if len(parts) >= 4 and parts[0] == "NSE" and parts[1] == "INDEX":
-                    broker_name = "unknown"
-                    exchange = "NSE_INDEX"
-                    symbol = parts[2]
-                    mode_str = parts[3]
-                elif len(parts) >= 4 and parts[0] == "BSE" and parts[1] == "INDEX":
-                    broker_name = "unknown"
-                    exchange = "BSE_INDEX"
-                    symbol = parts[2]
-                    mode_str = parts[3]
-                elif len(parts) >= 5 and parts[1] == "INDEX":  # BROKER_NSE_INDEX_SYMBOL_MODE format
-                    broker_name = parts[0]
-                    exchange = f"{parts[1]}_{parts[2]}"
-                    symbol = parts[3]
-                    mode_str = parts[4]
-                elif len(parts) >= 4:
-                    # Standard format with broker name
-                    broker_name = parts[0]
-                    exchange = parts[1]
-                    symbol = parts[2]
-                    mode_str = parts[3]
-                elif len(parts) >= 3:
-                    # Old format without broker name
-                    broker_name = "unknown"
-                    exchange = parts[0]
-                    symbol = parts[1]
-                    mode_str = parts[2]
+                # Binary tick frames carry a pre-parsed topic header, so no JSON decode
+                # or topic splitting is needed. JSON payloads are the negotiated fallback
+                # (ZMQ_TICK_FORMAT=json publishers and Flask cache invalidation messages).
+                if is_binary_tick(data):
+                    broker_name, exchange, symbol, mode, market_data = decode_tick(data)
                 else:
-                    logger.warning(f"Invalid topic format: {topic_str}")
-                    continue
+                    data_str = data.decode("utf-8")
 
-                # OPTIMIZATION: Use pre-computed mode map
-                mode = self.MODE_MAP.get(mode_str)
+                    # Handle cache invalidation messages (from Flask process)
+                    # These messages clear stale auth tokens after re-login
+                    # See GitHub issue #765 for details
+                    if topic_str.startswith("CACHE_INVALIDATE"):
+                        try:
+                            self._handle_cache_invalidation(topic_str, data_str)
+                        except Exception as e:
+                            logger.exception(f"Error handling cache invalidation: {e}")
+                        continue  # Skip market data processing for cache messages
 
-                if not mode:
-                    logger.warning(f"Invalid mode in topic: {mode_str}")
-                    continue
+                    market_data = json.loads(data_str)
+
+                    # Extract topic components (memoized per topic string)
+                    parsed_topic = parse_topic(topic_str)
+                    if parsed_topic is None:
+                        logger.warning(f"Invalid topic format: {topic_str}")
+                        continue
+                    broker_name, exchange, symbol, mode_str = parsed_topic
+
+                    # OPTIMIZATION: Use pre-computed mode map
+                    mode = self.MODE_MAP.get(mode_str)
+
+                    if not mode:
+                        logger.warning(f"Invalid mode in topic: {mode_str}")
+                        continue
 
                 # OPTIMIZATION: Message throttling for high-frequency updates
                 # Skip if we sent the same message too recently (reduces CPU on fast updates)
@@ -0,0 +1,397 @@
+"""
+Tick Wire Format for the Broker Adapter -> WebSocket Proxy ZeroMQ hop
+
+Broker adapters publish every tick as a two-frame ZeroMQ message ``[topic, payload]``.
+Historically the payload was ``json.dumps(data)`` and the proxy had to ``json.loads`` it
+and re-split the topic string for every tick. This module provides a compact,
+fixed-layout binary payload with a pre-parsed topic header so the proxy can route a
+tick without touching JSON or the topic string.
+
+The topic frame is unchanged, so ZeroMQ prefix filtering and the Flask
+``CACHE_INVALIDATE_*`` messages keep working. The proxy detects the payload format per
+message from its first byte (binary frames start with ``TICK_MAGIC``, JSON frames with
+``{``), so publishers configured with ``ZMQ_TICK_FORMAT=json`` and binary publishers
+can share the same proxy.
+
+Binary frame layout (little-endian):
+
+    header   : magic(B) version(B) mode(B) flags(B) broker_len(B) exchange_len(B) symbol_len(B)
+    strings  : broker, exchange, symbol (UTF-8)
+    fields   : present_mask(I) int_mask(I) extras_len(I)
+               one 8-byte value per present field, int64 if its int_mask bit is set else float64
+    depth    : (only if FLAG_DEPTH) buy_levels(B) sell_levels(B) buy_int_mask(Q) sell_int_mask(Q)
+               price/quantity/orders per level, int64 or float64 per int-mask bit
+    extras   : JSON object with any keys that do not fit the fixed layout
+
+Configuration:
+    ZMQ_TICK_FORMAT: ``binary`` (default) or ``json`` to fall back to the legacy payload
+"""
+
+import json
+import os
+import struct
+from functools import lru_cache
+from typing import Any
+
+TICK_MAGIC = 0xB7
+TICK_VERSION = 1
+
+FORMAT_BINARY = "binary"
+FORMAT_JSON = "json"
+
+MODE_MAP = {"LTP": 1, "QUOTE": 2, "DEPTH": 3}
+
+# Numeric tick fields carried in the fixed layout, in wire order (max 32 for the bitmask)
+TICK_FIELDS = (
+    "ltp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "oi",
+    "average_price",
+    "percent_change",
+    "change",
+    "last_quantity",
+    "last_trade_quantity",
+    "total_buy_quantity",
+    "total_sell_quantity",
+    "upper_circuit",
+    "lower_circuit",
+    "timestamp",
+    "ltt",
+    "last_trade_time",
+    "mode",
+    "depth_level",
+)
+_FIELD_INDEX = {name: idx for idx, name in enumerate(TICK_FIELDS)}
+
+MAX_DEPTH_LEVELS = 21  # 21 levels x 3 values fit in a 64-bit int mask
+
+FLAG_DEPTH = 0x01
+FLAG_SYMBOL = 0x02  # data["symbol"] equals the header symbol
+FLAG_EXCHANGE = 0x04  # data["exchange"] equals the header exchange
+
+_HEADER = struct.Struct("<BBBBBBB")
+_FIELDS_HEADER = struct.Struct("<III")
+_DEPTH_HEADER = struct.Struct("<BBQQ")
+
+_FLAG_BYTES = [bytes((flags,)) for flags in range(8)]
+
+_TOPIC_CACHE_MAX = 100000
+_topic_cache: dict[str, tuple[str, str, str, str] | None] = {}
+
+_LAYOUT_CACHE_MAX = 100000
+_layout_cache: dict[tuple, tuple | None] = {}
+
+
+def get_tick_format() -> str:
+    """Get the configured publisher tick format (binary unless ZMQ_TICK_FORMAT=json)"""
+    tick_format = os.getenv("ZMQ_TICK_FORMAT", FORMAT_BINARY).strip().lower()
+    return FORMAT_JSON if tick_format == FORMAT_JSON else FORMAT_BINARY
+
+
+def _parse_topic_uncached(topic: str) -> tuple[str, str, str, str] | None:
+    # Support both formats:
+    # New format: BROKER_EXCHANGE_SYMBOL_MODE (with broker name)
+    # Old format: EXCHANGE_SYMBOL_MODE (without broker name)
+    # Special case: NSE_INDEX_SYMBOL_MODE (exchange contains underscore)
+    parts = topic.split("_")
+
+    if len(parts) >= 4 and parts[0] == "NSE" and parts[1] == "INDEX":
+        return "unknown", "NSE_INDEX", parts[2], parts[3]
+    if len(parts) >= 4 and parts[0] == "BSE" and parts[1] == "INDEX":
+        return "unknown", "BSE_INDEX", parts[2], parts[3]
+    if len(parts) >= 5 and parts[1] == "INDEX":  # BROKER_NSE_INDEX_SYMBOL_MODE format
+        return parts[0], f"{parts[1]}_{parts[2]}", parts[3], parts[4]
+    if len(parts) >= 4:
+        # Standard format with broker name
+        return parts[0], parts[1], parts[2], parts[3]
+    if len(parts) >= 3:
+        # Old format without broker name
+        return "unknown", parts[0], parts[1], parts[2]
+    return None
+
+
+def parse_topic(topic: str) -> tuple[str, str, str, str] | None:
+    """
+    Split a ZeroMQ topic into (broker_name, exchange, symbol, mode_str).
+
+    Topics repeat for every tick of a symbol, so results are memoized.
+
+    Returns:
+        Tuple of (broker_name, exchange, symbol, mode_str), or None for an invalid topic
+    """
+    try:
+        return _topic_cache[topic]
+    except KeyError:
+        pass
+
+    parsed = _parse_topic_uncached(topic)
+    if len(_topic_cache) >= _TOPIC_CACHE_MAX:
+        _topic_cache.clear()
+    _topic_cache[topic] = parsed
+    return parsed
+
+
+@lru_cache(maxsize=4096)
+def _values_struct(count: int, int_mask: int) -> struct.Struct:
+    """Struct for `count` 8-byte values typed by `int_mask` (bit set -> int64)"""
+    return struct.Struct("<" + "".join("q" if int_mask >> i & 1 else "d" for i in range(count)))
+
+
+@lru_cache(maxsize=4096)
+def _field_names(present_mask: int) -> tuple[str, ...]:
+    """Field names present in a frame, in wire order"""
+    return tuple(name for idx, name in enumerate(TICK_FIELDS) if present_mask >> idx & 1)
+
+
+def _json_payload(data: dict) -> bytes:
+    return json.dumps(data).encode("utf-8")
+
+
+def _pack_depth_side(levels: Any) -> tuple[int, list] | None:
+    """Flatten one side of the book, or None if it does not fit the fixed layout"""
+    if type(levels) is not list or len(levels) > MAX_DEPTH_LEVELS:
+        return None
+
+    values = []
+    for level in levels:
+        if type(level) is not dict or len(level) != 3:
+            return None
+        try:
+            values += (level["price"], level["quantity"], level["orders"])
+        except KeyError:
+            return None
+
+    int_mask = 0
+    for bit, value in enumerate(values):
+        value_type = type(value)
+        if value_type is int:
+            int_mask |= 1 << bit
+        elif value_type is not float:
+            return None
+    return int_mask, values
+
+
+def _build_layout(topic: str, keys: tuple, types: tuple) -> tuple | None:
+    """
+    Work out the frame layout for a tick shape (topic, keys and value types).
+
+    Adapters publish the same shape for every tick of a subscription, so the
+    layout is computed once and reused.
+    """
+    parsed = parse_topic(topic)
+    mode = MODE_MAP.get(parsed[3]) if parsed else None
+    if not mode:
+        return None
+
+    broker_name, exchange, symbol, _ = parsed
+    strings = [value.encode("utf-8") for value in (broker_name, exchange, symbol)]
+    if any(len(value) > 255 for value in strings):
+        return None
+
+    fields = []
+    extra_keys = []
+    has_depth = has_symbol = has_exchange = False
+    for key, value_type in zip(keys, types):
+        idx = _FIELD_INDEX.get(key)
+        if idx is not None and (value_type is int or value_type is float):
+            fields.append((idx, key, value_type is int))
+        elif key == "depth" and value_type is dict:
+            has_depth = True
+        elif key == "symbol":
+            has_symbol = True
+        elif key == "exchange":
+            has_exchange = True
+        else:
+            extra_keys.append(key)
+
+    # Values go on the wire in field-table order so the decoder can walk the mask
+    fields.sort()
+    present_mask = 0
+    int_mask = 0
+    for pos, (idx, _, is_int) in enumerate(fields):
+        present_mask |= 1 << idx
+        if is_int:
+            int_mask |= 1 << pos
+
+    head = bytes((TICK_MAGIC, TICK_VERSION, mode))
+    tail = bytes(len(value) for value in strings) + b"".join(strings)
+    return (
+        head,
+        tail,
+        tuple(key for _, key, _ in fields),
+        _values_struct(len(fields), int_mask),
+        present_mask,
+        int_mask,
+        tuple(extra_keys),
+        has_depth,
+        symbol if has_symbol else None,
+        exchange if has_exchange else None,
+    )
+
+
+def encode_tick(topic: str, data: dict, tick_format: str = FORMAT_BINARY) -> bytes:
+    """
+    Encode a tick payload for publishing.
+
+    Falls back to the JSON payload when JSON is requested, the topic cannot be parsed
+    or a value does not fit the fixed layout.
+
+    Args:
+        topic: Topic string the tick is published under
+        data: Market data dictionary
+        tick_format: FORMAT_BINARY or FORMAT_JSON
+
+    Returns:
+        Payload bytes for the second ZeroMQ frame
+    """
+    if tick_format != FORMAT_BINARY:
+        return _json_payload(data)
+
+    shape = (topic, tuple(data), tuple(map(type, data.values())))
+    try:
+        layout = _layout_cache[shape]
+    except KeyError:
+        layout = _build_layout(*shape)
+        if len(_layout_cache) >= _LAYOUT_CACHE_MAX:
+            _layout_cache.clear()
+        _layout_cache[shape] = layout
+    if layout is None:
+        return _json_payload(data)
+
+    (
+        head,
+        tail,
+        field_keys,
+        values_struct,
+        present_mask,
+        int_mask,
+        extra_keys,
+        has_depth,
+        symbol,
+        exchange,
+    ) = layout
+
+    flags = 0
+    extras = {key: data[key] for key in extra_keys}
+    if symbol is not None:
+        if data["symbol"] == symbol:
+            flags |= FLAG_SYMBOL
+        else:
+            extras["symbol"] = data["symbol"]
+    if exchange is not None:
+        if data["exchange"] == exchange:
+            flags |= FLAG_EXCHANGE
+        else:
+            extras["exchange"] = data["exchange"]
+
+    depth_chunks = ()
+    if has_depth:
+        depth = data["depth"]
+        buy = _pack_depth_side(depth.get("buy")) if len(depth) == 2 else None
+        sell = _pack_depth_side(depth.get("sell")) if buy is not None else None
+        if sell is not None:
+            flags |= FLAG_DEPTH
+            (buy_mask, buy_values), (sell_mask, sell_values) = buy, sell
+            depth_chunks = (
+                _DEPTH_HEADER.pack(
+                    len(buy_values) // 3, len(sell_values) // 3, buy_mask, sell_mask
+                ),
+                _values_struct(len(buy_values), buy_mask).pack(*buy_values),
+                _values_struct(len(sell_values), sell_mask).pack(*sell_values),
+            )
+        else:
+            extras["depth"] = depth
+
+    try:
+        values_b = values_struct.pack(*[data[key] for key in field_keys])
+    except struct.error:
+        # Integers beyond int64
+        return _json_payload(data)
+
+    extras_b = _json_payload(extras) if extras else b""
+    return b"".join(
+        (
+            head,
+            _FLAG_BYTES[flags],
+            tail,
+            _FIELDS_HEADER.pack(present_mask, int_mask, len(extras_b)),
+            values_b,
+            *depth_chunks,
+            extras_b,
+        )
+    )
+
+
+def is_binary_tick(payload: bytes) -> bool:
+    """Check whether a ZeroMQ payload is a binary tick frame"""
+    return len(payload) >= _HEADER.size and payload[0] == TICK_MAGIC
+
+
+def _unpack_depth_side(payload: bytes, offset: int, count: int, int_mask: int):
+    values_struct = _values_struct(count * 3, int_mask)
+    values = values_struct.unpack_from(payload, offset)
+    levels = [
+        {"price": values[i], "quantity": values[i + 1], "orders": values[i + 2]}
+        for i in range(0, len(values), 3)
+    ]
+    return levels, offset + values_struct.size
+
+
+def decode_tick(payload: bytes) -> tuple[str, str, str, int, dict]:
+    """
+    Decode a binary tick frame.
+
+    Args:
+        payload: Payload bytes produced by encode_tick in binary format
+
+    Returns:
+        Tuple of (broker_name, exchange, symbol, mode, market_data)
+
+    Raises:
+        ValueError: If the payload is not a supported binary tick frame
+    """
+    if not is_binary_tick(payload):
+        raise ValueError("Not a binary tick frame")
+
+    magic, version, mode, flags, broker_len, exchange_len, symbol_len = _HEADER.unpack_from(
+        payload, 0
+    )
+    if version != TICK_VERSION:
+        raise ValueError(f"Unsupported tick frame version: {version}")
+
+    offset = _HEADER.size
+    broker_name = payload[offset : offset + broker_len].decode("utf-8")
+    offset += broker_len
+    exchange = payload[offset : offset + exchange_len].decode("utf-8")
+    offset += exchange_len
+    symbol = payload[offset : offset + symbol_len].decode("utf-8")
+    offset += symbol_len
+
+    present_mask, int_mask, extras_len = _FIELDS_HEADER.unpack_from(payload, offset)
+    offset += _FIELDS_HEADER.size
+
+    names = _field_names(present_mask)
+    values_struct = _values_struct(len(names), int_mask)
+    data = dict(zip(names, values_struct.unpack_from(payload, offset)))
+    offset += values_struct.size
+
+    if flags & FLAG_DEPTH:
+        buy_count, sell_count, buy_mask, sell_mask = _DEPTH_HEADER.unpack_from(payload, offset)
+        offset += _DEPTH_HEADER.size
+        buy, offset = _unpack_depth_side(payload, offset, buy_count, buy_mask)
+        sell, offset = _unpack_depth_side(payload, offset, sell_count, sell_mask)
+        data["depth"] = {"buy": buy, "sell": sell}
+
+    if flags & FLAG_SYMBOL:
+        data["symbol"] = symbol
+    if flags & FLAG_EXCHANGE:
+        data["exchange"] = exchange
+
+    if extras_len:
+        data.update(json.loads(payload[offset : offset + extras_len]))
+
+    return broker_name, exchange, symbol, mode, data